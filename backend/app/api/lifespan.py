@@ -11,6 +11,7 @@ from app.core.config import get_settings
 from app.core.logger import setup_logger
 from app.core.kafka.producer import KafkaProducer, KafkaProducerError
 from app.core.tools.redis import init_redis_client
+from app.core.rag.vault_version import get_vault_version_cache
 
 logger = setup_logger(__name__)
 
@@ -72,6 +73,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await check_redis_connection()
     logger.info("Connected to Redis successfully")
 
+    # Mirror vault content versions locally (cache keys without DB lookups)
+    get_vault_version_cache().start()
+
     app.state.db_engine = engine
     logger.info("Database engine initialized")
 
@@ -103,6 +107,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         except asyncio.CancelledError:
             pass
 
+        await get_vault_version_cache().stop()
+
+        # Close the LLM gateway's pooled HTTP clients
+        from app.core.tools.llm import close_llm_clients
+        await close_llm_clients()
+
         # Shut down PDF process pool
         from app.core.rag.parsing import shutdown_pdf_pool
         shutdown_pdf_pool()
@@ -16,6 +16,8 @@ from app.core.auth.deps import get_current_user, require_csrf, require_vault_mem
 from app.core.storage.local import LocalFileStore
 from app.core.kafka.producer import KafkaProducer, KafkaProducerError
 from app.core.kafka.topics import FILE_EVENTS, FileUploadedEvent, FileDeletedEvent
+from app.core.rag.rollup import apply_rollup_deltas, rollup_delta
+from app.core.rag.vault_version import bump_vault_versions
 from app.core.logger import setup_logger
 
 from app.api.routers.documents.schemas import DocumentResponse, UploadResponse, StatusResponse, ContentResponse
@@ -107,7 +109,9 @@ async def upload_document(
     if stale_doc:
         # Delete orphan chunks first (FK constraint prevents deleting the document otherwise)
         await db.execute(
-            sqlalchemy_delete(Chunk).where(Chunk.doc_id == stale_doc.id)
+            sqlalchemy_delete(Chunk).where(
+                Chunk.vault_id == vault_id, Chunk.doc_id == stale_doc.id,
+            )
         )
         await db.delete(stale_doc)
         await db.flush()
@@ -190,6 +194,7 @@ async def upload_document(
             vault_id=vault_id,
             db=db,
             embedder=get_embedder(),
+            file_store=_file_store,
         )
     except Exception as e:
         logger.error(f"Ingestion failed for {doc.id}: {e}")
@@ -306,10 +311,11 @@ async def get_document_content(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Read the raw file from storage, re-parse it to markdown, and return.
+    """Return the document's parsed markdown.
 
-    Only active documents can have their content read. The raw file is
-    parsed on-demand using the same pipeline that produced the chunks.
+    Only active documents can have their content read. Served from the
+    parsed artifact written at ingestion; documents ingested before
+    artifacts existed are parsed once here and the artifact is stored.
     """
     await require_vault_member(vault_id, current_user, db)
 
@@ -330,29 +336,35 @@ async def get_document_content(
             detail=f"Document is not ready (status: {doc.status})",
         )
 
-    # Read raw file from storage
+    from app.core.rag.parsing.artifact import load_or_parse
+
     try:
-        file_bytes = await _file_store.get(doc.storage_path)
+        markdown, ir_path = await load_or_parse(
+            _file_store,
+            storage_path=doc.storage_path,
+            file_hash=doc.file_hash_sha256,
+            file_type=doc.file_type,
+            filename=doc.original_filename,
+            parsed_ir_path=doc.parsed_ir_path,
+        )
     except (FileNotFoundError, ValueError):
         logger.error(f"File not found on disk for document {doc_id}: {doc.storage_path}")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Document file not found on disk",
         )
-
-    # Re-parse to markdown
-    from app.core.rag.parsing import get_parser
-
-    try:
-        parser = get_parser(doc.file_type)
-        markdown = await parser.parse(file_bytes, doc.original_filename)
-    except (ValueError, Exception) as e:
+    except Exception as e:
         logger.error(f"Failed to parse document {doc_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to parse document content",
         )
 
+    if ir_path and ir_path != doc.parsed_ir_path:
+        doc.parsed_ir_path = ir_path
+        db.add(doc)
+        await db.commit()
+
     return ContentResponse(
         id=doc.id,
         original_filename=doc.original_filename,
@@ -382,7 +394,7 @@ async def delete_document(
             Document.id == doc_id,
             Document.vault_id == vault_id,
             Document.deleted_at == None,
-        )
+        ).with_for_update()
     )
     doc = result.scalars().first()
     if not doc:
@@ -390,6 +402,11 @@ async def delete_document(
 
     now = utcnow()
 
+    # Both paths take the document out of "active": drop it from the
+    # aggregate rollup now, in the same transaction as the status change
+    if doc.status == "active":
+        await apply_rollup_deltas(db, [rollup_delta(vault_id, doc, -1)], now=now)
+
     # --- Async path (Kafka available) ---
     producer = _get_producer(request)
     if producer:
@@ -401,6 +418,8 @@ async def delete_document(
         await touch_vault_updated_at(db, vault_id)
 
         await db.commit()
+        # The document no longer counts in aggregates — invalidate cached answers
+        await bump_vault_versions([vault_id])
 
         event = FileDeletedEvent(
             doc_id=doc_id,
@@ -419,7 +438,7 @@ async def delete_document(
 
     await db.execute(
         sa_update(Chunk)
-        .where(Chunk.doc_id == doc_id, Chunk.is_deleted == False)
+        .where(Chunk.vault_id == vault_id, Chunk.doc_id == doc_id, Chunk.is_deleted == False)
         .values(is_deleted=True)
     )
 
@@ -427,6 +446,7 @@ async def delete_document(
     await touch_vault_updated_at(db, vault_id)
 
     await db.commit()
+    await bump_vault_versions([vault_id])
     return {"message": "Document deleted"}
 
 
@@ -439,7 +459,9 @@ async def parse_document(
 ):
     """Parse a file and return the extracted markdown without storing anything.
 
-    Useful for previewing parser output before uploading.
+    Useful for previewing parser output before uploading. If the vault
+    already holds a document with the same content hash, its parsed
+    artifact is served instead of re-parsing.
     """
     await require_vault_member(vault_id, current_user, db)
 
@@ -464,10 +486,32 @@ async def parse_document(
         )
 
     from app.core.rag.parsing import get_parser
+    from app.core.rag.parsing.artifact import read_artifact
+
+    markdown = None
+    file_hash = hashlib.sha256(content).hexdigest()
+    result = await db.execute(
+        select(Document).where(
+            Document.vault_id == vault_id,
+            Document.file_hash_sha256 == file_hash,
+            Document.file_type == extension,
+            Document.deleted_at == None,
+            Document.parsed_ir_path != None,
+        )
+    )
+    existing = result.scalars().first()
+    if existing:
+        markdown = await read_artifact(
+            _file_store,
+            storage_path=existing.storage_path,
+            file_hash=existing.file_hash_sha256,
+            parsed_ir_path=existing.parsed_ir_path,
+        )
 
     try:
-        parser = get_parser(extension)
-        markdown = await parser.parse(content, file.filename)
+        if markdown is None:
+            parser = get_parser(extension)
+            markdown = await parser.parse(content, file.filename)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
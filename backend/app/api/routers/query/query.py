@@ -91,6 +91,12 @@ async def query_vault(
 
     When ``stream=true``, returns a ``text/event-stream`` response with
     token-by-token deltas followed by a final structured ``done`` event.
+
+    A question already answered on the vault's current contents is
+    served from the answer cache (``retrieval_method="cache"``), and
+    SQL-parseable aggregate or single-entity questions skip the agent
+    loop (``"sql_aggregate"``, ``"entity_lookup"``); such answers are
+    replayed through the same event stream.
     """
     await require_vault_member(vault_id, current_user, db)
 
@@ -144,6 +150,6 @@ async def query_vault(
         confidence=answer.confidence,
         has_sufficient_evidence=answer.has_sufficient_evidence,
         chunks_used=len(answer.citations),
-        retrieval_method="agent",
+        retrieval_method=answer.retrieval_method,
         latency_ms=int((time.monotonic() - start) * 1000),
     )
@@ -2,7 +2,16 @@ from fastapi import APIRouter, Request
 from pydantic import BaseModel
 
 from app.core.config import get_settings
+from app.core.copilot.answer_cache import get_answer_cache
+from app.core.copilot.prefetch import prefetch_stats
+from app.core.rag.context import prompt_budget_stats
+from app.core.rag.embedding.cache import get_query_embedding_cache
+from app.core.rag.query import rewrite_stats
+from app.core.rag.embedding.doc_cache import doc_embedding_cache_stats
+from app.core.rag.vault_version import get_vault_version_cache
+from app.core.tools.llm import llm_stats
 from app.core.tools.redis import redis_health_check
+from app.workers.pipeline_metrics import read_pipeline_stats
 
 
 class HealthResponse(BaseModel):
@@ -47,3 +56,23 @@ async def health(request: Request):
         redis="ok" if redis_ok else "unavailable",
         database="ok" if db_ok else "unavailable",
     )
+
+
+@router.get("/metrics", tags=["Health Check"], summary="Runtime cache and pipeline counters")
+async def metrics() -> dict:
+    """Process-local counters for tuning (reset on restart).
+
+    ``ingestion_pipeline`` holds the latest snapshot published by each
+    running ingestion worker process.
+    """
+    return {
+        "answer_cache": get_answer_cache().stats(),
+        "agent_prefetch": prefetch_stats(),
+        "query_rewrite": rewrite_stats(),
+        "prompt_budget": prompt_budget_stats(),
+        "llm": llm_stats(),
+        "embedding_cache": get_query_embedding_cache().stats(),
+        "doc_embedding_cache": doc_embedding_cache_stats(),
+        "vault_versions": get_vault_version_cache().stats(),
+        "ingestion_pipeline": await read_pipeline_stats(),
+    }
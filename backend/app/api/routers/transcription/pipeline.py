@@ -6,7 +6,8 @@ for a captured batch of transcript segments.
 
 Uses the LangGraph-based copilot module:
   - ``extract_statements`` for pulling verifiable facts from transcript
-  - ``verify_statement`` for self-corrective retrieval + verdict synthesis
+  - ``verify_statement`` / ``verify_statements`` for self-corrective
+    retrieval + verdict synthesis (one statement at a time, or batched)
 """
 
 from __future__ import annotations
@@ -15,17 +16,15 @@ import asyncio
 from uuid import UUID
 
 from fastapi import WebSocket
-from sqlmodel import select
 
-from app.core.copilot import extract_statements, verify_statement
+from app.core.copilot import extract_statements, verify_statement, verify_statements
 from app.core.copilot.base import Statement
 from app.core.transcription.base import TranscriptSegment
 from app.core.transcription.buffer import TranscriptBuffer
 from app.core.transcription.persistence import SessionPersistence
 from app.core.config import get_settings
 from app.core.logger import setup_logger
-from app.db import get_db_session
-from app.db.models.vault import Vault
+from app.core.rag.vault_version import get_vault_version
 
 from app.api.routers.transcription.schemas import (
     WSClaimDetectedMessage,
@@ -37,13 +36,6 @@ logger = setup_logger(__name__)
 SETTINGS = get_settings()
 
 
-async def _get_vault_updated_at(vault_id: UUID) -> str | None:
-    async with get_db_session() as db:
-        result = await db.execute(select(Vault.updated_at).where(Vault.id == vault_id))
-        updated_at = result.scalar_one_or_none()
-    return updated_at.isoformat() if updated_at else None
-
-
 def spawn_claim_task(
     websocket: WebSocket,
     buffer: TranscriptBuffer,
@@ -126,10 +118,11 @@ async def process_statements_batch(
                 except Exception:
                     ws_alive = False
 
-        # 5. Verify all statements concurrently via LangGraph CRAG graph
-        vault_updated_at: str | None = None
+        # 5. Verify all statements — batched (shared embedding, retrieval
+        #    and LLM calls) or concurrently via the LangGraph CRAG graph
+        vault_version: str | None = None
         if SETTINGS.COPILOT.VERIFICATION_CACHE_ENABLED:
-            vault_updated_at = await _get_vault_updated_at(vault_id)
+            vault_version = await get_vault_version(vault_id)
 
         async def _verify_one(stmt: Statement):
             try:
@@ -137,7 +130,7 @@ async def process_statements_batch(
                     verify_statement(
                         stmt,
                         vault_id,
-                        vault_updated_at=vault_updated_at,
+                        vault_version=vault_version,
                     ),
                     timeout=SETTINGS.API_TIMEOUT_S,
                 )
@@ -148,7 +141,23 @@ async def process_statements_batch(
                 logger.error(f"Verification failed for '{stmt.text[:50]}': {exc}")
                 return None
 
-        verdicts = await asyncio.gather(*[_verify_one(s) for s in new_statements])
+        async def _verify_batch() -> list:
+            # No outer timeout: verify_statements keeps its own deadline and
+            # returns "timed out" verdicts next to the ones it finished
+            try:
+                return await verify_statements(
+                    new_statements,
+                    vault_id,
+                    vault_version=vault_version,
+                )
+            except Exception as exc:
+                logger.error(f"Batched verification failed: {exc} — verifying one by one")
+                return await asyncio.gather(*[_verify_one(s) for s in new_statements])
+
+        if SETTINGS.COPILOT.VERIFICATION_BATCH_ENABLED and len(new_statements) > 1:
+            verdicts = await _verify_batch()
+        else:
+            verdicts = await asyncio.gather(*[_verify_one(s) for s in new_statements])
 
         # 6. Persist verdicts + notify via WebSocket
         for stmt, verdict in zip(new_statements, verdicts):
@@ -183,6 +192,7 @@ async def process_statements_batch(
                         evidence=verdict.evidence,
                         verification_path=verdict.verification_path,
                         latency_ms=verdict.latency_ms,
+                        timings=verdict.timings,
                         cache_hit=verdict.cache_hit,
                     )
                     await websocket.send_json(msg.model_dump())
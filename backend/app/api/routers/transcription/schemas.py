@@ -47,6 +47,7 @@ class ClaimVerdictResponse(BaseModel):
     evidence: list[Evidence] = []
     verification_path: str | None = None
     latency_ms: int | None = None
+    timings: dict[str, float] = {}
     cache_hit: bool = False
 
 
@@ -184,6 +185,7 @@ class WSClaimVerifiedMessage(BaseModel):
     evidence: list[Evidence] = []
     verification_path: str | None = None
     latency_ms: int | None = None
+    timings: dict[str, float] = {}
     cache_hit: bool = False
 
 
@@ -16,13 +16,13 @@ from sqlmodel import select, func
 
 from app.db import get_db, get_db_session
 from app.db.models import User
-from app.db.models.vault import Vault
 from app.db.models.transcription_session import TranscriptionSession
 from app.core.auth.deps import get_current_user, require_vault_member, authenticate_websocket
 from app.core.config import get_settings
 from app.core.transcription import get_transcriber
 from app.core.transcription.persistence import SessionPersistence
 from app.core.transcription.buffer import TranscriptBuffer
+from app.core.rag.vault_version import get_vault_version
 from app.core.logger import setup_logger
 
 from app.api.routers.transcription.pipeline import spawn_claim_task
@@ -126,20 +126,16 @@ async def transcribe_audio(
         ]
 
         if statements:
-            vault_updated_at: str | None = None
+            vault_version: str | None = None
             if SETTINGS.COPILOT.VERIFICATION_CACHE_ENABLED:
-                result = await db.execute(
-                    select(Vault.updated_at).where(Vault.id == vault_id)
-                )
-                updated_at = result.scalar_one_or_none()
-                vault_updated_at = updated_at.isoformat() if updated_at else None
+                vault_version = await get_vault_version(vault_id)
 
             raw_verdicts = await asyncio.gather(*[
                 asyncio.wait_for(
                     verify_statement(
                         s,
                         vault_id,
-                        vault_updated_at=vault_updated_at,
+                        vault_version=vault_version,
                     ),
                     timeout=SETTINGS.API_TIMEOUT_S,
                 )
@@ -157,6 +153,7 @@ async def transcribe_audio(
                         explanation=v.explanation, evidence=v.evidence,
                         verification_path=v.verification_path,
                         latency_ms=v.latency_ms,
+                        timings=v.timings,
                         cache_hit=v.cache_hit,
                     )
                 )
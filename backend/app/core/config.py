@@ -54,11 +54,18 @@ class CopilotConfig(BaseSettings):
     VERIFICATION_MMR_LAMBDA: float = 1.0
     VERIFICATION_CACHE_ENABLED: bool = True
     VERIFICATION_CACHE_TTL_S: float = 300.0
+    # Verify a transcript batch's statements together (shared embedding,
+    # retrieval and LLM calls); at most this many statements per LLM call
+    VERIFICATION_BATCH_ENABLED: bool = True
+    VERIFICATION_BATCH_MAX_STATEMENTS: int = 6
     AGGREGATE_FASTPATH_ENABLED: bool = True
     AGGREGATE_FALLBACK_ENABLED: bool = False
     AGGREGATE_REQUIRE_COMPLETE_METADATA: bool = True
     AGGREGATE_LIST_MAX_DOCS: int = 50
     AGGREGATE_EVIDENCE_MAX_DOCS: int = 50
+    # Read counts/sums from the document_rollups table (one row read)
+    # instead of aggregating over documents on every question
+    AGGREGATE_ROLLUP_ENABLED: bool = True
 
     # Grading — fast model to grade retrieval relevance before synthesis
     GRADING_MODEL: str = ""  # defaults to OPENAI_QUERY_MODEL if empty
@@ -71,6 +78,27 @@ class CopilotConfig(BaseSettings):
     AGENT_MAX_FULL_DOC_CALLS: int = 3
     AGENT_TIMEOUT_S: float = 120.0
     AGENT_LLM_CALL_TIMEOUT_S: float = 45.0
+    # Token budgets for the agent's prompt: each tool output, a full
+    # document, and everything sent on one LLM call (older tool outputs
+    # are cut first when a turn would exceed it)
+    AGENT_PROMPT_MAX_TOKENS: int = 24000
+    AGENT_TOOL_OUTPUT_MAX_TOKENS: int = 4000
+    AGENT_FULL_DOCUMENT_MAX_TOKENS: int = 8000
+    # Answer SQL-parseable aggregate questions and single-entity point
+    # questions without the ReAct loop (app.core.copilot.planner)
+    AGENT_FASTPATH_ENABLED: bool = True
+    # Start the likely first tool call (lookup_entity / search_documents on
+    # the rewritten question) while the first agent LLM call is in flight
+    AGENT_PREFETCH_ENABLED: bool = True
+
+    # Answer cache — final agent answers keyed by vault content version and
+    # the normalized rewritten query; optional near-duplicate lookup by
+    # query-embedding cosine similarity
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_TTL_S: float = 600.0
+    ANSWER_CACHE_SEMANTIC_ENABLED: bool = False
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.95
+    ANSWER_CACHE_SEMANTIC_MAX_ENTRIES: int = 256
 
     # filter_documents tool — SQL-backed structured query
     FILTER_DOCUMENTS_MAX_RESULTS: int = 100
@@ -116,6 +144,39 @@ class MetadataConfig(BaseSettings):
     HYPOTHETICAL_QUESTIONS_COUNT: int = 3
 
 
+class LlmConfig(BaseSettings):
+    """Shared LLM gateway settings (``app.core.tools.llm``).
+
+    Every chat-completion call goes through one gateway per process:
+    pooled HTTP clients, per-provider request/token budgets, priority
+    scheduling (live verification > chat > bulk enrichment) and one
+    retry policy that honours ``Retry-After``. A budget of 0 is
+    unlimited.
+    """
+    model_config = SettingsConfigDict(env_prefix="LLM_", env_file=".env", extra="ignore")
+
+    # Retries — rate limits, 408/409/5xx and connection errors only
+    MAX_RETRIES: int = 2
+    RETRY_BASE_DELAY_S: float = 0.5
+    RETRY_MAX_DELAY_S: float = 30.0
+
+    # Pooled HTTP connections per provider
+    MAX_CONNECTIONS: int = 64
+    MAX_KEEPALIVE_CONNECTIONS: int = 32
+
+    # Share of a provider's concurrency bulk calls (metadata enrichment)
+    # may hold, so live and chat calls always find a free slot
+    BULK_MAX_SHARE: float = 0.5
+
+    OPENAI_MAX_CONCURRENCY: int = 32
+    OPENAI_REQUESTS_PER_MINUTE: int = 3000
+    OPENAI_TOKENS_PER_MINUTE: int = 1_000_000
+
+    GROQ_MAX_CONCURRENCY: int = 8
+    GROQ_REQUESTS_PER_MINUTE: int = 30
+    GROQ_TOKENS_PER_MINUTE: int = 12_000
+
+
 class WorkerConfig(BaseSettings):
     """Kafka worker tuning."""
     model_config = SettingsConfigDict(env_prefix="WORKER_", env_file=".env", extra="ignore")
@@ -124,6 +185,18 @@ class WorkerConfig(BaseSettings):
     INGESTION_BATCH_TIMEOUT_S: float = 2.0
     INGESTION_CONCURRENCY: int = 5
 
+    # Pipelined ingestion — parse → enrich → embed → store with bounded
+    # queues between stages; offsets commit as documents finish.
+    PIPELINE_ENABLED: bool = True
+    PIPELINE_PARSE_CONCURRENCY: int = 2
+    PIPELINE_ENRICH_CONCURRENCY: int = 10
+    PIPELINE_EMBED_CONCURRENCY: int = 2
+    PIPELINE_STORE_CONCURRENCY: int = 2
+    PIPELINE_QUEUE_SIZE: int = 20
+    PIPELINE_MAX_IN_FLIGHT: int = 100
+    PIPELINE_COMMIT_INTERVAL_S: float = 2.0
+    PIPELINE_METRICS_INTERVAL_S: float = 15.0
+
 
 # ---------------------------------------------------------------------------
 # Root settings
@@ -162,6 +235,7 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6380
     REDIS_PASSWORD: str = "mypassword"
     REDIS_SESSION_TTL_SECONDS: int = 60 * 60 * 24 * 7
+    REDIS_HEALTH_CHECK_INTERVAL_S: int = 30
 
     # Cookies
     SESSION_COOKIE_NAME: str = "session_id"
@@ -199,14 +273,26 @@ class Settings(BaseSettings):
     RAG_CHUNK_SIZE: int = 512
     RAG_CHUNK_OVERLAP: int = 50
     RAG_EMBEDDING_BATCH_SIZE: int = 2048
+    RAG_STREAM_EMBED_WINDOW: int = 128  # chunks embedded per call while the rest is still being chunked
     RAG_SEARCH_TOP_K: int = 5
     RAG_GENERATION_TEMPERATURE: float = 0.1
+    # Prompt token budgets (see app.core.rag.context): the whole grounded
+    # generation prompt, and the conversation history in any prompt
+    RAG_PROMPT_MAX_TOKENS: int = 12000
+    PROMPT_HISTORY_MAX_TOKENS: int = 2000
+    PROMPT_HISTORY_MESSAGE_MAX_TOKENS: int = 150
 
     # Query rewriting — resolves pronouns and co-references using
     # conversation history so the retrieval query is always standalone.
     QUERY_REWRITE_ENABLED: bool = True
     QUERY_REWRITE_MODEL: str = ""  # defaults to OPENAI_QUERY_MODEL if empty
     QUERY_HISTORY_MAX_TURNS: int = 10
+    # Skip the rewrite LLM call for follow-ups with no pronoun or bare
+    # definite reference ("the order") left to resolve
+    QUERY_REWRITE_DETECT_REFERENCES: bool = True
+    # In-process LRU of rewrites, keyed on the query and the history
+    # sent to the rewrite prompt (last QUERY_HISTORY_MAX_TURNS turns)
+    QUERY_REWRITE_CACHE_SIZE: int = 1024
 
     # Entity-aware retrieval — direct SQL lookup for entity IDs
     # (invoice numbers, order numbers) before embedding search.
@@ -214,6 +300,21 @@ class Settings(BaseSettings):
     ENTITY_SEARCH_MAX_IDS: int = 10
     ENTITY_SEARCH_LIMIT: int = 20
 
+    # Concurrent hybrid search — dense, BM25 and entity legs run on separate
+    # pooled connections. A leg that misses its deadline is dropped so a slow
+    # BM25 index degrades the request to dense-only instead of stalling it.
+    HYBRID_CONCURRENT_ENABLED: bool = True
+    HYBRID_DENSE_TIMEOUT_S: float = 5.0
+    HYBRID_SPARSE_TIMEOUT_S: float = 1.5
+    HYBRID_ENTITY_TIMEOUT_S: float = 1.5
+
+    # Dense search mode — "exact" orders by the fp32 HNSW index; "halfvec"
+    # and "binary" over-fetch DENSE_RERANK_OVERFETCH × top_k candidates from
+    # a compact expression index (half-precision, or binary-quantized
+    # Matryoshka prefix) and rerank them exactly on the full vectors.
+    DENSE_SEARCH_MODE: str = "exact"
+    DENSE_RERANK_OVERFETCH: int = 4
+
     # Kafka / Redpanda
     KAFKA_BOOTSTRAP_SERVERS: str = "localhost:19092"
     KAFKA_CONSUMER_GROUP: str = "ailways-workers"
@@ -233,6 +334,10 @@ class Settings(BaseSettings):
     EMBEDDING_TIMEOUT_S: float = 120.0
     EMBEDDING_MAX_RETRIES: int = 3
     EMBEDDING_RETRY_BASE_DELAY_S: float = 1.0
+    # Document embedding requests — packed by token count (the API caps a
+    # request at 300k tokens) and sent concurrently
+    EMBEDDING_MAX_TOKENS_PER_REQUEST: int = 100_000
+    EMBEDDING_MAX_IN_FLIGHT: int = 4
 
     # WebSocket
     WS_HEARTBEAT_INTERVAL_S: float = 30.0
@@ -248,13 +353,25 @@ class Settings(BaseSettings):
 
     # PDF process pool
     PDF_PARSE_WORKERS: int = 2
+    PDF_SHARD_MIN_PAGES: int = 40  # PDFs above this are scanned in page ranges across the pool
 
-    # Embedding cache (Redis-backed query dedup)
+    # Embedding cache — in-process LRU tier in front of Redis (query dedup)
     EMBEDDING_CACHE_TTL_S: float = 300.0
+    EMBEDDING_CACHE_LOCAL_TTL_S: float = 300.0
+    EMBEDDING_CACHE_LOCAL_MAX_ENTRIES: int = 2048
+
+    # Vault content versions — Redis counters bumped when a vault's chunks
+    # change; API processes mirror them locally via pub/sub invalidation
+    VAULT_VERSION_LOCAL_TTL_S: float = 300.0
+
+    # Document-embedding cache — reuse stored vectors for identical chunk
+    # text (embedding_cache table) instead of re-embedding during ingestion
+    EMBEDDING_DOC_CACHE_ENABLED: bool = True
 
     # Grouped sub-configs
     CLAIM: ClaimConfig = ClaimConfig()
     COPILOT: CopilotConfig = CopilotConfig()
+    LLM: LlmConfig = LlmConfig()
     METADATA: MetadataConfig = MetadataConfig()
     TRANSCRIPTION: TranscriptionConfig = TranscriptionConfig()
     WORKER: WorkerConfig = WorkerConfig()
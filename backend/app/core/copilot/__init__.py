@@ -2,18 +2,20 @@
 
 Two main capabilities:
   1. **Statement extraction + verification** (real-time transcription):
-     ``extract_statements`` → ``verify_statement`` (per-statement CRAG graph).
+     ``extract_statements`` → ``verify_statement`` (per-statement CRAG graph)
+     or ``verify_statements`` (the same loop, batched across statements).
   2. **Query agent** (copilot chat):
      ``query_vault_agent`` / ``stream_vault_agent`` (ReAct agent with tools).
 
 Usage::
 
-    from app.core.copilot import extract_statements, verify_statement
+    from app.core.copilot import extract_statements, verify_statement, verify_statements
     from app.core.copilot import query_vault_agent, stream_vault_agent
 
     # Transcription pipeline
     statements = await extract_statements(segments, context_segments)
     verdict = await verify_statement(statement, vault_id)
+    verdicts = await verify_statements(statements, vault_id)
 
     # Copilot chat
     answer = await query_vault_agent(query, vault_id, history)
@@ -28,7 +30,7 @@ from app.core.copilot.base import (
     CopilotAnswer,
 )
 from app.core.copilot.extraction import extract_statements
-from app.core.copilot.verification import verify_statement
+from app.core.copilot.verification import verify_statement, verify_statements
 from app.core.copilot.agent import query_vault_agent, stream_vault_agent
 
 __all__ = [
@@ -38,6 +40,7 @@ __all__ = [
     "CopilotAnswer",
     "extract_statements",
     "verify_statement",
+    "verify_statements",
     "query_vault_agent",
     "stream_vault_agent",
 ]
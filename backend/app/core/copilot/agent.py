@@ -19,8 +19,23 @@ Key improvements over a bare ReAct loop:
     infinite tool-calling loops.
   - **get_full_document budget**: max N calls per query, preventing
     context explosion on large corpora.
+  - **Prompt token budget**: history, tool outputs and full documents
+    are sized in tokens, and each LLM call fits ``AGENT_PROMPT_MAX_TOKENS``
+    (``app.core.rag.context``).
   - **Graceful tool errors**: ToolNode failures are caught and returned
     as error messages instead of crashing the graph.
+  - **Answer cache**: a question already answered on the vault's current
+    contents is served from ``answer_cache`` without running the agent
+    (streamed answers are replayed as the same events).
+  - **Speculative prefetch**: the likely first tool call of a point
+    question runs while the first LLM call is in flight, and serves that
+    tool call when the agent makes it (``prefetch``). When the query
+    rewrite needs an LLM call, it starts on the raw query instead and
+    is reconciled with the rewritten one.
+  - **Deterministic fast paths**: SQL-parseable aggregate questions and
+    single-entity point questions are answered by ``planner`` (SQL, or
+    one entity lookup and one generation call); the graph only runs
+    when the planner gives up.
 
 For streaming, the agent graph yields token-by-token deltas that
 the SSE endpoint can forward to the frontend.
@@ -31,11 +46,11 @@ from __future__ import annotations
 import asyncio
 import json
 import re
-from collections.abc import AsyncIterator
+import time
+from collections.abc import AsyncIterator, Iterator
 from typing import Annotated, TypedDict
 from uuid import UUID
 
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import (
     AnyMessage,
     HumanMessage,
@@ -43,18 +58,26 @@ from langchain_core.messages import (
     AIMessage,
     ToolMessage,
 )
+from langchain_core.runnables import Runnable
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode, tools_condition
 
+from app.core.copilot.answer_cache import CachedAnswer, get_answer_cache
+from app.core.copilot.planner import PlannedAnswer, plan_answer
+from app.core.copilot.prefetch import ToolPrefetch, reconcile_prefetch, start_prefetch
 from app.core.copilot.tools import COPILOT_TOOLS
 from app.core.copilot.prompts import AGENT_SYSTEM
 from app.core.copilot.base import CopilotAnswer, Evidence
-from app.core.rag.query import rewrite_query, extract_entity_ids
+from app.core.rag.chunking import count_tokens
+from app.core.rag.context import PromptUsage, fit_history, record_api_usage, truncate_to_budget
+from app.core.rag.query import rewrite_query, rewrite_needed, extract_entity_ids
 from app.core.rag.generation import Citation
+from app.core.tools.llm import Priority, get_chat_model, invoke_chat
 from app.core.copilot.classification import classify_query_type
 from app.core.config import get_settings
 from app.core.logger import setup_logger
+from app.core.utils import normalize_numbers
 
 logger = setup_logger(__name__)
 
@@ -99,20 +122,18 @@ class AgentState(TypedDict):
 
 
 # ---------------------------------------------------------------------------
-# Agent LLM (lazy singleton)
+# Agent LLM (lazy singleton, on the gateway's shared model)
 # ---------------------------------------------------------------------------
 
-_agent_llm: ChatOpenAI | None = None
+_agent_llm: Runnable | None = None
 
 
-def _get_agent_llm() -> ChatOpenAI:
+def _get_agent_llm() -> Runnable:
     global _agent_llm
     if _agent_llm is None:
         model = SETTINGS.COPILOT.AGENT_MODEL or SETTINGS.OPENAI_REASONING_MODEL
-        _agent_llm = ChatOpenAI(
-            model=model,
-            temperature=SETTINGS.COPILOT.AGENT_TEMPERATURE,
-            api_key=SETTINGS.OPENAI_API_KEY,
+        _agent_llm = get_chat_model(
+            model, temperature=SETTINGS.COPILOT.AGENT_TEMPERATURE,
         ).bind_tools(COPILOT_TOOLS)
     return _agent_llm
 
@@ -121,6 +142,15 @@ def _get_agent_llm() -> ChatOpenAI:
 # Graph nodes
 # ---------------------------------------------------------------------------
 
+# Marks the stand-in message ``agent_node`` returns when its LLM call
+# times out: such a reply is not an answer and must not be cached
+_TIMED_OUT = "agent_timed_out"
+
+
+def _timed_out(message: AnyMessage) -> bool:
+    return bool(getattr(message, "additional_kwargs", {}).get(_TIMED_OUT))
+
+
 async def agent_node(state: AgentState) -> dict:
     """Call the LLM with tool bindings.
 
@@ -128,27 +158,78 @@ async def agent_node(state: AgentState) -> dict:
     LangGraph's ``tools_condition`` routes accordingly.
 
     Each LLM call is individually timeout-guarded so a single stalled
-    OpenAI response cannot consume the entire agent budget.
+    OpenAI response cannot consume the entire agent budget, and sent
+    within ``AGENT_PROMPT_MAX_TOKENS`` (see ``_fit_prompt``).
     """
     llm = _get_agent_llm()
     try:
-        response = await asyncio.wait_for(
-            llm.ainvoke(state["messages"]),
+        response = await invoke_chat(
+            llm,
+            _fit_prompt(state["messages"]),
+            purpose="agent",
+            priority=Priority.INTERACTIVE,
             timeout=SETTINGS.COPILOT.AGENT_LLM_CALL_TIMEOUT_S,
         )
+        record_api_usage(response)
         return {"messages": [response]}
     except asyncio.TimeoutError:
         logger.warning("Agent LLM call timed out — forcing answer with available data")
         return {
             "messages": [
-                AIMessage(content=(
-                    "I apologize, but the response is taking too long. "
-                    "Let me compile an answer based on the information I've already gathered."
-                )),
+                AIMessage(
+                    content=(
+                        "I apologize, but the response is taking too long. "
+                        "Let me compile an answer based on the information I've already gathered."
+                    ),
+                    additional_kwargs={_TIMED_OUT: True},
+                ),
             ],
         }
 
 
+# Tool outputs are never cut below this many tokens to fit the prompt
+_MIN_TOOL_OUTPUT_TOKENS = 256
+
+
+def _fit_prompt(messages: list[AnyMessage]) -> list[AnyMessage]:
+    """The messages for one agent LLM call, within ``AGENT_PROMPT_MAX_TOKENS``.
+
+    When the conversation is over budget, tool outputs are cut oldest
+    first (the latest results matter most to the next step). The graph
+    state keeps the full outputs for citation extraction.
+    """
+    usage = PromptUsage()
+    sizes = [count_tokens(m.content) if isinstance(m.content, str) else 0 for m in messages]
+    over = sum(sizes) - SETTINGS.COPILOT.AGENT_PROMPT_MAX_TOKENS
+
+    fitted = list(messages)
+    for i, msg in enumerate(messages):
+        if over <= 0:
+            break
+        if not isinstance(msg, ToolMessage) or sizes[i] <= _MIN_TOOL_OUTPUT_TOKENS:
+            continue
+        content = truncate_to_budget(
+            msg.content,
+            max(sizes[i] - over, _MIN_TOOL_OUTPUT_TOKENS),
+            marker="\n... [output truncated to fit the prompt budget]",
+            usage=usage,
+        )
+        fitted[i] = msg.model_copy(update={"content": content})
+        size = count_tokens(content)
+        over -= sizes[i] - size
+        sizes[i] = size
+
+    for msg, size in zip(fitted, sizes):
+        if isinstance(msg, SystemMessage):
+            usage.add("system", size)
+        elif isinstance(msg, ToolMessage):
+            usage.add("tool_outputs", size)
+        else:
+            usage.add("conversation", size)
+    usage.record("agent")
+    return fitted
+
+
 def guard_rails(state: AgentState) -> dict:
     """Enforce iteration limits and budget constraints before tool execution.
 
@@ -323,24 +404,26 @@ def _build_messages(
 
     Combines:
       1. System prompt
-      2. Conversation history (truncated)
+      2. Conversation history (within ``PROMPT_HISTORY_MAX_TOKENS``)
       3. Planning hint based on query classification
       4. User's rewritten query
+
+    The system prompt and history form a prefix that stays the same
+    across a conversation's agent calls (prompt-cache friendly); the
+    per-query parts come last.
     """
     messages: list[AnyMessage] = [SystemMessage(content=AGENT_SYSTEM)]
 
-    if history:
-        for msg in history[-SETTINGS.QUERY_HISTORY_MAX_TURNS * 2:]:
-            role = msg.get("role", "user")
-            content = msg.get("content", "").strip()
-            if not content:
-                continue
-            if role == "assistant":
-                if len(content) > 500:
-                    content = content[:500] + "..."
-                messages.append(AIMessage(content=content))
-            else:
-                messages.append(HumanMessage(content=content))
+    for msg in fit_history(
+        history,
+        max_tokens=SETTINGS.PROMPT_HISTORY_MAX_TOKENS,
+        max_message_tokens=SETTINGS.PROMPT_HISTORY_MESSAGE_MAX_TOKENS,
+        max_turns=SETTINGS.QUERY_HISTORY_MAX_TURNS,
+    ):
+        if msg["role"] == "assistant":
+            messages.append(AIMessage(content=msg["content"]))
+        else:
+            messages.append(HumanMessage(content=msg["content"]))
 
     # Classify and inject planning hint
     query_type = classify_query_type(rewritten_query)
@@ -462,10 +545,12 @@ async def query_vault_agent(
 ) -> CopilotAnswer:
     """Run the query agent and return a structured answer.
 
-    1. Rewrites the query for coreference resolution.
-    2. Classifies query type and builds messages with planning hint.
-    3. Invokes the LangGraph agent graph with guardrails.
-    4. Parses the final response into ``CopilotAnswer``.
+    1. Rewrites the query for coreference resolution (skipped when
+       there is nothing to resolve).
+    2. Serves a cached answer, or one from a planner fast path.
+    3. Classifies query type and builds messages with planning hint.
+    4. Invokes the LangGraph agent graph with guardrails.
+    5. Parses the final response into ``CopilotAnswer``.
 
     Args:
         query: The user's current question.
@@ -476,21 +561,35 @@ async def query_vault_agent(
     Returns:
         CopilotAnswer with answer text, citations, and confidence.
     """
-    # 1. Rewrite query for standalone form
-    rewritten = await rewrite_query(query, history)
-
-    # 2. Build messages with planning hint
+    # 1. Rewrite query for standalone form (retrieval for the raw
+    #    query starts meanwhile when the rewrite needs the LLM)
+    top_k = top_k or SETTINGS.RAG_SEARCH_TOP_K
+    rewritten, speculative = await _rewrite(query, history, vault_id, top_k)
+
+    # 2-3. Same question on unchanged vault contents — reuse the answer;
+    #      else a deterministic fast path (SQL aggregate / single entity)
+    cache = get_answer_cache() if SETTINGS.COPILOT.ANSWER_CACHE_ENABLED else None
+    early = await _early_answer(rewritten, vault_id, history, top_k, cache, speculative)
+    if isinstance(early, CachedAnswer):
+        return early.answer.model_copy(update={"retrieval_method": "cache"})
+    if early:
+        return early.answer
+
+    # 4. Build messages with planning hint
     messages = _build_messages(rewritten, history)
 
-    # 3. Invoke agent
+    # 5. Invoke agent, with the likely first tool call already running
     graph = get_agent_graph()
+    prefetch = await _start_prefetch(rewritten, vault_id, top_k, speculative)
     config = {
         "configurable": {
             "vault_id": vault_id,
-            "top_k": top_k or SETTINGS.RAG_SEARCH_TOP_K,
+            "top_k": top_k,
+            "prefetch": prefetch,
         }
     }
 
+    agent_start = time.monotonic()
     try:
         result = await asyncio.wait_for(
             graph.ainvoke(
@@ -508,13 +607,18 @@ async def query_vault_agent(
     except Exception as e:
         logger.error(f"Query agent failed: {e}")
         return CopilotAnswer(answer=f"An error occurred: {e}")
+    finally:
+        if prefetch:
+            await prefetch.close()
 
-    # 4. Extract final answer from last AI message
+    # 6. Extract final answer from last AI message
     final_messages = result.get("messages", [])
     answer_text = ""
+    timed_out = False
     for msg in reversed(final_messages):
         if isinstance(msg, AIMessage) and msg.content and not msg.tool_calls:
             answer_text = msg.content
+            timed_out = _timed_out(msg)
             break
 
     if not answer_text:
@@ -523,6 +627,100 @@ async def query_vault_agent(
     # Extract structured citations from tool messages
     citations, chunks_used = _extract_citations_from_messages(final_messages)
 
+    answer = _final_answer(answer_text, citations, sufficient=not timed_out)
+    # Only answers drawn from tool output are worth replaying
+    if cache and chunks_used > 0:
+        await cache.store(
+            vault_id, rewritten, top_k, answer,
+            chunks_used=chunks_used,
+            agent_ms=int((time.monotonic() - agent_start) * 1000),
+        )
+    return answer
+
+
+async def _early_answer(
+    rewritten: str,
+    vault_id: UUID,
+    history: list[dict[str, str]] | None,
+    top_k: int,
+    cache,
+    speculative: ToolPrefetch | None,
+) -> CachedAnswer | PlannedAnswer | None:
+    """A cached answer, else a planned one, without running the agent.
+
+    ``speculative`` is closed when an answer is served or the lookup
+    raises; on a miss it is left running for the agent.
+    """
+    try:
+        early = await cache.lookup(vault_id, rewritten, top_k) if cache else None
+        if early is None:
+            early = await _planned_answer(rewritten, vault_id, history, top_k, cache)
+    except BaseException:
+        if speculative:
+            await speculative.close()
+        raise
+    if early and speculative:
+        await speculative.close()
+    return early
+
+
+async def _planned_answer(
+    rewritten: str,
+    vault_id: UUID,
+    history: list[dict[str, str]] | None,
+    top_k: int,
+    cache,
+) -> PlannedAnswer | None:
+    """Run the planner fast paths (if enabled) and cache what they answer."""
+    if not SETTINGS.COPILOT.AGENT_FASTPATH_ENABLED:
+        return None
+    start = time.monotonic()
+    planned = await plan_answer(rewritten, vault_id, history, top_k)
+    if planned and cache:
+        await cache.store(
+            vault_id, rewritten, top_k, planned.answer,
+            chunks_used=planned.chunks_used,
+            agent_ms=int((time.monotonic() - start) * 1000),
+        )
+    return planned
+
+
+async def _rewrite(
+    query: str,
+    history: list[dict[str, str]] | None,
+    vault_id: UUID,
+    top_k: int,
+) -> tuple[str, ToolPrefetch | None]:
+    """Rewrite the query; speculatively prefetch on the raw query while
+    the rewrite LLM call is in flight."""
+    speculative = None
+    if SETTINGS.COPILOT.AGENT_PREFETCH_ENABLED and rewrite_needed(query, history):
+        speculative = start_prefetch(normalize_numbers(query.strip()), vault_id, top_k)
+    try:
+        return await rewrite_query(query, history), speculative
+    except BaseException:
+        if speculative:
+            await speculative.close()
+        raise
+
+
+async def _start_prefetch(
+    rewritten: str,
+    vault_id: UUID,
+    top_k: int,
+    speculative: ToolPrefetch | None = None,
+) -> ToolPrefetch | None:
+    if not SETTINGS.COPILOT.AGENT_PREFETCH_ENABLED:
+        return None
+    return await reconcile_prefetch(speculative, rewritten, vault_id, top_k)
+
+
+def _final_answer(
+    answer_text: str,
+    citations: list[Citation],
+    *,
+    sufficient: bool = True,
+) -> CopilotAnswer:
     return CopilotAnswer(
         answer=answer_text,
         citations=[Evidence(
@@ -532,8 +730,8 @@ async def query_vault_agent(
             quote=c.quote,
             relevance_score=1.0,
         ) for c in citations],
-        confidence=0.8,
-        has_sufficient_evidence=True,
+        confidence=0.8 if sufficient else 0.0,
+        has_sufficient_evidence=sufficient,
     )
 
 
@@ -562,22 +760,37 @@ async def stream_vault_agent(
         history: Optional prior conversation.
         top_k: Override default top_k.
     """
-    # 1. Rewrite
-    rewritten = await rewrite_query(query, history)
-
-    # 2. Build messages with planning hint
+    # 1. Rewrite (retrieval for the raw query starts meanwhile)
+    top_k = top_k or SETTINGS.RAG_SEARCH_TOP_K
+    rewritten, speculative = await _rewrite(query, history, vault_id, top_k)
+
+    # 2-3. Cached answer, else a deterministic fast path — either is
+    #      replayed as the same event sequence
+    cache = get_answer_cache() if SETTINGS.COPILOT.ANSWER_CACHE_ENABLED else None
+    early = await _early_answer(rewritten, vault_id, history, top_k, cache, speculative)
+    if early:
+        method = "cache" if isinstance(early, CachedAnswer) else early.answer.retrieval_method
+        for event in _replay_events(early, method):
+            yield event
+        return
+
+    # 4. Build messages with planning hint
     messages = _build_messages(rewritten, history)
 
-    # 3. Stream agent
+    # 5. Stream agent, with the likely first tool call already running
     graph = get_agent_graph()
+    prefetch = await _start_prefetch(rewritten, vault_id, top_k, speculative)
     config = {
         "configurable": {
             "vault_id": vault_id,
-            "top_k": top_k or SETTINGS.RAG_SEARCH_TOP_K,
+            "top_k": top_k,
+            "prefetch": prefetch,
         }
     }
 
+    agent_start = time.monotonic()
     tool_call_count = 0
+    timed_out = False
     full_content = ""
     all_tool_messages: list[ToolMessage] = []
 
@@ -607,6 +820,12 @@ async def stream_vault_agent(
                         full_content += chunk.content
                         yield {"type": "token", "content": chunk.content}
 
+            # An agent LLM call timed out (see agent_node)
+            elif kind == "on_chain_end" and event.get("name") == "agent":
+                output = event.get("data", {}).get("output")
+                if isinstance(output, dict) and any(map(_timed_out, output.get("messages", []))):
+                    timed_out = True
+
         # Extract citations from collected tool messages
         citations, chunks_extracted = _extract_citations_from_messages(
             all_tool_messages,
@@ -628,6 +847,13 @@ async def stream_vault_agent(
             "retrieval_method": "agent",
         }
 
+        if cache and full_content and not timed_out and (chunks_extracted or tool_call_count):
+            await cache.store(
+                vault_id, rewritten, top_k, _final_answer(full_content, citations),
+                chunks_used=chunks_extracted or tool_call_count,
+                agent_ms=int((time.monotonic() - agent_start) * 1000),
+            )
+
     except Exception as e:
         logger.error(f"Stream agent failed: {e}")
         yield {
@@ -635,3 +861,33 @@ async def stream_vault_agent(
             "answer": f"An error occurred: {e}",
             "confidence": 0.0,
         }
+    finally:
+        if prefetch:
+            await prefetch.close()
+
+
+_REPLAY_TOKEN_RE = re.compile(r"\S+\s*|\s+")
+
+
+def _replay_events(
+    hit: CachedAnswer | PlannedAnswer,
+    retrieval_method: str = "cache",
+) -> Iterator[dict]:
+    """The stream events of a finished answer: retrieval, word tokens, done."""
+    answer = hit.answer
+    yield {"type": "retrieval", "chunks_used": hit.chunks_used}
+    for piece in _REPLAY_TOKEN_RE.findall(answer.answer):
+        yield {"type": "token", "content": piece}
+    yield {
+        "type": "done",
+        "answer": answer.answer,
+        "citations": [
+            {"doc_title": c.doc_title, "section": c.section,
+             "page": c.page, "quote": c.quote}
+            for c in answer.citations
+        ],
+        "confidence": answer.confidence,
+        "has_sufficient_evidence": answer.has_sufficient_evidence,
+        "chunks_used": hit.chunks_used,
+        "retrieval_method": retrieval_method,
+    }
@@ -0,0 +1,270 @@
+"""Answer cache for the copilot query agent.
+
+Dashboards and users re-ask the same questions of the same vault within
+minutes; each one used to run the full ReAct loop. Final answers are
+cached in Redis under the vault's content version (see
+``app.core.rag.vault_version``) and the normalized *rewritten* query,
+so an answer is reused until the vault's contents change, and then
+never again.
+
+With ``ANSWER_CACHE_SEMANTIC_ENABLED`` a miss falls back to a
+near-duplicate lookup: each stored answer's query embedding is kept in
+a per-vault-version Redis hash, and the closest stored query above
+``ANSWER_CACHE_SIMILARITY_THRESHOLD`` (cosine) is served instead.
+
+Like the embedding cache, every Redis error counts as a miss, and so
+does an embedding error on the near-duplicate path.
+
+Usage::
+
+    from app.core.copilot.answer_cache import get_answer_cache
+
+    cache = get_answer_cache()
+    hit = await cache.lookup(vault_id, rewritten_query, top_k)
+    if hit is None:
+        answer = ...  # run the agent
+        await cache.store(vault_id, rewritten_query, top_k, answer,
+                          chunks_used=n, agent_ms=elapsed_ms)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from uuid import UUID
+
+import numpy as np
+
+from app.core.copilot.base import CopilotAnswer
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.core.utils import normalize_numbers, singleton
+
+logger = setup_logger(__name__)
+SETTINGS = get_settings()
+
+_ANSWER_PREFIX = "answer_cache:"
+_INDEX_PREFIX = "answer_cache_idx:"
+
+
+@dataclass
+class CachedAnswer:
+    """A cached agent answer.
+
+    Attributes:
+        answer: The agent's final answer, with citations.
+        chunks_used: Chunks the agent's tools returned for it.
+        agent_ms: How long the agent took to produce it (time saved per hit).
+        similarity: 1.0 for an exact key hit, else the query cosine similarity.
+    """
+    answer: CopilotAnswer
+    chunks_used: int
+    agent_ms: int
+    similarity: float = 1.0
+
+
+class AnswerCache:
+    """Redis cache of final agent answers, scoped by vault content version.
+
+    Args:
+        ttl_s: Lifetime of cached answers (and of the similarity index).
+        semantic: Enable the near-duplicate lookup.
+        similarity_threshold: Minimum cosine similarity for a near-duplicate hit.
+        max_index_entries: Queries kept per vault version for the similarity scan.
+    """
+
+    def __init__(
+        self,
+        ttl_s: float = 600.0,
+        semantic: bool = False,
+        similarity_threshold: float = 0.95,
+        max_index_entries: int = 256,
+    ) -> None:
+        self._ttl_s = max(int(ttl_s), 1)
+        self._semantic = semantic
+        self._threshold = similarity_threshold
+        self._max_index_entries = max_index_entries
+        self._stats = {
+            "exact_hits": 0, "semantic_hits": 0, "misses": 0,
+            "stores": 0, "redis_errors": 0, "saved_agent_ms": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def lookup(self, vault_id: UUID, query: str, top_k: int) -> CachedAnswer | None:
+        """Find a cached answer for ``query`` (already rewritten) in this vault."""
+        scope = await _scope(vault_id, top_k)
+        digest = query_digest(query)
+
+        hit = await self._get(scope, digest)
+        if hit is not None:
+            self._stats["exact_hits"] += 1
+        elif self._semantic:
+            hit = await self._nearest(scope, query)
+            if hit is not None:
+                self._stats["semantic_hits"] += 1
+
+        if hit is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["saved_agent_ms"] += hit.agent_ms
+        logger.info(f"Answer cache hit (similarity={hit.similarity:.3f}): '{query[:60]}'")
+        return hit
+
+    async def store(
+        self,
+        vault_id: UUID,
+        query: str,
+        top_k: int,
+        answer: CopilotAnswer,
+        *,
+        chunks_used: int,
+        agent_ms: int,
+    ) -> None:
+        """Cache a final answer. Answers without evidence are not cached."""
+        if not answer.has_sufficient_evidence:
+            return
+        scope = await _scope(vault_id, top_k)
+        digest = query_digest(query)
+        payload = json.dumps({
+            "answer": answer.model_dump(),
+            "chunks_used": chunks_used,
+            "agent_ms": agent_ms,
+        })
+
+        try:
+            client = await _get_client()
+            await client.setex(_ANSWER_PREFIX + f"{scope}:{digest}", self._ttl_s, payload)
+            if self._semantic:
+                await self._index(client, scope, digest, query)
+            self._stats["stores"] += 1
+        except Exception as e:
+            logger.warning(f"Answer cache store failed: {e}")
+            self._stats["redis_errors"] += 1
+
+    def stats(self) -> dict:
+        """Hit/miss counters, hit ratio and agent time saved by hits."""
+        hits = self._stats["exact_hits"] + self._stats["semantic_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _get(self, scope: str, digest: str, similarity: float = 1.0) -> CachedAnswer | None:
+        try:
+            client = await _get_client()
+            raw = await client.get(_ANSWER_PREFIX + f"{scope}:{digest}")
+        except Exception:
+            self._stats["redis_errors"] += 1
+            return None
+        if not raw:
+            return None
+        try:
+            data = json.loads(raw)
+            return CachedAnswer(
+                answer=CopilotAnswer(**data["answer"]),
+                chunks_used=int(data.get("chunks_used", 0)),
+                agent_ms=int(data.get("agent_ms", 0)),
+                similarity=similarity,
+            )
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cached answer: {e}")
+            return None
+
+    async def _nearest(self, scope: str, query: str) -> CachedAnswer | None:
+        try:
+            client = await _get_binary_client()
+            entries = await client.hgetall(_INDEX_PREFIX + scope)
+        except Exception:
+            self._stats["redis_errors"] += 1
+            return None
+        if not entries:
+            return None
+
+        try:
+            query_vec = await _query_vector(query)
+        except Exception as e:
+            logger.warning(f"Answer cache query embedding failed: {e}")
+            self._stats["redis_errors"] += 1
+            return None
+        digests = [d.decode() if isinstance(d, bytes) else d for d in entries]
+        matrix = np.stack([np.frombuffer(v, dtype="<f4") for v in entries.values()])
+        similarities = _cosine(query_vec, matrix)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self._threshold:
+            return None
+        return await self._get(scope, digests[best], similarity=float(similarities[best]))
+
+    async def _index(self, client, scope: str, digest: str, query: str) -> None:
+        key = _INDEX_PREFIX + scope
+        if await client.hlen(key) >= self._max_index_entries:
+            return
+        try:
+            vector = np.asarray(await _query_vector(query), dtype="<f4").tobytes()
+        except Exception as e:
+            # The exact-key answer is stored; only its near-duplicate entry is lost
+            logger.warning(f"Answer cache query embedding failed: {e}")
+            self._stats["redis_errors"] += 1
+            return
+        pipe = client.pipeline(transaction=False)
+        pipe.hset(key, digest, vector)
+        pipe.expire(key, self._ttl_s)
+        await pipe.execute()
+
+
+def normalize_query(text: str) -> str:
+    """Case-, punctuation- and number-format-insensitive form of a query."""
+    normalized = normalize_numbers(text.lower())
+    normalized = re.sub(r"[^\w\s]", "", normalized)
+    return " ".join(normalized.split())
+
+
+def query_digest(text: str) -> str:
+    return hashlib.sha256(normalize_query(text).encode()).hexdigest()
+
+
+def _cosine(query: list[float], matrix: np.ndarray) -> np.ndarray:
+    q = np.asarray(query, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(q) or 1.0)
+    return (matrix @ q) / np.where(norms == 0, 1.0, norms)
+
+
+async def _scope(vault_id: UUID, top_k: int) -> str:
+    from app.core.rag.vault_version import get_vault_version
+    return f"{vault_id}:{await get_vault_version(vault_id)}:{top_k}"
+
+
+async def _query_vector(query: str) -> list[float]:
+    # Served by the query-embedding cache after the first call
+    from app.core.rag.embedding import get_embedder
+    return await get_embedder().embed_query(normalize_query(query))
+
+
+async def _get_client():
+    from app.core.tools.redis import get_redis_client
+    return await get_redis_client()
+
+
+async def _get_binary_client():
+    from app.core.tools.redis import get_redis_binary_client
+    return await get_redis_binary_client()
+
+
+@singleton
+def get_answer_cache() -> AnswerCache:
+    """Return the shared answer cache configured from ``COPILOT`` settings."""
+    return AnswerCache(
+        ttl_s=SETTINGS.COPILOT.ANSWER_CACHE_TTL_S,
+        semantic=SETTINGS.COPILOT.ANSWER_CACHE_SEMANTIC_ENABLED,
+        similarity_threshold=SETTINGS.COPILOT.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+        max_index_entries=SETTINGS.COPILOT.ANSWER_CACHE_SEMANTIC_MAX_ENTRIES,
+    )
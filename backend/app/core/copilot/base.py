@@ -66,6 +66,8 @@ class Verdict(BaseModel):
     evidence: list[Evidence] = []
     verification_path: str | None = None
     latency_ms: int | None = None
+    # Milliseconds spent per verification step (e.g. "retrieve_ms", "embed_ms")
+    timings: dict[str, float] = {}
     cache_hit: bool = False
 
 
@@ -80,3 +82,6 @@ class CopilotAnswer(BaseModel):
     citations: list[Evidence] = []
     confidence: float = 0.0
     has_sufficient_evidence: bool = False
+    # How the answer was produced: "agent", a planner fast path
+    # ("sql_aggregate", "entity_lookup"), or "cache" when replayed
+    retrieval_method: str = "agent"
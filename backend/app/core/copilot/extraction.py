@@ -1,7 +1,7 @@
 """Statement extraction — pull verifiable factual statements from transcript segments.
 
 Uses Groq's fast inference (same as old claim detector) for near-real-time
-extraction. The prompts are domain-agnostic so extraction works for any
+extraction, through the shared LLM gateway at live priority. The prompts are domain-agnostic so extraction works for any
 document type, not just invoices.
 
 The ``extract_statements`` function is called by the pipeline before
@@ -11,19 +11,17 @@ as a plain async function to keep latency minimal (one LLM call).
 
 from __future__ import annotations
 
-import asyncio
 import json
 import re
 import uuid
 
-from groq import AsyncGroq
-
 from app.core.copilot.base import Statement
 from app.core.copilot.prompts import (
     EXTRACTION_SYSTEM,
     EXTRACTION_USER_WITH_CONTEXT,
     EXTRACTION_USER_SIMPLE,
 )
+from app.core.tools.llm import Priority, call_provider, get_groq_client
 from app.core.transcription.base import TranscriptSegment
 from app.core.config import get_settings
 from app.core.logger import setup_logger
@@ -86,7 +84,7 @@ async def extract_statements(
             transcript=transcript_text,
         )
 
-    # Call LLM with retry
+    # Call LLM (retried by the gateway)
     raw = await _call_extraction_llm(user_content)
     if raw is None:
         return []
@@ -96,54 +94,53 @@ async def extract_statements(
 
 
 # ---------------------------------------------------------------------------
-# LLM call with retry
+# LLM call
 # ---------------------------------------------------------------------------
 
 async def _call_extraction_llm(user_content: str) -> str | None:
-    """Call the extraction LLM with exponential-backoff retry.
+    """Call the extraction LLM through the gateway (live priority, retried).
 
     Uses Groq by default (fast, free). Falls back gracefully on failure.
     """
     model = SETTINGS.COPILOT.EXTRACTION_MODEL or SETTINGS.GROQ_MODEL
-    api_key = SETTINGS.GROQ_API_KEY
-    max_retries = SETTINGS.COPILOT.EXTRACTION_MAX_RETRIES
-    delay = 1.0
 
-    if not api_key:
+    if not SETTINGS.GROQ_API_KEY:
         logger.warning("No GROQ_API_KEY configured — statement extraction disabled")
         return None
 
-    client = AsyncGroq(api_key=api_key)
-
-    for attempt in range(max_retries + 1):
-        try:
-            response = await asyncio.wait_for(
-                client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": EXTRACTION_SYSTEM},
-                        {"role": "user", "content": user_content},
-                    ],
-                    temperature=SETTINGS.COPILOT.EXTRACTION_TEMPERATURE,
-                    response_format={"type": "json_object"},
-                ),
-                timeout=SETTINGS.API_TIMEOUT_S,
-            )
-            return response.choices[0].message.content
-
-        except Exception as e:
-            is_last = attempt == max_retries
-            level = "error" if is_last else "warning"
-            getattr(logger, level)(
-                f"Extraction LLM attempt {attempt + 1}/{max_retries + 1} "
-                f"failed: {e}",
-            )
-            if is_last:
-                return None
-            await asyncio.sleep(delay)
-            delay = min(delay * 2, 8.0)
-
-    return None
+    client = get_groq_client()
+    messages = [
+        {"role": "system", "content": EXTRACTION_SYSTEM},
+        {"role": "user", "content": user_content},
+    ]
+    try:
+        response = await call_provider(
+            "groq",
+            lambda: client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=SETTINGS.COPILOT.EXTRACTION_TEMPERATURE,
+                response_format={"type": "json_object"},
+            ),
+            purpose="extraction",
+            priority=Priority.LIVE,
+            timeout=SETTINGS.API_TIMEOUT_S,
+            estimated_tokens=(len(EXTRACTION_SYSTEM) + len(user_content)) // 4,
+            max_retries=SETTINGS.COPILOT.EXTRACTION_MAX_RETRIES,
+            usage=_completion_usage,
+        )
+        return response.choices[0].message.content
+    except Exception as e:
+        logger.error(f"Extraction LLM call failed: {e!r}")
+        return None
+
+
+def _completion_usage(response) -> tuple[int, int]:
+    usage = getattr(response, "usage", None)
+    return (
+        getattr(usage, "prompt_tokens", 0) or 0,
+        getattr(usage, "completion_tokens", 0) or 0,
+    )
 
 
 # ---------------------------------------------------------------------------
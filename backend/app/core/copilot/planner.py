@@ -0,0 +1,284 @@
+"""Query planner — deterministic fast paths in front of the query agent.
+
+Most chat questions do not need a ReAct loop. The planner runs on the
+rewritten query before the agent graph and answers two shapes itself:
+
+  - **SQL aggregate** (``retrieval_method="sql_aggregate"``): count,
+    sum, average or "list all ..." questions whose filters
+    (document type, date range, customer) parse from the text are
+    answered from ``document_stats`` plus one document listing — the
+    same figures the ``filter_documents`` tool and the verification
+    ``aggregate_fast_node`` use, with no LLM call.
+  - **Entity lookup** (``retrieval_method="entity_lookup"``): a point
+    question naming exactly one entity ID gets one ``entity_id_search``
+    and one ``OpenAIGenerator.generate`` call.
+
+Anything else — no parseable filters, metadata gaps, no matches, an
+answer without sufficient evidence, several entity IDs, compound
+questions — returns None and the caller runs the agent graph as before.
+
+Usage::
+
+    from app.core.copilot.planner import plan_answer
+
+    planned = await plan_answer(rewritten, vault_id, history, top_k)
+    if planned is None:
+        ...  # run the agent
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from uuid import UUID
+
+from sqlmodel import col, select
+
+from app.core.copilot.base import CopilotAnswer, Evidence
+from app.core.copilot.classification import classify_query_type, infer_aggregate_intent
+from app.core.copilot.filters import (
+    build_filter_description,
+    parse_customer_id,
+    parse_date_range,
+    parse_document_type,
+)
+from app.core.rag.generation import generate_answer
+from app.core.rag.query import extract_entity_ids
+from app.core.rag.retrieval import entity_id_search
+from app.core.rag.rollup import document_stats
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.db import get_db_session
+from app.db.models.document import Document
+
+logger = setup_logger(__name__)
+
+SETTINGS = get_settings()
+
+# "list all invoices from July 2016" — the only "list" questions a plain
+# document listing answers; "which orders from 2017 contain Tofu" needs content
+_LISTING_RE = re.compile(
+    r"^\s*(?:please\s+)?(?:list|show(?:\s+me)?|give\s+me)\s+(?:all|every|the)\b",
+    re.IGNORECASE,
+)
+
+# Bare 4-digit numbers extract_entity_ids picks up from dates ("in 2016")
+_YEAR_RE = re.compile(r"^(?:19|20)\d{2}$")
+
+# A second question after the first ("how many ... and which ...")
+_COMPOUND_RE = re.compile(
+    r"\?\s*\S|\band\s+(?:what|which|who|how|why|when|where)\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class PlannedAnswer:
+    """An answer produced without the agent graph.
+
+    Attributes:
+        answer: The answer, with ``retrieval_method`` naming the fast path.
+        chunks_used: Documents (aggregate) or chunks (entity) it is based on.
+    """
+    answer: CopilotAnswer
+    chunks_used: int
+
+
+async def plan_answer(
+    query: str,
+    vault_id: UUID,
+    history: list[dict[str, str]] | None = None,
+    top_k: int | None = None,
+) -> PlannedAnswer | None:
+    """Answer ``query`` (already rewritten) on a deterministic fast path.
+
+    Returns None when no fast path applies or one gives up; errors are
+    logged and also return None, so the agent remains the fallback.
+    """
+    if not query or not query.strip() or _COMPOUND_RE.search(query):
+        return None
+
+    # A named entity makes it a point question whatever the wording
+    # ("how many items are in order 10248")
+    entity_ids = [eid for eid in extract_entity_ids(query) if not _YEAR_RE.match(eid)]
+    try:
+        if len(entity_ids) == 1:
+            return await _entity_lookup_answer(
+                query, entity_ids[0], vault_id, history,
+                top_k or SETTINGS.RAG_SEARCH_TOP_K,
+            )
+        if not entity_ids and classify_query_type(query) in ("aggregate", "compute"):
+            return await _sql_aggregate_answer(query, vault_id)
+    except Exception as e:
+        logger.warning(f"Planner fast path failed, falling back to agent: {e}")
+    return None
+
+
+# ---------------------------------------------------------------------------
+# SQL aggregate path
+# ---------------------------------------------------------------------------
+
+async def _sql_aggregate_answer(query: str, vault_id: UUID) -> PlannedAnswer | None:
+    intent = infer_aggregate_intent(query)
+    if intent == "list" and not _LISTING_RE.search(query):
+        return None
+
+    doc_type = parse_document_type(query)
+    date_from, date_to = parse_date_range(query)
+    customer_id = parse_customer_id(query)
+    if not (doc_type or date_from or customer_id):
+        return None
+
+    async with get_db_session() as db:
+        stats = await document_stats(
+            db,
+            vault_id=vault_id,
+            doc_type=doc_type,
+            date_from=date_from,
+            date_to=date_to,
+            customer_id=customer_id,
+            use_rollup=SETTINGS.COPILOT.AGGREGATE_ROLLUP_ENABLED,
+        )
+    # No matches may just be a filter the parser got wrong; missing
+    # metadata makes the figures inexact — let the agent look
+    if not stats.doc_count:
+        return None
+    if (date_from or date_to) and stats.missing_order_date:
+        return None
+    if intent in ("sum", "average") and (stats.missing_total_price or stats.total_price_sum is None):
+        return None
+
+    docs = await _list_documents(
+        vault_id, doc_type, date_from, date_to, customer_id,
+        limit=SETTINGS.COPILOT.AGGREGATE_LIST_MAX_DOCS,
+    )
+    filter_desc = build_filter_description(doc_type, date_from, date_to, customer_id)
+    total_count = stats.doc_count
+
+    if intent == "sum":
+        headline = (
+            f"The total of the {total_count} documents matching {filter_desc} "
+            f"is ${stats.total_price_sum:,.2f}."
+        )
+    elif intent == "average":
+        headline = (
+            f"The average total of the {total_count} documents matching {filter_desc} "
+            f"is ${stats.total_price_sum / total_count:,.2f}."
+        )
+    else:
+        headline = f"There are {total_count} documents matching {filter_desc}."
+
+    lines = [headline, ""]
+    for i, doc in enumerate(docs, 1):
+        lines.append(f"{i}. {_doc_line(doc)}")
+    if total_count > len(docs):
+        lines.append(f"... (showing first {len(docs)} of {total_count})")
+
+    logger.info(
+        f"Planner SQL aggregate: query='{query[:60]}', intent={intent}, "
+        f"filters='{filter_desc}', count={total_count}, source={stats.source}"
+    )
+    answer = CopilotAnswer(
+        answer="\n".join(lines),
+        citations=[
+            Evidence(doc_title=doc.original_filename, quote=_doc_line(doc), relevance_score=1.0)
+            for doc in docs[:SETTINGS.COPILOT.AGGREGATE_EVIDENCE_MAX_DOCS]
+        ],
+        confidence=1.0,
+        has_sufficient_evidence=True,
+        retrieval_method="sql_aggregate",
+    )
+    return PlannedAnswer(answer=answer, chunks_used=len(docs))
+
+
+async def _list_documents(
+    vault_id: UUID,
+    doc_type: str | None,
+    date_from: date | None,
+    date_to: date | None,
+    customer_id: str | None,
+    *,
+    limit: int,
+) -> list[Document]:
+    if limit <= 0:
+        return []
+    stmt = (
+        select(Document)
+        .where(Document.vault_id == vault_id)
+        .where(Document.deleted_at.is_(None))  # type: ignore[union-attr]
+        .where(Document.status == "active")
+    )
+    if doc_type:
+        stmt = stmt.where(Document.document_type == doc_type)
+    if date_from:
+        stmt = stmt.where(Document.order_date >= date_from)
+    if date_to:
+        stmt = stmt.where(Document.order_date <= date_to)
+    if customer_id:
+        stmt = stmt.where(col(Document.customer_id).ilike(customer_id))
+    stmt = stmt.order_by(Document.order_date, Document.entity_id).limit(limit)
+
+    async with get_db_session() as db:
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+
+def _doc_line(doc: Document) -> str:
+    details: list[str] = []
+    if doc.order_date:
+        details.append(f"Date: {doc.order_date}")
+    if doc.customer_id:
+        details.append(f"Customer: {doc.customer_id}")
+    if doc.total_price is not None:
+        details.append(f"Total: ${doc.total_price:,.2f}")
+    if doc.entity_id:
+        details.append(f"ID: {doc.entity_id}")
+    if not details:
+        return doc.original_filename
+    return f"{doc.original_filename} — " + ", ".join(details)
+
+
+# ---------------------------------------------------------------------------
+# Entity lookup path
+# ---------------------------------------------------------------------------
+
+async def _entity_lookup_answer(
+    query: str,
+    entity_id: str,
+    vault_id: UUID,
+    history: list[dict[str, str]] | None,
+    top_k: int,
+) -> PlannedAnswer | None:
+    async with get_db_session() as db:
+        results = await entity_id_search([entity_id], vault_id, db)
+    if not results:
+        return None
+    results = results[:top_k]
+
+    generated = await generate_answer(query, results, history=history)
+    if not generated.has_sufficient_evidence:
+        return None
+
+    scores = {r.original_filename: r.score for r in reversed(results)}
+    logger.info(
+        f"Planner entity lookup: query='{query[:60]}', entity={entity_id}, "
+        f"chunks={len(results)}"
+    )
+    answer = CopilotAnswer(
+        answer=generated.answer,
+        citations=[
+            Evidence(
+                doc_title=c.doc_title,
+                section=c.section,
+                page=c.page,
+                quote=c.quote,
+                relevance_score=scores.get(c.doc_title, 1.0),
+            )
+            for c in generated.citations
+        ],
+        confidence=generated.confidence,
+        has_sufficient_evidence=True,
+        retrieval_method="entity_lookup",
+    )
+    return PlannedAnswer(answer=answer, chunks_used=len(results))
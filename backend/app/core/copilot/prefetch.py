@@ -0,0 +1,233 @@
+"""Speculative tool prefetch for the query agent.
+
+The agent's first tool call cannot start until its first LLM round trip
+finishes, and for point questions that call is almost always
+``lookup_entity`` with the question's entity IDs or
+``search_documents`` with the rewritten question itself. The agent
+starts that call as a background task before invoking the graph; when
+the tool is then called with the same argument it awaits the task
+instead of running again, so the embedding and retrieval overlap the
+LLM call.
+
+When the query rewrite needs an LLM call, the calls are started on the
+raw query while the rewrite runs, then reconciled with the rewritten
+query: calls it would also start are kept (a speculation win), the rest
+are cancelled and replaced.
+
+Speculative calls nobody asked for are cancelled when the agent
+finishes. Process-lifetime counters (hit ratio, time saved, speculation
+wins) are exposed via ``GET /metrics``.
+
+Usage::
+
+    speculative = start_prefetch(raw_query, vault_id, top_k)
+    rewritten = await rewrite_query(raw_query, history)
+    prefetch = await reconcile_prefetch(speculative, rewritten, vault_id, top_k)
+    config = {"configurable": {..., "prefetch": prefetch}}
+    try:
+        ...  # run the graph; tools call prefetch.take(name, argument)
+    finally:
+        if prefetch:
+            await prefetch.close()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable, Coroutine
+from dataclasses import asdict, dataclass
+from uuid import UUID
+
+from app.core.copilot.answer_cache import normalize_query
+from app.core.copilot.classification import classify_query_type
+from app.core.copilot.tools import run_lookup_entity, run_search_documents
+from app.core.rag.query import extract_entity_ids
+from app.core.utils import normalize_numbers
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# (tool name, argument, factory of the call's coroutine)
+PlannedCall = tuple[str, str, Callable[[], Coroutine[None, None, str]]]
+
+
+@dataclass
+class PrefetchStats:
+    """Cumulative speculative-call counters.
+
+    Attributes:
+        started: Speculative calls started.
+        hits: Tool calls served from a speculative call.
+        misses: Prefetchable tool calls that matched no speculative call.
+        unused: Speculative calls cancelled or discarded unused.
+        failed: Speculative calls that raised (the tool then ran itself).
+        saved_ms: Speculative work that overlapped the agent's LLM calls.
+        speculative_wins: Calls started on the raw query and kept for
+            the rewritten one.
+        speculative_losses: Calls started on the raw query that the
+            rewritten one replaced.
+    """
+    started: int = 0
+    hits: int = 0
+    misses: int = 0
+    unused: int = 0
+    failed: int = 0
+    saved_ms: float = 0.0
+    speculative_wins: int = 0
+    speculative_losses: int = 0
+
+
+# Process-lifetime totals, exposed via GET /metrics
+_totals = PrefetchStats()
+
+
+def prefetch_stats() -> dict:
+    """Cumulative prefetch counters and hit ratio for this process."""
+    stats = asdict(_totals)
+    stats["saved_ms"] = round(stats["saved_ms"], 1)
+    stats["hit_ratio"] = round(_totals.hits / _totals.started, 4) if _totals.started else 0.0
+    speculated = _totals.speculative_wins + _totals.speculative_losses
+    stats["speculation_win_ratio"] = (
+        round(_totals.speculative_wins / speculated, 4) if speculated else 0.0
+    )
+    return stats
+
+
+class ToolPrefetch:
+    """Speculative tool calls for one agent run, keyed by tool and argument."""
+
+    def __init__(self) -> None:
+        self._calls: dict[tuple[str, str], tuple[float, asyncio.Task, Coroutine]] = {}
+
+    def start(self, tool_name: str, argument: str, call: Coroutine[None, None, str]) -> None:
+        """Start ``call`` as the speculative result of ``tool_name(argument)``."""
+        key = (tool_name, _argument_key(tool_name, argument))
+        if key in self._calls:
+            call.close()
+            return
+        self._calls[key] = (time.monotonic(), asyncio.ensure_future(_timed(call)), call)
+        _totals.started += 1
+
+    async def take(self, tool_name: str, argument: str) -> str | None:
+        """Result of a matching speculative call, or None to run the tool.
+
+        Each speculative call serves at most one tool call.
+        """
+        entry = self._calls.pop((tool_name, _argument_key(tool_name, argument)), None)
+        if entry is None:
+            _totals.misses += 1
+            return None
+
+        started_at, task, _ = entry
+        asked_at = time.monotonic()
+        try:
+            output, finished_at = await task
+        except Exception as e:
+            logger.warning(f"Prefetched {tool_name} failed, running it again: {e}")
+            _totals.failed += 1
+            return None
+
+        _totals.hits += 1
+        _totals.saved_ms += (min(asked_at, finished_at) - started_at) * 1000
+        logger.info(f"Served {tool_name}('{argument[:60]}') from prefetch")
+        return output
+
+    @property
+    def pending(self) -> int:
+        """Speculative calls not yet taken or cancelled."""
+        return len(self._calls)
+
+    async def retarget(self, plan: list[PlannedCall]) -> None:
+        """Keep the calls in ``plan``, cancel the rest, start the missing ones."""
+        wanted = {(tool_name, _argument_key(tool_name, argument)) for tool_name, argument, _ in plan}
+        stale = [key for key in self._calls if key not in wanted]
+        _totals.speculative_wins += len(self._calls) - len(stale)
+        _totals.speculative_losses += len(stale)
+        await self._cancel(stale)
+
+        for tool_name, argument, call in plan:
+            if (tool_name, _argument_key(tool_name, argument)) not in self._calls:
+                self.start(tool_name, argument, call())
+
+    async def close(self) -> None:
+        """Cancel the speculative calls no tool call asked for."""
+        await self._cancel(list(self._calls))
+
+    async def _cancel(self, keys: list[tuple[str, str]]) -> None:
+        entries = [self._calls.pop(key) for key in keys]
+        for _, task, _ in entries:
+            task.cancel()
+        _totals.unused += len(entries)
+        await asyncio.gather(*(task for _, task, _ in entries), return_exceptions=True)
+        # A task cancelled before its first step never started its call
+        for _, _, call in entries:
+            call.close()
+
+
+def start_prefetch(query: str, vault_id: UUID, top_k: int) -> ToolPrefetch | None:
+    """Start the likely first tool call for a point question.
+
+    ``lookup_entity`` when the question names entity IDs, otherwise
+    ``search_documents`` with the question itself. Aggregate questions
+    start with ``filter_documents`` on a parsed filter the agent words
+    itself, so nothing is prefetched for them.
+    """
+    plan = _plan(query, vault_id, top_k)
+    if not plan:
+        return None
+    prefetch = ToolPrefetch()
+    for tool_name, argument, call in plan:
+        prefetch.start(tool_name, argument, call())
+    return prefetch
+
+
+async def reconcile_prefetch(
+    speculative: ToolPrefetch | None,
+    query: str,
+    vault_id: UUID,
+    top_k: int,
+) -> ToolPrefetch | None:
+    """Re-target calls started on the raw query to the rewritten ``query``.
+
+    Calls the rewritten query would start too are kept; the others are
+    cancelled and the rewritten query's missing calls started.
+    """
+    if speculative is None:
+        return start_prefetch(query, vault_id, top_k)
+
+    await speculative.retarget(_plan(query, vault_id, top_k))
+    return speculative if speculative.pending else None
+
+
+def _plan(
+    query: str,
+    vault_id: UUID,
+    top_k: int,
+) -> list[PlannedCall]:
+    if classify_query_type(query) != "point":
+        return []
+    entity_ids = extract_entity_ids(query)
+    if entity_ids:
+        return [(
+            "lookup_entity", ",".join(entity_ids),
+            lambda: run_lookup_entity(entity_ids, vault_id),
+        )]
+    normalized = normalize_numbers(query.strip())
+    if not normalized:
+        return []
+    return [(
+        "search_documents", normalized,
+        lambda: run_search_documents(normalized, vault_id, top_k),
+    )]
+
+
+def _argument_key(tool_name: str, argument: str) -> str:
+    if tool_name == "lookup_entity":
+        return ",".join(sorted({eid.strip() for eid in argument.split(",") if eid.strip()}))
+    return normalize_query(argument)
+
+
+async def _timed(call: Coroutine[None, None, str]) -> tuple[str, float]:
+    output = await call
+    return output, time.monotonic()
@@ -5,7 +5,13 @@ The ``vault_id`` is passed at runtime via LangGraph's ``RunnableConfig``
 under ``config["configurable"]["vault_id"]``.
 
 Tools acquire their own short-lived DB sessions via ``get_db_session()``
-(the same pattern used by ``RAGClaimVerifier`` and ``SessionPersistence``).
+(the same pattern used by ``RAGClaimVerifier`` and ``SessionPersistence``),
+so the tool calls of one agent turn run concurrently on separate pooled
+connections.
+
+``search_documents`` and ``lookup_entity`` first check
+``config["configurable"]["prefetch"]`` for a matching speculative call
+the agent started before its first LLM turn (see ``prefetch``).
 """
 
 from __future__ import annotations
@@ -18,8 +24,10 @@ from sqlmodel import select, col
 from sqlalchemy import func
 
 from app.core.rag.embedding import get_embedder
-from app.core.rag.retrieval import hybrid_search, entity_id_search
-from app.core.rag.retrieval.base import SearchResult, build_retrieval_context
+from app.core.rag.retrieval import hybrid_search, concurrent_hybrid_search, entity_id_search
+from app.core.rag.context import assemble_context, truncate_to_budget
+from app.core.rag.retrieval.base import RetrievalHit, SearchResult
+from app.core.rag.rollup import document_stats
 from app.core.utils import normalize_numbers
 from app.core.config import get_settings
 from app.core.logger import setup_logger
@@ -39,11 +47,19 @@ SETTINGS = get_settings()
 
 
 
-def _format_results(results: list[SearchResult]) -> str:
-    """Format search results into a context string for the LLM."""
+async def _take_prefetched(config: RunnableConfig, tool_name: str, argument: str) -> str | None:
+    """Output of a matching speculative call started by the agent, if any."""
+    prefetch = config["configurable"].get("prefetch")
+    if prefetch is None:
+        return None
+    return await prefetch.take(tool_name, argument)
+
+
+def _format_results(results: list[SearchResult] | list[RetrievalHit]) -> str:
+    """Format search results into a deduplicated, token-budgeted context string."""
     if not results:
         return "No documents found."
-    return build_retrieval_context(results)
+    return assemble_context(results, max_tokens=SETTINGS.COPILOT.AGENT_TOOL_OUTPUT_MAX_TOKENS)
 
 
 @tool
@@ -64,17 +80,34 @@ async def search_documents(query: str, config: RunnableConfig) -> str:
     if not query:
         return "No documents found."
 
+    prefetched = await _take_prefetched(config, "search_documents", query)
+    if prefetched is not None:
+        return prefetched
+    return await run_search_documents(query, vault_id, top_k)
+
+
+async def run_search_documents(query: str, vault_id, top_k: int) -> str:
+    """``search_documents`` for a normalized, non-empty query."""
     embedder = get_embedder()
     query_embedding = await embedder.embed_query(query)
 
-    async with get_db_session() as db:
-        results = await hybrid_search(
+    if SETTINGS.HYBRID_CONCURRENT_ENABLED:
+        outcome = await concurrent_hybrid_search(
             query_text=query,
             query_embedding=query_embedding,
             vault_id=vault_id,
-            db=db,
             top_k=top_k,
         )
+        results = outcome.results
+    else:
+        async with get_db_session() as db:
+            results = await hybrid_search(
+                query_text=query,
+                query_embedding=query_embedding,
+                vault_id=vault_id,
+                db=db,
+                top_k=top_k,
+            )
 
     logger.info(f"search_documents: query='{query[:60]}', results={len(results)}")
     return _format_results(results)
@@ -101,6 +134,14 @@ async def lookup_entity(entity_ids: str, config: RunnableConfig) -> str:
     # Limit to prevent abuse
     ids = ids[: SETTINGS.ENTITY_SEARCH_MAX_IDS]
 
+    prefetched = await _take_prefetched(config, "lookup_entity", ",".join(ids))
+    if prefetched is not None:
+        return prefetched
+    return await run_lookup_entity(ids, vault_id)
+
+
+async def run_lookup_entity(ids: list[str], vault_id) -> str:
+    """``lookup_entity`` for an already split and capped list of IDs."""
     async with get_db_session() as db:
         results = await entity_id_search(ids, vault_id, db)
 
@@ -169,9 +210,13 @@ async def get_full_document(document_title: str, config: RunnableConfig) -> str:
 
     full_content = "\n".join(parts)
 
-    # Truncate if extremely large (>30k chars) to stay within LLM context
-    if len(full_content) > 30000:
-        full_content = full_content[:30000] + "\n\n... [Document truncated at 30,000 characters]"
+    # Cut very long documents at a token boundary to bound the prompt
+    max_tokens = SETTINGS.COPILOT.AGENT_FULL_DOCUMENT_MAX_TOKENS
+    full_content = truncate_to_budget(
+        full_content,
+        max_tokens,
+        marker=f"\n\n... [Document truncated at {max_tokens:,} tokens]",
+    )
 
     logger.info(
         f"get_full_document: title='{document_title}', "
@@ -259,47 +304,42 @@ async def filter_documents(
     customer_id = parse_customer_id(query)
 
     async with get_db_session() as db:
-        stmt = (
-            select(Document)
-            .where(Document.vault_id == vault_id)
-            .where(Document.deleted_at.is_(None))  # type: ignore[union-attr]
-            .where(Document.status == "active")
-        )
-
-        if doc_type:
-            stmt = stmt.where(Document.document_type == doc_type)
-        if date_from:
-            stmt = stmt.where(Document.order_date >= date_from)
-        if date_to:
-            stmt = stmt.where(Document.order_date <= date_to)
-        if customer_id:
-            stmt = stmt.where(col(Document.customer_id).ilike(customer_id))
-
-        stmt = stmt.order_by(Document.order_date, Document.entity_id)
-        stmt = stmt.limit(max_results)
-
-        result = await db.execute(stmt)
-        docs = result.scalars().all()
-
-        # Also get total count if we hit the limit
-        count_stmt = (
-            select(func.count())
-            .select_from(Document)
-            .where(Document.vault_id == vault_id)
-            .where(Document.deleted_at.is_(None))  # type: ignore[union-attr]
-            .where(Document.status == "active")
+        # Count and grand total come from the aggregate rollup; the list
+        # query only runs when there is something to show
+        stats = await document_stats(
+            db,
+            vault_id=vault_id,
+            doc_type=doc_type,
+            date_from=date_from,
+            date_to=date_to,
+            customer_id=customer_id,
+            use_rollup=SETTINGS.COPILOT.AGGREGATE_ROLLUP_ENABLED,
         )
-        if doc_type:
-            count_stmt = count_stmt.where(Document.document_type == doc_type)
-        if date_from:
-            count_stmt = count_stmt.where(Document.order_date >= date_from)
-        if date_to:
-            count_stmt = count_stmt.where(Document.order_date <= date_to)
-        if customer_id:
-            count_stmt = count_stmt.where(col(Document.customer_id).ilike(customer_id))
-
-        count_result = await db.execute(count_stmt)
-        total_count = count_result.scalar_one()
+        total_count = stats.doc_count
+
+        docs: list[Document] = []
+        if total_count:
+            stmt = (
+                select(Document)
+                .where(Document.vault_id == vault_id)
+                .where(Document.deleted_at.is_(None))  # type: ignore[union-attr]
+                .where(Document.status == "active")
+            )
+
+            if doc_type:
+                stmt = stmt.where(Document.document_type == doc_type)
+            if date_from:
+                stmt = stmt.where(Document.order_date >= date_from)
+            if date_to:
+                stmt = stmt.where(Document.order_date <= date_to)
+            if customer_id:
+                stmt = stmt.where(col(Document.customer_id).ilike(customer_id))
+
+            stmt = stmt.order_by(Document.order_date, Document.entity_id)
+            stmt = stmt.limit(max_results)
+
+            result = await db.execute(stmt)
+            docs = result.scalars().all()
 
     if not docs:
         # Provide helpful context about what IS available
@@ -313,7 +353,6 @@ async def filter_documents(
         parts.append(f"(Showing first {max_results} of {total_count})")
     parts.append("")
 
-    grand_total = 0.0
     for i, doc in enumerate(docs, 1):
         line = f"{i}. {doc.original_filename}"
         details: list[str] = []
@@ -323,7 +362,6 @@ async def filter_documents(
             details.append(f"Customer: {doc.customer_id}")
         if doc.total_price is not None:
             details.append(f"Total: ${doc.total_price:,.2f}")
-            grand_total += doc.total_price
         if doc.entity_id:
             details.append(f"ID: {doc.entity_id}")
         if details:
@@ -332,6 +370,8 @@ async def filter_documents(
             line += f"\n   Summary: {doc.summary}"
         parts.append(line)
 
+    # Over every match, not just the documents listed above
+    grand_total = stats.total_price_sum or 0.0
     if grand_total > 0:
         parts.append("")
         parts.append(f"Grand Total: ${grand_total:,.2f}")
@@ -12,6 +12,12 @@ Key design decisions:
     SQL fast path for exact counts and low latency.
   - Point queries use the corrective-RAG loop with transform + retry.
   - Classification is rule-based (no LLM call) for zero latency.
+  - ``verify_statements`` runs the point path for a whole batch of
+    statements at once: one embedding request, one multi-query
+    retrieval and one grading / verdict LLM call per group.
+  - Retrieval steps that do not depend on each other overlap (entity
+    and BM25 lookups run while the query is embedded), and every node's
+    duration is reported in ``Verdict.timings``.
 """
 
 from __future__ import annotations
@@ -21,7 +27,7 @@ import json
 import re
 import hashlib
 import time
-from typing import Literal, TypedDict
+from typing import Annotated, Awaitable, Callable, Literal, TypedDict
 from uuid import UUID
 
 from langchain_openai import ChatOpenAI
@@ -32,6 +38,10 @@ from sqlalchemy import func
 
 from app.core.copilot.base import Statement, Evidence, Verdict
 from app.core.copilot.prompts import (
+    BATCH_GRADING_SYSTEM,
+    BATCH_GRADING_USER,
+    BATCH_VERIFICATION_SYSTEM,
+    BATCH_VERIFICATION_USER,
     GRADING_SYSTEM,
     GRADING_USER,
     TRANSFORM_SYSTEM,
@@ -40,8 +50,13 @@ from app.core.copilot.prompts import (
     VERIFICATION_USER,
 )
 from app.core.rag.embedding import get_embedder
-from app.core.rag.retrieval import hybrid_search, entity_id_search
-from app.core.rag.retrieval.base import SearchResult, build_retrieval_context
+from app.core.rag.retrieval import (
+    batch_hybrid_search, concurrent_hybrid_search, entity_id_search, hybrid_search,
+)
+from app.core.rag.retrieval.base import RetrievalHit, SearchResult, build_retrieval_context
+from app.core.rag.rollup import DocumentStats, document_stats
+from app.core.rag.vault_version import get_vault_version
+from app.core.tools.llm import Priority, get_chat_model, invoke_chat
 from app.core.utils import normalize_numbers
 from app.core.copilot.classification import classify_query_type, infer_aggregate_intent
 from app.core.copilot.filters import (
@@ -55,7 +70,6 @@ from app.core.logger import setup_logger
 from app.db import get_db_session
 from app.db.models.chunk import Chunk
 from app.db.models.document import Document
-from app.db.models.vault import Vault
 from app.core.tools.redis import get_redis_client
 
 logger = setup_logger(__name__)
@@ -81,6 +95,15 @@ _DOC_INVENTORY_RE = re.compile(
 # Graph state
 # ---------------------------------------------------------------------------
 
+def _add_timings(current: dict[str, float], update: dict[str, float]) -> dict[str, float]:
+    """State reducer: add a node's timings to those already recorded."""
+    merged = dict(current or {})
+    for key, value in (update or {}).items():
+        if value is not None:
+            merged[key] = merged.get(key, 0.0) + value
+    return merged
+
+
 class VerificationState(TypedDict):
     """State flowing through the verification graph."""
 
@@ -104,52 +127,32 @@ class VerificationState(TypedDict):
     explanation: str
     evidence: list[dict]
 
+    # Milliseconds per node / retrieval step, summed over retries
+    timings: Annotated[dict[str, float], _add_timings]
 
-# ---------------------------------------------------------------------------
-# LLM instances (lazy, module-level for reuse)
-# ---------------------------------------------------------------------------
 
-_grading_llm: ChatOpenAI | None = None
-_transform_llm: ChatOpenAI | None = None
-_verdict_llm: ChatOpenAI | None = None
 
+# ---------------------------------------------------------------------------
+# LLM instances (shared gateway models, live priority)
+# ---------------------------------------------------------------------------
 
 def _get_grading_llm() -> ChatOpenAI:
-    global _grading_llm
-    if _grading_llm is None:
-        model = SETTINGS.COPILOT.GRADING_MODEL or SETTINGS.OPENAI_QUERY_MODEL
-        _grading_llm = ChatOpenAI(
-            model=model,
-            temperature=SETTINGS.COPILOT.GRADING_TEMPERATURE,
-            api_key=SETTINGS.OPENAI_API_KEY,
-            model_kwargs={"response_format": {"type": "json_object"}},
-        )
-    return _grading_llm
+    model = SETTINGS.COPILOT.GRADING_MODEL or SETTINGS.OPENAI_QUERY_MODEL
+    return get_chat_model(
+        model, temperature=SETTINGS.COPILOT.GRADING_TEMPERATURE, json_mode=True,
+    )
 
 
 def _get_transform_llm() -> ChatOpenAI:
-    global _transform_llm
-    if _transform_llm is None:
-        model = SETTINGS.COPILOT.GRADING_MODEL or SETTINGS.OPENAI_QUERY_MODEL
-        _transform_llm = ChatOpenAI(
-            model=model,
-            temperature=0.3,
-            api_key=SETTINGS.OPENAI_API_KEY,
-        )
-    return _transform_llm
+    model = SETTINGS.COPILOT.GRADING_MODEL or SETTINGS.OPENAI_QUERY_MODEL
+    return get_chat_model(model, temperature=0.3)
 
 
 def _get_verdict_llm() -> ChatOpenAI:
-    global _verdict_llm
-    if _verdict_llm is None:
-        model = SETTINGS.COPILOT.VERIFICATION_MODEL or SETTINGS.OPENAI_QUERY_MODEL
-        _verdict_llm = ChatOpenAI(
-            model=model,
-            temperature=SETTINGS.COPILOT.VERIFICATION_TEMPERATURE,
-            api_key=SETTINGS.OPENAI_API_KEY,
-            model_kwargs={"response_format": {"type": "json_object"}},
-        )
-    return _verdict_llm
+    model = SETTINGS.COPILOT.VERIFICATION_MODEL or SETTINGS.OPENAI_QUERY_MODEL
+    return get_chat_model(
+        model, temperature=SETTINGS.COPILOT.VERIFICATION_TEMPERATURE, json_mode=True,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -172,6 +175,10 @@ async def retrieve_node(state: VerificationState) -> dict:
     On first attempt, builds an enriched search query with entity-ID
     boosting. On subsequent attempts, uses the transformed query from
     ``transform_node``.
+
+    The entity lookup and BM25 search do not need the query vector, so
+    they run while the query is being embedded; only the dense search
+    waits for it.
     """
     statement = state["statement_text"]
     vault_id = UUID(state["vault_id"])
@@ -181,48 +188,58 @@ async def retrieve_node(state: VerificationState) -> dict:
     # Build search query
     if attempts == 0:
         # First attempt: use statement + entity boosting
-        search_text = normalize_numbers(statement)
-        entity_ids = re.findall(r"\b\d{4,}\b", search_text)
-        if entity_ids:
-            id_boost = " ".join(f"ID {eid}" for eid in entity_ids[:3])
-            search_text = f"{id_boost} {search_text}"
+        search_text = _initial_search_query(statement)
     else:
         # Retry: use the transformed query
         search_text = state.get("search_query", normalize_numbers(statement))
 
-    # Entity-ID pre-filter (exact SQL lookup)
-    entity_ids = re.findall(r"\b\d{4,}\b", normalize_numbers(statement))
-    exact_results: list[SearchResult] = []
-    if entity_ids:
-        async with get_db_session() as db:
-            exact_results = await entity_id_search(
-                entity_ids[:3], vault_id, db,
-            )
-
-    # Hybrid search
+    entity_ids = _statement_entity_ids(statement)
     embedder = get_embedder()
-    query_embedding = await embedder.embed_query(search_text)
+    timings: dict[str, float] = {}
 
-    async with get_db_session() as db:
-        hybrid_results = await hybrid_search(
+    if SETTINGS.HYBRID_CONCURRENT_ENABLED:
+        # Entity, dense and BM25 legs run in parallel on separate
+        # connections; the embedding is awaited by the dense leg only
+        outcome = await concurrent_hybrid_search(
             query_text=search_text,
-            query_embedding=query_embedding,
+            query_embedding=embedder.embed_query(search_text),
             vault_id=vault_id,
-            db=db,
             top_k=top_k,
             mmr_lambda=SETTINGS.COPILOT.VERIFICATION_MMR_LAMBDA,
+            entity_ids=entity_ids,
         )
+        exact_results = outcome.entity_results
+        hybrid_results = outcome.results
+        for key, value in outcome.timings.as_dict().items():
+            if key in ("embed_ms", "entity_ms", "dense_ms", "sparse_ms", "hydrate_ms"):
+                timings[key] = value
+    else:
+        # One connection: the entity lookup runs on it while the query
+        # is embedded, then the hybrid search reuses it
+        exact_results: list[SearchResult | RetrievalHit] = []
+        async with get_db_session() as db:
+            async with asyncio.TaskGroup() as tg:
+                embed_task = tg.create_task(
+                    _timed(timings, "embed_ms", embedder.embed_query(search_text)),
+                )
+                if entity_ids:
+                    entity_task = tg.create_task(
+                        _timed(timings, "entity_ms", entity_id_search(entity_ids, vault_id, db)),
+                    )
+            if entity_ids:
+                exact_results = entity_task.result()
+
+            hybrid_results = await _timed(timings, "search_ms", hybrid_search(
+                query_text=search_text,
+                query_embedding=embed_task.result(),
+                vault_id=vault_id,
+                db=db,
+                top_k=top_k,
+                mmr_lambda=SETTINGS.COPILOT.VERIFICATION_MMR_LAMBDA,
+            ))
 
     # Merge: exact-ID hits first, then hybrid (deduplicated)
-    if exact_results:
-        seen_ids = {r.chunk_id for r in exact_results}
-        merged = list(exact_results)
-        for r in hybrid_results:
-            if r.chunk_id not in seen_ids:
-                merged.append(r)
-        results = merged[: top_k + len(exact_results)]
-    else:
-        results = hybrid_results
+    results = _merge_exact_first(exact_results, hybrid_results, top_k)
 
     logger.info(
         "Verification retrieve (point): statement='%s', attempt=%d, results=%d",
@@ -230,10 +247,11 @@ async def retrieve_node(state: VerificationState) -> dict:
     )
 
     return {
-        "search_results": [r.model_dump(mode="json") for r in results],
+        "search_results": [r.as_dict() for r in results],
         "search_query": search_text,
         "search_attempts": attempts + 1,
         "verification_path": "crag",
+        "timings": timings,
     }
 
 
@@ -267,14 +285,15 @@ async def aggregate_fast_node(state: VerificationState) -> dict:
             "aggregate_fast",
         )
 
-    gaps = await _aggregate_metadata_gaps(
+    # Count, sum and metadata gaps in one query (the rollup when enabled)
+    stats = await _aggregate_stats(
         vault_id=vault_id,
         doc_type=doc_type,
         date_from=date_from,
         date_to=date_to,
         customer_id=customer_id,
-        intent=intent,
     )
+    gaps = _aggregate_metadata_gaps(stats, dated=bool(date_from or date_to), intent=intent)
     if gaps and SETTINGS.COPILOT.AGGREGATE_REQUIRE_COMPLETE_METADATA:
         if SETTINGS.COPILOT.AGGREGATE_FALLBACK_ENABLED:
             return {"aggregate_fallback": True}
@@ -290,25 +309,14 @@ async def aggregate_fast_node(state: VerificationState) -> dict:
             "aggregate_fast",
         )
 
-    list_limit = max(
-        SETTINGS.COPILOT.AGGREGATE_LIST_MAX_DOCS,
-        SETTINGS.COPILOT.AGGREGATE_EVIDENCE_MAX_DOCS,
-    )
-    docs, total_count = await _fetch_aggregate_documents(
-        vault_id=vault_id,
-        doc_type=doc_type,
-        date_from=date_from,
-        date_to=date_to,
-        customer_id=customer_id,
-        limit=list_limit,
-    )
-
+    total_count = stats.doc_count
     filter_desc = build_filter_description(doc_type, date_from, date_to, customer_id)
     logger.info(
-        "Verification aggregate fast: statement='%s', filters='%s', count=%d",
+        "Verification aggregate fast: statement='%s', filters='%s', count=%d, source=%s",
         statement[:50],
         filter_desc,
         total_count,
+        stats.source,
     )
 
     if total_count == 0:
@@ -325,14 +333,10 @@ async def aggregate_fast_node(state: VerificationState) -> dict:
             "verification_path": "aggregate_fast",
         }
 
+    value: float | None = None
+    label: str | None = None
     if intent in ("sum", "average"):
-        total_sum = await _sum_total_price(
-            vault_id=vault_id,
-            doc_type=doc_type,
-            date_from=date_from,
-            date_to=date_to,
-            customer_id=customer_id,
-        )
+        total_sum = stats.total_price_sum
         if total_sum is None:
             if SETTINGS.COPILOT.AGGREGATE_FALLBACK_ENABLED:
                 return {"aggregate_fallback": True}
@@ -345,21 +349,28 @@ async def aggregate_fast_node(state: VerificationState) -> dict:
         value = avg if intent == "average" else total_sum
         label = "Average Total" if intent == "average" else "Total Sum"
 
-        explanation = _format_aggregate_explanation(
-            filter_desc=filter_desc,
-            total_count=total_count,
-            docs=docs,
-            value=value,
-            value_label=label,
-        )
-    else:
-        explanation = _format_aggregate_explanation(
-            filter_desc=filter_desc,
-            total_count=total_count,
-            docs=docs,
-            value=None,
-            value_label=None,
-        )
+    # Documents are only needed for the listing and the evidence quotes,
+    # so fetch just as many as those display
+    list_limit = max(
+        SETTINGS.COPILOT.AGGREGATE_LIST_MAX_DOCS,
+        SETTINGS.COPILOT.AGGREGATE_EVIDENCE_MAX_DOCS,
+    )
+    docs = await _fetch_aggregate_documents(
+        vault_id=vault_id,
+        doc_type=doc_type,
+        date_from=date_from,
+        date_to=date_to,
+        customer_id=customer_id,
+        limit=list_limit,
+    )
+
+    explanation = _format_aggregate_explanation(
+        filter_desc=filter_desc,
+        total_count=total_count,
+        docs=docs,
+        value=value,
+        value_label=label,
+    )
 
     evidence = await _build_aggregate_evidence(
         vault_id=vault_id,
@@ -386,16 +397,18 @@ async def aggregate_retrieve_node(state: VerificationState) -> dict:
          ``Document.order_date``, ``Document.document_type``, etc.
       3. Fetch ALL chunks from matching document IDs.
       4. If SQL yields nothing (metadata not yet backfilled), fall back
-         to the original multi-pass hybrid search.
+         to the multi-pass hybrid search: the full-statement and focused
+         keyword passes run together, then their documents' chunks are
+         fetched.
     """
     statement = state["statement_text"]
     vault_id = UUID(state["vault_id"])
     top_k = SETTINGS.COPILOT.VERIFICATION_AGGREGATE_TOP_K
 
-    all_results: list[SearchResult] = []
+    all_results: list[SearchResult | RetrievalHit] = []
     seen_ids: set = set()
 
-    def _merge(new_results: list[SearchResult]) -> None:
+    def _merge(new_results: list[SearchResult | RetrievalHit]) -> None:
         for r in new_results:
             if r.chunk_id not in seen_ids:
                 seen_ids.add(r.chunk_id)
@@ -404,34 +417,15 @@ async def aggregate_retrieve_node(state: VerificationState) -> dict:
     # ------------------------------------------------------------------
     # Step 1: Try SQL metadata filter (precise, zero false-negatives)
     # ------------------------------------------------------------------
-    sql_doc_ids = await _sql_metadata_filter(statement, vault_id)
+    timings: dict[str, float] = {}
+    sql_doc_ids = await _timed(timings, "sql_filter_ms", _sql_metadata_filter(statement, vault_id))
 
     if sql_doc_ids:
         # Fetch ALL chunks from matched documents
         async with get_db_session() as db:
-            chunk_stmt = (
-                select(Chunk)
-                .where(Chunk.doc_id.in_(sql_doc_ids))
-                .where(Chunk.vault_id == vault_id)
-                .where(Chunk.is_deleted == False)  # noqa: E712
-                .order_by(Chunk.doc_id, Chunk.chunk_index)
-            )
-            result = await db.execute(chunk_stmt)
-            chunks = result.scalars().all()
-
-        for chunk in chunks:
-            if chunk.id not in seen_ids:
-                seen_ids.add(chunk.id)
-                all_results.append(SearchResult(
-                    chunk_id=chunk.id,
-                    doc_id=chunk.doc_id,
-                    content=chunk.content,
-                    content_with_header=chunk.content_with_header,
-                    score=1.0,
-                    section_heading=chunk.section_heading,
-                    page_number=chunk.page_number,
-                    original_filename=None,
-                ))
+            _merge(await _timed(
+                timings, "chunks_ms", _fetch_doc_chunk_hits(db, sql_doc_ids, vault_id, score=1.0),
+            ))
 
         logger.info(
             "Verification retrieve (aggregate/SQL): statement='%s', "
@@ -440,11 +434,12 @@ async def aggregate_retrieve_node(state: VerificationState) -> dict:
         )
 
         return {
-            "search_results": [r.model_dump(mode="json") for r in all_results],
+            "search_results": [r.as_dict() for r in all_results],
             "search_query": statement,
             "search_attempts": 1,
             "is_relevant": len(all_results) > 0,
             "verification_path": "aggregate_fallback",
+            "timings": timings,
         }
 
     # ------------------------------------------------------------------
@@ -455,66 +450,58 @@ async def aggregate_retrieve_node(state: VerificationState) -> dict:
         statement[:50],
     )
 
-    # Pass 1: Hybrid search with full statement
     search_text = normalize_numbers(statement)
+    date_keywords = _extract_date_keywords(statement)
+    entity_keywords = _extract_entity_type_keywords(statement)
+    focused_query = " ".join(entity_keywords + date_keywords)
+    run_focused = bool(focused_query.strip()) and focused_query.strip() != search_text.strip()
+
+    # Pass 1 (full statement) and pass 2 (focused date/entity keywords)
+    # share one embedding request
     embedder = get_embedder()
-    query_embedding = await embedder.embed_query(search_text)
+    queries = [search_text, focused_query] if run_focused else [search_text]
 
-    async with get_db_session() as db:
-        pass1 = await hybrid_search(
-            query_text=search_text,
-            query_embedding=query_embedding,
+    if SETTINGS.HYBRID_CONCURRENT_ENABLED:
+        # Both passes in one multi-query search; BM25 runs while embedding
+        outcomes = await batch_hybrid_search(
+            query_texts=queries,
+            query_embeddings=embedder.embed_queries(queries),
             vault_id=vault_id,
-            db=db,
             top_k=top_k,
             mmr_lambda=SETTINGS.COPILOT.VERIFICATION_MMR_LAMBDA,
         )
-    _merge(pass1)
-
-    # Pass 2: Focused keyword search with extracted date/entity keywords
-    date_keywords = _extract_date_keywords(statement)
-    entity_keywords = _extract_entity_type_keywords(statement)
-    focused_query = " ".join(entity_keywords + date_keywords)
-
-    if focused_query.strip() and focused_query.strip() != search_text.strip():
-        focused_embedding = await embedder.embed_query(focused_query)
-        async with get_db_session() as db:
-            pass2 = await hybrid_search(
-                query_text=focused_query,
-                query_embedding=focused_embedding,
-                vault_id=vault_id,
-                db=db,
-                top_k=top_k,
-                mmr_lambda=SETTINGS.COPILOT.VERIFICATION_MMR_LAMBDA,
-            )
-        _merge(pass2)
-
-    # Pass 3: Fetch ALL chunks from discovered document IDs
-    if all_results:
-        doc_ids = list({r.doc_id for r in all_results})[:20]
+        for outcome in outcomes:
+            _merge(outcome.results)
+        search_timings = outcomes[0].timings if outcomes else None
+        if search_timings is not None:
+            timings["embed_ms"] = search_timings.embed_ms
+            timings["search_ms"] = search_timings.total_ms
+
+        # Pass 3: Fetch ALL chunks from discovered document IDs
+        if all_results:
+            doc_ids = list({r.doc_id for r in all_results})[:20]
+            async with get_db_session() as db:
+                _merge(await _timed(
+                    timings, "chunks_ms", _fetch_doc_chunk_hits(db, doc_ids, vault_id, score=0.5),
+                ))
+    else:
+        embeddings = await _timed(timings, "embed_ms", embedder.embed_queries(queries))
+        # All three passes on one connection
         async with get_db_session() as db:
-            chunk_stmt = (
-                select(Chunk)
-                .where(Chunk.doc_id.in_(doc_ids))
-                .where(Chunk.vault_id == vault_id)
-                .where(Chunk.is_deleted == False)  # noqa: E712
-                .order_by(Chunk.doc_id, Chunk.chunk_index)
-            )
-            result = await db.execute(chunk_stmt)
-            chunks = result.scalars().all()
-
-        for chunk in chunks:
-            if chunk.id not in seen_ids:
-                seen_ids.add(chunk.id)
-                all_results.append(SearchResult(
-                    chunk_id=chunk.id,
-                    doc_id=chunk.doc_id,
-                    content=chunk.content,
-                    content_with_header=chunk.content_with_header,
-                    score=0.5,
-                    section_heading=chunk.section_heading,
-                    page_number=chunk.page_number,
-                    original_filename=None,
+            for query, embedding in zip(queries, embeddings):
+                _merge(await _timed(timings, "search_ms", hybrid_search(
+                    query_text=query,
+                    query_embedding=embedding,
+                    vault_id=vault_id,
+                    db=db,
+                    top_k=top_k,
+                    mmr_lambda=SETTINGS.COPILOT.VERIFICATION_MMR_LAMBDA,
+                )))
+
+            if all_results:
+                doc_ids = list({r.doc_id for r in all_results})[:20]
+                _merge(await _timed(
+                    timings, "chunks_ms", _fetch_doc_chunk_hits(db, doc_ids, vault_id, score=0.5),
                 ))
 
     logger.info(
@@ -523,11 +510,12 @@ async def aggregate_retrieve_node(state: VerificationState) -> dict:
     )
 
     return {
-        "search_results": [r.model_dump(mode="json") for r in all_results],
+        "search_results": [r.as_dict() for r in all_results],
         "search_query": search_text,
         "search_attempts": 1,
         "is_relevant": len(all_results) > 0,
         "verification_path": "aggregate_fallback",
+        "timings": timings,
     }
 
 
@@ -559,11 +547,14 @@ async def grade_node(state: VerificationState) -> dict:
 
     try:
         llm = _get_grading_llm()
-        response = await asyncio.wait_for(
-            llm.ainvoke([
+        response = await invoke_chat(
+            llm,
+            [
                 SystemMessage(content=GRADING_SYSTEM),
                 HumanMessage(content=user_message),
-            ]),
+            ],
+            purpose="grading",
+            priority=Priority.LIVE,
             timeout=SETTINGS.API_TIMEOUT_S,
         )
         data = json.loads(response.content)
@@ -591,11 +582,14 @@ async def transform_node(state: VerificationState) -> dict:
     )
 
     try:
-        response = await asyncio.wait_for(
-            llm.ainvoke([
+        response = await invoke_chat(
+            llm,
+            [
                 SystemMessage(content=TRANSFORM_SYSTEM),
                 HumanMessage(content=user_message),
-            ]),
+            ],
+            purpose="transform",
+            priority=Priority.LIVE,
             timeout=SETTINGS.API_TIMEOUT_S,
         )
         new_query = response.content.strip().strip('"\'')
@@ -656,11 +650,14 @@ async def synthesise_node(state: VerificationState) -> dict:
 
     try:
         llm = _get_verdict_llm()
-        response = await asyncio.wait_for(
-            llm.ainvoke([
+        response = await invoke_chat(
+            llm,
+            [
                 SystemMessage(content=VERIFICATION_SYSTEM),
                 HumanMessage(content=user_message),
-            ]),
+            ],
+            purpose="verdict",
+            priority=Priority.LIVE,
             timeout=SETTINGS.API_TIMEOUT_S,
         )
         return _parse_verdict_response(response.content)
@@ -738,14 +735,14 @@ def build_verification_graph() -> StateGraph:
     """
     graph = StateGraph(VerificationState)
 
-    # Add nodes
-    graph.add_node("classify", classify_node)
-    graph.add_node("retrieve", retrieve_node)
-    graph.add_node("aggregate_fast", aggregate_fast_node)
-    graph.add_node("aggregate_retrieve", aggregate_retrieve_node)
-    graph.add_node("grade", grade_node)
-    graph.add_node("transform", transform_node)
-    graph.add_node("synthesise", synthesise_node)
+    # Add nodes (each records its duration in ``timings``)
+    graph.add_node("classify", _timed_node("classify", classify_node))
+    graph.add_node("retrieve", _timed_node("retrieve", retrieve_node))
+    graph.add_node("aggregate_fast", _timed_node("aggregate_fast", aggregate_fast_node))
+    graph.add_node("aggregate_retrieve", _timed_node("aggregate_retrieve", aggregate_retrieve_node))
+    graph.add_node("grade", _timed_node("grade", grade_node))
+    graph.add_node("transform", _timed_node("transform", transform_node))
+    graph.add_node("synthesise", _timed_node("synthesise", synthesise_node))
 
     # Entry: classify first
     graph.add_edge(START, "classify")
@@ -797,7 +794,7 @@ def get_verification_graph():
 async def verify_statement(
     statement: Statement,
     vault_id: UUID,
-    vault_updated_at: str | None = None,
+    vault_version: str | None = None,
 ) -> Verdict:
     """Verify a single statement against vault documents.
 
@@ -807,6 +804,8 @@ async def verify_statement(
     Args:
         statement: The statement to verify.
         vault_id: Vault to search against.
+        vault_version: Vault content version for the verdict cache key
+            (looked up when omitted).
 
     Returns:
         Verdict: Verification result with evidence and explanation.
@@ -819,7 +818,7 @@ async def verify_statement(
         cache_key = await _build_verification_cache_key(
             vault_id=vault_id,
             statement_text=statement.text,
-            vault_updated_at=vault_updated_at,
+            vault_version=vault_version,
         )
         cached = await _get_cached_verdict(cache_key, statement)
         if cached:
@@ -844,6 +843,7 @@ async def verify_statement(
         "confidence": 0.0,
         "explanation": "",
         "evidence": [],
+        "timings": {},
     }
 
     try:
@@ -852,28 +852,11 @@ async def verify_statement(
             timeout=SETTINGS.API_TIMEOUT_S,
         )
 
-        # Parse evidence list
-        evidence_list: list[Evidence] = []
-        for e in result.get("evidence", []):
-            evidence_list.append(Evidence(
-                doc_title=e.get("doc_title", "Unknown"),
-                section=e.get("section"),
-                page=e.get("page"),
-                quote=e.get("quote", ""),
-                relevance_score=float(e.get("relevance_score", 0.0)),
-            ))
-
-        latency_ms = int((time.monotonic() - start) * 1000)
-        verdict_obj = Verdict(
-            claim_id=statement.id,
-            claim_text=statement.text,
-            verdict=result.get("verdict", "unverifiable"),
-            confidence=result.get("confidence", 0.0),
-            explanation=result.get("explanation", ""),
-            evidence=evidence_list,
+        verdict_obj = _build_verdict(
+            statement,
+            result,
             verification_path=result.get("verification_path", "crag"),
-            latency_ms=latency_ms,
-            cache_hit=False,
+            latency_ms=int((time.monotonic() - start) * 1000),
         )
         if cache_key and _is_cacheable_verdict(verdict_obj):
             await _store_cached_verdict(cache_key, verdict_obj)
@@ -881,15 +864,8 @@ async def verify_statement(
 
     except asyncio.TimeoutError:
         logger.warning(f"Verification graph timed out for: {statement.text[:50]}")
-        return Verdict(
-            claim_id=statement.id,
-            claim_text=statement.text,
-            verdict="unverifiable",
-            confidence=0.0,
-            explanation="Verification timed out.",
-            verification_path="crag",
-            latency_ms=int((time.monotonic() - start) * 1000),
-            cache_hit=False,
+        return _timed_out_verdict(
+            statement, "crag", latency_ms=int((time.monotonic() - start) * 1000),
         )
     except Exception as e:
         logger.error(f"Verification graph failed for: {statement.text[:50]}: {e}")
@@ -905,6 +881,327 @@ async def verify_statement(
         )
 
 
+# ---------------------------------------------------------------------------
+# Batched verification
+# ---------------------------------------------------------------------------
+
+async def verify_statements(
+    statements: list[Statement],
+    vault_id: UUID,
+    vault_version: str | None = None,
+) -> list[Verdict]:
+    """Verify several statements, sharing embedding, retrieval and LLM calls.
+
+    Point statements run the same corrective loop as the graph —
+    retrieve → grade → transform + retry → synthesise — but batched:
+    one ``embed_queries`` request and one multi-query hybrid search per
+    attempt, one grading call and one verdict call per group of up to
+    ``VERIFICATION_BATCH_MAX_STATEMENTS`` statements. Aggregate
+    statements take the graph (their fast path is SQL-only).
+
+    A group whose batch pipeline fails is verified statement by
+    statement instead. Everything shares one ``API_TIMEOUT_S`` deadline:
+    statements still running when it passes get a "Verification timed
+    out." verdict, and verdicts already produced are kept.
+
+    Args:
+        statements: Statements to verify.
+        vault_id: Vault to search against.
+        vault_version: Vault content version for the verdict cache key.
+
+    Returns:
+        list[Verdict]: One verdict per statement, in input order.
+    """
+    start = time.monotonic()
+    deadline = start + SETTINGS.API_TIMEOUT_S
+    verdicts: list[Verdict | None] = [None] * len(statements)
+
+    point: list[int] = []
+    others: list[int] = []
+    for i, statement in enumerate(statements):
+        (point if classify_statement(statement.text) == "point" else others).append(i)
+
+    cache_keys: dict[int, str] = {}
+    if SETTINGS.COPILOT.VERIFICATION_CACHE_ENABLED and point:
+        version = vault_version or await get_vault_version(vault_id)
+        for i in list(point):
+            cache_keys[i] = await _build_verification_cache_key(
+                vault_id=vault_id,
+                statement_text=statements[i].text,
+                vault_version=version,
+            )
+            cached = await _get_cached_verdict(cache_keys[i], statements[i])
+            if cached:
+                cached.latency_ms = int((time.monotonic() - start) * 1000)
+                cached.verification_path = "cache"
+                cached.cache_hit = True
+                verdicts[i] = cached
+                point.remove(i)
+    cached_count = sum(1 for v in verdicts if v is not None)
+
+    size = max(SETTINGS.COPILOT.VERIFICATION_BATCH_MAX_STATEMENTS, 1)
+    groups = [point[g:g + size] for g in range(0, len(point), size)]
+
+    def _latency_ms() -> int:
+        return int((time.monotonic() - start) * 1000)
+
+    async def _run_single(i: int) -> None:
+        try:
+            verdicts[i] = await asyncio.wait_for(
+                verify_statement(statements[i], vault_id, vault_version=vault_version),
+                timeout=max(deadline - time.monotonic(), 0.0),
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Verification timed out for: {statements[i].text[:50]}")
+            verdicts[i] = _timed_out_verdict(statements[i], "crag", latency_ms=_latency_ms())
+
+    async def _run_group(group: list[int]) -> None:
+        batch = [statements[i] for i in group]
+        try:
+            results = await asyncio.wait_for(
+                _verify_point_batch(batch, vault_id),
+                timeout=max(deadline - time.monotonic(), 0.0),
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Batched verification timed out for {len(batch)} statements")
+            for i in group:
+                verdicts[i] = _timed_out_verdict(
+                    statements[i], "crag_batch", latency_ms=_latency_ms(),
+                )
+            return
+        except Exception as e:
+            logger.warning(f"Batched verification failed ({e}) — verifying one by one")
+            await asyncio.gather(*[_run_single(i) for i in group])
+            return
+
+        latency_ms = _latency_ms()
+        for i, result in zip(group, results):
+            verdict = _build_verdict(
+                statements[i], result, verification_path="crag_batch", latency_ms=latency_ms,
+            )
+            if i in cache_keys and _is_cacheable_verdict(verdict):
+                await _store_cached_verdict(cache_keys[i], verdict)
+            verdicts[i] = verdict
+
+    await asyncio.gather(
+        *[_run_group(group) for group in groups],
+        *[_run_single(i) for i in others],
+    )
+
+    logger.info(
+        f"Batched verification: statements={len(statements)}, cached={cached_count}, "
+        f"batched={len(point)} in {len(groups)} group(s), graph={len(others)}, "
+        f"latency_ms={_latency_ms()}"
+    )
+    return verdicts  # type: ignore[return-value]
+
+
+async def _verify_point_batch(statements: list[Statement], vault_id: UUID) -> list[dict]:
+    """Corrective retrieval + verdicts for a group of point statements.
+
+    Returns one state dict (``verdict``, ``confidence``, ``explanation``,
+    ``evidence``, ``timings``) per statement; the timings are the
+    group's, shared by its statements.
+    """
+    texts = [s.text for s in statements]
+    queries = [_initial_search_query(t) for t in texts]
+    entity_ids = [_statement_entity_ids(t) for t in texts]
+    results: list[list[dict]] = [[] for _ in statements]
+    embedder = get_embedder()
+    timings: dict[str, float] = {}
+
+    pending = list(range(len(statements)))
+    attempts = 0
+    while True:
+        pending_queries = [queries[i] for i in pending]
+        # BM25 and entity legs run while the queries are being embedded
+        outcomes = await _timed(timings, "retrieve_ms", batch_hybrid_search(
+            query_texts=pending_queries,
+            query_embeddings=embedder.embed_queries(pending_queries),
+            vault_id=vault_id,
+            top_k=SETTINGS.COPILOT.VERIFICATION_TOP_K,
+            mmr_lambda=SETTINGS.COPILOT.VERIFICATION_MMR_LAMBDA,
+            entity_ids=[entity_ids[i] for i in pending],
+        ))
+        if outcomes and outcomes[0].timings.embed_ms is not None:
+            timings["embed_ms"] = timings.get("embed_ms", 0.0) + outcomes[0].timings.embed_ms
+        for i, outcome in zip(pending, outcomes):
+            merged = _merge_exact_first(
+                outcome.entity_results, outcome.results, SETTINGS.COPILOT.VERIFICATION_TOP_K,
+            )
+            results[i] = [r.as_dict() for r in merged]
+        attempts += 1
+        if attempts >= SETTINGS.COPILOT.VERIFICATION_MAX_SEARCH_ATTEMPTS:
+            # A grade could not change anything any more
+            break
+
+        relevant = await _timed(timings, "grade_ms", _grade_batch(
+            [texts[i] for i in pending], [results[i] for i in pending],
+        ))
+        logger.info(
+            f"Verification batch grade: attempt={attempts}, "
+            f"statements={len(pending)}, relevant={sum(relevant)}"
+        )
+        pending = [i for i, ok in zip(pending, relevant) if not ok]
+        if not pending:
+            break
+
+        # Rewrite the queries that missed (one small LLM call each, concurrently)
+        rewrites = await _timed(timings, "transform_ms", asyncio.gather(*[
+            transform_node({"statement_text": texts[i], "search_query": queries[i]})
+            for i in pending
+        ]))
+        for i, update in zip(pending, rewrites):
+            queries[i] = update.get("search_query", queries[i])
+
+    verdicts = await _timed(timings, "synthesise_ms", _synthesise_batch(texts, results))
+    return [{**verdict, "timings": timings} for verdict in verdicts]
+
+
+def _batch_prompt_parts(
+    texts: list[str],
+    result_lists: list[list[dict]],
+    per_statement: int,
+) -> tuple[str, str]:
+    """Shared chunk context and numbered statements for a batch prompt.
+
+    Chunks retrieved for several statements appear once; each statement
+    lists the numbers (and its own relevance scores) of its chunks.
+    """
+    numbers: dict[str, int] = {}
+    context_parts: list[str] = []
+    statement_parts: list[str] = []
+    for i, (text, results) in enumerate(zip(texts, result_lists), 1):
+        refs: list[str] = []
+        for r in results[:per_statement]:
+            key = r.get("chunk_id") or r.get("content_with_header", "")
+            n = numbers.get(key)
+            if n is None:
+                n = numbers[key] = len(numbers) + 1
+                context_parts.append(f"--- Document Chunk {n} ---")
+                context_parts.append(r.get("content_with_header", r.get("content", "")))
+                context_parts.append("")
+            refs.append(f"{n} (relevance: {r.get('score', 0.0):.3f})")
+        statement_parts.append(f"{i}. {normalize_numbers(text)}")
+        statement_parts.append(f"   Retrieved chunks: {', '.join(refs) or 'none'}")
+    return "\n".join(context_parts), "\n".join(statement_parts)
+
+
+def _entries_by_statement(raw: str, key: str, count: int) -> dict[int, dict]:
+    """Index a batch response's ``key`` list by 1-based statement number."""
+    entries: dict[int, dict] = {}
+    data = json.loads(raw)
+    for entry in data.get(key, []) if isinstance(data, dict) else []:
+        try:
+            number = int(entry.get("statement"))
+        except (AttributeError, TypeError, ValueError):
+            continue
+        if 1 <= number <= count:
+            entries[number] = entry
+    return entries
+
+
+async def _grade_batch(texts: list[str], result_lists: list[list[dict]]) -> list[bool]:
+    """Grade every statement's retrieval in one LLM call.
+
+    Statements without results are not relevant; a failed call (or a
+    statement missing from the answer) counts as relevant, as in
+    ``grade_node``.
+    """
+    relevant = [bool(results) for results in result_lists]
+    to_grade = [i for i, ok in enumerate(relevant) if ok]
+    if not to_grade:
+        return relevant
+
+    context, numbered = _batch_prompt_parts(
+        [texts[i] for i in to_grade], [result_lists[i] for i in to_grade], per_statement=10,
+    )
+    try:
+        response = await invoke_chat(
+            _get_grading_llm(),
+            [
+                SystemMessage(content=BATCH_GRADING_SYSTEM),
+                HumanMessage(content=BATCH_GRADING_USER.format(context=context, statements=numbered)),
+            ],
+            purpose="grading",
+            priority=Priority.LIVE,
+            timeout=SETTINGS.API_TIMEOUT_S,
+        )
+        grades = _entries_by_statement(response.content, "grades", len(to_grade))
+    except Exception as e:
+        logger.warning(f"Batch grading failed: {e} — assuming relevant")
+        return relevant
+
+    for n, i in enumerate(to_grade, 1):
+        if n in grades:
+            relevant[i] = bool(grades[n].get("relevant", False))
+    return relevant
+
+
+async def _synthesise_batch(texts: list[str], result_lists: list[list[dict]]) -> list[dict]:
+    """Verdicts for every statement in one LLM call.
+
+    Statements without results are unverifiable without asking the
+    LLM. Statements the answer leaves out are synthesised on their own
+    with ``synthesise_node``.
+    """
+    outputs: list[dict | None] = [None] * len(texts)
+    to_verify: list[int] = []
+    for i, results in enumerate(result_lists):
+        if results:
+            to_verify.append(i)
+        else:
+            outputs[i] = {
+                "verdict": "unverifiable",
+                "confidence": 0.0,
+                "explanation": "No relevant documents found in the vault.",
+                "evidence": [],
+            }
+
+    if to_verify:
+        context, numbered = _batch_prompt_parts(
+            [texts[i] for i in to_verify], [result_lists[i] for i in to_verify], per_statement=15,
+        )
+        try:
+            response = await invoke_chat(
+                _get_verdict_llm(),
+                [
+                    SystemMessage(content=BATCH_VERIFICATION_SYSTEM),
+                    HumanMessage(content=BATCH_VERIFICATION_USER.format(
+                        context=context, statements=numbered,
+                    )),
+                ],
+                purpose="verdict",
+                priority=Priority.LIVE,
+                timeout=SETTINGS.API_TIMEOUT_S,
+            )
+            entries = _entries_by_statement(response.content, "verdicts", len(to_verify))
+        except Exception as e:
+            logger.warning(f"Batch verdict synthesis failed: {e} — synthesising one by one")
+            entries = {}
+
+        for n, i in enumerate(to_verify, 1):
+            if n in entries:
+                try:
+                    outputs[i] = _verdict_fields(entries[n])
+                except (KeyError, TypeError, ValueError, AttributeError) as e:
+                    logger.warning(f"Failed to parse batch verdict {n}: {e}")
+
+    missing = [i for i, out in enumerate(outputs) if out is None]
+    if missing:
+        singles = await asyncio.gather(*[
+            synthesise_node({
+                "statement_text": texts[i],
+                "statement_type": "point",
+                "search_results": result_lists[i],
+            })
+            for i in missing
+        ])
+        for i, out in zip(missing, singles):
+            outputs[i] = out
+    return outputs  # type: ignore[return-value]
+
+
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
@@ -925,6 +1222,89 @@ _MONTH_MAP = {
 }
 
 
+async def _timed(timings: dict[str, float], key: str, awaitable: Awaitable):
+    """Await ``awaitable``, adding its wall-clock milliseconds to ``timings[key]``."""
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[key] = timings.get(key, 0.0) + (time.perf_counter() - start) * 1000
+
+
+def _timed_node(name: str, node: Callable[[VerificationState], Awaitable[dict]]):
+    """Wrap a graph node so its duration lands in the state's ``timings``."""
+    async def _run(state: VerificationState) -> dict:
+        start = time.perf_counter()
+        update = await node(state)
+        timings = dict(update.get("timings") or {})
+        timings[f"{name}_ms"] = (time.perf_counter() - start) * 1000
+        return {**update, "timings": timings}
+
+    return _run
+
+
+async def _fetch_doc_chunk_hits(
+    db,
+    doc_ids: list[UUID],
+    vault_id: UUID,
+    *,
+    score: float,
+) -> list[RetrievalHit]:
+    """All live chunks of ``doc_ids`` as hits with a fixed score."""
+    chunk_stmt = (
+        select(Chunk)
+        .where(Chunk.doc_id.in_(doc_ids))
+        .where(Chunk.vault_id == vault_id)
+        .where(Chunk.is_deleted == False)  # noqa: E712
+        .order_by(Chunk.doc_id, Chunk.chunk_index)
+    )
+    result = await db.execute(chunk_stmt)
+    return [
+        RetrievalHit(
+            chunk_id=chunk.id,
+            doc_id=chunk.doc_id,
+            content=chunk.content,
+            content_with_header=chunk.content_with_header,
+            score=score,
+            section_heading=chunk.section_heading,
+            page_number=chunk.page_number,
+            original_filename=None,
+        )
+        for chunk in result.scalars().all()
+    ]
+
+
+def _statement_entity_ids(statement: str) -> list[str]:
+    """Up to three 4+ digit identifiers mentioned in the statement."""
+    return re.findall(r"\b\d{4,}\b", normalize_numbers(statement))[:3]
+
+
+def _initial_search_query(statement: str) -> str:
+    """First-attempt search text: the statement, boosted with its entity IDs."""
+    search_text = normalize_numbers(statement)
+    entity_ids = _statement_entity_ids(statement)
+    if entity_ids:
+        id_boost = " ".join(f"ID {eid}" for eid in entity_ids)
+        search_text = f"{id_boost} {search_text}"
+    return search_text
+
+
+def _merge_exact_first(
+    exact_results: list[SearchResult | RetrievalHit],
+    hybrid_results: list[SearchResult | RetrievalHit],
+    top_k: int,
+) -> list[SearchResult | RetrievalHit]:
+    """Exact entity-ID hits first, then the hybrid hits not already listed."""
+    if not exact_results:
+        return hybrid_results
+    seen_ids = {r.chunk_id for r in exact_results}
+    merged = list(exact_results)
+    for r in hybrid_results:
+        if r.chunk_id not in seen_ids:
+            merged.append(r)
+    return merged[: top_k + len(exact_results)]
+
+
 def _unverifiable_response(reason: str, verification_path: str | None = None) -> dict:
     """Return a standardized unverifiable response."""
     response = {
@@ -945,21 +1325,13 @@ def _normalize_statement_for_cache(text: str) -> str:
     return " ".join(normalized.split())
 
 
-async def _get_vault_cache_version(vault_id: UUID) -> str:
-    async with get_db_session() as db:
-        stmt = select(Vault.updated_at).where(Vault.id == vault_id)
-        result = await db.execute(stmt)
-        updated_at = result.scalar_one_or_none()
-    return updated_at.isoformat() if updated_at else "unknown"
-
-
 async def _build_verification_cache_key(
     *,
     vault_id: UUID,
     statement_text: str,
-    vault_updated_at: str | None,
+    vault_version: str | None,
 ) -> str:
-    version = vault_updated_at or await _get_vault_cache_version(vault_id)
+    version = vault_version or await get_vault_version(vault_id)
     normalized = _normalize_statement_for_cache(statement_text)
     digest = hashlib.sha256(normalized.encode()).hexdigest()
     return f"verdict_cache:{vault_id}:{version}:{digest}"
@@ -1019,6 +1391,20 @@ async def _store_cached_verdict(
         return
 
 
+def _timed_out_verdict(statement: Statement, verification_path: str, *, latency_ms: int) -> Verdict:
+    """The "unverifiable" verdict for a statement that ran out of time."""
+    return Verdict(
+        claim_id=statement.id,
+        claim_text=statement.text,
+        verdict="unverifiable",
+        confidence=0.0,
+        explanation="Verification timed out.",
+        verification_path=verification_path,
+        latency_ms=latency_ms,
+        cache_hit=False,
+    )
+
+
 def _is_cacheable_verdict(verdict: Verdict) -> bool:
     explanation = (verdict.explanation or "").lower()
     if explanation.startswith("verification timed out"):
@@ -1089,40 +1475,32 @@ def _apply_date_filters(
     return filters
 
 
-async def _count_documents(filters: list) -> int:
-    async with get_db_session() as db:
-        stmt = select(func.count()).select_from(Document).where(*filters)
-        result = await db.execute(stmt)
-        return result.scalar() or 0
-
-
-async def _aggregate_metadata_gaps(
+async def _aggregate_stats(
     *,
     vault_id: UUID,
     doc_type: str | None,
     date_from,
     date_to,
     customer_id: str | None,
-    intent: str,
-) -> list[str]:
-    gaps: list[str] = []
-    base_filters = _base_filters(vault_id, doc_type, customer_id)
-
-    if date_from or date_to:
-        missing_dates = await _count_documents(
-            base_filters + [Document.order_date.is_(None)],  # type: ignore[union-attr]
+) -> DocumentStats:
+    async with get_db_session() as db:
+        return await document_stats(
+            db,
+            vault_id=vault_id,
+            doc_type=doc_type,
+            date_from=date_from,
+            date_to=date_to,
+            customer_id=customer_id,
+            use_rollup=SETTINGS.COPILOT.AGGREGATE_ROLLUP_ENABLED,
         )
-        if missing_dates:
-            gaps.append(f"{missing_dates} document(s) missing order date metadata")
 
-    if intent in ("sum", "average"):
-        total_filters = _apply_date_filters(base_filters[:], date_from, date_to)
-        missing_totals = await _count_documents(
-            total_filters + [Document.total_price.is_(None)],  # type: ignore[union-attr]
-        )
-        if missing_totals:
-            gaps.append(f"{missing_totals} document(s) missing total price metadata")
 
+def _aggregate_metadata_gaps(stats: DocumentStats, *, dated: bool, intent: str) -> list[str]:
+    gaps: list[str] = []
+    if dated and stats.missing_order_date:
+        gaps.append(f"{stats.missing_order_date} document(s) missing order date metadata")
+    if intent in ("sum", "average") and stats.missing_total_price:
+        gaps.append(f"{stats.missing_total_price} document(s) missing total price metadata")
     return gaps
 
 
@@ -1134,49 +1512,23 @@ async def _fetch_aggregate_documents(
     date_to,
     customer_id: str | None,
     limit: int,
-) -> tuple[list[Document], int]:
-    filters = _apply_date_filters(
-        _base_filters(vault_id, doc_type, customer_id),
-        date_from,
-        date_to,
-    )
-    async with get_db_session() as db:
-        count_stmt = select(func.count()).select_from(Document).where(*filters)
-        count_result = await db.execute(count_stmt)
-        total_count = count_result.scalar() or 0
-
-        docs: list[Document] = []
-        if limit > 0:
-            doc_stmt = (
-                select(Document)
-                .where(*filters)
-                .order_by(Document.order_date, Document.entity_id, Document.original_filename)
-                .limit(limit)
-            )
-            doc_result = await db.execute(doc_stmt)
-            docs = doc_result.scalars().all()
-
-    return docs, total_count
-
-
-async def _sum_total_price(
-    *,
-    vault_id: UUID,
-    doc_type: str | None,
-    date_from,
-    date_to,
-    customer_id: str | None,
-) -> float | None:
+) -> list[Document]:
+    if limit <= 0:
+        return []
     filters = _apply_date_filters(
         _base_filters(vault_id, doc_type, customer_id),
         date_from,
         date_to,
     )
     async with get_db_session() as db:
-        stmt = select(func.sum(Document.total_price)).where(*filters)
-        result = await db.execute(stmt)
-        total = result.scalar()
-    return float(total) if total is not None else None
+        doc_stmt = (
+            select(Document)
+            .where(*filters)
+            .order_by(Document.order_date, Document.entity_id, Document.original_filename)
+            .limit(limit)
+        )
+        doc_result = await db.execute(doc_stmt)
+        return list(doc_result.scalars().all())
 
 
 def _format_metadata_gap_explanation(
@@ -1447,33 +1799,8 @@ def _extract_entity_type_keywords(text: str) -> list[str]:
 def _parse_verdict_response(raw: str) -> dict:
     """Parse the LLM JSON response into state updates."""
     try:
-        data = json.loads(raw)
-
-        verdict = data.get("verdict", "unverifiable")
-        if verdict not in ("supported", "contradicted", "unverifiable"):
-            verdict = "unverifiable"
-
-        confidence = float(data.get("confidence", 0.0))
-        confidence = max(0.0, min(1.0, confidence))
-
-        evidence: list[dict] = []
-        for e in data.get("evidence", []):
-            evidence.append({
-                "doc_title": e.get("doc_title", "Unknown"),
-                "section": e.get("section"),
-                "page": e.get("page"),
-                "quote": e.get("quote", ""),
-                "relevance_score": float(e.get("relevance_score", 0.0)),
-            })
-
-        return {
-            "verdict": verdict,
-            "confidence": confidence,
-            "explanation": data.get("explanation", ""),
-            "evidence": evidence,
-        }
-
-    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        return _verdict_fields(json.loads(raw))
+    except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
         logger.warning(f"Failed to parse verdict response: {e}")
         return {
             "verdict": "unverifiable",
@@ -1481,3 +1808,67 @@ def _parse_verdict_response(raw: str) -> dict:
             "explanation": f"Failed to parse verification result: {e}",
             "evidence": [],
         }
+
+
+def _verdict_fields(data: dict) -> dict:
+    """Validate one verdict object from the LLM into state updates."""
+    verdict = data.get("verdict", "unverifiable")
+    if verdict not in ("supported", "contradicted", "unverifiable"):
+        verdict = "unverifiable"
+
+    confidence = float(data.get("confidence", 0.0))
+    confidence = max(0.0, min(1.0, confidence))
+
+    evidence: list[dict] = []
+    for e in data.get("evidence", []):
+        evidence.append({
+            "doc_title": e.get("doc_title", "Unknown"),
+            "section": e.get("section"),
+            "page": e.get("page"),
+            "quote": e.get("quote", ""),
+            "relevance_score": float(e.get("relevance_score", 0.0)),
+        })
+
+    return {
+        "verdict": verdict,
+        "confidence": confidence,
+        "explanation": data.get("explanation", ""),
+        "evidence": evidence,
+    }
+
+
+def _build_verdict(
+    statement: Statement,
+    result: dict,
+    *,
+    verification_path: str,
+    latency_ms: int,
+) -> Verdict:
+    """Build the public ``Verdict`` from final graph (or batch) state."""
+    timings = {
+        key: round(value, 1)
+        for key, value in (result.get("timings") or {}).items()
+        if value is not None
+    }
+    evidence_list: list[Evidence] = []
+    for e in result.get("evidence", []):
+        evidence_list.append(Evidence(
+            doc_title=e.get("doc_title", "Unknown"),
+            section=e.get("section"),
+            page=e.get("page"),
+            quote=e.get("quote", ""),
+            relevance_score=float(e.get("relevance_score", 0.0)),
+        ))
+
+    return Verdict(
+        claim_id=statement.id,
+        claim_text=statement.text,
+        verdict=result.get("verdict", "unverifiable"),
+        confidence=result.get("confidence", 0.0),
+        explanation=result.get("explanation", ""),
+        evidence=evidence_list,
+        verification_path=verification_path,
+        latency_ms=latency_ms,
+        timings=timings,
+        cache_hit=False,
+    )
@@ -5,6 +5,7 @@ from typing import Callable, Awaitable
 from aiokafka import AIOKafkaConsumer
 
 from app.core.kafka.dlq import DLQHandler
+from app.core.kafka.offsets import OffsetTracker
 from app.core.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -19,6 +20,10 @@ class KafkaConsumer:
         ``max_batch_size`` messages (or waits ``batch_timeout_s``),
         then calls the handler with the full list. Offsets are committed
         once after the entire batch succeeds.
+      - ``consume_tracked()``: pipelined — every message is handed to
+        ``submit`` with an ``ack`` callback and polling continues
+        immediately. Offsets are committed periodically up to the lowest
+        message not yet acked, per partition.
     """
 
     def __init__(
@@ -183,6 +188,86 @@ class KafkaConsumer:
                 logger.error(f"Batch consumer loop error: {e}")
                 raise
 
+    async def consume_tracked(
+        self,
+        submit: Callable[[dict, Callable[[], None]], Awaitable[None]],
+        drain: Callable[[], Awaitable[None]],
+        max_in_flight: int = 100,
+        commit_interval_s: float = 2.0,
+        poll_timeout_ms: int = 200,
+    ) -> None:
+        """Pipelined consume loop with out-of-order offset tracking.
+
+        Each message is passed to ``submit(event, ack)``; the consumer
+        must call ``ack()`` exactly once when the message reaches a
+        terminal state (stored, skipped, failed or DLQ'd). ``submit``
+        may block to apply backpressure. Polling also pauses while
+        ``max_in_flight`` messages are un-acked.
+
+        On shutdown, ``drain()`` is awaited (finish in-flight work) before
+        the final commit.
+
+        Args:
+            submit: Async callable that enqueues one event.
+            drain: Async callable that waits for in-flight events to finish.
+            max_in_flight: Cap on un-acked messages.
+            commit_interval_s: Seconds between offset commits.
+            poll_timeout_ms: Max milliseconds per poll iteration.
+        """
+        tracker = OffsetTracker()
+        loop = asyncio.get_running_loop()
+        next_commit = loop.time() + commit_interval_s
+
+        def _ack_for(tp, offset: int) -> Callable[[], None]:
+            return lambda: tracker.complete(tp, offset)
+
+        try:
+            while self._running:
+                if tracker.in_flight() < max_in_flight:
+                    records = await self._consumer.getmany(
+                        timeout_ms=poll_timeout_ms,
+                        max_records=max_in_flight - tracker.in_flight(),
+                    )
+                    for tp, messages in records.items():
+                        for msg in messages:
+                            tracker.track(tp, msg.offset)
+                            ack = _ack_for(tp, msg.offset)
+                            if msg.value and isinstance(msg.value, dict):
+                                await submit(msg.value, ack)
+                            else:
+                                ack()
+                else:
+                    await asyncio.sleep(poll_timeout_ms / 1000)
+
+                if loop.time() >= next_commit:
+                    await self._commit_tracked(tracker)
+                    next_commit = loop.time() + commit_interval_s
+        except Exception as e:
+            if self._running:
+                logger.error(f"Tracked consumer loop error: {e}")
+                raise
+        finally:
+            await drain()
+            await self._commit_tracked(tracker)
+
+    async def _commit_tracked(self, tracker: OffsetTracker) -> None:
+        """Commit completed offsets; a failed commit is retried next interval."""
+        offsets = tracker.committable()
+        if not offsets:
+            return
+        assigned = self._consumer.assignment()
+        revoked = [tp for tp in offsets if tp not in assigned]
+        if revoked:
+            tracker.forget(revoked)
+            offsets = {tp: off for tp, off in offsets.items() if tp in assigned}
+        if not offsets:
+            return
+        try:
+            await self._consumer.commit(offsets)
+            tracker.mark_committed(offsets)
+        except Exception as e:
+            logger.warning(f"Offset commit failed (will retry): {e}")
+
     def request_shutdown(self) -> None:
         """Signal the consume loop to stop after the current message."""
         self._running = False
@@ -0,0 +1,63 @@
+"""Out-of-order completion tracking for Kafka offset commits.
+
+A pipelined consumer finishes messages out of order: a small text file
+polled after a 300-page PDF is stored first. Kafka only records one
+committed offset per partition, so the safe commit point is the lowest
+offset still in flight (or one past the highest seen offset once
+everything completed). On a crash, only unfinished messages — and any
+finished ones behind them — are redelivered.
+"""
+
+from __future__ import annotations
+
+from typing import Hashable
+
+
+class OffsetTracker:
+    """Tracks in-flight offsets per partition and computes commit points.
+
+    Partitions are opaque hashable keys (``aiokafka.TopicPartition`` in
+    production).
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[Hashable, set[int]] = {}
+        self._highest: dict[Hashable, int] = {}
+        self._committed: dict[Hashable, int] = {}
+
+    def track(self, partition: Hashable, offset: int) -> None:
+        """Record a polled message as in flight."""
+        self._pending.setdefault(partition, set()).add(offset)
+        if offset > self._highest.get(partition, -1):
+            self._highest[partition] = offset
+
+    def complete(self, partition: Hashable, offset: int) -> None:
+        """Record a message as finished (stored, skipped, failed or DLQ'd)."""
+        pending = self._pending.get(partition)
+        if pending is not None:
+            pending.discard(offset)
+
+    def in_flight(self) -> int:
+        """Number of tracked messages not yet completed."""
+        return sum(len(p) for p in self._pending.values())
+
+    def committable(self) -> dict[Hashable, int]:
+        """Next offset to commit per partition, for partitions that advanced."""
+        offsets: dict[Hashable, int] = {}
+        for partition, highest in self._highest.items():
+            pending = self._pending.get(partition)
+            next_offset = min(pending) if pending else highest + 1
+            if next_offset > self._committed.get(partition, -1):
+                offsets[partition] = next_offset
+        return offsets
+
+    def mark_committed(self, offsets: dict[Hashable, int]) -> None:
+        """Record offsets acknowledged by the broker."""
+        self._committed.update(offsets)
+
+    def forget(self, partitions: list[Hashable]) -> None:
+        """Drop state for partitions revoked in a rebalance."""
+        for partition in partitions:
+            self._pending.pop(partition, None)
+            self._highest.pop(partition, None)
+            self._committed.pop(partition, None)
@@ -9,10 +9,13 @@ Usage::
 
     chunker = get_chunker()
     chunks = chunker.chunk(markdown_text, filename)
+
+    for chunk in chunker.iter_chunks(markdown_text, filename):  # streaming
+        ...
 """
 
 from app.core.rag.chunking.base import Chunker, ChunkData
-from app.core.rag.chunking.recursive import RecursiveChunker
+from app.core.rag.chunking.recursive import RecursiveChunker, count_tokens, truncate_tokens
 from app.core.config import get_settings
 from app.core.logger import setup_logger
 from app.core.utils import singleton
@@ -34,4 +37,11 @@ def get_chunker() -> Chunker:
     )
 
 
-__all__ = ["Chunker", "ChunkData", "RecursiveChunker", "get_chunker"]
+__all__ = [
+    "Chunker",
+    "ChunkData",
+    "RecursiveChunker",
+    "get_chunker",
+    "count_tokens",
+    "truncate_tokens",
+]
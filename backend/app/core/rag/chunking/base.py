@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from typing import Protocol, runtime_checkable
 
 from pydantic import BaseModel
@@ -11,8 +12,8 @@ from pydantic import BaseModel
 class Chunker(Protocol):
     """Protocol for text chunking strategies.
 
-    Any class that implements ``chunk`` with the correct signature
-    satisfies this protocol — no inheritance needed.
+    Any class that implements ``chunk`` and ``iter_chunks`` with the
+    correct signatures satisfies this protocol — no inheritance needed.
 
     To add a new chunker (e.g. semantic):
         1. Create ``app/core/rag/chunking/semantic.py``.
@@ -23,6 +24,10 @@ class Chunker(Protocol):
         """Split parsed markdown into chunks with contextual source headers."""
         ...
 
+    def iter_chunks(self, text: str, filename: str) -> Iterator[ChunkData]:
+        """Yield the same chunks as ``chunk`` incrementally, in order."""
+        ...
+
 
 class ChunkData(BaseModel):
     """Single chunk with metadata ready for storage.
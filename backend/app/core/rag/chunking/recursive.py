@@ -1,11 +1,21 @@
-"""Recursive text splitter — LangChain-backed, markdown-aware chunking."""
+"""Recursive text splitter — streaming, markdown-aware chunking.
+
+Implements the same recursive split-and-merge algorithm as LangChain's
+``RecursiveCharacterTextSplitter`` (separators kept at the start of each
+piece, whitespace stripped) so chunk boundaries are unchanged, but as a
+generator: chunks are yielded as soon as they are merged, and each
+split's token count is computed once and reused by the merge, the
+overlap window and the final ``ChunkData.token_count``.
+"""
 
 from __future__ import annotations
 
 import hashlib
+from collections import deque
+from collections.abc import Callable, Iterator
+from functools import lru_cache
 
 import tiktoken
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from app.core.rag.chunking.base import ChunkData
 from app.core.logger import setup_logger
@@ -14,6 +24,10 @@ logger = setup_logger(__name__)
 
 _ENCODER = tiktoken.get_encoding("cl100k_base")
 
+# Split pieces are only re-measured within one merge window, so a small
+# per-document memo catches every repeat.
+_TOKEN_MEMO_SIZE = 4096
+
 _SEPARATORS = [
     "\n\n## ",     # Markdown H2
     "\n\n### ",    # Markdown H3
@@ -28,9 +42,9 @@ _SEPARATORS = [
 class RecursiveChunker:
     """Markdown-aware recursive text splitter.
 
-    Uses LangChain's ``RecursiveCharacterTextSplitter`` with tiktoken
-    encoding to split text at token-level boundaries while respecting
-    markdown structure.
+    Splits text at token-level boundaries (tiktoken ``cl100k_base``)
+    while respecting markdown structure: headings first, then
+    paragraphs, lines, sentences, words and finally characters.
 
     Args:
         chunk_size: Maximum chunk size in tokens.
@@ -38,12 +52,12 @@ class RecursiveChunker:
     """
 
     def __init__(self, chunk_size: int = 512, chunk_overlap: int = 50) -> None:
-        self._splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-            encoding_name="cl100k_base",
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            separators=_SEPARATORS,
-        )
+        if chunk_overlap > chunk_size:
+            raise ValueError(
+                f"chunk_overlap ({chunk_overlap}) must not exceed chunk_size ({chunk_size})"
+            )
+        self._chunk_size = chunk_size
+        self._chunk_overlap = chunk_overlap
 
     def chunk(self, text: str, filename: str) -> list[ChunkData]:
         """Split text into chunks with contextual headers.
@@ -61,31 +75,84 @@ class RecursiveChunker:
             list[ChunkData]: Ordered list of chunks. Empty list if text
             is blank.
         """
+        return list(self.iter_chunks(text, filename))
+
+    def iter_chunks(self, text: str, filename: str) -> Iterator[ChunkData]:
+        """Yield chunks in order as they are produced (see ``chunk``)."""
         if not text or not text.strip():
-            return []
+            return
 
-        fragments = self._splitter.split_text(text)
-        source_label = _source_label(filename)
-        chunks: list[ChunkData] = []
+        count = lru_cache(maxsize=_TOKEN_MEMO_SIZE)(count_tokens)
+        header = f"[Source: {_source_label(filename)}]"
+        index = 0
 
-        for fragment in fragments:
+        for fragment in self._split(text, _SEPARATORS, count):
             content = fragment.strip()
             if not content:
                 continue
 
-            header = f"[Source: {source_label}]"
-            content_with_header = f"{header}\n{content}"
-
-            chunks.append(ChunkData(
+            yield ChunkData(
                 content=content,
-                content_with_header=content_with_header,
+                content_with_header=f"{header}\n{content}",
                 content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(),
-                token_count=len(_ENCODER.encode(content)),
-                chunk_index=len(chunks),
-            ))
-
-        logger.debug(f"Chunked '{filename}': {len(chunks)} chunk(s) from {len(text)} chars")
-        return chunks
+                token_count=count(content),
+                chunk_index=index,
+            )
+            index += 1
+
+        logger.debug(f"Chunked '{filename}': {index} chunk(s) from {len(text)} chars")
+
+    # ------------------------------------------------------------------
+    # Split / merge
+    # ------------------------------------------------------------------
+
+    def _split(
+        self, text: str, separators: list[str], count: Callable[[str], int],
+    ) -> Iterator[str]:
+        """Split on the first separator present, recursing into oversized pieces."""
+        separator = separators[-1]
+        remaining: list[str] = []
+        for i, sep in enumerate(separators):
+            if not sep:
+                separator = sep
+                break
+            if sep in text:
+                separator = sep
+                remaining = separators[i + 1:]
+                break
+
+        good: list[str] = []
+        for piece in _split_keep_separator(text, separator):
+            if count(piece) < self._chunk_size:
+                good.append(piece)
+                continue
+            if good:
+                yield from self._merge(good, count)
+                good = []
+            if remaining:
+                yield from self._split(piece, remaining, count)
+            else:
+                yield piece
+        if good:
+            yield from self._merge(good, count)
+
+    def _merge(self, pieces: list[str], count: Callable[[str], int]) -> Iterator[str]:
+        """Greedily pack pieces into chunks, carrying ``chunk_overlap`` tokens forward."""
+        window: deque[str] = deque()
+        total = 0
+        for piece in pieces:
+            n = count(piece)
+            if total + n > self._chunk_size and window:
+                doc = "".join(window).strip()
+                if doc:
+                    yield doc
+                while total > self._chunk_overlap or (total + n > self._chunk_size and total > 0):
+                    total -= count(window.popleft())
+            window.append(piece)
+            total += n
+        doc = "".join(window).strip()
+        if doc:
+            yield doc
 
 
 # ---------------------------------------------------------------------------
@@ -100,3 +167,25 @@ def _source_label(filename: str) -> str:
     """
     stem = filename.rsplit(".", 1)[0] if "." in filename else filename
     return stem.replace("_", " ").replace("-", " ")
+
+
+def count_tokens(text: str) -> int:
+    """Tokens in ``text`` under the chunker's encoding (``cl100k_base``)."""
+    return len(_ENCODER.encode(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Longest prefix of ``text`` that is at most ``max_tokens`` tokens."""
+    tokens = _ENCODER.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return _ENCODER.decode(tokens[:max(max_tokens, 0)])
+
+
+def _split_keep_separator(text: str, separator: str) -> list[str]:
+    """Split on ``separator``, keeping it at the start of each following piece."""
+    if not separator:
+        return list(text)
+    head, *tail = text.split(separator)
+    pieces = [head, *(separator + part for part in tail)]
+    return [p for p in pieces if p]
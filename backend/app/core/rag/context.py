@@ -0,0 +1,309 @@
+"""Token-budgeted prompt assembly for generation and the query agent.
+
+Prompt size drives time to first token, and it used to follow whatever
+retrieval and the conversation returned: whole chunks, a 30,000
+character cut on full documents, history trimmed by turn count and a
+500 character cut. Prompts are now assembled against token budgets,
+counted with the chunker's tiktoken encoding (``cl100k_base``):
+
+  - ``fit_history``: the most recent turns that fit the history budget;
+    older turns are dropped whole and long assistant turns are capped.
+  - ``assemble_context``: retrieved chunks in rank order, minus text
+    that overlaps a chunk of the same document already included (the
+    chunker's overlap window), until the context budget is spent.
+  - ``truncate_to_budget``: one long text (a tool output, a document)
+    cut at a token boundary.
+
+Prompts keep a stable, cacheable prefix: the static system prompt
+first, history next (rendered deterministically, so a turn reads the
+same in every later prompt), and the per-request parts — retrieved
+context and the question — last.
+
+Each assembled prompt records its usage per section (``PromptUsage``);
+process totals, together with the input and cached-input tokens the
+API reported, are exposed via ``GET /metrics``.
+
+Usage::
+
+    usage = PromptUsage()
+    usage.add("system", count_tokens(SYSTEM_PROMPT))
+    history = fit_history(history, max_tokens=2000, usage=usage)
+    context = assemble_context(results, max_tokens=8000, usage=usage)
+    usage.record("generation")
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, field
+from uuid import UUID
+
+from app.core.rag.chunking import count_tokens, truncate_tokens
+from app.core.rag.retrieval.base import RetrievalHit, SearchResult
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_TRUNCATION_MARKER = "..."
+
+# Shorter common runs between neighbouring chunks are coincidence, not overlap
+_MIN_OVERLAP_CHARS = 40
+
+# A chunk cut below this many tokens is dropped rather than included
+_MIN_PARTIAL_CHUNK_TOKENS = 64
+
+
+# ---------------------------------------------------------------------------
+# Usage accounting
+# ---------------------------------------------------------------------------
+
+@dataclass
+class PromptBudgetStats:
+    """Cumulative prompt-assembly counters.
+
+    Attributes:
+        prompts: Prompts assembled.
+        prompt_tokens: Their estimated tokens, summed.
+        max_prompt_tokens: The largest prompt assembled.
+        history_messages_dropped: Turns left out for the history budget.
+        chunks_deduplicated: Chunks with overlapping text removed.
+        chunks_dropped: Chunks left out for the context budget.
+        truncations: Texts cut at a token boundary.
+        api_input_tokens: Input tokens the API reported.
+        api_cached_input_tokens: Of those, served from the prompt cache.
+    """
+    prompts: int = 0
+    prompt_tokens: int = 0
+    max_prompt_tokens: int = 0
+    history_messages_dropped: int = 0
+    chunks_deduplicated: int = 0
+    chunks_dropped: int = 0
+    truncations: int = 0
+    api_input_tokens: int = 0
+    api_cached_input_tokens: int = 0
+
+
+# Process-lifetime totals, exposed via GET /metrics
+_totals = PromptBudgetStats()
+
+
+def prompt_budget_stats() -> dict:
+    """Cumulative prompt-size counters and prompt-cache ratio for this process."""
+    stats = asdict(_totals)
+    stats["avg_prompt_tokens"] = (
+        round(_totals.prompt_tokens / _totals.prompts, 1) if _totals.prompts else 0.0
+    )
+    stats["cached_input_ratio"] = (
+        round(_totals.api_cached_input_tokens / _totals.api_input_tokens, 4)
+        if _totals.api_input_tokens else 0.0
+    )
+    return stats
+
+
+@dataclass
+class PromptUsage:
+    """Token usage of one assembled prompt, by section."""
+
+    sections: dict[str, int] = field(default_factory=dict)
+    history_dropped: int = 0
+    chunks_deduplicated: int = 0
+    chunks_dropped: int = 0
+    truncations: int = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.sections.values())
+
+    def add(self, section: str, tokens: int) -> None:
+        self.sections[section] = self.sections.get(section, 0) + tokens
+
+    def record(self, label: str) -> None:
+        """Log this prompt's usage and add it to the process totals."""
+        total = self.total
+        _totals.prompts += 1
+        _totals.prompt_tokens += total
+        _totals.max_prompt_tokens = max(_totals.max_prompt_tokens, total)
+        _totals.history_messages_dropped += self.history_dropped
+        _totals.chunks_deduplicated += self.chunks_deduplicated
+        _totals.chunks_dropped += self.chunks_dropped
+        _totals.truncations += self.truncations
+        logger.info(
+            f"{label} prompt: {total} tokens "
+            f"({', '.join(f'{k}={v}' for k, v in self.sections.items())}; "
+            f"history_dropped={self.history_dropped}, "
+            f"chunks_deduplicated={self.chunks_deduplicated}, "
+            f"chunks_dropped={self.chunks_dropped}, truncations={self.truncations})"
+        )
+
+
+def record_api_usage(response) -> None:
+    """Add the input/cached-input tokens an LLM response reports to the totals."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    _totals.api_input_tokens += usage.get("input_tokens", 0) or 0
+    details = usage.get("input_token_details") or {}
+    _totals.api_cached_input_tokens += details.get("cache_read", 0) or 0
+
+
+# ---------------------------------------------------------------------------
+# Assembly
+# ---------------------------------------------------------------------------
+
+def truncate_to_budget(
+    text: str,
+    max_tokens: int,
+    *,
+    marker: str = _TRUNCATION_MARKER,
+    usage: PromptUsage | None = None,
+) -> str:
+    """``text`` cut to at most ``max_tokens`` tokens (marker included)."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    if usage is not None:
+        usage.truncations += 1
+    return truncate_tokens(text, max_tokens - count_tokens(marker)).rstrip() + marker
+
+
+def fit_history(
+    history: list[dict[str, str]] | None,
+    *,
+    max_tokens: int,
+    max_message_tokens: int | None = None,
+    max_turns: int | None = None,
+    usage: PromptUsage | None = None,
+) -> list[dict[str, str]]:
+    """The most recent history messages that fit ``max_tokens``.
+
+    Empty messages are skipped, assistant messages are capped at
+    ``max_message_tokens``, and the first message that no longer fits
+    drops itself and everything older, so history is never cut
+    mid-conversation.
+
+    Returns:
+        list[dict]: ``{"role", "content"}`` dicts, oldest first.
+    """
+    if not history:
+        return []
+    recent = history[-max_turns * 2:] if max_turns else history
+
+    kept: list[dict[str, str]] = []
+    spent = 0
+    candidates = 0
+    for msg in reversed(recent):
+        role = msg.get("role", "user")
+        content = msg.get("content", "").strip()
+        if not content:
+            continue
+        candidates += 1
+        if role == "assistant" and max_message_tokens:
+            content = truncate_to_budget(content, max_message_tokens, usage=usage)
+        tokens = count_tokens(content)
+        if spent + tokens > max_tokens:
+            break
+        kept.append({"role": role, "content": content})
+        spent += tokens
+
+    if usage is not None:
+        usage.add("history", spent)
+        usage.history_dropped += sum(
+            1 for msg in recent if msg.get("content", "").strip()
+        ) - len(kept)
+    kept.reverse()
+    return kept
+
+
+def assemble_context(
+    results: Sequence[SearchResult | RetrievalHit],
+    max_tokens: int,
+    *,
+    usage: PromptUsage | None = None,
+) -> str:
+    """Numbered context block for LLM prompts, within ``max_tokens``.
+
+    Same format as ``build_retrieval_context``. Results are taken in
+    order; text a result shares with an already included chunk of the
+    same document is removed (a result with nothing new is skipped),
+    and the result that would overrun the budget is cut, or dropped
+    if too little budget is left, along with everything after it.
+    """
+    parts: list[str] = []
+    included: dict[UUID, list[str]] = {}
+    spent = 0
+    number = 0
+
+    for position, r in enumerate(results):
+        content = r.content or ""
+        unique = _strip_overlap(content, included.get(r.doc_id, []))
+        if unique is None:
+            if usage is not None:
+                usage.chunks_deduplicated += 1
+            continue
+        if unique != content and usage is not None:
+            usage.chunks_deduplicated += 1
+
+        block = (
+            f"--- Document Chunk {number + 1} (relevance: {r.score:.3f}) ---\n"
+            f"{_with_header(r, content, unique)}\n"
+        )
+        tokens = count_tokens(block)
+        if spent + tokens > max_tokens:
+            remaining = max_tokens - spent
+            cut = remaining >= _MIN_PARTIAL_CHUNK_TOKENS
+            if cut:
+                block = truncate_to_budget(block, remaining, usage=usage) + "\n"
+                parts.append(block)
+                spent += count_tokens(block)
+            if usage is not None:
+                usage.chunks_dropped += len(results) - position - (1 if cut else 0)
+            break
+
+        parts.append(block)
+        spent += tokens
+        number += 1
+        included.setdefault(r.doc_id, []).append(content)
+
+    if usage is not None:
+        usage.add("context", spent)
+    return "\n".join(parts)
+
+
+def _with_header(r: SearchResult | RetrievalHit, content: str, unique: str) -> str:
+    full = r.content_with_header or content
+    if unique == content:
+        return full
+    # content_with_header is the chunk's "[Source: ...]" header + content
+    header = full[: len(full) - len(content)] if full.endswith(content) else ""
+    return header + unique
+
+
+def _strip_overlap(content: str, previous: list[str]) -> str | None:
+    """``content`` minus text shared with ``previous`` chunks; None if nothing is left."""
+    text = content
+    for prev in previous:
+        if text in prev:
+            return None
+        head = _overlap(prev, text)
+        if head:
+            text = text[head:].lstrip()
+        tail = _overlap(text, prev)
+        if tail:
+            text = text[: len(text) - tail].rstrip()
+        if not text:
+            return None
+    return text
+
+
+def _overlap(left: str, right: str) -> int:
+    """Length of the longest suffix of ``left`` that is a prefix of ``right``.
+
+    Only overlaps of at least ``_MIN_OVERLAP_CHARS`` count.
+    """
+    if len(left) < _MIN_OVERLAP_CHARS or len(right) < _MIN_OVERLAP_CHARS:
+        return 0
+    probe = right[:_MIN_OVERLAP_CHARS]
+    start = left.find(probe)
+    while start != -1:
+        size = len(left) - start
+        if right.startswith(left[start:]) and size >= _MIN_OVERLAP_CHARS:
+            return size
+        start = left.find(probe, start + 1)
+    return 0
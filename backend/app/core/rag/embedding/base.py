@@ -9,8 +9,8 @@ from typing import Protocol, runtime_checkable
 class Embedder(Protocol):
     """Protocol for embedding providers.
 
-    Any class that implements ``embed_documents`` and ``embed_query``
-    with the correct signatures satisfies this protocol.
+    Any class that implements ``embed_documents``, ``embed_query`` and
+    ``embed_queries`` with the correct signatures satisfies this protocol.
 
     To add a new provider (e.g. Cohere):
         1. Create ``app/core/rag/embedding/cohere.py`` with a
@@ -18,10 +18,22 @@ class Embedder(Protocol):
         2. Update ``get_embedder()`` in ``embedding/__init__.py``.
     """
 
-    async def embed_documents(self, texts: list[str]) -> list[list[float]]:
-        """Embed a batch of texts and return one vector per input."""
+    async def embed_documents(
+        self,
+        texts: list[str],
+        token_counts: list[int] | None = None,
+    ) -> list[list[float]]:
+        """Embed a batch of texts and return one vector per input.
+
+        ``token_counts`` (one per text) lets providers pack requests by
+        size. Raises ``PartialEmbeddingError`` when only some texts fail.
+        """
         ...
 
     async def embed_query(self, text: str) -> list[float]:
         """Embed a single query string."""
         ...
+
+    async def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Embed several query strings (cache-aware batch of ``embed_query``)."""
+        ...
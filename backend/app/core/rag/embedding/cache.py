@@ -0,0 +1,181 @@
+"""Two-tier query-embedding cache — process LRU in front of Redis.
+
+Tier 1 is a bounded in-process LRU with TTL: a hit costs a dict lookup.
+Tier 2 is Redis, storing each vector as packed little-endian float32
+bytes (6 KB for 1536 dims instead of ~30 KB of JSON). Multi-query
+callers resolve all tier-1 misses with a single ``MGET``.
+
+Both tiers are fail-open: a Redis error is treated as a miss.
+
+Usage::
+
+    from app.core.rag.embedding.cache import get_query_embedding_cache
+
+    cache = get_query_embedding_cache()
+    vectors = await cache.get_many(texts)   # None for misses
+    await cache.put_many(missed_texts, new_vectors)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.core.utils import singleton
+
+logger = setup_logger(__name__)
+SETTINGS = get_settings()
+
+_CACHE_PREFIX = "emb_cache:f32:"
+
+
+class QueryEmbeddingCache:
+    """LRU + Redis cache for query embeddings.
+
+    Keys are scoped by model and dimensions so switching embedding
+    models never serves stale vectors.
+
+    Args:
+        model: Embedding model name (part of the cache key).
+        dimensions: Embedding dimensionality (part of the cache key).
+        max_entries: Capacity of the in-process LRU tier.
+        local_ttl_s: TTL of the in-process tier.
+        redis_ttl_s: TTL of the Redis tier.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        dimensions: int,
+        max_entries: int = 2048,
+        local_ttl_s: float = 300.0,
+        redis_ttl_s: float = 300.0,
+    ) -> None:
+        self._scope = f"{model}:{dimensions}"
+        self._max_entries = max_entries
+        self._local_ttl_s = local_ttl_s
+        self._redis_ttl_s = max(int(redis_ttl_s), 1)
+        self._local: OrderedDict[str, tuple[float, list[float]]] = OrderedDict()
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "redis_errors": 0}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get(self, text: str) -> list[float] | None:
+        """Look up one query embedding."""
+        return (await self.get_many([text]))[0]
+
+    async def get_many(self, texts: list[str]) -> list[list[float] | None]:
+        """Look up several query embeddings (one ``MGET`` for local misses).
+
+        Returns:
+            list: One vector per input text, ``None`` for misses.
+        """
+        keys = [self._key(t) for t in texts]
+        found: list[list[float] | None] = [self._local_get(k) for k in keys]
+        self._stats["local_hits"] += sum(v is not None for v in found)
+
+        pending = [i for i, v in enumerate(found) if v is None]
+        if pending:
+            raws = await self._redis_mget([keys[i] for i in pending])
+            for i, raw in zip(pending, raws):
+                if raw is None:
+                    continue
+                vector = np.frombuffer(raw, dtype="<f4").tolist()
+                found[i] = vector
+                self._local_put(keys[i], vector)
+                self._stats["redis_hits"] += 1
+
+        self._stats["misses"] += sum(v is None for v in found)
+        return found
+
+    async def put(self, text: str, vector: list[float]) -> None:
+        """Store one query embedding in both tiers."""
+        await self.put_many([text], [vector])
+
+    async def put_many(self, texts: list[str], vectors: list[list[float]]) -> None:
+        """Store several query embeddings in both tiers (one pipeline)."""
+        if not texts:
+            return
+        keys = [self._key(t) for t in texts]
+        for key, vector in zip(keys, vectors):
+            self._local_put(key, vector)
+
+        try:
+            client = await _get_binary_client()
+            pipe = client.pipeline(transaction=False)
+            for key, vector in zip(keys, vectors):
+                pipe.setex(key, self._redis_ttl_s, np.asarray(vector, dtype="<f4").tobytes())
+            await pipe.execute()
+        except Exception:
+            self._stats["redis_errors"] += 1
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current local-tier size."""
+        lookups = self._stats["local_hits"] + self._stats["redis_hits"] + self._stats["misses"]
+        hits = self._stats["local_hits"] + self._stats["redis_hits"]
+        return {
+            **self._stats,
+            "local_entries": len(self._local),
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Drop the in-process tier (Redis entries expire on their own)."""
+        self._local.clear()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _key(self, text: str) -> str:
+        digest = hashlib.sha256(f"{self._scope}:{text}".encode()).hexdigest()
+        return _CACHE_PREFIX + digest
+
+    def _local_get(self, key: str) -> list[float] | None:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, vector = entry
+        if expires_at < time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return vector
+
+    def _local_put(self, key: str, vector: list[float]) -> None:
+        self._local[key] = (time.monotonic() + self._local_ttl_s, vector)
+        self._local.move_to_end(key)
+        while len(self._local) > self._max_entries:
+            self._local.popitem(last=False)
+
+    async def _redis_mget(self, keys: list[str]) -> list[bytes | None]:
+        try:
+            client = await _get_binary_client()
+            return await client.mget(keys)
+        except Exception:
+            self._stats["redis_errors"] += 1
+            return [None] * len(keys)
+
+
+async def _get_binary_client():
+    from app.core.tools.redis import get_redis_binary_client
+    return await get_redis_binary_client()
+
+
+@singleton
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Return the shared query-embedding cache for the configured model."""
+    return QueryEmbeddingCache(
+        model=SETTINGS.OPENAI_EMBEDDING_MODEL,
+        dimensions=SETTINGS.OPENAI_EMBEDDING_DIMENSIONS,
+        max_entries=SETTINGS.EMBEDDING_CACHE_LOCAL_MAX_ENTRIES,
+        local_ttl_s=SETTINGS.EMBEDDING_CACHE_LOCAL_TTL_S,
+        redis_ttl_s=SETTINGS.EMBEDDING_CACHE_TTL_S,
+    )
@@ -0,0 +1,234 @@
+"""Content-hash keyed cache for document-chunk embeddings.
+
+Invoice corpora share a lot of template boilerplate and users often
+re-upload files, so many chunk texts have already been embedded. Before
+calling the embedding API, ingestion looks up every text in the
+``embedding_cache`` table by ``sha256(model:dimensions:content_with_header)``
+and only embeds the misses. Identical texts within one batch are
+embedded once.
+
+Lookups and writes are fail-open: a cache error falls back to embedding
+everything.
+
+Usage::
+
+    from app.core.rag.embedding.doc_cache import embed_documents_cached
+
+    vectors, stats = await embed_documents_cached(texts, token_counts, db, embedder)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.core.utils import utcnow
+from app.core.rag.embedding.base import Embedder
+from app.core.rag.exceptions import PartialEmbeddingError
+from app.core.rag.retrieval.base import decode_vectors
+from app.db.models.embedding_cache import EmbeddingCacheEntry
+
+logger = setup_logger(__name__)
+SETTINGS = get_settings()
+
+_INSERT_BATCH_ROWS = 1000
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Savings from one cached embedding call.
+
+    Attributes:
+        total_texts: Texts requested.
+        cached_texts: Texts served from the cache (or duplicated in-batch).
+        embedded_texts: Unique texts sent to the API.
+        tokens_saved: Approximate tokens not sent to the API.
+        api_calls_saved: API requests avoided at the configured batch size.
+    """
+
+    total_texts: int = 0
+    cached_texts: int = 0
+    embedded_texts: int = 0
+    tokens_saved: int = 0
+    api_calls_saved: int = 0
+
+    def merge(self, other: EmbeddingCacheStats) -> None:
+        self.total_texts += other.total_texts
+        self.cached_texts += other.cached_texts
+        self.embedded_texts += other.embedded_texts
+        self.tokens_saved += other.tokens_saved
+        self.api_calls_saved += other.api_calls_saved
+
+    def summary(self) -> str:
+        return (
+            f"embedded {self.embedded_texts}/{self.total_texts} texts, "
+            f"saved {self.api_calls_saved} API calls and ~{self.tokens_saved} tokens"
+        )
+
+
+# Process-lifetime totals, exposed via GET /metrics
+_totals = EmbeddingCacheStats()
+
+
+def doc_embedding_cache_stats() -> dict:
+    """Cumulative document-embedding cache savings for this process."""
+    return asdict(_totals)
+
+
+def embedding_cache_key(content: str, model: str, dimensions: int) -> str:
+    """sha256 hex key for a text under a given model and dimensionality."""
+    return hashlib.sha256(f"{model}:{dimensions}:{content}".encode()).hexdigest()
+
+
+async def embed_documents_cached(
+    texts: list[str],
+    token_counts: list[int],
+    db: AsyncSession,
+    embedder: Embedder,
+) -> tuple[list[list[float]], EmbeddingCacheStats]:
+    """Embed ``texts``, reusing stored embeddings for previously seen texts.
+
+    Args:
+        texts: Chunk texts (``content_with_header``) to embed.
+        token_counts: Token count per text (for the savings report).
+        db: Async database session (cache rows are written in a savepoint).
+        embedder: Shared embedder instance.
+
+    Returns:
+        tuple: One vector per input text, and the savings for this call.
+
+    Raises:
+        PartialEmbeddingError: Some misses failed to embed. Carries one
+            entry per input text (cached and successful vectors filled
+            in); successful vectors are still written to the cache.
+        Exception: Whatever else ``embedder.embed_documents`` raises.
+    """
+    stats = EmbeddingCacheStats(total_texts=len(texts))
+    if not texts:
+        return [], stats
+    if not SETTINGS.EMBEDDING_DOC_CACHE_ENABLED:
+        stats.embedded_texts = len(texts)
+        return await embedder.embed_documents(texts, token_counts), stats
+
+    model = SETTINGS.OPENAI_EMBEDDING_MODEL
+    dims = SETTINGS.OPENAI_EMBEDDING_DIMENSIONS
+    keys = [embedding_cache_key(t, model, dims) for t in texts]
+
+    cached = await _lookup(db, list(set(keys)))
+
+    # Unique misses, in first-seen order
+    miss_index: dict[str, int] = {}
+    miss_texts: list[str] = []
+    miss_tokens: list[int] = []
+    for key, content, tokens in zip(keys, texts, token_counts):
+        if key not in cached and key not in miss_index:
+            miss_index[key] = len(miss_texts)
+            miss_texts.append(content)
+            miss_tokens.append(tokens)
+
+    fresh: list[list[float] | None] = []
+    partial: PartialEmbeddingError | None = None
+    if miss_texts:
+        try:
+            fresh = await embedder.embed_documents(miss_texts, miss_tokens)
+        except PartialEmbeddingError as e:
+            fresh, partial = e.vectors, e
+        ok = [i for i, vec in enumerate(fresh) if vec is not None]
+        miss_keys = list(miss_index)
+        await _store(
+            db,
+            [miss_keys[i] for i in ok],
+            [fresh[i] for i in ok],
+            [miss_tokens[i] for i in ok],
+            model, dims,
+        )
+
+    vectors = [
+        cached[key] if key in cached else fresh[miss_index[key]]
+        for key in keys
+    ]
+    if partial is not None:
+        raise PartialEmbeddingError(
+            str(partial),
+            vectors,
+            [i for i, vec in enumerate(vectors) if vec is None],
+        ) from partial
+
+    batch_size = max(SETTINGS.RAG_EMBEDDING_BATCH_SIZE, 1)
+    stats.embedded_texts = len(miss_texts)
+    stats.cached_texts = len(texts) - len(miss_texts)
+    stats.tokens_saved = sum(token_counts) - sum(miss_tokens)
+    stats.api_calls_saved = (
+        math.ceil(len(texts) / batch_size) - math.ceil(len(miss_texts) / batch_size)
+    )
+    _totals.merge(stats)
+    return vectors, stats
+
+
+# ---------------------------------------------------------------------------
+# Internals
+# ---------------------------------------------------------------------------
+
+async def _lookup(db: AsyncSession, keys: list[str]) -> dict[str, list[float]]:
+    """Fetch cached vectors for ``keys`` in one query (binary transfer)."""
+    try:
+        # Savepoint so a failed lookup cannot poison the caller's transaction
+        async with db.begin_nested():
+            result = await db.execute(
+                text("""
+                    SELECT key_hash, vector_send(embedding)
+                    FROM embedding_cache
+                    WHERE key_hash = ANY(:keys)
+                """),
+                {"keys": keys},
+            )
+            rows = result.fetchall()
+    except Exception as e:
+        logger.warning(f"Embedding cache lookup failed: {e}")
+        return {}
+
+    if not rows:
+        return {}
+    matrix, _ = decode_vectors([row[1] for row in rows])
+    return {row[0]: vec.tolist() for row, vec in zip(rows, matrix)}
+
+
+async def _store(
+    db: AsyncSession,
+    keys: list[str],
+    vectors: list[list[float]],
+    token_counts: list[int],
+    model: str,
+    dims: int,
+) -> None:
+    """Insert new cache rows, ignoring keys another worker stored first."""
+    now = utcnow()
+    rows = [
+        {
+            "key_hash": key,
+            "model": model,
+            "dimensions": dims,
+            "embedding": vector,
+            "token_count": tokens,
+            "created_at": now,
+        }
+        for key, vector, tokens in zip(keys, vectors, token_counts)
+    ]
+
+    try:
+        async with db.begin_nested():
+            # Stay well below asyncpg's 32k bind-parameter limit
+            for start in range(0, len(rows), _INSERT_BATCH_ROWS):
+                stmt = pg_insert(EmbeddingCacheEntry).values(
+                    rows[start:start + _INSERT_BATCH_ROWS],
+                ).on_conflict_do_nothing(index_elements=["key_hash"])
+                await db.execute(stmt)
+    except Exception as e:
+        logger.warning(f"Embedding cache write failed: {e}")
@@ -1,21 +1,24 @@
-"""OpenAI embedder — wraps langchain-openai OpenAIEmbeddings."""
+"""OpenAI embedder — wraps langchain-openai OpenAIEmbeddings.
+
+Document batches bypass langchain's sequential batching: they are
+packed by token count and sent as concurrent requests on the client's
+pooled async connection (see ``scheduler.embed_in_sub_batches``).
+"""
 
 from __future__ import annotations
 
 import asyncio
-import hashlib
-import json
 
 from langchain_openai import OpenAIEmbeddings
 
 from app.core.config import get_settings
 from app.core.logger import setup_logger
+from app.core.rag.embedding.cache import get_query_embedding_cache
+from app.core.rag.embedding.scheduler import embed_in_sub_batches, estimate_tokens, is_input_error
 
 logger = setup_logger(__name__)
 SETTINGS = get_settings()
 
-_CACHE_PREFIX = "emb_cache:"
-
 
 class OpenAIEmbedder:
     """Embedder backed by OpenAI text-embedding models.
@@ -23,8 +26,9 @@ class OpenAIEmbedder:
     Wraps ``langchain_openai.OpenAIEmbeddings`` to provide a clean,
     provider-agnostic interface that satisfies the ``Embedder`` protocol.
 
-    Connection pooling, retries, and batch splitting are handled by the
-    underlying langchain client.
+    Connection pooling is handled by the underlying client. Document
+    batches are split into token-bounded requests that run concurrently,
+    each with its own retries.
 
     Args:
         model: OpenAI embedding model name.
@@ -46,36 +50,47 @@ class OpenAIEmbedder:
             api_key=api_key,
             chunk_size=batch_size,
         )
-        self._cache_ttl = int(SETTINGS.EMBEDDING_CACHE_TTL_S)
-
-    async def embed_documents(self, texts: list[str]) -> list[list[float]]:
-        """Embed a batch of texts with exponential-backoff retries.
+        self._model = model
+        self._dimensions = dimensions
+        self._batch_size = batch_size
+        self._query_cache = get_query_embedding_cache()
 
-        Retries on timeout and transient API errors to survive the
-        intermittent failures that killed the old one-shot approach.
+    async def embed_documents(
+        self,
+        texts: list[str],
+        token_counts: list[int] | None = None,
+    ) -> list[list[float]]:
+        """Embed a batch of texts as concurrent token-packed requests.
+
+        Each request retries with exponential backoff on timeouts and
+        transient API errors; only failed requests are retried.
+
+        Args:
+            texts: Texts to embed.
+            token_counts: Token count per text, used to pack requests
+                (estimated from length when omitted).
+
+        Raises:
+            PartialEmbeddingError: Some texts failed; carries the vectors
+                that succeeded.
         """
         if not texts:
             return []
-        return await self._embed_with_retries(
-            self._client.aembed_documents,
+        counts = token_counts or [estimate_tokens(t) for t in texts]
+        return await embed_in_sub_batches(
             texts,
-            label=f"{len(texts)} texts",
-            timeout=SETTINGS.EMBEDDING_TIMEOUT_S,
+            counts,
+            self._embed_request,
+            max_tokens=SETTINGS.EMBEDDING_MAX_TOKENS_PER_REQUEST,
+            max_texts=self._batch_size,
+            max_in_flight=SETTINGS.EMBEDDING_MAX_IN_FLIGHT,
         )
 
     async def embed_query(self, text: str) -> list[float]:
-        """Embed a single query string (cached in Redis with TTL)."""
-        cache_key = _CACHE_PREFIX + hashlib.sha256(text.encode()).hexdigest()
-
-        # Try Redis cache — fail-open (miss on error)
-        try:
-            from app.core.tools.redis import get_redis_client
-            client = await get_redis_client()
-            raw = await client.get(cache_key)
-            if raw is not None:
-                return json.loads(raw)
-        except Exception:
-            pass
+        """Embed a single query string (cached: process LRU, then Redis)."""
+        cached = await self._query_cache.get(text)
+        if cached is not None:
+            return cached
 
         result = await self._embed_with_retries(
             self._client.aembed_query,
@@ -83,26 +98,58 @@ class OpenAIEmbedder:
             label="query",
             timeout=SETTINGS.API_TIMEOUT_S,
         )
+        await self._query_cache.put(text, result)
+        return result
 
-        # Store in Redis — fire-and-forget, non-blocking on failure
-        try:
-            from app.core.tools.redis import get_redis_client
-            client = await get_redis_client()
-            await client.setex(cache_key, self._cache_ttl, json.dumps(result))
-        except Exception:
-            pass
+    async def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Embed several query strings with one cache lookup and one API call.
 
-        return result
+        Cache hits are resolved with a single ``MGET``; all misses go to
+        OpenAI in one batch.
+        """
+        if not texts:
+            return []
+
+        vectors = await self._query_cache.get_many(texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+        if missing:
+            embedded = await self._embed_with_retries(
+                self._client.aembed_documents,
+                missing,
+                label=f"{len(missing)} queries",
+                timeout=SETTINGS.API_TIMEOUT_S,
+            )
+            await self._query_cache.put_many(missing, embedded)
+            by_text = dict(zip(missing, embedded))
+            vectors = [v if v is not None else by_text[t] for t, v in zip(texts, vectors)]
+
+        return vectors
 
     # ------------------------------------------------------------------
-    # Retry helper
+    # Request + retry helpers
     # ------------------------------------------------------------------
 
+    async def _embed_request(self, texts: list[str]) -> list[list[float]]:
+        """One embeddings API request (with retries)."""
+        return await self._embed_with_retries(
+            self._create_embeddings,
+            texts,
+            label=f"{len(texts)} texts",
+            timeout=SETTINGS.EMBEDDING_TIMEOUT_S,
+        )
+
+    async def _create_embeddings(self, texts: list[str]) -> list[list[float]]:
+        response = await self._client.async_client.create(
+            input=texts, model=self._model, dimensions=self._dimensions,
+        )
+        return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
     async def _embed_with_retries(self, fn, payload, *, label: str, timeout: float):
         """Call *fn(payload)* with exponential-backoff retries.
 
         On timeout or transient error, retries up to
         ``EMBEDDING_MAX_RETRIES`` times with ``2^attempt`` delay.
+        Input errors (HTTP 4xx other than 408/409/429) are not retried.
         On final failure, raises a descriptive ``TimeoutError``
         (for timeouts) or re-raises the original exception.
         """
@@ -125,7 +172,7 @@ class OpenAIEmbedder:
                 )
                 await asyncio.sleep(delay)
             except Exception as exc:
-                if attempt == max_retries - 1:
+                if attempt == max_retries - 1 or is_input_error(exc):
                     raise
                 delay = base_delay * (2 ** attempt)
                 logger.warning(
@@ -0,0 +1,120 @@
+"""Token-aware sub-batch scheduling for document embeddings.
+
+Texts are packed, in order, into requests bounded by a token budget and
+a text count, and the requests run concurrently under an in-flight
+limit. Each request has its own retries; a request that still fails
+with an input error (HTTP 4xx) is bisected so a single bad text fails
+alone instead of taking its neighbours down. Transient failures that
+survive the retries fail just that request.
+
+Failures never discard finished work: ``embed_in_sub_batches`` raises
+``PartialEmbeddingError`` carrying every vector that did succeed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable
+
+from app.core.logger import setup_logger
+from app.core.rag.exceptions import PartialEmbeddingError
+
+logger = setup_logger(__name__)
+
+EmbedBatch = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Conservative token estimate when no count is known (~3 chars/token)."""
+    return len(text) // 3 + 1
+
+
+def pack_by_tokens(
+    token_counts: list[int],
+    *,
+    max_tokens: int,
+    max_texts: int,
+) -> list[tuple[int, int]]:
+    """Split ``[0, len(token_counts))`` into contiguous request ranges.
+
+    A range closes when adding the next text would exceed ``max_tokens``
+    or ``max_texts``. A single text larger than the budget gets a range
+    of its own.
+
+    Returns:
+        list: ``(start, end)`` index ranges covering every text in order.
+    """
+    ranges: list[tuple[int, int]] = []
+    start, tokens = 0, 0
+    for i, n in enumerate(token_counts):
+        if i > start and (tokens + n > max_tokens or i - start >= max_texts):
+            ranges.append((start, i))
+            start, tokens = i, 0
+        tokens += n
+    if start < len(token_counts):
+        ranges.append((start, len(token_counts)))
+    return ranges
+
+
+def is_input_error(exc: BaseException) -> bool:
+    """True for request errors that retrying the same payload cannot fix."""
+    status = getattr(exc, "status_code", None)
+    return isinstance(status, int) and 400 <= status < 500 and status not in (408, 409, 429)
+
+
+async def embed_in_sub_batches(
+    texts: list[str],
+    token_counts: list[int],
+    embed_batch: EmbedBatch,
+    *,
+    max_tokens: int,
+    max_texts: int,
+    max_in_flight: int,
+) -> list[list[float]]:
+    """Embed ``texts`` as concurrent, token-packed sub-batches.
+
+    Args:
+        texts: Texts to embed.
+        token_counts: Token count per text (used for packing only).
+        embed_batch: Embeds one request's texts (with its own retries).
+        max_tokens: Token budget per request.
+        max_texts: Text cap per request.
+        max_in_flight: Concurrent requests.
+
+    Returns:
+        list: One vector per text, in input order.
+
+    Raises:
+        PartialEmbeddingError: Some texts failed; carries the rest.
+    """
+    vectors: list[list[float] | None] = [None] * len(texts)
+    errors: list[BaseException] = []
+    sem = asyncio.Semaphore(max(max_in_flight, 1))
+
+    async def run(start: int, end: int) -> None:
+        try:
+            async with sem:
+                result = await embed_batch(texts[start:end])
+        except Exception as exc:
+            if end - start > 1 and is_input_error(exc):
+                mid = (start + end) // 2
+                logger.warning(f"Embedding rejected {end - start} texts ({exc}) — bisecting")
+                await asyncio.gather(run(start, mid), run(mid, end))
+                return
+            logger.error(f"Embedding failed for texts {start}-{end - 1}: {exc}")
+            errors.append(exc)
+            return
+        vectors[start:end] = result
+
+    ranges = pack_by_tokens(token_counts, max_tokens=max_tokens, max_texts=max_texts)
+    await asyncio.gather(*(run(start, end) for start, end in ranges))
+
+    failed = [i for i, v in enumerate(vectors) if v is None]
+    if failed:
+        raise PartialEmbeddingError(
+            f"{len(failed)}/{len(texts)} texts failed to embed "
+            f"({len(ranges)} requests): {errors[0] if errors else 'unknown error'}",
+            vectors,
+            failed,
+        )
+    return vectors
@@ -6,3 +6,22 @@ class ParseError(Exception):
 class IngestionError(Exception):
     """Raised when the ingestion pipeline fails."""
     pass
+
+
+class PartialEmbeddingError(Exception):
+    """Raised when some texts of an embedding request could not be embedded.
+
+    Attributes:
+        vectors: One entry per input text; ``None`` where embedding failed.
+        failed_indices: Sorted positions of the texts that failed.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        vectors: list[list[float] | None],
+        failed_indices: list[int],
+    ) -> None:
+        super().__init__(message)
+        self.vectors = vectors
+        self.failed_indices = failed_indices
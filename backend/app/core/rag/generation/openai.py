@@ -1,4 +1,4 @@
-"""OpenAI answer generator — wraps langchain-openai ChatOpenAI."""
+"""OpenAI answer generator — a langchain-openai ChatOpenAI behind the LLM gateway."""
 
 from __future__ import annotations
 
@@ -6,11 +6,13 @@ import asyncio
 import json
 from collections.abc import AsyncIterator
 
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 
 from app.core.config import get_settings
-from app.core.rag.retrieval.base import SearchResult, build_retrieval_context
+from app.core.tools.llm import Priority, get_chat_model, invoke_chat, stream_chat
+from app.core.rag.chunking import count_tokens
+from app.core.rag.context import PromptUsage, assemble_context, fit_history, record_api_usage
+from app.core.rag.retrieval.base import SearchResult
 from app.core.rag.generation.base import Citation, AnswerResult
 from app.core.logger import setup_logger
 
@@ -74,7 +76,8 @@ class OpenAIGenerator:
     """Generates grounded answers using OpenAI ChatGPT.
 
     Uses JSON-mode structured output to ensure consistent response
-    format. Wraps ``langchain_openai.ChatOpenAI``.
+    format. Wraps the gateway's shared ``ChatOpenAI`` (interactive
+    priority).
 
     Args:
         model: OpenAI model name (e.g. ``'gpt-4o-mini'``).
@@ -83,11 +86,8 @@ class OpenAIGenerator:
     """
 
     def __init__(self, model: str, temperature: float, api_key: str) -> None:
-        self._llm = ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            api_key=api_key,
-            model_kwargs={"response_format": {"type": "json_object"}},
+        self._llm = get_chat_model(
+            model, temperature=temperature, json_mode=True, api_key=api_key,
         )
         logger.info(f"Initialised generator: model={model}")
 
@@ -113,17 +113,20 @@ class OpenAIGenerator:
         if not results:
             return _INSUFFICIENT
 
-        context = build_retrieval_context(results)
-        user_message = _build_user_message(query, context, history)
+        user_message = _build_user_message(query, results, history)
 
         try:
-            response = await asyncio.wait_for(
-                self._llm.ainvoke([
+            response = await invoke_chat(
+                self._llm,
+                [
                     SystemMessage(content=_SYSTEM_PROMPT),
                     HumanMessage(content=user_message),
-                ]),
+                ],
+                purpose="generation",
+                priority=Priority.INTERACTIVE,
                 timeout=SETTINGS.API_TIMEOUT_S,
             )
+            record_api_usage(response)
             return parse_response(response.content)
         except asyncio.TimeoutError:
             logger.error("Generation timed out")
@@ -150,14 +153,18 @@ class OpenAIGenerator:
             yield json.dumps(_INSUFFICIENT.model_dump())
             return
 
-        context = build_retrieval_context(results)
-        user_message = _build_user_message(query, context, history)
+        user_message = _build_user_message(query, results, history)
 
         try:
-            async for chunk in self._llm.astream([
-                SystemMessage(content=_SYSTEM_PROMPT),
-                HumanMessage(content=user_message),
-            ]):
+            async for chunk in stream_chat(
+                self._llm,
+                [
+                    SystemMessage(content=_SYSTEM_PROMPT),
+                    HumanMessage(content=user_message),
+                ],
+                purpose="generation",
+                priority=Priority.INTERACTIVE,
+            ):
                 if chunk.content:
                     yield chunk.content
         except Exception as e:
@@ -200,29 +207,43 @@ def parse_response(raw: str) -> AnswerResult:
 
 def _build_user_message(
     query: str,
-    context: str,
+    results: list[SearchResult],
     history: list[dict[str, str]] | None = None,
 ) -> str:
-    """Build the user message, optionally including conversation history.
+    """Build the user message within ``RAG_PROMPT_MAX_TOKENS``.
 
     When history is present, uses a template that includes the
-    conversation context so the LLM can maintain continuity.
+    conversation context so the LLM can maintain continuity. History
+    comes before the retrieved context so consecutive turns of a
+    conversation share a prompt prefix; the context gets whatever
+    budget the system prompt, history and question leave.
     """
-    if history:
-        lines: list[str] = []
-        for msg in history[-SETTINGS.QUERY_HISTORY_MAX_TURNS * 2:]:
-            role = msg.get("role", "user").capitalize()
-            content = msg.get("content", "").strip()
-            if content:
-                # Truncate long assistant messages to save tokens
-                if role == "Assistant" and len(content) > 500:
-                    content = content[:500] + "..."
-                lines.append(f"{role}: {content}")
-        history_text = "\n".join(lines)
-        if history_text.strip():
-            return _USER_TEMPLATE_WITH_HISTORY.format(
-                history=history_text,
-                context=context,
-                query=query,
-            )
+    usage = PromptUsage()
+    usage.add("system", count_tokens(_SYSTEM_PROMPT))
+    usage.add("question", count_tokens(query))
+
+    turns = fit_history(
+        history,
+        max_tokens=SETTINGS.PROMPT_HISTORY_MAX_TOKENS,
+        max_message_tokens=SETTINGS.PROMPT_HISTORY_MESSAGE_MAX_TOKENS,
+        max_turns=SETTINGS.QUERY_HISTORY_MAX_TURNS,
+        usage=usage,
+    )
+    history_text = "\n".join(f"{m['role'].capitalize()}: {m['content']}" for m in turns)
+    template = _USER_TEMPLATE_WITH_HISTORY if history_text else _USER_TEMPLATE
+    usage.add("template", count_tokens(template))
+
+    context = assemble_context(
+        results,
+        max_tokens=SETTINGS.RAG_PROMPT_MAX_TOKENS - usage.total,
+        usage=usage,
+    )
+    usage.record("generation")
+
+    if history_text:
+        return _USER_TEMPLATE_WITH_HISTORY.format(
+            history=history_text,
+            context=context,
+            query=query,
+        )
     return _USER_TEMPLATE.format(context=context, query=query)
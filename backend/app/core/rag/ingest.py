@@ -14,11 +14,18 @@ Supports two modes:
   - **Batch-optimised:** ``prepare_document()`` + ``batch_embed_and_store()``
     — parse+chunk up-front for N documents, then embed ALL chunks across
     all documents in a single OpenAI API call and bulk-insert. Used by
-    the batching ingestion worker for ~5-10× throughput.
+    the batching ingestion worker for ~5-10× throughput. The embed and
+    store halves are also exposed separately (``embed_prepared_docs()``,
+    ``store_prepared_docs()``) for the pipelined worker.
 
 Key design decisions:
   - Parsing runs in a thread pool (CPU-bound pdfplumber).
-  - All chunks for a document are bulk-inserted in one flush.
+  - Chunking streams from a worker thread; each window of
+    ``RAG_STREAM_EMBED_WINDOW`` chunks is embedded while the next window
+    is still being chunked.
+  - All chunks for a document are bulk-inserted in one flush; the batch
+    path writes every document's chunks with one binary ``COPY`` and
+    applies status/metadata updates with set-based statements.
   - Embeddings use the shared embedder instance (connection reuse).
   - On failure, the document is marked 'failed' and the error is recorded.
   - A pre-flight deletion check prevents wasted work if the document
@@ -28,6 +35,8 @@ Key design decisions:
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Iterator
+from itertools import islice
 from uuid import UUID
 from dataclasses import dataclass, field
 
@@ -36,16 +45,26 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import Document, Chunk
 from app.db.models.utils import touch_vault_updated_at
+from app.core.config import get_settings
 from app.core.utils import utcnow
 from app.core.rag.parsing import get_parser
+from app.core.rag.parsing.artifact import load_or_parse
+from app.core.storage.base import FileStore
 from app.core.rag.chunking import get_chunker
 from app.core.rag.chunking.base import ChunkData
 from app.core.rag.embedding.base import Embedder
-from app.core.rag.exceptions import IngestionError
-from app.core.rag.metadata import extract_document_metadata, build_metadata_chunk, DocumentMetadata
+from app.core.rag.embedding.doc_cache import EmbeddingCacheStats, embed_documents_cached
+from app.core.rag.exceptions import IngestionError, PartialEmbeddingError
+from app.core.rag.vault_version import bump_vault_versions
+from app.core.rag.metadata import (
+    extract_document_metadata, build_metadata_chunk, extract_identifier_tokens, DocumentMetadata,
+)
+from app.core.rag.persistence import ChunkBatch, set_document_statuses, write_chunk_batch
+from app.core.rag.rollup import apply_rollup_deltas, rollup_delta
 from app.core.logger import setup_logger
 
 logger = setup_logger(__name__)
+SETTINGS = get_settings()
 
 
 # ---------------------------------------------------------------------------
@@ -64,6 +83,9 @@ class PreparedDoc:
         markdown: Parsed markdown content (for metadata extraction).
         metadata: Extracted metadata (populated during prepare phase).
         meta_chunk_index: Index of the metadata chunk in ``chunks``, or -1.
+        embeddings: Vectors for the leading ``len(embeddings)`` chunks when
+            they were embedded while chunking; the rest are embedded by
+            ``batch_embed_and_store()``.
     """
     doc_id: UUID
     vault_id: UUID
@@ -72,6 +94,7 @@ class PreparedDoc:
     markdown: str = ""
     metadata: DocumentMetadata | None = None
     meta_chunk_index: int = -1
+    embeddings: list[list[float]] = field(default_factory=list)
 
 
 # ---------------------------------------------------------------------------
@@ -80,12 +103,13 @@ class PreparedDoc:
 
 async def ingest_document(
     doc_id: UUID,
-    file_content: bytes,
+    file_content: bytes | None,
     filename: str,
     file_type: str,
     vault_id: UUID,
     db: AsyncSession,
     embedder: Embedder,
+    file_store: FileStore | None = None,
 ) -> int:
     """Run the full ingestion pipeline for one document.
 
@@ -98,6 +122,9 @@ async def ingest_document(
         db: Async database session (caller manages the transaction boundary
             for the sync-fallback path; the worker path commits here).
         embedder: Shared embedder instance (satisfies Embedder protocol).
+        file_store: If given, parsed markdown is served from / saved to the
+            document's parsed artifact. ``file_content`` may then be None
+            and is read from the store only when parsing is needed.
 
     Returns:
         int: Number of chunks created.
@@ -110,43 +137,53 @@ async def ingest_document(
         # Mark document as ingesting
         await _set_status(db, doc_id, "ingesting")
 
-        # 1. Parse
-        parser = get_parser(file_type)
-        markdown = await parser.parse(file_content, filename)
-
-        # 2. Chunk
-        chunker = get_chunker()
-        chunk_data = chunker.chunk(markdown, filename)
-
-        if not chunk_data:
-            await _set_status(db, doc_id, "failed", error_message="No text content could be extracted")
-            raise IngestionError("No text content could be extracted")
+        # 1. Parse (or load the cached parsed artifact)
+        markdown = await _parse_markdown(db, doc_id, file_content, filename, file_type, file_store)
 
-        # 3. Pre-flight check — abort if document was deleted while queued
+        # 2. Pre-flight check — abort if document was deleted while queued
         doc = await _get_doc(db, doc_id)
         if doc.deleted_at is not None or doc.status in ("pending_delete", "deleted"):
             logger.info(f"Document {doc_id} was deleted during ingestion — aborting")
             return 0
 
-        # 4. Extract structured metadata (async — LLM + regex)
-        meta = await extract_document_metadata(filename, markdown)
+        # 3. Extract structured metadata (LLM + regex) while chunking and
+        #    embedding stream through, reusing cached vectors for chunk
+        #    text seen before
+        meta_task = asyncio.create_task(extract_document_metadata(filename, markdown))
+        try:
+            chunk_data, embeddings, cache_stats = await _chunk_and_embed(
+                markdown, filename, db, embedder,
+            )
+        except BaseException:
+            meta_task.cancel()
+            raise
 
-        # 5. Build metadata chunk (HyDE summary + keywords + questions)
+        if not chunk_data:
+            meta_task.cancel()
+            await _set_status(db, doc_id, "failed", error_message="No text content could be extracted")
+            raise IngestionError("No text content could be extracted")
+
+        meta = await meta_task
+
+        # 4. Build and embed the metadata chunk (HyDE summary + keywords + questions)
         meta_chunk = build_metadata_chunk(meta, filename, chunk_index=len(chunk_data))
         if meta_chunk:
+            meta_embeddings, meta_stats = await embed_documents_cached(
+                [meta_chunk.content_with_header], [meta_chunk.token_count], db, embedder,
+            )
             chunk_data.append(meta_chunk)
+            embeddings.extend(meta_embeddings)
+            cache_stats.merge(meta_stats)
 
-        # 6. Embed — batch all chunks (including metadata chunk) in one API call
-        texts = [cd.content_with_header for cd in chunk_data]
-        embeddings = await embedder.embed_documents(texts)
-
-        # 6a. Post-embed deletion check — abort if deleted during embedding
-        doc = await _get_doc(db, doc_id)
+        # 5. Post-embed deletion check — abort if deleted during embedding.
+        #    The row stays locked until commit, so a concurrent delete
+        #    waits and then sees the document as active.
+        doc = await _get_doc(db, doc_id, for_update=True)
         if doc.deleted_at is not None or doc.status in ("pending_delete", "deleted"):
             logger.info(f"Document {doc_id} was deleted during embedding — aborting")
             return 0
 
-        # 7. Bulk insert chunks
+        # 6. Bulk insert chunks
         chunk_records = [
             Chunk(
                 doc_id=doc_id,
@@ -158,6 +195,7 @@ async def ingest_document(
                 chunk_index=cd.chunk_index,
                 chunk_type="metadata" if cd is meta_chunk else "child",
                 embedding=emb,
+                entity_tokens=extract_identifier_tokens(cd.content_with_header),
                 chunk_version=1,
             )
             for cd, emb in zip(chunk_data, embeddings)
@@ -165,7 +203,7 @@ async def ingest_document(
         db.add_all(chunk_records)
         await db.flush()
 
-        # 8. Update document with extracted metadata
+        # 7. Update document with extracted metadata
         doc = await _get_doc(db, doc_id)
         doc.status = "active"
         doc.error_message = None
@@ -180,13 +218,18 @@ async def ingest_document(
         doc.hypothetical_questions = meta.hypothetical_questions or None
         doc.extracted_entities = meta.entities or None
         db.add(doc)
+        await apply_rollup_deltas(db, [rollup_delta(vault_id, doc)])
 
-        # 7. Touch vault so "Latest Activity" reflects ingestion completion
+        # 8. Touch vault so "Latest Activity" reflects ingestion completion
         await touch_vault_updated_at(db, vault_id)
 
         await db.commit()
+        await bump_vault_versions([vault_id])
 
-        logger.info(f"Ingestion complete for {doc_id}: {len(chunk_records)} chunks")
+        logger.info(
+            f"Ingestion complete for {doc_id}: {len(chunk_records)} chunks "
+            f"({cache_stats.summary()})"
+        )
         return len(chunk_records)
 
     except IngestionError:
@@ -205,11 +248,13 @@ async def ingest_document(
 
 async def prepare_document(
     doc_id: UUID,
-    file_content: bytes,
+    file_content: bytes | None,
     filename: str,
     file_type: str,
     vault_id: UUID,
     db: AsyncSession,
+    file_store: FileStore | None = None,
+    embedder: Embedder | None = None,
 ) -> PreparedDoc | None:
     """Parse and chunk a document without embedding.
 
@@ -224,6 +269,11 @@ async def prepare_document(
         file_type: File extension.
         vault_id: Owning vault UUID.
         db: Async database session.
+        file_store: If given, parse via the document's parsed artifact
+            (see ``ingest_document``).
+        embedder: If given, chunks are embedded window by window while the
+            rest of the document is still being chunked, and the vectors
+            are carried in ``PreparedDoc.embeddings``.
 
     Returns:
         PreparedDoc with parsed chunks, or None if skipped (deleted, empty).
@@ -231,17 +281,8 @@ async def prepare_document(
     try:
         await _set_status(db, doc_id, "ingesting")
 
-        # Parse
-        parser = get_parser(file_type)
-        markdown = await parser.parse(file_content, filename)
-
-        # Chunk
-        chunker = get_chunker()
-        chunk_data = chunker.chunk(markdown, filename)
-
-        if not chunk_data:
-            await _set_status(db, doc_id, "failed", error_message="No text content could be extracted")
-            return None
+        # Parse (or load the cached parsed artifact)
+        markdown = await _parse_markdown(db, doc_id, file_content, filename, file_type, file_store)
 
         # Pre-flight deletion check
         doc = await _get_doc(db, doc_id)
@@ -249,12 +290,27 @@ async def prepare_document(
             logger.info(f"Document {doc_id} was deleted during ingestion — aborting")
             return None
 
+        # Chunk (and embed as chunks stream out, if an embedder was given)
+        embeddings: list[list[float]] = []
+        if embedder is None:
+            chunk_data = get_chunker().chunk(markdown, filename)
+        else:
+            chunk_data, embeddings, cache_stats = await _chunk_and_embed(
+                markdown, filename, db, embedder,
+            )
+            logger.info(f"Prepared {doc_id}: {cache_stats.summary()}")
+
+        if not chunk_data:
+            await _set_status(db, doc_id, "failed", error_message="No text content could be extracted")
+            return None
+
         return PreparedDoc(
             doc_id=doc_id,
             vault_id=vault_id,
             chunks=chunk_data,
             filename=filename,
             markdown=markdown,
+            embeddings=embeddings,
         )
 
     except Exception as e:
@@ -328,9 +384,8 @@ async def batch_embed_and_store(
 ) -> dict[UUID, int]:
     """Embed and store chunks for multiple documents in one API call.
 
-    Collects all chunk texts across all prepared documents, calls the
-    embedder once, then bulk-inserts all Chunk records and marks each
-    document as active.
+    Runs ``embed_prepared_docs()`` then ``store_prepared_docs()`` on the
+    same session.
 
     Args:
         prepared: List of PreparedDoc from ``prepare_document()``.
@@ -343,118 +398,161 @@ async def batch_embed_and_store(
     if not prepared:
         return {}
 
-    # Flatten all texts and track ownership
+    failed_doc_ids = await embed_prepared_docs(prepared, db, embedder)
+    if len(failed_doc_ids) == len(prepared):
+        await db.commit()
+        return {}
+
+    return await store_prepared_docs(
+        [pdoc for pdoc in prepared if pdoc.doc_id not in failed_doc_ids], db,
+    )
+
+
+async def embed_prepared_docs(
+    prepared: list[PreparedDoc],
+    db: AsyncSession,
+    embedder: Embedder,
+) -> set[UUID]:
+    """Fill ``PreparedDoc.embeddings`` for every chunk, in one API call.
+
+    Collects all chunk texts across all prepared documents that were not
+    already embedded during ``prepare_document()`` and calls the embedder
+    once (it packs and parallelises requests and retries failed ones).
+    Documents owning any text that still failed are marked 'failed'
+    (not committed); the rest keep their vectors.
+
+    Args:
+        prepared: List of PreparedDoc from ``prepare_document()``.
+        db: Async database session (embedding-cache lookups and writes).
+        embedder: Shared embedder instance.
+
+    Returns:
+        set: IDs of documents whose embedding failed.
+    """
+    # Flatten all texts still to embed and track ownership
     all_texts: list[str] = []
+    all_tokens: list[int] = []
     doc_offsets: list[tuple[PreparedDoc, int, int]] = []  # (prepared, start, end)
 
     for pdoc in prepared:
+        pending = pdoc.chunks[len(pdoc.embeddings):]
         start = len(all_texts)
-        all_texts.extend(cd.content_with_header for cd in pdoc.chunks)
+        all_texts.extend(cd.content_with_header for cd in pending)
+        all_tokens.extend(cd.token_count for cd in pending)
         end = len(all_texts)
         doc_offsets.append((pdoc, start, end))
 
-    total_chunks = len(all_texts)
-    logger.info(f"Batch embedding {total_chunks} chunks across {len(prepared)} documents")
+    total_chunks = sum(len(pdoc.chunks) for pdoc in prepared)
+    logger.info(
+        f"Batch embedding {len(all_texts)}/{total_chunks} chunks across "
+        f"{len(prepared)} documents"
+    )
 
-    # Embed — batch first, per-document fallback on failure
-    all_embeddings: list = []
+    # Embed — one call; the embedder retries failed sub-batches itself,
+    # so a failure only fails the documents owning the failed texts
     failed_doc_ids: set[UUID] = set()
+    cache_stats = EmbeddingCacheStats()
+    errors: dict[UUID, str] = {}
 
     try:
-        all_embeddings = await embedder.embed_documents(all_texts)
-    except Exception as batch_err:
-        logger.warning(
-            "Batch embedding failed (%s), falling back to per-document embedding",
-            batch_err,
+        all_embeddings, cache_stats = await embed_documents_cached(
+            all_texts, all_tokens, db, embedder,
         )
-        all_embeddings = [None] * len(all_texts)
+    except PartialEmbeddingError as e:
+        all_embeddings = e.vectors
+        failed_positions = set(e.failed_indices)
         for pdoc, start, end in doc_offsets:
-            doc_texts = all_texts[start:end]
-            try:
-                doc_embeddings = await embedder.embed_documents(doc_texts)
-                all_embeddings[start:end] = doc_embeddings
-            except Exception as doc_err:
-                logger.error("Per-document embedding failed for %s: %s", pdoc.doc_id, doc_err)
-                failed_doc_ids.add(pdoc.doc_id)
-                try:
-                    await _set_status(
-                        db, pdoc.doc_id, "failed",
-                        error_message=f"Embedding failed: {doc_err}"[:500],
-                    )
-                except Exception:
-                    pass
-
-        if len(failed_doc_ids) == len(prepared):
-            await db.commit()
-            return {}
+            if any(i in failed_positions for i in range(start, end)):
+                errors[pdoc.doc_id] = str(e)
+    except Exception as e:
+        logger.error(f"Batch embedding failed for {len(prepared)} documents: {e}")
+        all_embeddings = []
+        errors = {pdoc.doc_id: str(e) for pdoc in prepared}
 
-    # Build and store chunks per document (using savepoints for isolation)
-    results: dict[UUID, int] = {}
     for pdoc, start, end in doc_offsets:
-        if pdoc.doc_id in failed_doc_ids:
-            continue
+        if pdoc.doc_id in errors:
+            failed_doc_ids.add(pdoc.doc_id)
+        else:
+            pdoc.embeddings = pdoc.embeddings + all_embeddings[start:end]
 
+    if errors:
         try:
-            async with db.begin_nested():
-                # Pre-store deletion check — abort if deleted during embedding
-                doc = await _get_doc(db, pdoc.doc_id)
-                if doc.deleted_at is not None or doc.status in ("pending_delete", "deleted"):
-                    logger.info(f"Document {pdoc.doc_id} was deleted during embedding — skipping")
-                    continue
-
-                doc_embeddings = all_embeddings[start:end]
-                chunk_records = [
-                    Chunk(
-                        doc_id=pdoc.doc_id,
-                        vault_id=pdoc.vault_id,
-                        content=cd.content,
-                        content_with_header=cd.content_with_header,
-                        content_hash=cd.content_hash,
-                        token_count=cd.token_count,
-                        chunk_index=cd.chunk_index,
-                        chunk_type="metadata" if i == pdoc.meta_chunk_index else "child",
-                        embedding=emb,
-                        chunk_version=1,
-                    )
-                    for i, (cd, emb) in enumerate(zip(pdoc.chunks, doc_embeddings))
-                ]
-                db.add_all(chunk_records)
-                await db.flush()
-
-                # Update document with extracted metadata
-                meta = pdoc.metadata
-                doc.status = "active"
-                doc.error_message = None
-                doc.updated_at = utcnow()
-                if meta:
-                    doc.document_type = meta.document_type
-                    doc.entity_id = meta.entity_id
-                    doc.order_date = meta.order_date
-                    doc.customer_id = meta.customer_id
-                    doc.total_price = meta.total_price
-                    doc.summary = meta.summary
-                    doc.keywords = meta.keywords or None
-                    doc.hypothetical_questions = meta.hypothetical_questions or None
-                    doc.extracted_entities = meta.entities or None
-                db.add(doc)
-
-            results[pdoc.doc_id] = len(chunk_records)
+            await set_document_statuses(
+                db,
+                {doc_id: f"Embedding failed: {msg}" for doc_id, msg in errors.items()},
+                "failed",
+            )
+        except Exception:
+            pass
 
-        except Exception as e:
-            logger.error(f"Store failed for {pdoc.doc_id}: {e}")
-            # Savepoint rollback is automatic — only this doc's changes are undone
+    if failed_doc_ids:
+        logger.warning(
+            f"Embedding failed for {len(failed_doc_ids)}/{len(prepared)} documents"
+        )
+    logger.info(f"Batch embedding done: {cache_stats.summary()}")
+    return failed_doc_ids
+
+
+async def store_prepared_docs(
+    prepared: list[PreparedDoc],
+    db: AsyncSession,
+) -> dict[UUID, int]:
+    """Bulk-write chunks for fully embedded documents and mark them active.
+
+    The whole batch is written with ``COPY`` and set-based updates (see
+    ``app.core.rag.persistence``) in one savepoint. If that fails, each
+    document is retried in its own savepoint, so one bad document does
+    not undo the others. Commits once at the end.
+
+    Args:
+        prepared: Documents whose ``embeddings`` cover every chunk.
+        db: Async database session.
+
+    Returns:
+        dict mapping doc_id → chunk count for successfully stored documents.
+    """
+    if not prepared:
+        return {}
+
+    batches = [
+        ChunkBatch(
+            doc_id=pdoc.doc_id,
+            vault_id=pdoc.vault_id,
+            chunks=pdoc.chunks,
+            embeddings=pdoc.embeddings,
+            meta_chunk_index=pdoc.meta_chunk_index,
+            metadata=pdoc.metadata,
+        )
+        for pdoc in prepared
+    ]
+
+    results: dict[UUID, int] = {}
+    errors: dict[UUID, str] = {}
+    try:
+        async with db.begin_nested():
+            results = await write_chunk_batch(db, batches)
+    except Exception as e:
+        logger.warning(f"Bulk store failed for {len(batches)} documents, retrying one by one: {e}")
+        for batch in batches:
             try:
-                await _set_status(db, pdoc.doc_id, "failed", error_message=str(e)[:500])
-            except Exception:
-                pass
+                async with db.begin_nested():
+                    results.update(await write_chunk_batch(db, [batch]))
+            except Exception as doc_error:
+                logger.error(f"Store failed for {batch.doc_id}: {doc_error}")
+                errors[batch.doc_id] = str(doc_error)
 
-    # Touch vault timestamps for all vaults that had successful ingestions
-    updated_vault_ids = {pdoc.vault_id for pdoc, _, _ in doc_offsets if pdoc.doc_id in results}
-    for vid in updated_vault_ids:
-        await touch_vault_updated_at(db, vid)
+    if errors:
+        try:
+            await set_document_statuses(db, errors, "failed")
+        except Exception as e:
+            logger.error(f"Could not mark {len(errors)} documents failed: {e}")
 
     await db.commit()
-    logger.info(f"Batch complete: {len(results)}/{len(prepared)} documents stored, {total_chunks} chunks")
+    await bump_vault_versions({pdoc.vault_id for pdoc in prepared if pdoc.doc_id in results})
+    logger.info(
+        f"Batch complete: {len(results)}/{len(prepared)} documents stored, "
+        f"{sum(results.values())} chunks"
+    )
     return results
 
 
@@ -463,15 +561,99 @@ async def batch_embed_and_store(
 # ---------------------------------------------------------------------------
 
 
-async def _get_doc(db: AsyncSession, doc_id: UUID) -> Document:
-    """Fetch a Document by ID. Raises if not found."""
-    result = await db.execute(select(Document).where(Document.id == doc_id))
+async def _get_doc(db: AsyncSession, doc_id: UUID, *, for_update: bool = False) -> Document:
+    """Fetch a Document by ID (optionally locking its row). Raises if not found."""
+    stmt = select(Document).where(Document.id == doc_id)
+    if for_update:
+        # Refresh the identity-mapped object too: the lock is only useful
+        # if the check after it sees the committed status
+        stmt = stmt.with_for_update().execution_options(populate_existing=True)
+    result = await db.execute(stmt)
     doc = result.scalars().one_or_none()
     if doc is None:
         raise IngestionError(f"Document {doc_id} not found in database")
     return doc
 
 
+async def _chunk_and_embed(
+    markdown: str,
+    filename: str,
+    db: AsyncSession,
+    embedder: Embedder,
+) -> tuple[list[ChunkData], list[list[float]], EmbeddingCacheStats]:
+    """Chunk in a worker thread, embedding each window as soon as it is ready.
+
+    The next window is chunked while the current one is embedded, so
+    for large documents the embedding round trips overlap with
+    tokenisation instead of following it. Only one embedding call is in
+    flight at a time (it shares ``db`` for the cache lookup).
+
+    Returns:
+        tuple: Chunks, one vector per chunk, and the cache savings.
+    """
+    chunks_iter = get_chunker().iter_chunks(markdown, filename)
+    window_size = max(SETTINGS.RAG_STREAM_EMBED_WINDOW, 1)
+
+    chunks: list[ChunkData] = []
+    vectors: list[list[float]] = []
+    stats = EmbeddingCacheStats()
+
+    next_window = asyncio.ensure_future(asyncio.to_thread(_take, chunks_iter, window_size))
+    try:
+        while window := await next_window:
+            next_window = asyncio.ensure_future(asyncio.to_thread(_take, chunks_iter, window_size))
+            window_vectors, window_stats = await embed_documents_cached(
+                [cd.content_with_header for cd in window],
+                [cd.token_count for cd in window],
+                db, embedder,
+            )
+            chunks.extend(window)
+            vectors.extend(window_vectors)
+            stats.merge(window_stats)
+    finally:
+        next_window.cancel()
+
+    return chunks, vectors, stats
+
+
+def _take(iterator: Iterator[ChunkData], n: int) -> list[ChunkData]:
+    """Pull up to ``n`` items from ``iterator`` (runs in a worker thread)."""
+    return list(islice(iterator, n))
+
+
+async def _parse_markdown(
+    db: AsyncSession,
+    doc_id: UUID,
+    file_content: bytes | None,
+    filename: str,
+    file_type: str,
+    file_store: FileStore | None,
+) -> str:
+    """Parse a document, reusing its parsed artifact when a store is given.
+
+    Records a newly written artifact in ``Document.parsed_ir_path``.
+    """
+    if file_store is None:
+        parser = get_parser(file_type)
+        return await parser.parse(file_content, filename)
+
+    doc = await _get_doc(db, doc_id)
+    markdown, ir_path = await load_or_parse(
+        file_store,
+        storage_path=doc.storage_path,
+        file_hash=doc.file_hash_sha256,
+        file_type=file_type,
+        filename=filename,
+        parsed_ir_path=doc.parsed_ir_path,
+        file_content=file_content,
+    )
+    if ir_path and ir_path != doc.parsed_ir_path:
+        doc.parsed_ir_path = ir_path
+        db.add(doc)
+        await db.flush()
+    return markdown
+
+
 async def _set_status(
     db: AsyncSession,
     doc_id: UUID,
@@ -40,6 +40,7 @@ from datetime import date
 
 from app.core.config import get_settings
 from app.core.logger import setup_logger
+from app.core.utils import normalize_numbers
 
 logger = setup_logger(__name__)
 
@@ -100,6 +101,23 @@ _STOCK_DATE_PATTERN = re.compile(
     r"StockReport[_\s-]*(\d{4}-\d{2})", re.IGNORECASE,
 )
 
+# Identifier tokens — indexed per chunk (``chunks.entity_tokens``) so
+# entity lookups are a GIN index probe instead of an ILIKE scan.
+# REFERENCE_NUMBER_PATTERN is shared with the transcript buffer.
+REFERENCE_NUMBER_PATTERN = re.compile(
+    r"(?:invoice|order|po|purchase\s*order|contract|ticket|case|"
+    r"serial|batch|lot|ref|shipment|delivery|receipt)"
+    r"\s*(?:number|#|id|no\.?)?\s*:?\s*([A-Z]*-?\d{3,})",
+    re.IGNORECASE,
+)
+# Digit runs of 4+ not inside a longer run — also inside ``invoice_10248``
+# or ``2016-07-04``, where ``\b`` would not split
+_NUMERIC_TOKEN_PATTERN = re.compile(r"(?<!\d)\d{4,}(?!\d)")
+# Words that may be codes; kept when all-caps (customer ``VINET``) or
+# mixing letters and digits (``SKU12A``)
+_CODE_TOKEN_PATTERN = re.compile(r"(?<![A-Za-z0-9])[A-Za-z0-9][A-Za-z0-9-]+[A-Za-z0-9](?![A-Za-z0-9])")
+_REFERENCE_PREFIX_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ-"
+
 
 # ---------------------------------------------------------------------------
 # LLM extraction prompt
@@ -285,6 +303,42 @@ def build_metadata_chunk(
     )
 
 
+def extract_identifier_tokens(text: str) -> list[str]:
+    """Identifier tokens in a chunk, as stored in ``chunks.entity_tokens``.
+
+    Named references (``PO-5021``, ``invoice 521``), every 4+ digit
+    run and code-like words (all-caps like ``VINET``, or mixing letters
+    and digits like ``SKU12A``), upper-cased, with thousand separators
+    collapsed. A prefixed reference also contributes its digits, so
+    ``INV-10248`` is found by a lookup for ``10248``.
+
+    Returns:
+        list[str]: Sorted unique tokens.
+    """
+    text = normalize_numbers(text)
+    tokens: set[str] = set()
+    for match in REFERENCE_NUMBER_PATTERN.finditer(text):
+        # The keyword may swallow a prefix ("PO-5021" captures "-5021")
+        ref = match.group(1).upper().lstrip("-")
+        tokens.add(ref)
+        tokens.add(ref.lstrip(_REFERENCE_PREFIX_CHARS))
+    tokens.update(m.group(0) for m in _NUMERIC_TOKEN_PATTERN.finditer(text))
+    for match in _CODE_TOKEN_PATTERN.finditer(text):
+        word = match.group(0)
+        if word.isupper() or (
+            any(c.isalpha() for c in word) and any(c.isdigit() for c in word)
+        ):
+            tokens.add(word.upper())
+    return sorted(tokens)
+
+
+def identifier_lookup_tokens(entity_id: str) -> list[str]:
+    """Tokens to match against ``chunks.entity_tokens`` for one query ID."""
+    token = normalize_numbers(entity_id).strip().upper().lstrip("-")
+    digits = token.lstrip(_REFERENCE_PREFIX_CHARS)
+    return [token] if digits in ("", token) else [token, digits]
+
+
 # ---------------------------------------------------------------------------
 # Regex extraction (zero-cost, always runs)
 # ---------------------------------------------------------------------------
@@ -369,17 +423,13 @@ async def _extract_llm(
 
     Truncates content to MAX_CONTENT_CHARS to control cost/latency.
     Uses structured JSON output — parses the response with graceful
-    degradation on malformed output.
+    degradation on malformed output. Runs at bulk priority in the
+    shared LLM gateway, behind live verification and chat.
     """
-    from langchain_openai import ChatOpenAI
+    from app.core.tools.llm import Priority, get_chat_model, invoke_chat
 
     model_name = cfg.MODEL or SETTINGS.OPENAI_QUERY_MODEL
-    llm = ChatOpenAI(
-        model=model_name,
-        temperature=cfg.TEMPERATURE,
-        api_key=SETTINGS.OPENAI_API_KEY,
-        max_retries=cfg.MAX_RETRIES,
-    )
+    llm = get_chat_model(model_name, temperature=cfg.TEMPERATURE)
 
     # Truncate content to control cost
     truncated = content[: cfg.MAX_CONTENT_CHARS]
@@ -394,7 +444,13 @@ async def _extract_llm(
         questions_count=cfg.HYPOTHETICAL_QUESTIONS_COUNT,
     )
 
-    response = await llm.ainvoke(prompt)
+    response = await invoke_chat(
+        llm, prompt,
+        purpose="metadata",
+        priority=Priority.BULK,
+        timeout=SETTINGS.API_TIMEOUT_S,
+        max_retries=cfg.MAX_RETRIES,
+    )
     raw = response.content if hasattr(response, "content") else str(response)
 
     return _parse_llm_response(raw)
@@ -0,0 +1,159 @@
+"""Parsed-markdown artifacts — parse once, serve many times.
+
+Ingestion writes the parser output, gzip-compressed, next to the raw
+upload in the file store and records its path in
+``Document.parsed_ir_path``. The content endpoint, the parse preview and
+ingestion retries read the artifact instead of re-running pdfplumber.
+
+The artifact path embeds the file's sha256 and ``ARTIFACT_VERSION``, so
+an artifact is only trusted when ``parsed_ir_path`` equals the path
+expected for the document's current ``file_hash_sha256``. Bump
+``ARTIFACT_VERSION`` whenever parser output changes to invalidate every
+stored artifact.
+
+Usage::
+
+    from app.core.rag.parsing.artifact import load_or_parse
+
+    markdown, ir_path = await load_or_parse(
+        file_store, storage_path=doc.storage_path, file_hash=doc.file_hash_sha256,
+        file_type=doc.file_type, filename=doc.original_filename,
+        parsed_ir_path=doc.parsed_ir_path,
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import posixpath
+
+from app.core.rag.parsing import get_parser
+from app.core.storage.base import FileStore
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+ARTIFACT_VERSION = 1
+
+
+def artifact_path(storage_path: str, file_hash: str) -> str:
+    """Artifact location for a raw upload: same directory, hash + version in the name."""
+    return posixpath.join(
+        posixpath.dirname(storage_path),
+        f"parsed-{file_hash}-v{ARTIFACT_VERSION}.md.gz",
+    )
+
+
+async def artifact_available(
+    file_store: FileStore,
+    *,
+    storage_path: str,
+    file_hash: str,
+    parsed_ir_path: str | None,
+) -> bool:
+    """True if ``parsed_ir_path`` is current for ``file_hash`` and exists."""
+    expected = artifact_path(storage_path, file_hash)
+    if parsed_ir_path != expected:
+        return False
+    try:
+        return await file_store.exists(expected)
+    except Exception:
+        return False
+
+
+async def read_artifact(
+    file_store: FileStore,
+    *,
+    storage_path: str,
+    file_hash: str,
+    parsed_ir_path: str | None,
+) -> str | None:
+    """Return cached markdown if a valid artifact exists, else None.
+
+    Args:
+        file_store: Store holding the upload and its artifact.
+        storage_path: Raw upload path (``Document.storage_path``).
+        file_hash: Current ``Document.file_hash_sha256``.
+        parsed_ir_path: Recorded ``Document.parsed_ir_path``.
+
+    Returns:
+        str or None: Markdown, or None when missing, stale or unreadable.
+    """
+    expected = artifact_path(storage_path, file_hash)
+    if parsed_ir_path != expected:
+        return None
+    try:
+        compressed = await file_store.get(expected)
+        return (await asyncio.to_thread(gzip.decompress, compressed)).decode("utf-8")
+    except Exception as e:
+        logger.warning(f"Parsed artifact unreadable at {expected}: {e}")
+        return None
+
+
+async def write_artifact(
+    file_store: FileStore,
+    markdown: str,
+    *,
+    storage_path: str,
+    file_hash: str,
+) -> str | None:
+    """Compress and store markdown; return its path, or None on failure."""
+    path = artifact_path(storage_path, file_hash)
+    try:
+        compressed = await asyncio.to_thread(gzip.compress, markdown.encode("utf-8"), 6)
+        await file_store.save(path, compressed)
+        return path
+    except Exception as e:
+        logger.warning(f"Failed to write parsed artifact {path}: {e}")
+        return None
+
+
+async def load_or_parse(
+    file_store: FileStore,
+    *,
+    storage_path: str,
+    file_hash: str,
+    file_type: str,
+    filename: str,
+    parsed_ir_path: str | None,
+    file_content: bytes | None = None,
+) -> tuple[str, str | None]:
+    """Serve markdown from the artifact, or parse the upload and store one.
+
+    Args:
+        file_store: Store holding the upload and its artifact.
+        storage_path: Raw upload path (``Document.storage_path``).
+        file_hash: Current ``Document.file_hash_sha256``.
+        file_type: Lowercase file extension.
+        filename: Original filename (passed to the parser).
+        parsed_ir_path: Recorded ``Document.parsed_ir_path``.
+        file_content: Raw bytes if already in memory; read from the
+            store only when parsing is needed.
+
+    Returns:
+        tuple: ``(markdown, parsed_ir_path)``. The path is None if the
+            artifact could not be written (parsing still succeeded).
+
+    Raises:
+        FileNotFoundError: The artifact is stale and the raw file is gone.
+        ValueError: Unsupported file type.
+    """
+    markdown = await read_artifact(
+        file_store,
+        storage_path=storage_path,
+        file_hash=file_hash,
+        parsed_ir_path=parsed_ir_path,
+    )
+    if markdown is not None:
+        return markdown, parsed_ir_path
+
+    if file_content is None:
+        file_content = await file_store.get(storage_path)
+
+    parser = get_parser(file_type)
+    markdown = await parser.parse(file_content, filename)
+    path = await write_artifact(
+        file_store, markdown, storage_path=storage_path, file_hash=file_hash,
+    )
+    return markdown, path
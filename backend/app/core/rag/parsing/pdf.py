@@ -2,14 +2,23 @@
 
 Handles bordered tables, borderless tables, cross-page table merging,
 and text block classification (heading / key-value / footnote / body).
+
+Each page is scanned once (a single ``find_tables`` pass yields both the
+table rows and the bounding boxes that exclude table text from body
+blocks). Large PDFs are split into page ranges that are scanned in
+parallel across the process pool; cross-page table merging and markdown
+rendering run afterwards over the ordered page scans, so shard
+boundaries never split a merged table.
 """
 
 from __future__ import annotations
 
 import asyncio
 import io
+import math
 import re
 from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any
 
 import pdfplumber
@@ -53,11 +62,32 @@ _MIN_EDGES = 4
 _KV_RE = re.compile(r"^(.+?)\s*:\s+(.+)$")
 
 
+@dataclass
+class _PageTable:
+    """One table detected on a page (picklable — crosses the pool boundary)."""
+
+    rows: list[list[str]]
+    col_positions: list[float]
+    top: float
+
+
+@dataclass
+class _PageScan:
+    """Everything the merge/render stage needs from one page."""
+
+    page_number: int
+    bordered: bool
+    tables: list[_PageTable] = field(default_factory=list)
+    blocks: list[tuple[str, str, float]] = field(default_factory=list)
+
+
 class PdfParser:
     """Parses PDF files into markdown using pdfplumber.
 
     Runs CPU-bound parsing in a process pool to avoid blocking the
-    event loop and bypass the GIL for true parallelism.
+    event loop and bypass the GIL for true parallelism. PDFs with more
+    than ``PDF_SHARD_MIN_PAGES`` pages are scanned in page ranges on
+    several pool workers at once.
     """
 
     async def parse(self, file_content: bytes, filename: str) -> str:
@@ -66,14 +96,44 @@ class PdfParser:
         Raises:
             ValueError: If the PDF cannot be opened or has no content.
         """
+        settings = get_settings()
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            _get_pdf_pool(), _parse_pdf_sync, file_content, filename,
+        pool = _get_pdf_pool()
+
+        if settings.PDF_PARSE_WORKERS < 2:
+            return await loop.run_in_executor(pool, _parse_pdf_sync, file_content, filename)
+
+        page_count = await loop.run_in_executor(pool, _count_pages, file_content, filename)
+        ranges = _page_ranges(
+            page_count,
+            workers=settings.PDF_PARSE_WORKERS,
+            min_pages=settings.PDF_SHARD_MIN_PAGES,
         )
+        if len(ranges) == 1:
+            return await loop.run_in_executor(pool, _parse_pdf_sync, file_content, filename)
+
+        shards = await asyncio.gather(*(
+            loop.run_in_executor(pool, _scan_page_range, file_content, filename, start, end)
+            for start, end in ranges
+        ))
+        logger.info(f"Parsed {filename}: {page_count} pages in {len(ranges)} shards")
+        return _assemble([scan for shard in shards for scan in shard], filename)
+
+
+def _page_ranges(page_count: int, *, workers: int, min_pages: int) -> list[tuple[int, int]]:
+    """Split ``[0, page_count)`` into at most ``workers`` contiguous ranges.
+
+    PDFs with ``min_pages`` pages or fewer stay in one range — below that
+    the per-shard cost of re-opening the file outweighs the parallelism.
+    """
+    if page_count <= max(min_pages, 1) or workers < 2:
+        return [(0, page_count)]
+    size = math.ceil(page_count / workers)
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
 
 
 # ---------------------------------------------------------------------------
-# Synchronous entry point (process-pool worker)
+# Synchronous entry points (process-pool workers)
 # ---------------------------------------------------------------------------
 
 def _parse_pdf_sync(file_content: bytes, filename: str) -> str:
@@ -82,57 +142,67 @@ def _parse_pdf_sync(file_content: bytes, filename: str) -> str:
     Raises:
         ValueError: If the PDF cannot be opened or has no content.
     """
+    return _assemble(_scan_page_range(file_content, filename, 0, None), filename)
+
+
+def _count_pages(file_content: bytes, filename: str) -> int:
+    """Number of pages in the PDF (used to plan shards)."""
+    try:
+        with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+            return len(pdf.pages)
+    except Exception as e:
+        raise ValueError(f"Failed to parse PDF '{filename}': {e}") from e
+
+
+def _scan_page_range(
+    file_content: bytes, filename: str, start: int, end: int | None,
+) -> list[_PageScan]:
+    """Scan pages ``[start, end)`` — executed in a process pool worker.
+
+    Raises:
+        ValueError: If the PDF cannot be opened or scanned.
+    """
     try:
         pdf_file = io.BytesIO(file_content)
         with pdfplumber.open(pdf_file, unicode_norm="NFKC") as pdf:
-            pages = pdf.pages
-            tables = _extract_all_tables(pages)
+            return [_scan_page(p) for p in pdf.pages[start:end]]
+    except Exception as e:
+        raise ValueError(f"Failed to parse PDF '{filename}': {e}") from e
 
-            page_blocks: dict[int, list] = {}
-            for p in pages:
-                blocks = _extract_text_blocks(p)
-                if blocks:
-                    page_blocks[p.page_number] = blocks
 
-            page_tables: dict[int, list[tuple]] = {}
-            for hdr, rows, caption, pr in tables:
-                page_tables.setdefault(pr[0], []).append((hdr, rows, caption, pr))
+def _assemble(scans: list[_PageScan], filename: str) -> str:
+    """Merge cross-page tables and render page scans (in page order) to markdown.
 
-            table_y: dict[int, dict[int, float]] = {}
-            for p in pages:
-                settings = _BORDERED if _is_bordered(p) else _BORDERLESS
-                tbls = p.find_tables(table_settings=settings)
-                for i, t in enumerate(tbls):
-                    if t.bbox:
-                        table_y.setdefault(p.page_number, {})[i] = t.bbox[1]
+    Raises:
+        ValueError: If no content was extracted.
+    """
+    tables = _merge_tables(scans)
 
-        sections: list[str] = []
-        for pn in sorted(set(list(page_blocks) + list(page_tables))):
-            items: list[tuple[float, str]] = []
+    page_tables: dict[int, list[tuple]] = {}
+    for hdr, rows, caption, pr, top in tables:
+        page_tables.setdefault(pr[0], []).append((hdr, rows, caption, top))
 
-            for kind, text, y in page_blocks.get(pn, []):
-                items.append((y, _md_block(kind, text)))
+    sections: list[str] = []
+    for scan in scans:
+        items: list[tuple[float, str]] = []
 
-            for idx, (hdr, rows, caption, _) in enumerate(page_tables.get(pn, [])):
-                y = table_y.get(pn, {}).get(idx, 0.0)
-                items.append((y, _md_table(hdr, rows, caption)))
+        for kind, text, y in scan.blocks:
+            items.append((y, _md_block(kind, text)))
 
-            items.sort(key=lambda x: x[0])
-            page_md = "\n\n".join(s for _, s in items)
-            if page_md.strip():
-                sections.append(page_md)
+        for hdr, rows, caption, top in page_tables.get(scan.page_number, []):
+            items.append((top, _md_table(hdr, rows, caption)))
 
-        result = "\n\n".join(sections) + "\n"
+        items.sort(key=lambda x: x[0])
+        page_md = "\n\n".join(s for _, s in items)
+        if page_md.strip():
+            sections.append(page_md)
 
-        if not result.strip():
-            raise ValueError(f"No text content extracted from PDF: {filename}")
+    result = "\n\n".join(sections) + "\n"
 
-        return result
+    if not result.strip():
+        raise ValueError(f"No text content extracted from PDF: {filename}")
 
-    except ValueError:
-        raise
-    except Exception as e:
-        raise ValueError(f"Failed to parse PDF '{filename}': {e}") from e
+    return result
 
 
 # ---------------------------------------------------------------------------
@@ -270,23 +340,33 @@ def _strip_spillover(
 # Table extraction
 # ---------------------------------------------------------------------------
 
-def _extract_page_tables(page: Page) -> list[tuple[Any, list[list[str]]]]:
-    """Extract tables from a single page."""
-    settings = _BORDERED if _is_bordered(page) else _BORDERLESS
-    borderless = not _is_bordered(page)
-    results: list[tuple[Any, list[list[str]]]] = []
+def _scan_page(page: Page) -> _PageScan:
+    """Detect tables once and extract both table rows and non-table text."""
+    bordered = _is_bordered(page)
+    borderless = not bordered
+    settings = _BORDERED if bordered else _BORDERLESS
+
+    scan = _PageScan(page_number=page.page_number, bordered=bordered)
+    bboxes: list[tuple[float, float, float, float]] = []
     for tbl in page.find_tables(table_settings=settings):
         raw = tbl.extract()
-        if not raw:
+        if borderless and raw and len(raw[0]) < 2:
             continue
-        if borderless and len(raw[0]) < 2:
+        if tbl.bbox:
+            x0, top, x1, bot = tbl.bbox
+            pad = 20 if borderless else 0
+            bboxes.append((x0, top, x1 + pad, bot + pad))
+        if not raw:
             continue
         if borderless:
             _repair_right_edge(page, tbl, raw)
         clean = [[_cell(c) for c in r] for r in raw if not _empty_row(r)]
         if clean:
-            results.append((tbl, clean))
-    return results
+            top = tbl.bbox[1] if tbl.bbox else 0.0
+            scan.tables.append(_PageTable(clean, _col_positions(tbl), top))
+
+    scan.blocks = _extract_text_blocks(page, bboxes)
+    return scan
 
 
 def _col_positions(tbl: Any) -> list[float]:
@@ -294,47 +374,49 @@ def _col_positions(tbl: Any) -> list[float]:
     return sorted({round(c[0], 1) for c in tbl.cells}) if tbl.cells else []
 
 
-def _should_merge(
-    prev_tbl: Any, prev_rows: list[list[str]],
-    cur_tbl: Any, cur_rows: list[list[str]],
-) -> bool:
+def _should_merge(prev: _PageTable, cur: _PageTable) -> bool:
     """Decide if two consecutive tables should be merged (cross-page continuation)."""
-    if not prev_rows or not cur_rows or len(prev_rows[0]) != len(cur_rows[0]):
+    if not prev.rows or not cur.rows or len(prev.rows[0]) != len(cur.rows[0]):
         return False
-    a, b = _col_positions(prev_tbl), _col_positions(cur_tbl)
+    a, b = prev.col_positions, cur.col_positions
     return len(a) == len(b) and all(abs(x - y) <= 15 for x, y in zip(a, b))
 
 
-def _extract_all_tables(
-    pages: list[Page],
-) -> list[tuple[list[str], list[list[str]], str | None, tuple[int, int]]]:
-    """Extract and merge tables across all pages."""
-    per_page: list[tuple[int, Any, list[list[str]]]] = []
-    for p in pages:
-        for tbl, rows in _extract_page_tables(p):
-            per_page.append((p.page_number, tbl, rows))
+def _merge_tables(
+    scans: list[_PageScan],
+) -> list[tuple[list[str], list[list[str]], str | None, tuple[int, int], float]]:
+    """Merge tables across consecutive pages.
+
+    Returns:
+        list: ``(header, rows, caption, (first_page, last_page), top_y)``
+            per merged table.
+    """
+    per_page: list[tuple[int, _PageTable]] = [
+        (scan.page_number, tbl) for scan in scans for tbl in scan.tables
+    ]
     if not per_page:
         return []
 
-    merged: list[tuple[list[str], list[list[str]], str | None, tuple[int, int]]] = []
+    merged: list[tuple[list[str], list[list[str]], str | None, tuple[int, int], float]] = []
+    borderless = not scans[0].bordered
     i = 0
     while i < len(per_page):
-        pn, tbl, rows = per_page[i]
-        header = rows[0]
-        data = list(rows[1:])
+        pn, tbl = per_page[i]
+        header = tbl.rows[0]
+        data = list(tbl.rows[1:])
         last_pn, last_tbl = pn, tbl
 
         j = i + 1
         while j < len(per_page):
-            npn, ntbl, nrows = per_page[j]
-            if npn != last_pn + 1 or not _should_merge(last_tbl, rows, ntbl, nrows):
+            npn, ntbl = per_page[j]
+            if npn != last_pn + 1 or not _should_merge(last_tbl, ntbl):
                 break
+            nrows = ntbl.rows
             cont = nrows[1:] if nrows and [_cell(c) for c in nrows[0]] == header else nrows
             data.extend([_cell(c) for c in r] for r in cont)
             last_pn, last_tbl = npn, ntbl
             j += 1
 
-        borderless = not _is_bordered(pages[0]) if pages else False
         caption = None
         if borderless:
             header, data, caption = _strip_spillover(header, data)
@@ -343,7 +425,7 @@ def _extract_all_tables(
 
         ncols = len(header)
         data = [(r + [""] * ncols)[:ncols] for r in data]
-        merged.append((header, data, caption, (pn, last_pn)))
+        merged.append((header, data, caption, (pn, last_pn), tbl.top))
         i = j
     return merged
 
@@ -352,24 +434,6 @@ def _extract_all_tables(
 # Text extraction (non-table regions)
 # ---------------------------------------------------------------------------
 
-def _table_bboxes(page: Page) -> list[tuple[float, float, float, float]]:
-    """Get bounding boxes of real tables on the page."""
-    settings = _BORDERED if _is_bordered(page) else _BORDERLESS
-    borderless = not _is_bordered(page)
-    bboxes: list[tuple[float, float, float, float]] = []
-    for t in page.find_tables(table_settings=settings):
-        if not t.bbox:
-            continue
-        if borderless:
-            raw = t.extract()
-            if raw and len(raw[0]) < 2:
-                continue
-        x0, top, x1, bot = t.bbox
-        pad = 20 if borderless else 0
-        bboxes.append((x0, top, x1 + pad, bot + pad))
-    return bboxes
-
-
 def _inside(ch: dict, bboxes: list[tuple[float, float, float, float]], margin: int = 6) -> bool:
     """True if the character falls inside any bounding box."""
     x, y = ch["x0"], ch["top"]
@@ -379,9 +443,10 @@ def _inside(ch: dict, bboxes: list[tuple[float, float, float, float]], margin: i
     )
 
 
-def _extract_text_blocks(page: Page) -> list[tuple[str, str, float]]:
-    """Extract non-table text as classified ``(kind, text, y)`` blocks."""
-    bboxes = _table_bboxes(page)
+def _extract_text_blocks(
+    page: Page, bboxes: list[tuple[float, float, float, float]],
+) -> list[tuple[str, str, float]]:
+    """Extract text outside ``bboxes`` as classified ``(kind, text, y)`` blocks."""
     chars = [c for c in page.chars if not _inside(c, bboxes)]
     if not chars:
         return []
@@ -0,0 +1,375 @@
+"""Bulk persistence for the batch ingestion path.
+
+Writing a batch through the ORM costs one ``Chunk`` object and one
+INSERT parameter set per chunk, plus a SELECT + UPDATE per document for
+status and metadata. This module writes the whole batch in a fixed
+number of statements regardless of its size:
+
+    1. ``SELECT ... FOR UPDATE`` — lock the batch's live documents
+       (deleted ones are dropped, and cannot be deleted mid-write).
+    2. ``COPY`` — stream chunk rows, embeddings and identifier tokens
+       included, into a temporary staging table in PostgreSQL's binary
+       COPY format.
+       Vectors are written in pgvector's binary wire format straight from
+       a float32 matrix — no text formatting or parsing.
+    3. ``INSERT ... SELECT`` — merge the staging rows into ``chunks``.
+    4. ``UPDATE ... FROM jsonb_to_recordset`` — status, metadata and
+       vault timestamps for every document in one statement each.
+    5. ``INSERT ... ON CONFLICT`` — add the documents to the per-vault
+       aggregate rollup (``app.core.rag.rollup``).
+
+All statements run on the caller's session and transaction; the caller
+owns savepoints and the commit.
+
+Usage::
+
+    from app.core.rag.persistence import ChunkBatch, write_chunk_batch
+
+    counts = await write_chunk_batch(db, batches)   # doc_id → chunks written
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date
+from uuid import UUID, uuid4
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.rag.chunking.base import ChunkData
+from app.core.rag.metadata import DocumentMetadata, extract_identifier_tokens
+from app.core.rag.rollup import apply_rollup_deltas, rollup_delta
+from app.core.logger import setup_logger
+from app.core.utils import utcnow
+
+logger = setup_logger(__name__)
+
+_STAGE_TABLE = "chunk_stage"
+
+# Staging columns, in COPY order
+_STAGE_COLUMNS = (
+    "id", "doc_id", "vault_id", "chunk_type", "content", "content_with_header",
+    "content_hash", "token_count", "chunk_index", "embedding", "entity_tokens",
+)
+
+# Rows per bytes payload handed to the COPY stream
+_COPY_ROWS_PER_PAYLOAD = 256
+
+_DELETED_STATUSES = ("pending_delete", "deleted")
+
+
+@dataclass
+class ChunkBatch:
+    """One document's chunks and vectors, ready to be written.
+
+    Attributes:
+        doc_id: Document UUID.
+        vault_id: Owning vault UUID.
+        chunks: Chunks in index order.
+        embeddings: One vector per chunk.
+        meta_chunk_index: Position of the metadata chunk in ``chunks``, or -1.
+        metadata: Extracted metadata to record on the document, if any.
+    """
+    doc_id: UUID
+    vault_id: UUID
+    chunks: list[ChunkData]
+    embeddings: list[list[float]]
+    meta_chunk_index: int = -1
+    metadata: DocumentMetadata | None = None
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+async def write_chunk_batch(db: AsyncSession, batches: Sequence[ChunkBatch]) -> dict[UUID, int]:
+    """Write chunks and metadata for several documents and mark them active.
+
+    Documents deleted (or pending deletion) by the time of the write are
+    skipped and absent from the result. Any error propagates — run this
+    in a savepoint to keep the rest of the transaction usable.
+
+    Args:
+        db: Async database session (not committed).
+        batches: Documents to write; each must have one vector per chunk.
+
+    Returns:
+        dict mapping doc_id → number of chunks written.
+    """
+    if not batches:
+        return {}
+
+    live = await _lock_live_documents(db, [b.doc_id for b in batches])
+    batches = [b for b in batches if b.doc_id in live]
+    if not batches:
+        return {}
+
+    for b in batches:
+        if len(b.embeddings) != len(b.chunks):
+            raise ValueError(
+                f"Document {b.doc_id} has {len(b.chunks)} chunks but "
+                f"{len(b.embeddings)} embeddings"
+            )
+
+    now = utcnow()
+    await _copy_to_stage(db, batches)
+    counts = await _merge_stage(db, now)
+    await _update_metadata(db, batches, now)
+    await set_document_statuses(db, {b.doc_id: None for b in batches}, "active", now=now)
+    await touch_vaults(db, {b.vault_id for b in batches}, now=now)
+    await apply_rollup_deltas(db, [rollup_delta(b.vault_id, b.metadata) for b in batches], now=now)
+    return counts
+
+
+async def set_document_statuses(
+    db: AsyncSession,
+    errors: dict[UUID, str | None],
+    status: str,
+    *,
+    now=None,
+) -> None:
+    """Set ``status`` (and a per-document error message) in one statement.
+
+    Args:
+        db: Async database session (not committed).
+        errors: doc_id → error message (None clears it).
+        status: New status for every listed document.
+        now: ``updated_at`` value (defaults to the current UTC time).
+    """
+    if not errors:
+        return
+    rows = [
+        {"id": str(doc_id), "error_message": message[:500] if message else None}
+        for doc_id, message in errors.items()
+    ]
+    await db.execute(
+        text("""
+            UPDATE documents AS d
+            SET status = :status,
+                error_message = m.error_message,
+                updated_at = :now
+            FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS m(id uuid, error_message text)
+            WHERE d.id = m.id
+        """),
+        {"status": status, "now": now or utcnow(), "rows": json.dumps(rows)},
+    )
+
+
+async def touch_vaults(db: AsyncSession, vault_ids: set[UUID], *, now=None) -> None:
+    """Set ``updated_at`` on several vaults in one statement."""
+    if not vault_ids:
+        return
+    await db.execute(
+        text("UPDATE vaults SET updated_at = :now WHERE id = ANY(CAST(:ids AS uuid[]))"),
+        {"now": now or utcnow(), "ids": sorted(vault_ids)},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Binary COPY encoding
+# ---------------------------------------------------------------------------
+
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_COPY_TRAILER = struct.pack(">h", -1)
+_NULL_FIELD = struct.pack(">i", -1)
+_INT4_FIELD = struct.Struct(">ii")  # length (4) + value
+_TEXT_OID = 25
+
+
+def encode_vectors(vectors: Sequence[Sequence[float]]) -> list[bytes]:
+    """Encode vectors in pgvector's binary format (as read by ``vector_recv``).
+
+    int16 dim, int16 unused, float4[dim], all big-endian — the same
+    layout ``decode_vectors`` reads back from ``vector_send``.
+    """
+    if not vectors:
+        return []
+    matrix = np.asarray(vectors, dtype=">f4")
+    if matrix.ndim != 2:
+        raise ValueError("Embeddings must all have the same dimensionality")
+    header = struct.pack(">hh", matrix.shape[1], 0)
+    return [header + row.tobytes() for row in matrix]
+
+
+def iter_copy_payloads(
+    batches: Sequence[ChunkBatch],
+    rows_per_payload: int = _COPY_ROWS_PER_PAYLOAD,
+) -> Iterator[bytes]:
+    """Yield the staging rows as a binary COPY stream, a few rows per payload."""
+    yield _COPY_HEADER
+    field_count = struct.pack(">h", len(_STAGE_COLUMNS))
+    pending: list[bytes] = []
+
+    for b in batches:
+        vectors = encode_vectors(b.embeddings)
+        doc_id = _uuid_field(b.doc_id)
+        vault_id = _uuid_field(b.vault_id)
+        for i, (cd, vector) in enumerate(zip(b.chunks, vectors)):
+            pending.append(b"".join((
+                field_count,
+                _uuid_field(uuid4()),
+                doc_id,
+                vault_id,
+                _text_field("metadata" if i == b.meta_chunk_index else "child"),
+                _text_field(cd.content),
+                _text_field(cd.content_with_header),
+                _text_field(cd.content_hash),
+                _INT4_FIELD.pack(4, cd.token_count),
+                _INT4_FIELD.pack(4, cd.chunk_index),
+                struct.pack(">i", len(vector)) + vector,
+                _text_array_field(extract_identifier_tokens(cd.content_with_header)),
+            )))
+            if len(pending) >= rows_per_payload:
+                yield b"".join(pending)
+                pending.clear()
+
+    if pending:
+        yield b"".join(pending)
+    yield _COPY_TRAILER
+
+
+def _uuid_field(value: UUID) -> bytes:
+    return b"\x00\x00\x00\x10" + value.bytes
+
+
+def _text_field(value: str | None) -> bytes:
+    if value is None:
+        return _NULL_FIELD
+    encoded = value.encode("utf-8")
+    return struct.pack(">i", len(encoded)) + encoded
+
+
+def _text_array_field(values: Sequence[str]) -> bytes:
+    """One-dimensional ``text[]`` in array_recv's binary layout."""
+    if not values:
+        body = struct.pack(">iii", 0, 0, _TEXT_OID)
+    else:
+        body = struct.pack(">iiiii", 1, 0, _TEXT_OID, len(values), 1) + b"".join(
+            _text_field(v) for v in values
+        )
+    return struct.pack(">i", len(body)) + body
+
+
+# ---------------------------------------------------------------------------
+# Statements
+# ---------------------------------------------------------------------------
+
+async def _lock_live_documents(db: AsyncSession, doc_ids: list[UUID]) -> set[UUID]:
+    """Lock the listed documents that are not deleted; return their IDs."""
+    result = await db.execute(
+        text("""
+            SELECT id FROM documents
+            WHERE id = ANY(CAST(:ids AS uuid[]))
+              AND deleted_at IS NULL
+              AND status <> ALL(CAST(:deleted AS text[]))
+            ORDER BY id
+            FOR UPDATE
+        """),
+        {"ids": doc_ids, "deleted": list(_DELETED_STATUSES)},
+    )
+    live = {row[0] for row in result.fetchall()}
+    for doc_id in set(doc_ids) - live:
+        logger.info(f"Document {doc_id} was deleted during embedding — skipping")
+    return live
+
+
+async def _copy_to_stage(db: AsyncSession, batches: Sequence[ChunkBatch]) -> None:
+    """Create (once per connection) and fill the staging table via COPY."""
+    await db.execute(text(f"""
+        CREATE TEMP TABLE IF NOT EXISTS {_STAGE_TABLE} (
+            id uuid NOT NULL,
+            doc_id uuid NOT NULL,
+            vault_id uuid NOT NULL,
+            chunk_type varchar(20) NOT NULL,
+            content text NOT NULL,
+            content_with_header text NOT NULL,
+            content_hash varchar(64) NOT NULL,
+            token_count integer NOT NULL,
+            chunk_index integer NOT NULL,
+            embedding vector,
+            entity_tokens text[]
+        ) ON COMMIT DELETE ROWS
+    """))
+    # Rows left by an earlier batch in this transaction
+    await db.execute(text(f"TRUNCATE {_STAGE_TABLE}"))
+
+    # COPY runs on the session's own connection, inside its transaction
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+
+    async def source():
+        for payload in iter_copy_payloads(batches):
+            yield payload
+
+    await raw.driver_connection.copy_to_table(
+        _STAGE_TABLE, source=source(), columns=list(_STAGE_COLUMNS), format="binary",
+    )
+
+
+async def _merge_stage(db: AsyncSession, now) -> dict[UUID, int]:
+    """Insert the staged rows into ``chunks``; return chunks per document."""
+    columns = ", ".join(_STAGE_COLUMNS)
+    result = await db.execute(
+        text(f"""
+            WITH inserted AS (
+                INSERT INTO chunks ({columns}, is_deleted, chunk_version, created_at)
+                SELECT {columns}, false, 1, CAST(:now AS timestamp) FROM {_STAGE_TABLE}
+                RETURNING doc_id
+            )
+            SELECT doc_id, count(*) FROM inserted GROUP BY doc_id
+        """),
+        {"now": now},
+    )
+    return {row[0]: row[1] for row in result.fetchall()}
+
+
+async def _update_metadata(db: AsyncSession, batches: Sequence[ChunkBatch], now) -> None:
+    """Record extracted metadata for every document that has some."""
+    rows = [_metadata_row(b.doc_id, b.metadata) for b in batches if b.metadata]
+    if not rows:
+        return
+    await db.execute(
+        text("""
+            UPDATE documents AS d
+            SET document_type = m.document_type,
+                entity_id = m.entity_id,
+                order_date = m.order_date,
+                customer_id = m.customer_id,
+                total_price = m.total_price,
+                summary = m.summary,
+                keywords = m.keywords,
+                hypothetical_questions = m.hypothetical_questions,
+                extracted_entities = m.extracted_entities,
+                updated_at = :now
+            FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS m(
+                id uuid, document_type text, entity_id text, order_date date,
+                customer_id text, total_price double precision, summary text,
+                keywords jsonb, hypothetical_questions jsonb, extracted_entities jsonb
+            )
+            WHERE d.id = m.id
+        """),
+        {"now": now, "rows": json.dumps(rows)},
+    )
+
+
+def _metadata_row(doc_id: UUID, meta: DocumentMetadata) -> dict:
+    """One ``jsonb_to_recordset`` row; absent keys become SQL NULL."""
+    row = {
+        "id": str(doc_id),
+        "document_type": meta.document_type,
+        "entity_id": meta.entity_id,
+        "order_date": meta.order_date.isoformat() if isinstance(meta.order_date, date) else None,
+        "customer_id": meta.customer_id,
+        "total_price": meta.total_price,
+        "summary": meta.summary,
+        # Empty collections are stored as NULL, as the ORM path did
+        "keywords": meta.keywords or None,
+        "hypothetical_questions": meta.hypothetical_questions or None,
+        "extracted_entities": meta.entities or None,
+    }
+    return {key: value for key, value in row.items() if value is not None}
@@ -2,7 +2,9 @@
 
 Provides conversation-aware query rewriting so that follow-up
 questions like "who are the customers of it?" are resolved into
-standalone queries using prior conversation context.
+standalone queries using prior conversation context. Follow-ups with
+nothing to resolve skip the LLM call; rewrites are cached per query and
+recent history.
 
 Usage::
 
@@ -12,6 +14,20 @@ Usage::
     entity_ids = extract_entity_ids(standalone)
 """
 
-from app.core.rag.query.rewriter import QueryRewriter, rewrite_query, extract_entity_ids
+from app.core.rag.query.rewriter import (
+    QueryRewriter,
+    rewrite_query,
+    rewrite_needed,
+    rewrite_stats,
+    has_unresolved_references,
+    extract_entity_ids,
+)
 
-__all__ = ["QueryRewriter", "rewrite_query", "extract_entity_ids"]
+__all__ = [
+    "QueryRewriter",
+    "rewrite_query",
+    "rewrite_needed",
+    "rewrite_stats",
+    "has_unresolved_references",
+    "extract_entity_ids",
+]
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import re
+from collections import OrderedDict
 
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 
 from app.core.config import get_settings
+from app.core.tools.llm import Priority, get_chat_model, invoke_chat
 from app.core.utils import singleton, normalize_numbers
 from app.core.logger import setup_logger
 
@@ -54,6 +56,88 @@ LATEST QUESTION: {query}
 Rewrite the latest question as a standalone search query:"""
 
 
+# ---------------------------------------------------------------------------
+# Reference detection — decides whether a follow-up needs the LLM at all
+# ---------------------------------------------------------------------------
+
+# Pronouns and anaphoric words that point back into the conversation
+_PRONOUN_RE = re.compile(
+    r"\b(?:it|its|they|them|their|theirs|he|she|him|his|her|hers|this|that|these|those"
+    r"|one|ones|same|former|latter|above|previous|earlier)\b",
+    re.IGNORECASE,
+)
+
+# Elliptical follow-ups: "and the shipping date?", "what about 2017?", "...too?"
+_FOLLOW_UP_RE = re.compile(
+    r"^\s*(?:and|also|or|but|what about|how about)\b|\b(?:as well|too|instead)\s*\??\s*$",
+    re.IGNORECASE,
+)
+
+# A definite entity or attribute reference with no identifier of its own:
+# "the order", "the total price" — but not "the order 10248"
+_DEFINITE_REF_RE = re.compile(
+    r"\bthe\s+(?:invoice|order|purchase order|customer|supplier|product|item|document"
+    r"|report|shipment|file|total|price|amount|cost|quantity|date|status|address)s?\b"
+    r"(?!\s*(?:#|no\.?|number|id)?\s*:?\s*[A-Z]*-?\d)",
+    re.IGNORECASE,
+)
+
+# Anchors that make "the <noun>" standalone: quantifiers and dates
+_ANCHOR_RE = re.compile(
+    r"\b(?:all|every|each|any)\b|\b(?:19|20)\d{2}\b|\bq[1-4]\b",
+    re.IGNORECASE,
+)
+
+_MIN_STANDALONE_WORDS = 3
+
+
+def has_unresolved_references(query: str) -> bool:
+    """Whether a follow-up query needs the conversation to be understood.
+
+    Deliberately conservative: any pronoun, elliptical opener, bare
+    definite reference ("the order" without an ID or date) or very short
+    query counts as unresolved. Only queries with none of these skip
+    the rewrite LLM call.
+
+    Args:
+        query: The user's current question.
+
+    Returns:
+        bool: True if the query should be rewritten using history.
+    """
+    text = query.strip()
+    if not text:
+        return False
+    if _PRONOUN_RE.search(text) or _FOLLOW_UP_RE.search(text):
+        return True
+    has_id = bool(_ENTITY_ID_PATTERN.search(text))
+    if _DEFINITE_REF_RE.search(text) and not has_id and not _ANCHOR_RE.search(text):
+        return True
+    return len(text.split()) < _MIN_STANDALONE_WORDS and not has_id
+
+
+# Process-lifetime counters, exposed via GET /metrics
+_stats = {
+    "requests": 0,
+    "skipped_no_history": 0,
+    "skipped_standalone": 0,
+    "cache_hits": 0,
+    "llm_calls": 0,
+    "failures": 0,
+}
+
+
+def rewrite_stats() -> dict:
+    """Rewrite counters with skip and cache hit ratios."""
+    skipped = _stats["skipped_no_history"] + _stats["skipped_standalone"]
+    lookups = _stats["cache_hits"] + _stats["llm_calls"]
+    return {
+        **_stats,
+        "skip_ratio": round(skipped / _stats["requests"], 4) if _stats["requests"] else 0.0,
+        "cache_hit_ratio": round(_stats["cache_hits"] / lookups, 4) if lookups else 0.0,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Rewriter
 # ---------------------------------------------------------------------------
@@ -62,13 +146,18 @@ class QueryRewriter:
     """Rewrites follow-up queries into standalone search queries.
 
     Uses a lightweight LLM call (gpt-4o-mini) to resolve pronouns
-    and coreferences from conversation history.
+    and coreferences from conversation history. Queries with nothing
+    to resolve skip the call, and rewrites are kept in a bounded LRU
+    keyed on the query and the same trimmed history the prompt sees.
 
     Args:
         model: OpenAI model name.
         temperature: Sampling temperature (low for determinism).
         api_key: OpenAI API key.
         max_history_turns: Maximum conversation turns to include.
+        detect_references: Skip the LLM when ``has_unresolved_references``
+            finds nothing to resolve.
+        cache_size: Maximum cached rewrites (0 disables the cache).
     """
 
     def __init__(
@@ -77,13 +166,14 @@ class QueryRewriter:
         temperature: float,
         api_key: str,
         max_history_turns: int = 10,
+        detect_references: bool = True,
+        cache_size: int = 1024,
     ) -> None:
-        self._llm = ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            api_key=api_key,
-        )
+        self._llm = get_chat_model(model, temperature=temperature, api_key=api_key)
         self._max_turns = max_history_turns
+        self._detect_references = detect_references
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._cache_size = cache_size
         logger.info(f"Initialised query rewriter: model={model}")
 
     async def rewrite(
@@ -95,6 +185,7 @@ class QueryRewriter:
 
         Returns the original query unchanged when:
           - History is empty or None (first message).
+          - The query has no unresolved references.
           - Rewriting is disabled in config.
           - The LLM call fails (graceful degradation).
 
@@ -108,9 +199,11 @@ class QueryRewriter:
         """
         if not query or not query.strip():
             return query
+        _stats["requests"] += 1
 
         # No history → query is already standalone
         if not history:
+            _stats["skipped_no_history"] += 1
             return normalize_numbers(query.strip())
 
         # Trim to max turns (most recent)
@@ -119,19 +212,35 @@ class QueryRewriter:
         # Format history for the prompt
         history_text = self._format_history(trimmed)
         if not history_text.strip():
+            _stats["skipped_no_history"] += 1
             return normalize_numbers(query.strip())
 
+        if self._detect_references and not has_unresolved_references(query):
+            _stats["skipped_standalone"] += 1
+            return normalize_numbers(query.strip())
+
+        key = self._cache_key(query, trimmed)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            _stats["cache_hits"] += 1
+            return cached
+        _stats["llm_calls"] += 1
+
         user_message = _USER_TEMPLATE.format(
             history=history_text,
             query=query.strip(),
         )
 
         try:
-            response = await asyncio.wait_for(
-                self._llm.ainvoke([
+            response = await invoke_chat(
+                self._llm,
+                [
                     SystemMessage(content=_SYSTEM_PROMPT),
                     HumanMessage(content=user_message),
-                ]),
+                ],
+                purpose="query_rewrite",
+                priority=Priority.INTERACTIVE,
                 timeout=SETTINGS.API_TIMEOUT_S,
             )
             rewritten = response.content.strip()
@@ -139,21 +248,55 @@ class QueryRewriter:
             # Sanity check: if the LLM returned empty or something weird
             if not rewritten or len(rewritten) > 2000:
                 logger.warning("Query rewriter returned unusable output, using original")
+                _stats["failures"] += 1
                 return normalize_numbers(query.strip())
 
             # Strip any quotes the LLM might wrap around the output
-            rewritten = rewritten.strip('"\'')
+            rewritten = normalize_numbers(rewritten.strip('"\''))
 
             logger.info(f"Query rewritten: '{query.strip()[:50]}' → '{rewritten[:50]}'")
-            return normalize_numbers(rewritten)
+            self._cache_put(key, rewritten)
+            return rewritten
 
         except asyncio.TimeoutError:
             logger.warning("Query rewrite timed out, using original query")
+            _stats["failures"] += 1
             return normalize_numbers(query.strip())
         except Exception as e:
             logger.warning(f"Query rewrite failed: {e}, using original query")
+            _stats["failures"] += 1
             return normalize_numbers(query.strip())
 
+    def needs_llm(
+        self,
+        query: str,
+        history: list[dict[str, str]] | None = None,
+    ) -> bool:
+        """Whether ``rewrite`` would call the LLM (no skip, no cached rewrite)."""
+        if not query or not query.strip():
+            return False
+        trimmed = (history or [])[-self._max_turns * 2:]
+        if not self._format_history(trimmed).strip():
+            return False
+        if self._detect_references and not has_unresolved_references(query):
+            return False
+        return self._cache_key(query, trimmed) not in self._cache
+
+    def _cache_key(self, query: str, trimmed: list[dict[str, str]]) -> str:
+        # Keyed on the full prompt history: a rewrite may resolve a
+        # reference from any turn the LLM saw
+        context = self._format_history(trimmed)
+        normalized = " ".join(query.lower().split())
+        return hashlib.sha256(f"{context}\n{normalized}".encode()).hexdigest()
+
+    def _cache_put(self, key: str, rewritten: str) -> None:
+        if self._cache_size <= 0:
+            return
+        self._cache[key] = rewritten
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
     @staticmethod
     def _format_history(history: list[dict[str, str]]) -> str:
         """Format history messages into a readable block."""
@@ -235,6 +378,8 @@ def get_rewriter() -> QueryRewriter:
         temperature=0.0,
         api_key=settings.OPENAI_API_KEY,
         max_history_turns=settings.QUERY_HISTORY_MAX_TURNS,
+        detect_references=settings.QUERY_REWRITE_DETECT_REFERENCES,
+        cache_size=settings.QUERY_REWRITE_CACHE_SIZE,
     )
 
 
@@ -250,3 +395,17 @@ async def rewrite_query(
     if not SETTINGS.QUERY_REWRITE_ENABLED:
         return normalize_numbers(query.strip()) if query else query
     return await get_rewriter().rewrite(query, history)
+
+
+def rewrite_needed(
+    query: str,
+    history: list[dict[str, str]] | None = None,
+) -> bool:
+    """Whether ``rewrite_query`` will make an LLM call for this query.
+
+    Lets callers start work on the raw query speculatively only when
+    the rewrite is actually going to cost a round trip.
+    """
+    if not SETTINGS.QUERY_REWRITE_ENABLED:
+        return False
+    return get_rewriter().needs_llm(query, history)
@@ -7,19 +7,32 @@ Usage::
     from app.core.rag.retrieval import hybrid_search, entity_id_search, SearchResult
 
     results = await hybrid_search(query_text, query_vec, vault_id, db)
+    outcome = await concurrent_hybrid_search(query_text, query_vec, vault_id)
     exact = await entity_id_search(["10248"], vault_id, db)
+    outcomes = await batch_hybrid_search(query_texts, query_vecs, vault_id)
 """
 
-from app.core.rag.retrieval.base import SearchResult
+from app.core.rag.retrieval.base import RetrievalHit, SearchResult
 from app.core.rag.retrieval.dense import dense_search
 from app.core.rag.retrieval.sparse import sparse_search
-from app.core.rag.retrieval.hybrid import hybrid_search
+from app.core.rag.retrieval.hybrid import (
+    HybridSearchOutcome,
+    HybridTimings,
+    batch_hybrid_search,
+    concurrent_hybrid_search,
+    hybrid_search,
+)
 from app.core.rag.retrieval.entity import entity_id_search
 
 __all__ = [
     "SearchResult",
+    "RetrievalHit",
     "dense_search",
     "sparse_search",
     "hybrid_search",
+    "concurrent_hybrid_search",
+    "batch_hybrid_search",
+    "HybridSearchOutcome",
+    "HybridTimings",
     "entity_id_search",
 ]
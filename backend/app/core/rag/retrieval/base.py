@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+from typing import Sequence
 from uuid import UUID
 
-from pydantic import BaseModel
+import numpy as np
+from pydantic import BaseModel, PrivateAttr
 
 
 class SearchResult(BaseModel):
-    """A single search result from retrieval."""
+    """A single search result from retrieval.
+
+    The chunk embedding is not a model field: retrievers decode the
+    vectors of a whole result set into one float32 matrix and attach a
+    row view via :func:`attach_vectors`. It is never serialised.
+    """
 
     chunk_id: UUID
     doc_id: UUID
@@ -18,10 +25,110 @@ class SearchResult(BaseModel):
     section_heading: str | None = None
     page_number: int | None = None
     original_filename: str | None = None
-    embedding: list[float] | None = None
 
+    _vector: np.ndarray | None = PrivateAttr(default=None)
+
+    @property
+    def vector(self) -> np.ndarray | None:
+        """float32 embedding row, or None if it was not fetched."""
+        return self._vector
+
+    def as_dict(self) -> dict:
+        """JSON-safe dict (same shape as :meth:`RetrievalHit.as_dict`)."""
+        return self.model_dump(mode="json")
+
+
+class RetrievalHit:
+    """Lightweight result used inside the retrieval pipeline.
+
+    Slotted and unvalidated, so building and re-scoring dozens of
+    candidates per search is cheap. Text fields stay ``None`` until the
+    hit is hydrated (see :func:`app.core.rag.retrieval.hydrate.hydrate_hits`);
+    ranking only needs ids, scores and the shared vector matrix.
+
+    Convert with :meth:`to_result` at the API boundary, or pass hits
+    straight to :func:`build_retrieval_context` for LLM prompts.
+    """
+
+    __slots__ = (
+        "chunk_id", "doc_id", "score", "vector",
+        "content", "content_with_header",
+        "section_heading", "page_number", "original_filename",
+    )
+
+    def __init__(
+        self,
+        chunk_id: UUID,
+        doc_id: UUID,
+        score: float,
+        vector: np.ndarray | None = None,
+        content: str | None = None,
+        content_with_header: str | None = None,
+        section_heading: str | None = None,
+        page_number: int | None = None,
+        original_filename: str | None = None,
+    ) -> None:
+        self.chunk_id = chunk_id
+        self.doc_id = doc_id
+        self.score = score
+        self.vector = vector
+        self.content = content
+        self.content_with_header = content_with_header
+        self.section_heading = section_heading
+        self.page_number = page_number
+        self.original_filename = original_filename
 
-def build_retrieval_context(results: list[SearchResult]) -> str:
+    @property
+    def is_hydrated(self) -> bool:
+        return self.content_with_header is not None
+
+    def rescored(self, score: float, vector: np.ndarray | None = None) -> RetrievalHit:
+        """Shallow copy with a new score (and optionally a vector)."""
+        return RetrievalHit(
+            self.chunk_id, self.doc_id, score,
+            vector if vector is not None else self.vector,
+            self.content, self.content_with_header,
+            self.section_heading, self.page_number, self.original_filename,
+        )
+
+    def to_result(self) -> SearchResult:
+        """Convert to the public Pydantic model (skips re-validation)."""
+        result = SearchResult.model_construct(
+            chunk_id=self.chunk_id,
+            doc_id=self.doc_id,
+            content=self.content or "",
+            content_with_header=self.content_with_header or "",
+            score=self.score,
+            section_heading=self.section_heading,
+            page_number=self.page_number,
+            original_filename=self.original_filename,
+        )
+        result._vector = self.vector
+        return result
+
+    def as_dict(self) -> dict:
+        """JSON-safe dict for graph state, without building a model."""
+        return {
+            "chunk_id": str(self.chunk_id),
+            "doc_id": str(self.doc_id),
+            "content": self.content or "",
+            "content_with_header": self.content_with_header or "",
+            "score": self.score,
+            "section_heading": self.section_heading,
+            "page_number": self.page_number,
+            "original_filename": self.original_filename,
+        }
+
+    @classmethod
+    def from_result(cls, result: SearchResult) -> RetrievalHit:
+        return cls(
+            result.chunk_id, result.doc_id, result.score, result.vector,
+            result.content, result.content_with_header,
+            result.section_heading, result.page_number, result.original_filename,
+        )
+
+
+def build_retrieval_context(results: Sequence[SearchResult | RetrievalHit]) -> str:
     """Format search results into a numbered context block for LLM prompts."""
     parts: list[str] = []
     for i, r in enumerate(results, 1):
@@ -29,3 +136,90 @@ def build_retrieval_context(results: list[SearchResult]) -> str:
         parts.append(r.content_with_header)
         parts.append("")
     return "\n".join(parts)
+
+
+# ---------------------------------------------------------------------------
+# Binary vector decoding
+# ---------------------------------------------------------------------------
+
+# pgvector's binary send format: int16 dim, int16 unused, float4[dim] (big-endian)
+_VECTOR_HEADER_BYTES = 4
+
+
+def decode_vectors(raws: Sequence[bytes | None]) -> tuple[np.ndarray, np.ndarray]:
+    """Decode ``vector_send()`` payloads into one contiguous float32 matrix.
+
+    Args:
+        raws: Binary vectors as returned by ``vector_send(c.embedding)``;
+            ``None`` for rows without an embedding.
+
+    Returns:
+        tuple: ``(matrix, present)`` where ``matrix`` has one row per
+            non-null payload and ``present`` is a boolean mask over ``raws``.
+    """
+    present = np.fromiter((r is not None for r in raws), dtype=bool, count=len(raws))
+    payloads = [bytes(r) for r in raws if r is not None]
+    if not payloads:
+        return np.empty((0, 0), dtype=np.float32), present
+
+    dim = (len(payloads[0]) - _VECTOR_HEADER_BYTES) // 4
+    record = np.dtype([("header", ">i4"), ("values", ">f4", (dim,))])
+    decoded = np.frombuffer(b"".join(payloads), dtype=record)["values"]
+    return decoded.astype(np.float32), present
+
+
+def attach_vectors(
+    results: list[SearchResult],
+    raws: Sequence[bytes | None],
+) -> list[SearchResult]:
+    """Decode binary vectors and attach them to ``results`` as row views.
+
+    All vectors for the result set share a single matrix allocation.
+
+    Args:
+        results: Results in the same order as ``raws``.
+        raws: Binary vectors from ``vector_send()``.
+
+    Returns:
+        list[SearchResult]: The same list, for chaining.
+    """
+    matrix, present = decode_vectors(raws)
+    row = 0
+    for result, has_vector in zip(results, present):
+        if has_vector:
+            result._vector = matrix[row]
+            row += 1
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Row builders
+# ---------------------------------------------------------------------------
+
+# Text columns appended to a leg's SELECT when hits are built hydrated.
+TEXT_COLUMNS = (
+    "c.content, c.content_with_header, c.section_heading, "
+    "c.page_number, d.original_filename"
+)
+
+
+def hits_from_rows(rows: Sequence) -> list[RetrievalHit]:
+    """Build hits from ``(id, doc_id, score, embedding_bin[, *TEXT_COLUMNS])`` rows.
+
+    Vectors for the whole row set are decoded into one shared matrix.
+    Rows without the trailing text columns produce unhydrated hits.
+    """
+    matrix, present = decode_vectors([row[3] for row in rows])
+    hits: list[RetrievalHit] = []
+    vec_row = 0
+    for row, has_vector in zip(rows, present):
+        vector = None
+        if has_vector:
+            vector = matrix[vec_row]
+            vec_row += 1
+        hit = RetrievalHit(row[0], row[1], float(row[2]), vector)
+        if len(row) > 4:
+            (hit.content, hit.content_with_header, hit.section_heading,
+             hit.page_number, hit.original_filename) = row[4:9]
+        hits.append(hit)
+    return hits
@@ -1,18 +1,102 @@
-"""Dense search — pgvector cosine similarity."""
+"""Dense search — pgvector cosine similarity.
+
+Two modes, chosen by ``DENSE_SEARCH_MODE``:
+
+  - ``exact``: order by cosine distance on the fp32 HNSW index.
+  - ``halfvec`` / ``binary``: over-fetch candidates from a compact
+    expression index (half precision, or a binary-quantized 512-dim
+    Matryoshka prefix), then rerank them exactly against the stored
+    full vectors. The compact indexes are a fraction of the size, so
+    the first pass stays in the buffer cache on large vaults.
+"""
 
 from __future__ import annotations
 
-import json
 from uuid import UUID
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.rag.retrieval.base import SearchResult
+from app.core.rag.retrieval.base import (
+    TEXT_COLUMNS,
+    RetrievalHit,
+    SearchResult,
+    hits_from_rows,
+)
+from app.core.config import get_settings
 from app.core.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+SETTINGS = get_settings()
+
+# ``chunks`` is hash-partitioned by vault_id: the vault_id equality prunes
+# the scan to one partition and its own HNSW index.
+_DENSE_SQL = """
+    SELECT c.id, c.doc_id,
+           1 - (c.embedding <=> :query_vec) AS score,
+           vector_send(c.embedding) AS embedding_bin{text_columns}
+    FROM chunks c
+    JOIN documents d ON c.doc_id = d.id
+    WHERE c.vault_id = :vault_id
+      AND c.is_deleted = FALSE
+      AND d.status = 'active'
+      AND c.embedding IS NOT NULL
+    ORDER BY c.embedding <=> :query_vec
+    LIMIT :top_k
+"""
+
+# First-pass expressions for the two-stage modes. They must match the
+# expression indexes of migration f7a2d4c8e1b3 exactly, or the planner
+# cannot use them.
+EMBEDDING_DIMS = 1536
+BINARY_PREFIX_DIMS = 512
+
+_COMPACT_DISTANCE = {
+    "halfvec": (
+        f"(c.embedding::halfvec({EMBEDDING_DIMS}))"
+        f" <=> CAST(:compact_vec AS halfvec({EMBEDDING_DIMS}))"
+    ),
+    "binary": (
+        f"(binary_quantize(subvector(c.embedding, 1, {BINARY_PREFIX_DIMS}))::bit({BINARY_PREFIX_DIMS}))"
+        f" <~> binary_quantize(CAST(:compact_vec AS vector({BINARY_PREFIX_DIMS})))::bit({BINARY_PREFIX_DIMS})"
+    ),
+}
+
+_TWO_STAGE_SQL = """
+    WITH candidates AS (
+        SELECT c.id
+        FROM chunks c
+        WHERE c.vault_id = :vault_id
+          AND c.is_deleted = FALSE
+          AND c.embedding IS NOT NULL
+        ORDER BY {compact_distance}
+        LIMIT :candidates
+    )
+    SELECT c.id, c.doc_id,
+           1 - (c.embedding <=> :query_vec) AS score,
+           vector_send(c.embedding) AS embedding_bin{text_columns}
+    FROM candidates k
+    JOIN chunks c ON c.id = k.id AND c.vault_id = :vault_id
+    JOIN documents d ON c.doc_id = d.id
+    WHERE d.status = 'active'
+    ORDER BY c.embedding <=> :query_vec
+    LIMIT :top_k
+"""
+
+# Several queries in one statement: each query vector drives its own
+# LATERAL search (still an HNSW index scan per query), one round trip.
+_MULTI_SQL = """
+    SELECT q.ord, h.*
+    FROM unnest(CAST(:query_vecs AS text[]), CAST(:compact_vecs AS text[]))
+         WITH ORDINALITY AS q(query_vec, compact_vec, ord)
+    CROSS JOIN LATERAL ({search}) h
+    ORDER BY q.ord, h.score DESC
+"""
+
+# pgvector's default hnsw.ef_search; an HNSW scan returns at most this many rows
+_DEFAULT_EF_SEARCH = 40
+
 
 async def dense_search(
     query_embedding: list[float],
@@ -31,60 +115,130 @@ async def dense_search(
     Returns:
         list[SearchResult]: Ranked by cosine similarity (descending).
     """
-    query = text("""
-        SELECT c.id, c.doc_id, c.content, c.content_with_header,
-               1 - (c.embedding <=> :query_vec) AS score,
-               c.section_heading, c.page_number,
-               d.original_filename,
-               c.embedding::text AS embedding_text
-        FROM chunks c
-        JOIN documents d ON c.doc_id = d.id
-        WHERE c.vault_id = :vault_id
-          AND c.is_deleted = FALSE
-          AND d.status = 'active'
-          AND c.embedding IS NOT NULL
-        ORDER BY c.embedding <=> :query_vec
-        LIMIT :top_k
-    """)
+    hits = await dense_hits(query_embedding, vault_id, db, top_k, with_text=True)
+    return [h.to_result() for h in hits]
+
+
+async def dense_hits(
+    query_embedding: list[float],
+    vault_id: UUID,
+    db: AsyncSession,
+    top_k: int = 20,
+    with_text: bool = False,
+    mode: str | None = None,
+) -> list[RetrievalHit]:
+    """Dense search returning lightweight hits for the hybrid pipeline.
+
+    Args:
+        query_embedding: Query vector from the embedder.
+        vault_id: Scope search to this vault.
+        db: Async database session.
+        top_k: Maximum results to return.
+        with_text: Also select chunk text; otherwise hits are unhydrated.
+        mode: ``exact``, ``halfvec`` or ``binary``; defaults to
+            ``DENSE_SEARCH_MODE``.
 
-    result = await db.execute(query, {
+    Returns:
+        list[RetrievalHit]: Ranked by cosine similarity (descending).
+            Scores are exact in every mode.
+
+    Raises:
+        ValueError: Unknown mode.
+    """
+    mode = mode or SETTINGS.DENSE_SEARCH_MODE
+    sql = _search_sql(mode, with_text)
+    params = {
         "query_vec": str(query_embedding),
         "vault_id": str(vault_id),
         "top_k": top_k,
-    })
-
-    return [
-        SearchResult(
-            chunk_id=row[0],
-            doc_id=row[1],
-            content=row[2],
-            content_with_header=row[3],
-            score=float(row[4]),
-            section_heading=row[5],
-            page_number=row[6],
-            original_filename=row[7],
-            embedding=_parse_vector(row[8]),
+    }
+    if mode in _COMPACT_DISTANCE:
+        params.update(
+            candidates=await _prepare_candidates(db, top_k),
+            compact_vec=_compact_literal(query_embedding, mode),
         )
-        for row in result.fetchall()
-    ]
 
+    result = await db.execute(text(sql), params)
+    return hits_from_rows(result.fetchall())
 
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
 
-def _parse_vector(raw: str | None) -> list[float] | None:
-    """Parse a pgvector text representation back to a float list.
+async def dense_hits_many(
+    query_embeddings: list[list[float]],
+    vault_id: UUID,
+    db: AsyncSession,
+    top_k: int = 20,
+    mode: str | None = None,
+) -> list[list[RetrievalHit]]:
+    """Dense search for several query vectors in a single statement.
+
+    The same search as :func:`dense_hits`, run once per vector inside a
+    ``LATERAL`` join over ``unnest`` of the vectors, so a batch of
+    queries costs one round trip on one connection.
 
     Args:
-        raw: Vector as text (e.g. ``'[0.1, 0.2, ...]'``).
+        query_embeddings: One vector per query.
+        vault_id: Scope search to this vault.
+        db: Async database session.
+        top_k: Maximum results per query.
+        mode: ``exact``, ``halfvec`` or ``binary``; defaults to
+            ``DENSE_SEARCH_MODE``.
 
     Returns:
-        list[float] or None: Parsed vector.
+        list[list[RetrievalHit]]: Unhydrated hits per query, in input order.
+
+    Raises:
+        ValueError: Unknown mode.
     """
-    if not raw:
-        return None
-    try:
-        return json.loads(raw)
-    except (json.JSONDecodeError, TypeError):
-        return None
+    if not query_embeddings:
+        return []
+    mode = mode or SETTINGS.DENSE_SEARCH_MODE
+    search = (
+        _search_sql(mode, with_text=False)
+        .replace(":query_vec", "CAST(q.query_vec AS vector)")
+        .replace(":compact_vec", "q.compact_vec")
+    )
+    params = {
+        "query_vecs": [str(e) for e in query_embeddings],
+        "compact_vecs": [str(e) for e in query_embeddings],
+        "vault_id": str(vault_id),
+        "top_k": top_k,
+    }
+    if mode in _COMPACT_DISTANCE:
+        params.update(
+            candidates=await _prepare_candidates(db, top_k),
+            compact_vecs=[_compact_literal(e, mode) for e in query_embeddings],
+        )
+
+    result = await db.execute(text(_MULTI_SQL.format(search=search)), params)
+    rows_by_query: list[list] = [[] for _ in query_embeddings]
+    for row in result.fetchall():
+        rows_by_query[row[0] - 1].append(tuple(row[1:]))
+    return [hits_from_rows(rows) for rows in rows_by_query]
+
+
+def _search_sql(mode: str, with_text: bool) -> str:
+    text_columns = f", {TEXT_COLUMNS}" if with_text else ""
+    if mode == "exact":
+        return _DENSE_SQL.format(text_columns=text_columns)
+    if mode in _COMPACT_DISTANCE:
+        return _TWO_STAGE_SQL.format(
+            compact_distance=_COMPACT_DISTANCE[mode], text_columns=text_columns,
+        )
+    raise ValueError(f"Unknown dense search mode: {mode!r}")
+
+
+def _compact_literal(query_embedding: list[float], mode: str) -> str:
+    compact = query_embedding[:BINARY_PREFIX_DIMS] if mode == "binary" else query_embedding
+    return str(list(compact))
+
+
+async def _prepare_candidates(db: AsyncSession, top_k: int) -> int:
+    """First-pass candidate count for the two-stage modes."""
+    candidates = top_k * max(SETTINGS.DENSE_RERANK_OVERFETCH, 1)
+    if candidates > _DEFAULT_EF_SEARCH:
+        # Let the first pass return every requested candidate (this transaction only)
+        await db.execute(
+            text("SELECT set_config('hnsw.ef_search', :ef, true)"),
+            {"ef": str(candidates)},
+        )
+    return candidates
@@ -1,11 +1,23 @@
+"""Entity-aware search — exact lookups by invoice/order number.
+
+Identifier tokens are extracted per chunk at ingestion time
+(``extract_identifier_tokens``) into the GIN-indexed
+``chunks.entity_tokens`` column, so a lookup is an index probe rather
+than a scan of the vault's chunk text. Chunks stored before the column
+existed (``entity_tokens IS NULL``) are still matched with ILIKE until
+``backfill_entity_tokens`` has filled them.
+"""
+
 from __future__ import annotations
 
+import json
 from uuid import UUID
 
 from sqlalchemy import text as sa_text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.rag.retrieval.base import SearchResult
+from app.core.rag.metadata import extract_identifier_tokens, identifier_lookup_tokens
+from app.core.rag.retrieval.base import SearchResult, attach_vectors
 from app.core.config import get_settings
 from app.core.logger import setup_logger
 
@@ -13,26 +25,65 @@ logger = setup_logger(__name__)
 
 SETTINGS = get_settings()
 
+_ENTITY_SQL = sa_text("""
+    SELECT c.id, c.doc_id, c.content, c.content_with_header,
+           c.chunk_index, c.section_heading, c.page_number,
+           d.original_filename,
+           vector_send(c.embedding) AS embedding_bin,
+           m.matched
+    FROM chunks c
+    JOIN documents d ON c.doc_id = d.id
+    CROSS JOIN LATERAL (
+        SELECT CASE
+            WHEN c.entity_tokens IS NULL THEN ARRAY(
+                SELECT t FROM unnest(CAST(:tokens AS text[])) AS t
+                WHERE c.content_with_header ILIKE '%' || t || '%'
+            )
+            ELSE ARRAY(
+                SELECT unnest(c.entity_tokens)
+                INTERSECT
+                SELECT unnest(CAST(:tokens AS text[]))
+            )
+        END AS matched
+    ) m
+    WHERE c.vault_id = :vault_id
+      AND (
+          c.entity_tokens && CAST(:tokens AS text[])
+          -- chunks not yet backfilled: the old ILIKE scan
+          OR (c.entity_tokens IS NULL
+              AND c.content_with_header ILIKE ANY(CAST(:patterns AS text[])))
+      )
+      AND c.is_deleted = false
+      AND d.status = 'active'
+    ORDER BY cardinality(m.matched) DESC, c.doc_id, c.chunk_index
+    LIMIT :limit
+""")
+
 
 async def entity_id_search(
     entity_ids: list[str],
     vault_id: UUID,
     db: AsyncSession,
 ) -> list[SearchResult]:
-    """Retrieve chunks whose content contains one of the entity IDs.
+    """Retrieve chunks that mention one of the entity IDs.
+
+    Bypasses embedding-based search and looks the IDs up in the
+    GIN-indexed ``chunks.entity_tokens`` column (ILIKE for chunks not
+    yet backfilled).  Critical for corpora
+    of near-identical documents (e.g. 800+ invoices with the same
+    template) where cosine similarity cannot distinguish the correct
+    document.
 
-    Bypasses embedding-based search and does a direct SQL ``ILIKE``
-    lookup.  Critical for corpora of near-identical documents (e.g.
-    800+ invoices with the same template) where cosine similarity
-    cannot distinguish the correct document.
+    Chunks matching more of the requested IDs rank first; ``score`` is
+    the fraction of IDs a chunk matches (1.0 for single-ID lookups).
 
     Args:
-        entity_ids: Numeric entity identifiers (e.g. ``["10248"]``).
+        entity_ids: Entity identifiers (e.g. ``["10248"]``, ``["INV-10248"]``).
         vault_id: Scope search to this vault.
         db: Async database session.
 
     Returns:
-        list[SearchResult]: Matching chunks with ``score=1.0``.
+        list[SearchResult]: Matching chunks, best first.
             Empty list if no matches or on error.
     """
     if not entity_ids:
@@ -42,56 +93,19 @@ async def entity_id_search(
 
     # Limit the number of IDs to prevent SQL explosion
     ids = entity_ids[: SETTINGS.ENTITY_SEARCH_MAX_IDS]
+    tokens_by_id = [set(identifier_lookup_tokens(eid)) for eid in ids]
+    tokens = sorted(set().union(*tokens_by_id))
+    if not tokens:
+        return []
 
     try:
-        # Build OR conditions for each entity ID
-        conditions = " OR ".join(
-            f"c.content_with_header ILIKE :id_{i}"
-            for i in range(len(ids))
-        )
-        params: dict = {"vault_id": vault_id, "limit": SETTINGS.ENTITY_SEARCH_LIMIT}
-        for i, eid in enumerate(ids):
-            params[f"id_{i}"] = f"%{eid}%"
-
-        query = sa_text(f"""
-            SELECT c.id, c.doc_id, c.content, c.content_with_header,
-                   c.chunk_index, c.section_heading, c.page_number,
-                   d.original_filename,
-                   c.embedding::text AS embedding_text
-            FROM chunks c
-            JOIN documents d ON c.doc_id = d.id
-            WHERE c.vault_id = :vault_id
-              AND c.is_deleted = false
-              AND d.status = 'active'
-              AND ({conditions})
-            ORDER BY c.chunk_index
-            LIMIT :limit
-        """)
-
-        result = await db.execute(query, params)
-        rows = result.fetchall()
-
-        results = [
-            SearchResult(
-                chunk_id=row.id,
-                doc_id=row.doc_id,
-                content=row.content,
-                content_with_header=row.content_with_header,
-                score=1.0,  # Exact match — highest confidence
-                section_heading=row.section_heading,
-                page_number=row.page_number,
-                original_filename=row.original_filename,
-                embedding=_parse_embedding(row.embedding_text),
-            )
-            for row in rows
-        ]
-
+        rows = await _fetch_matches(db, vault_id, tokens, SETTINGS.ENTITY_SEARCH_LIMIT)
+        results = _rank_rows(rows, tokens_by_id)
         if results:
             logger.info(
                 f"Entity search found {len(results)} chunks "
                 f"for IDs {ids} in vault {vault_id}"
             )
-
         return results
 
     except Exception as exc:
@@ -99,13 +113,141 @@ async def entity_id_search(
         return []
 
 
-def _parse_embedding(raw: str | None) -> list[float] | None:
-    """Parse a Postgres vector text representation into a float list."""
-    if not raw:
-        return None
+async def entity_id_search_many(
+    entity_ids_per_query: list[list[str]],
+    vault_id: UUID,
+    db: AsyncSession,
+) -> list[list[SearchResult]]:
+    """Entity lookups for several queries in one index probe.
+
+    Looks up the union of every query's tokens once, then ranks the
+    matching chunks separately for each query exactly as
+    :func:`entity_id_search` would (fraction of *that* query's IDs
+    matched). Each query keeps at most ``ENTITY_SEARCH_LIMIT`` chunks.
+
+    Args:
+        entity_ids_per_query: Entity identifiers per query (may be empty).
+        vault_id: Scope search to this vault.
+        db: Async database session.
+
+    Returns:
+        list[list[SearchResult]]: Matches per query, in input order.
+    """
+    empty: list[list[SearchResult]] = [[] for _ in entity_ids_per_query]
+    if not SETTINGS.ENTITY_SEARCH_ENABLED:
+        return empty
+
+    tokens_by_query = [
+        [set(identifier_lookup_tokens(eid)) for eid in ids[: SETTINGS.ENTITY_SEARCH_MAX_IDS]]
+        for ids in entity_ids_per_query
+    ]
+    tokens = sorted({t for per_id in tokens_by_query for id_tokens in per_id for t in id_tokens})
+    if not tokens:
+        return empty
+
+    searching = sum(1 for per_id in tokens_by_query if any(per_id))
     try:
-        # pgvector format: "[0.1,0.2,0.3,...]"
-        cleaned = raw.strip("[]")
-        return [float(x) for x in cleaned.split(",")]
-    except (ValueError, AttributeError):
-        return None
+        rows = await _fetch_matches(
+            db, vault_id, tokens, SETTINGS.ENTITY_SEARCH_LIMIT * searching,
+        )
+    except Exception as exc:
+        logger.warning(f"Entity-ID search failed: {exc}")
+        return empty
+
+    results: list[list[SearchResult]] = []
+    for tokens_by_id in tokens_by_query:
+        if not any(tokens_by_id):
+            results.append([])
+            continue
+        ranked = _rank_rows(rows, tokens_by_id)
+        results.append([r for r in ranked if r.score > 0][: SETTINGS.ENTITY_SEARCH_LIMIT])
+    return results
+
+
+async def _fetch_matches(db: AsyncSession, vault_id: UUID, tokens: list[str], limit: int) -> list:
+    # A savepoint: callers swallow a failed lookup and keep using the
+    # session (see sparse_hits)
+    async with db.begin_nested():
+        result = await db.execute(_ENTITY_SQL, {
+            "vault_id": vault_id,
+            "tokens": tokens,
+            "patterns": [f"%{t}%" for t in tokens],
+            "limit": limit,
+        })
+        return result.fetchall()
+
+
+def _rank_rows(rows: list, tokens_by_id: list[set[str]]) -> list[SearchResult]:
+    """Results scored by the fraction of IDs each chunk matches, best first."""
+    scores = [
+        sum(1 for id_tokens in tokens_by_id if id_tokens & set(row.matched)) / len(tokens_by_id)
+        for row in rows
+    ]
+    # SQL ranks by matched tokens; re-rank by matched IDs (stable)
+    order = sorted(range(len(rows)), key=lambda i: -scores[i])
+    rows = [rows[i] for i in order]
+
+    results = [
+        SearchResult(
+            chunk_id=row.id,
+            doc_id=row.doc_id,
+            content=row.content,
+            content_with_header=row.content_with_header,
+            score=scores[i],
+            section_heading=row.section_heading,
+            page_number=row.page_number,
+            original_filename=row.original_filename,
+        )
+        for i, row in zip(order, rows)
+    ]
+    attach_vectors(results, [row.embedding_bin for row in rows])
+    return results
+
+
+async def backfill_entity_tokens(
+    vault_id: UUID,
+    db: AsyncSession,
+    *,
+    batch_size: int = 500,
+) -> int:
+    """Fill ``entity_tokens`` for a vault's chunks stored before the column existed.
+
+    Commits after every batch, so it can be interrupted and re-run.
+
+    Args:
+        vault_id: Vault whose chunks to backfill.
+        db: Async database session.
+        batch_size: Chunks tokenised and updated per statement.
+
+    Returns:
+        int: Number of chunks updated.
+    """
+    updated = 0
+    while True:
+        result = await db.execute(
+            sa_text("""
+                SELECT id, content_with_header FROM chunks
+                WHERE vault_id = :vault_id AND entity_tokens IS NULL
+                LIMIT :limit
+            """),
+            {"vault_id": vault_id, "limit": batch_size},
+        )
+        rows = result.fetchall()
+        if not rows:
+            return updated
+
+        payload = [
+            {"id": str(row.id), "tokens": extract_identifier_tokens(row.content_with_header)}
+            for row in rows
+        ]
+        await db.execute(
+            sa_text("""
+                UPDATE chunks AS c
+                SET entity_tokens = ARRAY(SELECT jsonb_array_elements_text(m.tokens))
+                FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS m(id uuid, tokens jsonb)
+                WHERE c.vault_id = :vault_id AND c.id = m.id
+            """),
+            {"vault_id": vault_id, "rows": json.dumps(payload)},
+        )
+        await db.commit()
+        updated += len(rows)
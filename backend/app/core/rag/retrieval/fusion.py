@@ -0,0 +1,118 @@
+"""Vectorised fusion and diversification over a candidate matrix.
+
+Pure NumPy kernels used by hybrid search. They operate on candidate
+*indices* and a float32 embedding matrix, so callers only materialise
+result objects for the handful of candidates that are finally selected.
+
+Usage::
+
+    from app.core.rag.retrieval.fusion import rrf_scores, mmr_indices
+
+    scores = rrf_scores([dense_idx, sparse_idx], n_candidates)
+    picked = mmr_indices(query_vec, matrix, k=5, lambda_param=0.7)
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+
+# ---------------------------------------------------------------------------
+# Reciprocal Rank Fusion
+# ---------------------------------------------------------------------------
+
+def rrf_scores(
+    rank_lists: Sequence[np.ndarray],
+    n_candidates: int,
+    k: int = 60,
+) -> np.ndarray:
+    """Compute Reciprocal Rank Fusion scores for a candidate pool.
+
+    Score formula: ``score(d) = Σ 1 / (k + rank + 1)``
+
+    Args:
+        rank_lists: One array per retriever holding candidate indices in
+            rank order (best first).
+        n_candidates: Size of the candidate pool.
+        k: RRF smoothing constant (standard = 60).
+
+    Returns:
+        np.ndarray: float64 score per candidate index.
+    """
+    scores = np.zeros(n_candidates, dtype=np.float64)
+    for ranked in rank_lists:
+        if len(ranked) == 0:
+            continue
+        contrib = 1.0 / (k + np.arange(1, len(ranked) + 1, dtype=np.float64))
+        np.add.at(scores, ranked, contrib)
+    return scores
+
+
+def rank_by_score(scores: np.ndarray) -> np.ndarray:
+    """Return candidate indices sorted by score (descending, stable on ties)."""
+    return np.argsort(-scores, kind="stable")
+
+
+# ---------------------------------------------------------------------------
+# Maximal Marginal Relevance
+# ---------------------------------------------------------------------------
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalise each row of ``matrix`` (zero rows stay zero)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return matrix / norms
+
+
+def mmr_indices(
+    query_embedding: np.ndarray | Sequence[float],
+    matrix: np.ndarray,
+    k: int,
+    lambda_param: float = 0.7,
+) -> np.ndarray:
+    """Select ``k`` diverse rows of ``matrix`` with Maximal Marginal Relevance.
+
+    Rows are normalised once, then each step is a single mat-vec: the
+    query-similarity vector is fixed and the max-similarity-to-selected
+    vector is updated incrementally with the newest pick.
+
+    Args:
+        query_embedding: Query vector.
+        matrix: Candidate embeddings, one row per candidate.
+        k: Number of candidates to select.
+        lambda_param: Trade-off — 1.0 = pure relevance, 0.0 = pure diversity.
+
+    Returns:
+        np.ndarray: Selected row indices in selection order.
+    """
+    n = len(matrix)
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    candidates = normalize_rows(matrix)
+    query = normalize_rows(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+
+    query_sim = candidates @ query
+    selected = np.empty(k, dtype=np.intp)
+    selected[0] = int(np.argmax(query_sim))
+    if k == 1:
+        return selected
+
+    relevance = lambda_param * query_sim
+    max_sim = candidates @ candidates[selected[0]]
+    taken = np.zeros(n, dtype=bool)
+    taken[selected[0]] = True
+
+    for step in range(1, k):
+        mmr = relevance - (1.0 - lambda_param) * max_sim
+        mmr[taken] = -np.inf
+        best = int(np.argmax(mmr))
+        selected[step] = best
+        taken[best] = True
+        np.maximum(max_sim, candidates @ candidates[best], out=max_sim)
+
+    return selected
@@ -2,19 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
 from uuid import UUID
 
 import numpy as np
-from langchain_core.vectorstores.utils import maximal_marginal_relevance as _lc_mmr
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.rag.retrieval.base import SearchResult
-from app.core.rag.retrieval.dense import dense_search
-from app.core.rag.retrieval.sparse import sparse_search
+from app.core.rag.retrieval.base import RetrievalHit, SearchResult
+from app.core.rag.retrieval.dense import dense_hits, dense_hits_many
+from app.core.rag.retrieval.entity import entity_id_search, entity_id_search_many
+from app.core.rag.retrieval.fusion import mmr_indices, rank_by_score, rrf_scores
+from app.core.rag.retrieval.hydrate import hydrate_hits
+from app.core.rag.retrieval.sparse import sparse_hits, sparse_hits_many
+from app.core.config import get_settings
 from app.core.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+SETTINGS = get_settings()
+
 
 # ---------------------------------------------------------------------------
 # Public API
@@ -32,7 +42,8 @@ async def hybrid_search(
 
     Executes dense and sparse searches, merges the ranked lists using
     Reciprocal Rank Fusion, then applies Maximal Marginal Relevance
-    for diversity in the final results.
+    for diversity in the final results. Candidates are ranked as
+    lightweight hits; text is loaded only for the final ``top_k``.
 
     Args:
         query_text: Raw user query string.
@@ -46,28 +57,449 @@ async def hybrid_search(
     Returns:
         list[SearchResult]: High-quality results.
     """
+    fetch_k = _fetch_k(top_k)
+
+    dense_results = await dense_hits(query_embedding, vault_id, db, top_k=fetch_k)
+    sparse_results = await sparse_hits(query_text, vault_id, db, top_k=fetch_k)
+
+    logger.info(f"Hybrid search: dense={len(dense_results)}, sparse={len(sparse_results)}")
+
+    selected = _fuse(query_embedding, dense_results, sparse_results, top_k, mmr_lambda)
+    hydrated = await hydrate_hits(selected, vault_id, db)
+    return [h.to_result() for h in hydrated]
+
+
+@dataclass
+class HybridTimings:
+    """Wall-clock timings for one concurrent hybrid search, in milliseconds.
+
+    A leg that was not run (e.g. no entity IDs) has ``None``. Legs that
+    missed their deadline or raised are listed in ``degraded``.
+    ``embed_ms`` is set when the caller passed a pending embedding.
+    """
+
+    embed_ms: float | None = None
+    dense_ms: float | None = None
+    sparse_ms: float | None = None
+    entity_ms: float | None = None
+    fusion_ms: float = 0.0
+    hydrate_ms: float = 0.0
+    total_ms: float = 0.0
+    degraded: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "embed_ms": _round_ms(self.embed_ms),
+            "dense_ms": _round_ms(self.dense_ms),
+            "sparse_ms": _round_ms(self.sparse_ms),
+            "entity_ms": _round_ms(self.entity_ms),
+            "fusion_ms": _round_ms(self.fusion_ms),
+            "hydrate_ms": _round_ms(self.hydrate_ms),
+            "total_ms": _round_ms(self.total_ms),
+            "degraded": list(self.degraded),
+        }
+
+
+@dataclass
+class HybridSearchOutcome:
+    """Result of :func:`concurrent_hybrid_search`.
+
+    ``results`` are the fused + diversified hybrid hits. ``entity_results``
+    are the exact entity-ID matches, kept separate so callers decide how
+    to rank them against the hybrid list. Both are hydrated
+    :class:`RetrievalHit` objects — call ``to_result()`` at the API
+    boundary if a Pydantic model is needed.
+    """
+
+    results: list[RetrievalHit]
+    entity_results: list[RetrievalHit]
+    timings: HybridTimings
+
+
+async def concurrent_hybrid_search(
+    query_text: str,
+    query_embedding: list[float] | Awaitable[list[float]],
+    vault_id: UUID,
+    top_k: int = 5,
+    mmr_lambda: float = 0.7,
+    entity_ids: list[str] | None = None,
+) -> HybridSearchOutcome:
+    """Hybrid search with dense, BM25 and entity legs running in parallel.
+
+    Each leg opens its own pooled session so pgvector and ParadeDB
+    queries execute concurrently instead of back-to-back on one
+    connection. Every leg has its own deadline; a leg that times out
+    or errors contributes no results (a slow BM25 leg degrades the
+    request to dense-only).
+
+    ``query_embedding`` may also be the pending embedder call (e.g.
+    ``embedder.embed_query(text)``, not awaited): the BM25 and entity
+    legs then run while the query is being embedded, and only the dense
+    leg waits for the vector. An embedding error is raised once the
+    other legs have finished.
+
+    Args:
+        query_text: Raw user query string.
+        query_embedding: Query vector from the embedder, or an awaitable of it.
+        vault_id: Scope search to this vault.
+        top_k: Final number of results after MMR.
+        mmr_lambda: Trade-off — 1.0 = pure relevance, 0.0 = pure diversity.
+        entity_ids: Optional entity identifiers for the exact-match leg.
+
+    Returns:
+        HybridSearchOutcome: Fused results, entity matches and per-leg timings.
+    """
+    from app.db import get_db_session
+
+    start = time.perf_counter()
+    timings = HybridTimings()
+    fetch_k = _fetch_k(top_k)
+    embedding = _start_embedding(query_embedding, timings)
+
+    async def _dense() -> list[RetrievalHit]:
+        async with get_db_session() as db:
+            return await dense_hits(embedding.result(), vault_id, db, top_k=fetch_k)
+
+    async def _sparse() -> list[RetrievalHit]:
+        async with get_db_session() as db:
+            return await sparse_hits(query_text, vault_id, db, top_k=fetch_k)
+
+    async def _entity() -> list[RetrievalHit]:
+        async with get_db_session() as db:
+            exact = await entity_id_search(entity_ids, vault_id, db)
+        return [RetrievalHit.from_result(r) for r in exact]
+
+    legs = [
+        _after_embedding(embedding, "dense", _dense, SETTINGS.HYBRID_DENSE_TIMEOUT_S, timings),
+        _run_leg("sparse", _sparse, SETTINGS.HYBRID_SPARSE_TIMEOUT_S, timings),
+    ]
+    if entity_ids:
+        legs.append(
+            _run_leg("entity", _entity, SETTINGS.HYBRID_ENTITY_TIMEOUT_S, timings),
+        )
+
+    leg_results = await asyncio.gather(*legs)
+    dense_results, sparse_results = leg_results[0], leg_results[1]
+    entity_results = leg_results[2] if entity_ids else []
+    query_embedding = await embedding
+
+    fusion_start = time.perf_counter()
+    results = _fuse(query_embedding, dense_results, sparse_results, top_k, mmr_lambda)
+    timings.fusion_ms = (time.perf_counter() - fusion_start) * 1000
+
+    if results:
+        hydrate_start = time.perf_counter()
+        async with get_db_session() as db:
+            results = await hydrate_hits(results, vault_id, db)
+        timings.hydrate_ms = (time.perf_counter() - hydrate_start) * 1000
+
+    timings.total_ms = (time.perf_counter() - start) * 1000
+
+    logger.info(
+        f"Hybrid search (concurrent): dense={len(dense_results)}, "
+        f"sparse={len(sparse_results)}, entity={len(entity_results)}, "
+        f"timings={timings.as_dict()}"
+    )
+
+    return HybridSearchOutcome(
+        results=results, entity_results=entity_results, timings=timings,
+    )
+
+
+async def batch_hybrid_search(
+    query_texts: list[str],
+    query_embeddings: list[list[float]] | Awaitable[list[list[float]]],
+    vault_id: UUID,
+    top_k: int = 5,
+    mmr_lambda: float = 0.7,
+    entity_ids: list[list[str]] | None = None,
+) -> list[HybridSearchOutcome]:
+    """Hybrid search for several queries with one statement per leg.
+
+    Same pipeline as :func:`concurrent_hybrid_search`, but each leg
+    answers every query at once (``dense_hits_many``,
+    ``sparse_hits_many``, ``entity_id_search_many``), and the selected
+    hits of all queries are hydrated together — four round trips and at
+    most three concurrent connections, whatever the number of queries.
+    As there, the embeddings may be passed as a pending
+    ``embed_queries`` call.
+
+    Args:
+        query_texts: Raw query strings.
+        query_embeddings: One vector per query, or an awaitable of them.
+        vault_id: Scope search to this vault.
+        top_k: Final number of results per query after MMR.
+        mmr_lambda: Trade-off — 1.0 = pure relevance, 0.0 = pure diversity.
+        entity_ids: Optional entity identifiers per query.
+
+    Returns:
+        list[HybridSearchOutcome]: One outcome per query, in input order.
+            They share one ``HybridTimings`` (the timings of the batch).
+    """
+    from app.db import get_db_session
+
+    start = time.perf_counter()
+    timings = HybridTimings()
+    fetch_k = _fetch_k(top_k)
+    n = len(query_texts)
+    no_hits: list[list[RetrievalHit]] = [[] for _ in range(n)]
+    embeddings = _start_embedding(query_embeddings, timings)
+
+    async def _dense() -> list[list[RetrievalHit]]:
+        async with get_db_session() as db:
+            return await dense_hits_many(embeddings.result(), vault_id, db, top_k=fetch_k)
+
+    async def _sparse() -> list[list[RetrievalHit]]:
+        async with get_db_session() as db:
+            return await sparse_hits_many(query_texts, vault_id, db, top_k=fetch_k)
+
+    async def _entity() -> list[list[RetrievalHit]]:
+        async with get_db_session() as db:
+            exact = await entity_id_search_many(entity_ids, vault_id, db)
+        return [[RetrievalHit.from_result(r) for r in per_query] for per_query in exact]
+
+    legs = [
+        _after_embedding(embeddings, "dense", _dense, SETTINGS.HYBRID_DENSE_TIMEOUT_S, timings),
+        _run_leg("sparse", _sparse, SETTINGS.HYBRID_SPARSE_TIMEOUT_S, timings),
+    ]
+    has_entities = bool(entity_ids and any(entity_ids))
+    if has_entities:
+        legs.append(
+            _run_leg("entity", _entity, SETTINGS.HYBRID_ENTITY_TIMEOUT_S, timings),
+        )
+
+    leg_results = await asyncio.gather(*legs)
+    dense_results = leg_results[0] or no_hits
+    sparse_results = leg_results[1] or no_hits
+    entity_results = (leg_results[2] if has_entities else None) or no_hits
+    query_embeddings = await embeddings
+
+    fusion_start = time.perf_counter()
+    selected = [
+        _fuse(embedding, dense, sparse, top_k, mmr_lambda)
+        for embedding, dense, sparse in zip(query_embeddings, dense_results, sparse_results)
+    ]
+    timings.fusion_ms = (time.perf_counter() - fusion_start) * 1000
+
+    # Fused hits are per-query copies, so one hydration fills every list
+    flat = [hit for hits in selected for hit in hits]
+    if flat:
+        hydrate_start = time.perf_counter()
+        async with get_db_session() as db:
+            await hydrate_hits(flat, vault_id, db)
+        timings.hydrate_ms = (time.perf_counter() - hydrate_start) * 1000
+        selected = [[hit for hit in hits if hit.is_hydrated] for hits in selected]
+
+    timings.total_ms = (time.perf_counter() - start) * 1000
+
+    logger.info(
+        f"Hybrid search (batch of {n}): dense={sum(map(len, dense_results))}, "
+        f"sparse={sum(map(len, sparse_results))}, "
+        f"entity={sum(map(len, entity_results))}, timings={timings.as_dict()}"
+    )
+
+    return [
+        HybridSearchOutcome(results=results, entity_results=exact, timings=timings)
+        for results, exact in zip(selected, entity_results)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Internals
+# ---------------------------------------------------------------------------
+
+def _fetch_k(top_k: int) -> int:
     # Fetch more candidates than needed for RRF + MMR to operate on.
     # Use a generous multiplier — with 800+ near-identical invoice docs
     # the correct document may rank outside the top 20 with dense alone.
-    fetch_k = max(top_k * 6, 40)
+    return max(top_k * 6, 40)
 
-    dense_results = await dense_search(query_embedding, vault_id, db, top_k=fetch_k)
-    sparse_results = await sparse_search(query_text, vault_id, db, top_k=fetch_k)
-
-    logger.info(f"Hybrid search: dense={len(dense_results)}, sparse={len(sparse_results)}")
 
+def _fuse(
+    query_embedding: list[float],
+    dense_results: list[RetrievalHit],
+    sparse_results: list[RetrievalHit],
+    top_k: int,
+    mmr_lambda: float,
+) -> list[RetrievalHit]:
+    """RRF-fuse the dense and sparse lists, then diversify with MMR.
+
+    Works on candidate indices end to end; only the ``top_k`` selected
+    results are copied.
+    """
     if not dense_results and not sparse_results:
         return []
 
-    # Fuse with RRF
-    fused = reciprocal_rank_fusion([dense_results, sparse_results])
+    pool = _build_pool([dense_results, sparse_results])
+    scores = rrf_scores(pool.rank_lists, len(pool.results))
+    order = rank_by_score(scores)
+    selected = _select(query_embedding, pool, order, top_k, mmr_lambda)
+    return _materialise(pool, selected, scores)
 
-    # Diversify with MMR
-    diverse = maximal_marginal_relevance(
-        query_embedding, fused, top_k=top_k, lambda_param=mmr_lambda,
-    )
 
-    return diverse
+async def _run_leg(
+    name: str,
+    leg: Callable[[], Awaitable[list[RetrievalHit]]],
+    timeout_s: float,
+    timings: HybridTimings,
+) -> list[RetrievalHit]:
+    """Run one retrieval leg under a deadline, recording its latency.
+
+    Returns an empty list when the leg times out or raises.
+    """
+    start = time.perf_counter()
+    try:
+        return await asyncio.wait_for(leg(), timeout=timeout_s)
+    except asyncio.TimeoutError:
+        logger.warning(f"Hybrid {name} leg exceeded {timeout_s}s deadline — dropped")
+        timings.degraded.append(name)
+        return []
+    except Exception as e:
+        logger.warning(f"Hybrid {name} leg failed: {e}")
+        timings.degraded.append(name)
+        return []
+    finally:
+        setattr(timings, f"{name}_ms", (time.perf_counter() - start) * 1000)
+
+
+def _start_embedding(value, timings: HybridTimings) -> asyncio.Future:
+    """Wrap the query embedding(s) in a future, starting it if still pending."""
+    if not inspect.isawaitable(value):
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        return future
+
+    async def _embed():
+        start = time.perf_counter()
+        try:
+            return await value
+        finally:
+            timings.embed_ms = (time.perf_counter() - start) * 1000
+
+    return asyncio.ensure_future(_embed())
+
+
+async def _after_embedding(
+    embedding: asyncio.Future,
+    name: str,
+    leg: Callable[[], Awaitable[list]],
+    timeout_s: float,
+    timings: HybridTimings,
+) -> list:
+    """Run a leg that needs the query vector once it is available.
+
+    The leg's deadline starts after the embedding; if embedding fails
+    the leg returns nothing and the caller re-raises the error.
+    """
+    try:
+        await embedding
+    except Exception:
+        return []
+    return await _run_leg(name, leg, timeout_s, timings)
+
+
+def _round_ms(value: float | None) -> float | None:
+    return round(value, 1) if value is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Candidate pool — index-based fusion
+# ---------------------------------------------------------------------------
+
+# Fusion works on internal hits and, for the public helpers, on models.
+_Ranked = RetrievalHit | SearchResult
+
+@dataclass
+class _CandidatePool:
+    """Unique candidates across retrievers, addressed by integer index.
+
+    ``results`` holds the highest-scoring original copy of each chunk
+    (not copied); ``vectors`` holds the first embedding seen for it.
+    """
+
+    results: list[_Ranked]
+    vectors: list[np.ndarray | None]
+    rank_lists: list[np.ndarray]
+
+
+def _build_pool(result_lists: list[list[_Ranked]]) -> _CandidatePool:
+    index: dict[UUID, int] = {}
+    results: list[_Ranked] = []
+    vectors: list[np.ndarray | None] = []
+    rank_lists: list[np.ndarray] = []
+
+    for result_list in result_lists:
+        ranked = np.empty(len(result_list), dtype=np.intp)
+        for rank, result in enumerate(result_list):
+            idx = index.get(result.chunk_id)
+            if idx is None:
+                idx = index[result.chunk_id] = len(results)
+                results.append(result)
+                vectors.append(result.vector)
+            else:
+                # Keep the copy with the highest original score
+                if result.score > results[idx].score:
+                    results[idx] = result
+                # Prefer copies that have an embedding vector
+                if vectors[idx] is None:
+                    vectors[idx] = result.vector
+            ranked[rank] = idx
+        rank_lists.append(ranked)
+
+    return _CandidatePool(results=results, vectors=vectors, rank_lists=rank_lists)
+
+
+def _select(
+    query_embedding: list[float],
+    pool: _CandidatePool,
+    order: np.ndarray,
+    top_k: int,
+    lambda_param: float,
+) -> list[int]:
+    """Pick ``top_k`` pool indices from ``order`` with MMR.
+
+    Candidates without embeddings (e.g. BM25-only hits) fill any slots
+    left after the embedding-based selection.
+    """
+    if len(order) <= top_k:
+        return order.tolist()
+
+    with_vec = [int(i) for i in order if pool.vectors[i] is not None]
+    without_vec = [int(i) for i in order if pool.vectors[i] is None]
+
+    if not with_vec:
+        # No embeddings available — fall back to relevance order
+        return order[:top_k].tolist()
+
+    matrix = np.stack([pool.vectors[i] for i in with_vec])
+    picked = mmr_indices(query_embedding, matrix, k=top_k, lambda_param=lambda_param)
+    selected = [with_vec[i] for i in picked]
+
+    # Fill remaining slots from results without embeddings
+    remaining = top_k - len(selected)
+    if remaining > 0:
+        selected.extend(without_vec[:remaining])
+    return selected
+
+
+def _materialise(
+    pool: _CandidatePool,
+    indices: list[int],
+    scores: np.ndarray,
+) -> list[_Ranked]:
+    """Copy only the selected candidates, stamping their fused score."""
+    return [
+        _rescore(pool.results[i], float(scores[i]), pool.vectors[i])
+        for i in indices
+    ]
+
+
+def _rescore(item: _Ranked, score: float, vector: np.ndarray | None) -> _Ranked:
+    if isinstance(item, RetrievalHit):
+        return item.rescored(score, vector)
+    copy = item.model_copy(update={"score": score})
+    copy._vector = vector
+    return copy
 
 
 # ---------------------------------------------------------------------------
@@ -89,26 +521,9 @@ def reciprocal_rank_fusion(
     Returns:
         list[SearchResult]: Merged list sorted by fused score (descending).
     """
-    scores: dict[str, float] = {}
-    best: dict[str, SearchResult] = {}
-
-    for result_list in result_lists:
-        for rank, result in enumerate(result_list):
-            cid = str(result.chunk_id)
-            scores[cid] = scores.get(cid, 0.0) + 1.0 / (k + rank + 1)
-            # Keep the copy with the highest original score
-            if cid not in best or result.score > best[cid].score:
-                best[cid] = result
-            # Prefer copies that have an embedding vector
-            if result.embedding is not None and best[cid].embedding is None:
-                best[cid] = best[cid].model_copy(update={"embedding": result.embedding})
-
-    fused = [
-        best[cid].model_copy(update={"score": fused_score})
-        for cid, fused_score in scores.items()
-    ]
-    fused.sort(key=lambda r: r.score, reverse=True)
-    return fused
+    pool = _build_pool(result_lists)
+    scores = rrf_scores(pool.rank_lists, len(pool.results), k=k)
+    return _materialise(pool, rank_by_score(scores).tolist(), scores)
 
 
 # ---------------------------------------------------------------------------
@@ -123,8 +538,8 @@ def maximal_marginal_relevance(
 ) -> list[SearchResult]:
     """Select diverse results using Maximal Marginal Relevance.
 
-    Delegates to ``langchain_core.vectorstores.utils.maximal_marginal_relevance``
-    for the core computation. Results without embeddings (e.g. from BM25-only
+    Uses the vectorised kernel in :mod:`fusion` over the candidates'
+    float32 vectors. Results without embeddings (e.g. from BM25-only
     retrieval) are appended after the embedding-based selection.
 
     Args:
@@ -138,31 +553,11 @@ def maximal_marginal_relevance(
     """
     if not results:
         return []
-    if len(results) <= top_k:
-        return list(results)
-
-    # Separate results with and without embeddings
-    with_emb = [(i, r) for i, r in enumerate(results) if r.embedding is not None]
-    without_emb = [r for r in results if r.embedding is None]
-
-    if not with_emb:
-        # No embeddings available — fall back to relevance order
-        return results[:top_k]
-
-    embedding_list = [r.embedding for _, r in with_emb]
 
-    selected_indices = _lc_mmr(
-        np.array(query_embedding),
-        embedding_list,
-        lambda_mult=lambda_param,
-        k=min(top_k, len(with_emb)),
+    pool = _CandidatePool(
+        results=list(results),
+        vectors=[r.vector for r in results],
+        rank_lists=[],
     )
-
-    selected = [with_emb[idx][1] for idx in selected_indices]
-
-    # Fill remaining slots from results without embeddings
-    remaining = top_k - len(selected)
-    if remaining > 0:
-        selected.extend(without_emb[:remaining])
-
-    return selected
+    order = np.arange(len(results))
+    return [results[i] for i in _select(query_embedding, pool, order, top_k, lambda_param)]
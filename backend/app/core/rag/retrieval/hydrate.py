@@ -0,0 +1,67 @@
+"""Lazy text loading for retrieval hits.
+
+Hybrid search ranks 80+ candidates but returns only ``top_k`` of them,
+so the dense and BM25 legs skip the chunk text columns. This module
+fetches text for the final selection in one round trip.
+"""
+
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.rag.retrieval.base import TEXT_COLUMNS, RetrievalHit
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+async def hydrate_hits(
+    hits: list[RetrievalHit],
+    vault_id: UUID,
+    db: AsyncSession,
+) -> list[RetrievalHit]:
+    """Load text fields for unhydrated hits, preserving order.
+
+    Hits whose chunk disappeared between ranking and hydration (e.g. a
+    concurrent delete) are dropped.
+
+    Args:
+        hits: Ranked hits, possibly unhydrated.
+        vault_id: Vault the hits were retrieved from (prunes the lookup
+            to that vault's ``chunks`` partition).
+        db: Async database session.
+
+    Returns:
+        list[RetrievalHit]: Hydrated hits in the original order.
+    """
+    missing = [h.chunk_id for h in hits if not h.is_hydrated]
+    if not missing:
+        return hits
+
+    query = text(f"""
+        SELECT c.id, {TEXT_COLUMNS}
+        FROM chunks c
+        JOIN documents d ON c.doc_id = d.id
+        WHERE c.id = ANY(:ids)
+          AND c.vault_id = :vault_id
+          AND c.is_deleted = FALSE
+    """)
+    result = await db.execute(query, {"ids": missing, "vault_id": str(vault_id)})
+    rows = {row[0]: row[1:] for row in result.fetchall()}
+
+    hydrated: list[RetrievalHit] = []
+    for hit in hits:
+        if not hit.is_hydrated:
+            row = rows.get(hit.chunk_id)
+            if row is None:
+                continue
+            (hit.content, hit.content_with_header, hit.section_heading,
+             hit.page_number, hit.original_filename) = row
+        hydrated.append(hit)
+
+    if len(hydrated) < len(hits):
+        logger.info(f"Hydration dropped {len(hits) - len(hydrated)} vanished chunks")
+    return hydrated
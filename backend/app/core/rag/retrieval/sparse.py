@@ -8,8 +8,12 @@ from uuid import UUID
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.rag.retrieval.base import SearchResult
-from app.core.rag.retrieval.dense import _parse_vector
+from app.core.rag.retrieval.base import (
+    TEXT_COLUMNS,
+    RetrievalHit,
+    SearchResult,
+    hits_from_rows,
+)
 from app.core.utils import normalize_numbers
 from app.core.config import get_settings
 from app.core.logger import setup_logger
@@ -24,6 +28,21 @@ SETTINGS = get_settings()
 _bm25_available: bool | None = None
 
 
+_SPARSE_SQL = """
+    SELECT c.id, c.doc_id,
+           paradedb.score(c.id) AS score,
+           vector_send(c.embedding) AS embedding_bin{text_columns}
+    FROM chunks c
+    JOIN documents d ON c.doc_id = d.id
+    WHERE c.content_with_header @@@ :query_text
+      AND c.vault_id = :vault_id
+      AND c.is_deleted = FALSE
+      AND d.status = 'active'
+    ORDER BY paradedb.score(c.id) DESC
+    LIMIT :top_k
+"""
+
+
 async def sparse_search(
     query_text: str,
     vault_id: UUID,
@@ -44,34 +63,49 @@ async def sparse_search(
     Returns:
         list[SearchResult]: Ranked by BM25 score (descending).
     """
+    hits = await sparse_hits(query_text, vault_id, db, top_k, with_text=True)
+    return [h.to_result() for h in hits]
+
+
+async def sparse_hits(
+    query_text: str,
+    vault_id: UUID,
+    db: AsyncSession,
+    top_k: int = 20,
+    with_text: bool = False,
+) -> list[RetrievalHit]:
+    """BM25 search returning lightweight hits for the hybrid pipeline.
+
+    Args:
+        query_text: Raw user query string.
+        vault_id: Scope search to this vault.
+        db: Async database session.
+        top_k: Maximum results to return.
+        with_text: Also select chunk text; otherwise hits are unhydrated.
+
+    Returns:
+        list[RetrievalHit]: Ranked by BM25 score (descending).
+    """
     sanitized = _sanitize_query(query_text)
     if not sanitized:
         return []
 
     global _bm25_available
 
-    query = text("""
-        SELECT c.id, c.doc_id, c.content, c.content_with_header,
-               paradedb.score(c.id) AS score,
-               c.section_heading, c.page_number,
-               d.original_filename,
-               c.embedding::text AS embedding_text
-        FROM chunks c
-        JOIN documents d ON c.doc_id = d.id
-        WHERE c.content_with_header @@@ :query_text
-          AND c.vault_id = :vault_id
-          AND c.is_deleted = FALSE
-          AND d.status = 'active'
-        ORDER BY paradedb.score(c.id) DESC
-        LIMIT :top_k
-    """)
+    query = text(_SPARSE_SQL.format(
+        text_columns=f", {TEXT_COLUMNS}" if with_text else "",
+    ))
 
     try:
-        result = await db.execute(query, {
-            "query_text": sanitized,
-            "vault_id": str(vault_id),
-            "top_k": top_k,
-        })
+        # A savepoint: a failed BM25 query must not abort the caller's
+        # transaction (hydration and later passes reuse the session)
+        async with db.begin_nested():
+            result = await db.execute(query, {
+                "query_text": sanitized,
+                "vault_id": str(vault_id),
+                "top_k": top_k,
+            })
+            rows = result.fetchall()
     except Exception as e:
         if _bm25_available is not False:
             # Log at ERROR level on the first failure so it's clearly visible
@@ -87,20 +121,68 @@ async def sparse_search(
         logger.info("BM25 search (ParadeDB) is available and operational")
         _bm25_available = True
 
-    return [
-        SearchResult(
-            chunk_id=row[0],
-            doc_id=row[1],
-            content=row[2],
-            content_with_header=row[3],
-            score=float(row[4]),
-            section_heading=row[5],
-            page_number=row[6],
-            original_filename=row[7],
-            embedding=_parse_vector(row[8]),
-        )
-        for row in result.fetchall()
-    ]
+    return hits_from_rows(rows)
+
+
+async def sparse_hits_many(
+    query_texts: list[str],
+    vault_id: UUID,
+    db: AsyncSession,
+    top_k: int = 20,
+) -> list[list[RetrievalHit]]:
+    """BM25 search for several queries in a single statement.
+
+    One ``UNION ALL`` branch per query (each with its own ``@@@``
+    predicate and limit) — one round trip however many queries.
+    Queries that sanitize to nothing get no hits; so does every query
+    if ParadeDB is unavailable.
+
+    Args:
+        query_texts: Raw query strings.
+        vault_id: Scope search to this vault.
+        db: Async database session.
+        top_k: Maximum results per query.
+
+    Returns:
+        list[list[RetrievalHit]]: Unhydrated hits per query, in input order.
+    """
+    global _bm25_available
+
+    hits: list[list[RetrievalHit]] = [[] for _ in query_texts]
+    params: dict = {"vault_id": str(vault_id), "top_k": top_k}
+    branches: list[str] = []
+    for i, query_text in enumerate(query_texts):
+        sanitized = _sanitize_query(query_text)
+        if not sanitized:
+            continue
+        params[f"query_text_{i}"] = sanitized
+        branch = _SPARSE_SQL.format(text_columns="").replace(":query_text", f":query_text_{i}")
+        branches.append(f"(SELECT {i} AS query_index, s.* FROM ({branch}) s)")
+    if not branches:
+        return hits
+
+    query = text("\nUNION ALL\n".join(branches) + "\nORDER BY query_index, score DESC")
+    try:
+        async with db.begin_nested():  # see sparse_hits
+            result = await db.execute(query, params)
+            rows = result.fetchall()
+    except Exception as e:
+        if _bm25_available is not False:
+            logger.error(
+                f"BM25 search unavailable (ParadeDB may not be installed): {e}. "
+                f"Falling back to dense-only retrieval."
+            )
+            _bm25_available = False
+        return hits
+
+    if _bm25_available is None:
+        logger.info("BM25 search (ParadeDB) is available and operational")
+        _bm25_available = True
+
+    rows_by_query: list[list] = [[] for _ in query_texts]
+    for row in rows:
+        rows_by_query[row[0]].append(tuple(row[1:]))
+    return [hits_from_rows(rows) for rows in rows_by_query]
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,263 @@
+"""Per-vault aggregate rollup of document metadata.
+
+Aggregate questions ("total of all invoices in 2017", "how many orders
+for VINET") only need counts and sums over ``documents`` grouped by
+type, order month and customer. The ``document_rollups`` table keeps
+those figures per vault, one row per (document_type, month,
+customer_id), so an aggregate answer is a single read of a few indexed
+rows instead of several scans of ``documents``.
+
+The rollup is maintained incrementally: every code path that moves a
+document into or out of the ``active`` status applies a signed delta in
+the same transaction (``apply_rollup_deltas``). Deltas are added with
+``ON CONFLICT DO UPDATE SET x = x + delta``, so concurrent writers never
+overwrite each other's counts.
+
+Usage::
+
+    from app.core.rag.rollup import apply_rollup_deltas, document_stats, rollup_delta
+
+    await apply_rollup_deltas(db, [rollup_delta(doc.vault_id, doc)])       # doc became active
+    await apply_rollup_deltas(db, [rollup_delta(doc.vault_id, doc, -1)])   # doc left active
+    stats = await document_stats(db, vault_id=vault_id, doc_type="invoice",
+                                 date_from=date(2017, 1, 1), date_to=date(2017, 12, 31))
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, timedelta
+from uuid import UUID
+
+from sqlalchemy import and_, func, text, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col, select
+
+from app.core.logger import setup_logger
+from app.core.utils import utcnow
+from app.db.models.document import Document
+from app.db.models.document_rollup import DocumentRollup
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class DocumentStats:
+    """Count, sum and metadata gaps for one set of aggregate filters.
+
+    Attributes:
+        doc_count: Active documents matching every filter.
+        total_price_sum: Sum of their total prices, or None if none has one.
+        missing_order_date: Documents matching the type/customer filters
+            that have no order date (and so cannot be placed in a range).
+        missing_total_price: Matching documents without a total price.
+        source: ``"rollup"`` or ``"documents"`` — where the figures came from.
+    """
+    doc_count: int = 0
+    total_price_sum: float | None = None
+    missing_order_date: int = 0
+    missing_total_price: int = 0
+    source: str = "rollup"
+
+
+# ---------------------------------------------------------------------------
+# Maintenance
+# ---------------------------------------------------------------------------
+
+def rollup_delta(vault_id: UUID, doc, sign: int = 1) -> dict:
+    """One document's contribution to its rollup row.
+
+    Args:
+        vault_id: Owning vault.
+        doc: Anything with ``document_type``, ``order_date``,
+            ``customer_id`` and ``total_price`` attributes (a ``Document``
+            or ``DocumentMetadata``); None for a document without metadata.
+        sign: +1 when the document becomes active, -1 when it stops being.
+    """
+    order_date = getattr(doc, "order_date", None)
+    price = getattr(doc, "total_price", None)
+    return {
+        "vault_id": str(vault_id),
+        "document_type": getattr(doc, "document_type", None),
+        "month": order_date.replace(day=1).isoformat() if isinstance(order_date, date) else None,
+        "customer_id": getattr(doc, "customer_id", None),
+        "doc_count": sign,
+        "missing_total_price": sign if price is None else 0,
+        # repr keeps the shortest exact decimal form for the numeric column
+        "total_price_sum": repr(sign * float(price)) if price is not None else "0",
+    }
+
+
+async def apply_rollup_deltas(db: AsyncSession, deltas: Sequence[dict], *, now=None) -> None:
+    """Add several ``rollup_delta`` rows to the rollup in one statement.
+
+    Deltas for the same key are summed first (an upsert may touch each
+    row once), and rows are written in key order so concurrent batches
+    lock them in the same order.
+
+    Args:
+        db: Async database session (not committed).
+        deltas: Rows from ``rollup_delta``.
+        now: ``updated_at`` value (defaults to the current UTC time).
+    """
+    if not deltas:
+        return
+    await db.execute(
+        text("""
+            INSERT INTO document_rollups AS r (
+                id, vault_id, document_type, month, customer_id,
+                doc_count, missing_total_price, total_price_sum, updated_at
+            )
+            SELECT gen_random_uuid(), d.vault_id, d.document_type, d.month, d.customer_id,
+                   sum(d.doc_count), sum(d.missing_total_price), sum(d.total_price_sum),
+                   CAST(:now AS timestamp)
+            FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS d(
+                vault_id uuid, document_type text, month date, customer_id text,
+                doc_count integer, missing_total_price integer, total_price_sum numeric
+            )
+            GROUP BY d.vault_id, d.document_type, d.month, d.customer_id
+            ORDER BY d.vault_id, d.document_type, d.month, d.customer_id
+            ON CONFLICT ON CONSTRAINT uq_document_rollups_key DO UPDATE SET
+                doc_count = r.doc_count + EXCLUDED.doc_count,
+                missing_total_price = r.missing_total_price + EXCLUDED.missing_total_price,
+                total_price_sum = r.total_price_sum + EXCLUDED.total_price_sum,
+                updated_at = EXCLUDED.updated_at
+        """),
+        {"now": now or utcnow(), "rows": json.dumps(list(deltas))},
+    )
+
+
+async def rebuild_vault_rollup(db: AsyncSession, vault_id: UUID) -> int:
+    """Recompute one vault's rollup rows from ``documents``.
+
+    For repairs only — run while the vault has no ingestion or deletion
+    in flight. Does not commit.
+
+    Returns:
+        Number of rollup rows written.
+    """
+    params = {"vault_id": str(vault_id), "now": utcnow()}
+    await db.execute(text("DELETE FROM document_rollups WHERE vault_id = :vault_id"), params)
+    result = await db.execute(
+        text("""
+            INSERT INTO document_rollups (
+                id, vault_id, document_type, month, customer_id,
+                doc_count, missing_total_price, total_price_sum, updated_at
+            )
+            SELECT gen_random_uuid(), vault_id, document_type,
+                   CAST(date_trunc('month', order_date) AS date), customer_id,
+                   count(*), count(*) FILTER (WHERE total_price IS NULL),
+                   coalesce(sum(CAST(total_price AS numeric)), 0), CAST(:now AS timestamp)
+            FROM documents
+            WHERE vault_id = :vault_id
+              AND status = 'active'
+              AND deleted_at IS NULL
+            GROUP BY vault_id, document_type, CAST(date_trunc('month', order_date) AS date), customer_id
+        """),
+        params,
+    )
+    return result.rowcount
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+async def document_stats(
+    db: AsyncSession,
+    *,
+    vault_id: UUID,
+    doc_type: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    customer_id: str | None = None,
+    use_rollup: bool = True,
+) -> DocumentStats:
+    """Count, sum and metadata gaps of the vault's matching active documents.
+
+    Reads the rollup when the date range covers whole months (which is
+    what ``parse_date_range`` produces); otherwise — or with
+    ``use_rollup=False`` — computes the same figures with one aggregate
+    query over ``documents``.
+    """
+    if use_rollup and _covers_whole_months(date_from, date_to):
+        return await _rollup_stats(db, vault_id, doc_type, date_from, date_to, customer_id)
+    return await _documents_stats(db, vault_id, doc_type, date_from, date_to, customer_id)
+
+
+def _covers_whole_months(date_from: date | None, date_to: date | None) -> bool:
+    if date_from and date_from.day != 1:
+        return False
+    if date_to and (date_to + timedelta(days=1)).day != 1:
+        return False
+    return True
+
+
+async def _rollup_stats(db, vault_id, doc_type, date_from, date_to, customer_id) -> DocumentStats:
+    filters = [DocumentRollup.vault_id == vault_id]
+    if doc_type:
+        filters.append(DocumentRollup.document_type == doc_type)
+    if customer_id:
+        filters.append(col(DocumentRollup.customer_id).ilike(customer_id))
+
+    in_range = [true()]
+    if date_from:
+        in_range.append(DocumentRollup.month >= date_from)
+    if date_to:
+        in_range.append(DocumentRollup.month <= date_to)
+    in_range = and_(*in_range)
+
+    stmt = select(
+        func.sum(DocumentRollup.doc_count).filter(in_range),
+        func.sum(DocumentRollup.doc_count).filter(col(DocumentRollup.month).is_(None)),
+        func.sum(DocumentRollup.missing_total_price).filter(in_range),
+        func.sum(DocumentRollup.total_price_sum).filter(in_range),
+    ).where(*filters)
+    count, missing_dates, missing_totals, total = (await db.execute(stmt)).one()
+
+    count, missing_totals = int(count or 0), int(missing_totals or 0)
+    return DocumentStats(
+        doc_count=count,
+        # The rollup stores 0 for "no priced documents"; report that as no sum
+        total_price_sum=float(total) if count > missing_totals else None,
+        missing_order_date=int(missing_dates or 0),
+        missing_total_price=missing_totals,
+        source="rollup",
+    )
+
+
+async def _documents_stats(db, vault_id, doc_type, date_from, date_to, customer_id) -> DocumentStats:
+    filters = [
+        Document.vault_id == vault_id,
+        Document.deleted_at.is_(None),  # type: ignore[union-attr]
+        Document.status == "active",
+    ]
+    if doc_type:
+        filters.append(Document.document_type == doc_type)
+    if customer_id:
+        filters.append(col(Document.customer_id).ilike(customer_id))
+
+    in_range = [true()]
+    if date_from:
+        in_range.append(Document.order_date >= date_from)
+    if date_to:
+        in_range.append(Document.order_date <= date_to)
+    in_range = and_(*in_range)
+
+    stmt = select(
+        func.count().filter(in_range),
+        func.count().filter(col(Document.order_date).is_(None)),
+        func.count().filter(and_(in_range, col(Document.total_price).is_(None))),
+        func.sum(Document.total_price).filter(in_range),
+    ).select_from(Document).where(*filters)
+    count, missing_dates, missing_totals, total = (await db.execute(stmt)).one()
+
+    return DocumentStats(
+        doc_count=count or 0,
+        total_price_sum=float(total) if total is not None else None,
+        missing_order_date=missing_dates or 0,
+        missing_total_price=missing_totals or 0,
+        source="documents",
+    )
@@ -0,0 +1,243 @@
+"""Vault content versions — Redis counters mirrored in-process.
+
+Caches whose entries depend on a vault's contents (verdicts, answers)
+put the vault's version in their keys. The version is a Redis counter,
+``vault_version:<vault_id>``, bumped after every commit that changes
+the vault's searchable chunks (ingestion, deletion). A bump is
+published on ``vault_version``; every API process subscribes and keeps
+a local copy, so building a cache key is a dict lookup — no database
+and, while subscribed, no Redis round trip.
+
+Local copies are only trusted while the subscription is live; without
+it (workers, scripts, a dropped connection) every read goes to Redis.
+Counters are seeded with the current time in microseconds when they
+are missing (first use, or evicted), so a vault's version never goes
+back to a value an older cache entry could have been stored under.
+
+Reads and bumps are fail-open: if Redis is unreachable the version
+falls back to the vault's ``updated_at`` from the database.
+
+Usage::
+
+    from app.core.rag.vault_version import bump_vault_versions, get_vault_version
+
+    version = await get_vault_version(vault_id)     # part of a cache key
+    await db.commit()
+    await bump_vault_versions([vault_id])           # after chunks changed
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Iterable
+from uuid import UUID
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.core.utils import singleton
+
+logger = setup_logger(__name__)
+SETTINGS = get_settings()
+
+_KEY_PREFIX = "vault_version:"
+_CHANNEL = "vault_version"
+_RESUBSCRIBE_DELAY_S = 1.0
+
+
+class VaultVersionCache:
+    """Process-local mirror of the per-vault version counters.
+
+    Args:
+        local_ttl_s: How long a local copy is trusted while subscribed
+            (a backstop in case an invalidation message is lost).
+    """
+
+    def __init__(self, local_ttl_s: float = 300.0) -> None:
+        self._local_ttl_s = local_ttl_s
+        self._local: dict[UUID, tuple[float, int]] = {}
+        self._subscribed = False
+        self._listener: asyncio.Task | None = None
+        self._stats = {"local_hits": 0, "redis_reads": 0, "db_fallbacks": 0, "bumps": 0}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get(self, vault_id: UUID) -> str:
+        """Current content version of a vault, as a cache-key component."""
+        local = self._local_get(vault_id)
+        if local is not None:
+            self._stats["local_hits"] += 1
+            return str(local)
+
+        try:
+            version = await _read_counter(vault_id)
+        except Exception as e:
+            logger.warning(f"Vault version read failed for {vault_id}, using updated_at: {e}")
+            self._stats["db_fallbacks"] += 1
+            return await _vault_updated_at(vault_id)
+
+        self._stats["redis_reads"] += 1
+        self._local_put(vault_id, version)
+        return str(version)
+
+    async def bump(self, vault_ids: Iterable[UUID]) -> None:
+        """Advance the versions of vaults whose contents just changed.
+
+        Call after the change is committed, so a reader that sees the
+        new version also sees the new data.
+        """
+        vault_ids = sorted(set(vault_ids), key=str)
+        if not vault_ids:
+            return
+        try:
+            client = await _get_client()
+            pipe = client.pipeline(transaction=True)
+            for vault_id in vault_ids:
+                pipe.set(_KEY_PREFIX + str(vault_id), _seed(), nx=True)
+                pipe.incr(_KEY_PREFIX + str(vault_id))
+            results = await pipe.execute()
+
+            pipe = client.pipeline(transaction=False)
+            for vault_id, version in zip(vault_ids, results[1::2]):
+                self._local_put(vault_id, int(version))
+                pipe.publish(_CHANNEL, f"{vault_id} {version}")
+            await pipe.execute()
+            self._stats["bumps"] += len(vault_ids)
+        except Exception as e:
+            # Cached entries for these vaults live on until their TTL
+            logger.warning(f"Vault version bump failed for {len(vault_ids)} vault(s): {e}")
+            for vault_id in vault_ids:
+                self._local.pop(vault_id, None)
+
+    def start(self) -> None:
+        """Start the background subscriber (idempotent)."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop the subscriber; later reads go to Redis."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._subscribed = False
+        self._local.clear()
+
+    def apply(self, message: str) -> None:
+        """Apply one ``"<vault_id> <version>"`` invalidation message."""
+        try:
+            raw_id, raw_version = message.split()
+            vault_id, version = UUID(raw_id), int(raw_version)
+        except ValueError:
+            logger.warning(f"Ignoring malformed vault version message: {message!r}")
+            return
+        self._local_put(vault_id, version)
+
+    def stats(self) -> dict:
+        """Lookup counters, subscription state and local size."""
+        return {
+            **self._stats,
+            "subscribed": self._subscribed,
+            "local_entries": len(self._local),
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _local_get(self, vault_id: UUID) -> int | None:
+        if not self._subscribed:
+            return None
+        entry = self._local.get(vault_id)
+        if entry is None:
+            return None
+        expires_at, version = entry
+        if expires_at < time.monotonic():
+            del self._local[vault_id]
+            return None
+        return version
+
+    def _local_put(self, vault_id: UUID, version: int) -> None:
+        # Versions only grow: never let a slow read overwrite a newer bump
+        current = self._local.get(vault_id)
+        if current is not None and current[1] > version:
+            version = current[1]
+        self._local[vault_id] = (time.monotonic() + self._local_ttl_s, version)
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = None
+            try:
+                client = await _get_client()
+                pubsub = client.pubsub()
+                await pubsub.subscribe(_CHANNEL)
+                # Anything cached before subscribing may have missed a bump
+                self._local.clear()
+                self._subscribed = True
+                logger.info("Subscribed to vault version invalidations")
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.apply(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Vault version subscription lost: {e}")
+            finally:
+                self._subscribed = False
+                self._local.clear()
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+            await asyncio.sleep(_RESUBSCRIBE_DELAY_S)
+
+
+def _seed() -> int:
+    return time.time_ns() // 1000
+
+
+async def _get_client():
+    from app.core.tools.redis import get_redis_client
+    return await get_redis_client()
+
+
+async def _read_counter(vault_id: UUID) -> int:
+    client = await _get_client()
+    pipe = client.pipeline(transaction=True)
+    pipe.set(_KEY_PREFIX + str(vault_id), _seed(), nx=True)
+    pipe.get(_KEY_PREFIX + str(vault_id))
+    _, version = await pipe.execute()
+    return int(version)
+
+
+async def _vault_updated_at(vault_id: UUID) -> str:
+    from sqlmodel import select
+    from app.db import get_db_session
+    from app.db.models.vault import Vault
+
+    async with get_db_session() as db:
+        result = await db.execute(select(Vault.updated_at).where(Vault.id == vault_id))
+        updated_at = result.scalar_one_or_none()
+    return updated_at.isoformat() if updated_at else "unknown"
+
+
+@singleton
+def get_vault_version_cache() -> VaultVersionCache:
+    """Return the shared vault version cache."""
+    return VaultVersionCache(local_ttl_s=SETTINGS.VAULT_VERSION_LOCAL_TTL_S)
+
+
+async def get_vault_version(vault_id: UUID) -> str:
+    """Current content version of ``vault_id`` (see module docstring)."""
+    return await get_vault_version_cache().get(vault_id)
+
+
+async def bump_vault_versions(vault_ids: Iterable[UUID]) -> None:
+    """Advance the content versions of ``vault_ids`` after a committed change."""
+    await get_vault_version_cache().bump(vault_ids)
@@ -0,0 +1,587 @@
+"""Shared LLM gateway — pooled clients, provider budgets and priority scheduling.
+
+Every chat-completion call in the process (chat, live verification,
+statement extraction, ingestion metadata enrichment) goes through here:
+
+  - One pooled HTTP client per provider, shared by every model
+    instance (``get_chat_model``, ``get_groq_client``). SDK-level
+    retries are off; the gateway retries.
+  - Per-provider budgets: concurrent calls, requests and tokens per
+    minute (``SETTINGS.LLM``). Calls wait in a priority queue for a
+    slot — ``Priority.LIVE`` before ``INTERACTIVE`` before ``BULK`` —
+    and bulk calls never hold more than ``BULK_MAX_SHARE`` of the
+    slots, so a burst of ingestion cannot delay live verification.
+  - One retry policy: rate limits, 408/409/5xx and connection errors
+    back off exponentially with jitter, or for as long as the
+    provider's ``Retry-After`` asks — and a rate limit pauses the whole
+    provider queue, not just the call that hit it. Timeouts are not
+    retried: ``timeout`` is the caller's latency budget for an attempt.
+  - Per-purpose latency, queueing, retry and token counters, exposed
+    via ``GET /metrics``.
+
+Usage::
+
+    llm = get_chat_model("gpt-4o-mini", temperature=0.0, json_mode=True)
+    response = await invoke_chat(
+        llm, messages, purpose="grading", priority=Priority.LIVE,
+        timeout=SETTINGS.API_TIMEOUT_S,
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import TypeVar
+
+import groq
+import httpx
+import openai
+from langchain_core.messages import BaseMessage
+from langchain_openai import ChatOpenAI
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+
+SETTINGS = get_settings()
+logger = setup_logger(__name__)
+
+_T = TypeVar("_T")
+
+_WINDOW_S = 60.0
+
+
+class Priority(IntEnum):
+    """Scheduling class of an LLM call; lower values are served first."""
+
+    LIVE = 0  # live transcript verification and statement extraction
+    INTERACTIVE = 1  # chat: agent, grounded generation, query rewrite
+    BULK = 2  # ingestion-time metadata enrichment
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+@dataclass
+class LlmCallStats:
+    """Cumulative counters for one call purpose.
+
+    Attributes:
+        calls: Calls made (retries not counted).
+        failures: Calls that raised after their last attempt.
+        timeouts: Attempts that exceeded their timeout.
+        retries: Attempts retried.
+        rate_limited: Attempts the provider answered with HTTP 429.
+        input_tokens: Input tokens the provider reported.
+        output_tokens: Output tokens the provider reported.
+        latency_ms: Time in provider calls, summed over attempts.
+        max_latency_ms: The slowest attempt.
+        queued_ms: Time spent waiting for a provider slot.
+    """
+    calls: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+    queued_ms: float = 0.0
+
+
+# Process-lifetime totals per purpose, exposed via GET /metrics
+_stats: dict[str, LlmCallStats] = {}
+
+
+def llm_stats() -> dict:
+    """Per-purpose call counters and per-provider queue state for this process."""
+    purposes = {}
+    for purpose, s in sorted(_stats.items()):
+        entry = asdict(s)
+        entry["latency_ms"] = round(s.latency_ms, 1)
+        entry["max_latency_ms"] = round(s.max_latency_ms, 1)
+        entry["queued_ms"] = round(s.queued_ms, 1)
+        attempts = s.calls + s.retries
+        entry["avg_latency_ms"] = round(s.latency_ms / attempts, 1) if attempts else 0.0
+        entry["avg_queued_ms"] = round(s.queued_ms / attempts, 1) if attempts else 0.0
+        purposes[purpose] = entry
+    return {
+        "purposes": purposes,
+        "providers": {name: limiter.state() for name, limiter in _limiters.items()},
+    }
+
+
+def _stats_for(purpose: str) -> LlmCallStats:
+    stats = _stats.get(purpose)
+    if stats is None:
+        stats = _stats[purpose] = LlmCallStats()
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Provider budgets
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Grant:
+    priority: Priority
+    entry: list  # [started_at, tokens] in the provider's one-minute window
+
+
+class ProviderLimiter:
+    """Priority-ordered admission to one provider's concurrency and rate budgets.
+
+    Waiting calls are served strictly by priority, then arrival. The
+    request and token budgets are checked against a sliding one-minute
+    window; a call's estimated tokens are replaced by the tokens the
+    provider reports once it finishes.
+
+    Args:
+        name: Provider name (for logs and metrics).
+        max_concurrency: Calls in flight at once.
+        requests_per_minute: Request budget (0 = unlimited).
+        tokens_per_minute: Token budget (0 = unlimited).
+        bulk_max_share: Share of ``max_concurrency`` bulk calls may hold.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_concurrency: int,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        bulk_max_share: float = 1.0,
+    ) -> None:
+        self.name = name
+        self._max_concurrency = max(max_concurrency, 1)
+        self._max_bulk = max(int(self._max_concurrency * bulk_max_share), 1)
+        self._rpm = requests_per_minute
+        self._tpm = tokens_per_minute
+        self._in_flight = 0
+        self._bulk_in_flight = 0
+        self._window: deque[list] = deque()
+        self._waiters: list[tuple[int, int, asyncio.Future, int]] = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def acquire(self, priority: Priority, tokens: int) -> _Grant:
+        """Wait for a slot within the provider's budgets."""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future, tokens))
+        self._dispatch()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # Granted in the same step the caller was cancelled
+            if future.done() and not future.cancelled():
+                self.release(future.result())
+            raise
+
+    def release(self, grant: _Grant, tokens: int | None = None) -> None:
+        """Free ``grant``'s slot; ``tokens`` replaces its estimate in the window."""
+        self._in_flight -= 1
+        if grant.priority == Priority.BULK:
+            self._bulk_in_flight -= 1
+        if tokens:
+            grant.entry[1] = tokens
+        self._dispatch()
+
+    def pause(self, seconds: float) -> None:
+        """Admit nothing for ``seconds`` (the provider asked callers to back off)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def state(self) -> dict:
+        now = time.monotonic()
+        self._prune(now)
+        return {
+            "in_flight": self._in_flight,
+            "waiting": sum(1 for *_, future, _ in self._waiters if not future.done()),
+            "requests_last_minute": len(self._window),
+            "tokens_last_minute": sum(tokens for _, tokens in self._window),
+            "paused_s": round(max(self._paused_until - now, 0.0), 1),
+        }
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        self._prune(now)
+        while self._waiters:
+            priority, _, future, tokens = self._waiters[0]
+            if future.done():  # cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+            wait = self._wait_time(priority, tokens, now)
+            if wait is None:  # no free slot: the next release dispatches
+                return
+            if wait > 0:
+                self._wake_in(wait)
+                return
+            heapq.heappop(self._waiters)
+            entry = [now, tokens]
+            self._window.append(entry)
+            self._in_flight += 1
+            if priority == Priority.BULK:
+                self._bulk_in_flight += 1
+            future.set_result(_Grant(priority, entry))
+
+    def _wait_time(self, priority: Priority, tokens: int, now: float) -> float | None:
+        """Seconds until the head call fits the budgets; None while slots are full."""
+        if self._in_flight >= self._max_concurrency:
+            return None
+        if priority == Priority.BULK and self._bulk_in_flight >= self._max_bulk:
+            return None
+        if self._paused_until > now:
+            return self._paused_until - now
+        if self._rpm and len(self._window) >= self._rpm:
+            return self._window[0][0] + _WINDOW_S - now
+        if self._tpm and self._window:
+            excess = sum(t for _, t in self._window) + tokens - self._tpm
+            if excess > 0:
+                # Until enough of the window expires (all of it for a call
+                # larger than the whole budget)
+                for started_at, t in self._window:
+                    excess -= t
+                    if excess <= 0:
+                        break
+                return started_at + _WINDOW_S - now
+        return 0.0
+
+    def _wake_in(self, seconds: float) -> None:
+        loop = asyncio.get_running_loop()
+        when = loop.time() + seconds
+        if self._timer is not None and not self._timer.cancelled() and self._timer.when() <= when:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_at(when, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def _prune(self, now: float) -> None:
+        while self._window and self._window[0][0] <= now - _WINDOW_S:
+            self._window.popleft()
+
+
+_limiters: dict[str, ProviderLimiter] = {}
+
+
+def _limiter(provider: str) -> ProviderLimiter:
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        cfg = SETTINGS.LLM
+        prefix = provider.upper()
+        limiter = _limiters[provider] = ProviderLimiter(
+            provider,
+            max_concurrency=getattr(cfg, f"{prefix}_MAX_CONCURRENCY"),
+            requests_per_minute=getattr(cfg, f"{prefix}_REQUESTS_PER_MINUTE"),
+            tokens_per_minute=getattr(cfg, f"{prefix}_TOKENS_PER_MINUTE"),
+            bulk_max_share=cfg.BULK_MAX_SHARE,
+        )
+    return limiter
+
+
+# ---------------------------------------------------------------------------
+# Pooled clients
+# ---------------------------------------------------------------------------
+
+_http_clients: dict[str, httpx.AsyncClient] = {}
+_chat_models: dict[tuple, ChatOpenAI] = {}
+_groq_client: groq.AsyncGroq | None = None
+
+
+def _http_client(provider: str) -> httpx.AsyncClient:
+    client = _http_clients.get(provider)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(
+            max_connections=SETTINGS.LLM.MAX_CONNECTIONS,
+            max_keepalive_connections=SETTINGS.LLM.MAX_KEEPALIVE_CONNECTIONS,
+        )
+        factory = groq.DefaultAsyncHttpxClient if provider == "groq" else openai.DefaultAsyncHttpxClient
+        client = _http_clients[provider] = factory(limits=limits)
+    return client
+
+
+def get_chat_model(
+    model: str,
+    *,
+    temperature: float,
+    json_mode: bool = False,
+    api_key: str | None = None,
+) -> ChatOpenAI:
+    """Shared OpenAI chat model on the pooled client (SDK retries off).
+
+    One instance per (model, temperature, json_mode, key); call through
+    ``invoke_chat`` / ``stream_chat`` so budgets and retries apply.
+    """
+    api_key = api_key or SETTINGS.OPENAI_API_KEY
+    key = (model, temperature, json_mode, api_key)
+    llm = _chat_models.get(key)
+    if llm is None:
+        llm = _chat_models[key] = ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            api_key=api_key,
+            max_retries=0,
+            http_async_client=_http_client("openai"),
+            model_kwargs={"response_format": {"type": "json_object"}} if json_mode else {},
+        )
+    return llm
+
+
+def get_groq_client() -> groq.AsyncGroq:
+    """Shared Groq client on the pooled client (SDK retries off)."""
+    global _groq_client
+    if _groq_client is None:
+        _groq_client = groq.AsyncGroq(
+            api_key=SETTINGS.GROQ_API_KEY,
+            max_retries=0,
+            http_client=_http_client("groq"),
+        )
+    return _groq_client
+
+
+async def close_llm_clients() -> None:
+    """Close the pooled HTTP clients (application shutdown)."""
+    global _groq_client
+    clients = list(_http_clients.values())
+    _http_clients.clear()
+    _chat_models.clear()
+    _groq_client = None
+    await asyncio.gather(*(c.aclose() for c in clients), return_exceptions=True)
+
+
+# ---------------------------------------------------------------------------
+# Calls
+# ---------------------------------------------------------------------------
+
+async def call_provider(
+    provider: str,
+    fn: Callable[[], Awaitable[_T]],
+    *,
+    purpose: str,
+    priority: Priority,
+    timeout: float,
+    estimated_tokens: int = 0,
+    max_retries: int | None = None,
+    usage: Callable[[_T], tuple[int, int]] | None = None,
+) -> _T:
+    """Run ``fn()`` — one provider request — within the provider's budgets.
+
+    Args:
+        provider: ``"openai"`` or ``"groq"``.
+        fn: Makes the request; called again for each retry.
+        purpose: Metrics label (``"agent"``, ``"grading"``, ...).
+        priority: Scheduling class.
+        timeout: Seconds per attempt (queueing not included).
+        estimated_tokens: Tokens to reserve until the provider reports usage.
+        max_retries: Overrides ``LLM_MAX_RETRIES``.
+        usage: ``(input_tokens, output_tokens)`` of a response.
+
+    Raises:
+        asyncio.TimeoutError: An attempt exceeded ``timeout``.
+        Exception: The provider error of the last attempt.
+    """
+    limiter = _limiter(provider)
+    stats = _stats_for(purpose)
+    stats.calls += 1
+    retries = SETTINGS.LLM.MAX_RETRIES if max_retries is None else max_retries
+
+    for attempt in range(retries + 1):
+        queued_at = time.monotonic()
+        grant = await limiter.acquire(priority, estimated_tokens)
+        started_at = time.monotonic()
+        stats.queued_ms += (started_at - queued_at) * 1000
+        used: int | None = None
+        try:
+            result = await asyncio.wait_for(fn(), timeout=timeout)
+            if usage is not None:
+                input_tokens, output_tokens = usage(result)
+                stats.input_tokens += input_tokens
+                stats.output_tokens += output_tokens
+                used = input_tokens + output_tokens
+            return result
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            stats.failures += 1
+            raise
+        except Exception as exc:
+            if getattr(exc, "status_code", None) == 429:
+                stats.rate_limited += 1
+            delay = _retry_delay(exc, attempt, limiter)
+            if delay is None or attempt == retries:
+                stats.failures += 1
+                raise
+            stats.retries += 1
+            logger.warning(
+                f"{provider} {purpose} call failed (attempt {attempt + 1}/{retries + 1}): "
+                f"{exc} — retrying in {delay:.1f}s"
+            )
+        finally:
+            latency = (time.monotonic() - started_at) * 1000
+            stats.latency_ms += latency
+            stats.max_latency_ms = max(stats.max_latency_ms, latency)
+            limiter.release(grant, used)
+        await asyncio.sleep(delay)
+
+    raise RuntimeError("Retry loop exhausted without result")
+
+
+async def invoke_chat(
+    llm,
+    messages: list[BaseMessage] | str,
+    *,
+    purpose: str,
+    priority: Priority,
+    timeout: float,
+    max_retries: int | None = None,
+):
+    """``llm.ainvoke(messages)`` through the OpenAI budgets (see ``call_provider``)."""
+    return await call_provider(
+        "openai",
+        lambda: llm.ainvoke(messages),
+        purpose=purpose,
+        priority=priority,
+        timeout=timeout,
+        estimated_tokens=_estimate_tokens(messages),
+        max_retries=max_retries,
+        usage=_message_usage,
+    )
+
+
+async def stream_chat(
+    llm,
+    messages: list[BaseMessage],
+    *,
+    purpose: str,
+    priority: Priority,
+) -> AsyncIterator:
+    """``llm.astream(messages)`` through the OpenAI budgets.
+
+    Failures before the first chunk are retried like ``call_provider``;
+    once chunks have been yielded, errors propagate to the caller.
+    """
+    limiter = _limiter("openai")
+    stats = _stats_for(purpose)
+    stats.calls += 1
+    retries = SETTINGS.LLM.MAX_RETRIES
+
+    for attempt in range(retries + 1):
+        queued_at = time.monotonic()
+        grant = await limiter.acquire(priority, _estimate_tokens(messages))
+        started_at = time.monotonic()
+        stats.queued_ms += (started_at - queued_at) * 1000
+        streamed = False
+        used: int | None = None
+        try:
+            async for chunk in llm.astream(messages):
+                streamed = True
+                input_tokens, output_tokens = _message_usage(chunk)
+                if input_tokens or output_tokens:
+                    stats.input_tokens += input_tokens
+                    stats.output_tokens += output_tokens
+                    used = input_tokens + output_tokens
+                yield chunk
+            return
+        except Exception as exc:
+            if getattr(exc, "status_code", None) == 429:
+                stats.rate_limited += 1
+            delay = None if streamed else _retry_delay(exc, attempt, limiter)
+            if delay is None or attempt == retries:
+                stats.failures += 1
+                raise
+            stats.retries += 1
+            logger.warning(
+                f"openai {purpose} stream failed (attempt {attempt + 1}/{retries + 1}): "
+                f"{exc} — retrying in {delay:.1f}s"
+            )
+        finally:
+            latency = (time.monotonic() - started_at) * 1000
+            stats.latency_ms += latency
+            stats.max_latency_ms = max(stats.max_latency_ms, latency)
+            limiter.release(grant, used)
+        await asyncio.sleep(delay)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+_RETRYABLE_STATUS = (408, 409, 429)
+_CONNECTION_ERRORS = (
+    ConnectionError, httpx.TransportError, openai.APIConnectionError, groq.APIConnectionError,
+)
+
+
+def _retry_delay(exc: Exception, attempt: int, limiter: ProviderLimiter) -> float | None:
+    """Seconds to back off before retrying after ``exc``; None if not retryable.
+
+    A rate limit pauses the whole provider queue for the same time.
+    """
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        if status < 500 and status not in _RETRYABLE_STATUS:
+            return None
+    elif not isinstance(exc, _CONNECTION_ERRORS):
+        return None
+
+    cfg = SETTINGS.LLM
+    retry_after = _retry_after(exc)
+    if retry_after is None:
+        base = cfg.RETRY_BASE_DELAY_S * (2 ** attempt)
+        delay = base + random.uniform(0, cfg.RETRY_BASE_DELAY_S)
+    else:
+        delay = retry_after
+    delay = min(delay, cfg.RETRY_MAX_DELAY_S)
+
+    if status == 429:
+        limiter.pause(delay)
+        logger.warning(f"Rate limited by {limiter.name} — pausing its queue for {delay:.1f}s")
+    return delay
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """The provider's ``retry-after-ms`` / ``Retry-After`` header, in seconds."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _estimate_tokens(messages: list[BaseMessage] | str) -> int:
+    """Rough prompt size (~4 chars/token) to reserve before usage is known."""
+    if isinstance(messages, str):
+        return len(messages) // 4 + 1
+    return sum(
+        len(m.content) // 4 + 4 if isinstance(m.content, str) else 4
+        for m in messages
+    )
+
+
+def _message_usage(message) -> tuple[int, int]:
+    usage = getattr(message, "usage_metadata", None) or {}
+    return usage.get("input_tokens", 0) or 0, usage.get("output_tokens", 0) or 0
@@ -8,29 +8,48 @@ logger = setup_logger(__name__)
 
 
 redis_client: Optional[aioredis.Redis] = None
+redis_binary_client: Optional[aioredis.Redis] = None
 
 
 async def init_redis_client() -> None:
     """Initialize the Redis client and verify connectivity."""
     global redis_client
-    redis_client = aioredis.from_url(url=SETTINGS.REDIS_URL, decode_responses=True)
+    redis_client = aioredis.from_url(
+        url=SETTINGS.REDIS_URL,
+        decode_responses=True,
+        health_check_interval=SETTINGS.REDIS_HEALTH_CHECK_INTERVAL_S,
+    )
     await redis_client.ping()
 
 
 async def get_redis_client() -> aioredis.Redis:
-    """Get the Redis client, reconnecting if the connection dropped."""
-    global redis_client
+    """Get the shared Redis client, initialising it on first use.
+
+    Does not PING per call: the connection pool drops broken
+    connections and reconnects on the next command, and idle
+    connections are health-checked every
+    ``REDIS_HEALTH_CHECK_INTERVAL_S`` seconds.
+    """
     if redis_client is None:
         await init_redis_client()
-        return redis_client
-    try:
-        await redis_client.ping()
-    except Exception:
-        logger.warning("Redis connection lost — reconnecting")
-        await init_redis_client()
     return redis_client
 
 
+async def get_redis_binary_client() -> aioredis.Redis:
+    """Get a Redis client that returns raw ``bytes`` (no response decoding).
+
+    Used for binary payloads such as packed float32 embeddings.
+    """
+    global redis_binary_client
+    if redis_binary_client is None:
+        redis_binary_client = aioredis.from_url(
+            url=SETTINGS.REDIS_URL,
+            decode_responses=False,
+            health_check_interval=SETTINGS.REDIS_HEALTH_CHECK_INTERVAL_S,
+        )
+    return redis_binary_client
+
+
 async def redis_health_check() -> bool:
     """Return True if Redis is reachable, False otherwise."""
     try:
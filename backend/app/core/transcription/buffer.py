@@ -17,6 +17,7 @@ from typing import Protocol, runtime_checkable
 from uuid import UUID
 
 from app.core.transcription.base import TranscriptSegment
+from app.core.rag.metadata import REFERENCE_NUMBER_PATTERN
 from app.core.config import get_settings
 from app.core.logger import setup_logger
 
@@ -190,12 +191,7 @@ class TranscriptBuffer:
                         entities["amounts"].add(v)
 
         # Extract reference numbers with entity keywords
-        for match in re.finditer(
-            r"(?:invoice|order|po|purchase\s*order|contract|ticket|case|"
-            r"serial|batch|lot|ref|shipment|delivery|receipt)"
-            r"\s*(?:number|#|id|no\.?)?\s*:?\s*([A-Z]*-?\d{3,})",
-            text, re.IGNORECASE,
-        ):
+        for match in REFERENCE_NUMBER_PATTERN.finditer(text):
             entities["reference_numbers"].add(match.group(1))
 
         # Bare numeric IDs (5+ digits to avoid false positives)
@@ -0,0 +1,48 @@
+"""Add chunks.entity_tokens with a GIN index for exact entity lookups.
+
+``entity_id_search`` used to OR together ``content_with_header ILIKE
+'%10248%'`` predicates, which no index can serve — a sequential scan of
+the vault's chunks on every entity lookup. Ingestion now stores each
+chunk's identifier tokens (invoice/order numbers, named references) in
+a ``text[]`` column, and lookups use ``entity_tokens && ARRAY[...]``
+against a GIN index (built per ``chunks`` partition).
+
+Existing rows start with NULL tokens. Lookups still match those with
+ILIKE (a partial index keeps finding them cheap, and empty once
+backfilled); fill them with::
+
+    PYTHONPATH=. python scripts/backfill_entity_tokens.py
+
+Revision ID: a9d3e5f7b1c2
+Revises: f7a2d4c8e1b3
+Create Date: 2025-07-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a9d3e5f7b1c2"
+down_revision: Union[str, Sequence[str], None] = "f7a2d4c8e1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the entity_tokens column, its GIN index and the not-yet-backfilled index."""
+    op.add_column("chunks", sa.Column("entity_tokens", ARRAY(sa.Text()), nullable=True))
+    op.execute("CREATE INDEX idx_chunks_entity_tokens ON chunks USING gin (entity_tokens)")
+    op.execute(
+        "CREATE INDEX idx_chunks_untokenized ON chunks (vault_id) WHERE entity_tokens IS NULL"
+    )
+
+
+def downgrade() -> None:
+    """Drop the entity_tokens column and its indexes."""
+    op.execute("DROP INDEX IF EXISTS idx_chunks_untokenized")
+    op.execute("DROP INDEX IF EXISTS idx_chunks_entity_tokens")
+    op.drop_column("chunks", "entity_tokens")
@@ -0,0 +1,43 @@
+"""Add embedding_cache table for content-hash keyed chunk embeddings.
+
+Lets ingestion skip the OpenAI call for chunk texts that were already
+embedded (template boilerplate, re-uploads). Rows are keyed by
+sha256 of ``model:dimensions:content_with_header``, so a model or
+dimension change never serves a stale vector.
+
+Revision ID: b7d2c9e4f5a6
+Revises: a4f1e2d83b01
+Create Date: 2025-07-02 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2c9e4f5a6"
+down_revision: Union[str, Sequence[str], None] = "a4f1e2d83b01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the embedding_cache table."""
+    op.create_table(
+        "embedding_cache",
+        sa.Column("key_hash", sa.String(length=64), nullable=False),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("dimensions", sa.Integer(), nullable=False),
+        sa.Column("embedding", Vector(1536), nullable=False),
+        sa.Column("token_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("key_hash"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the embedding_cache table."""
+    op.drop_table("embedding_cache")
@@ -0,0 +1,71 @@
+"""Add the per-vault document_rollups aggregate table.
+
+Aggregate verification and the ``filter_documents`` tool counted and
+summed ``documents`` with several separate queries per question (count,
+missing dates, missing prices, sum). ``document_rollups`` keeps those
+figures per vault and (document_type, order month, customer_id); the
+ingestion and deletion paths apply signed deltas to it as documents
+enter and leave the ``active`` status (``app.core.rag.rollup``).
+
+The key columns are nullable (NULL groups documents missing that
+field), hence the NULLS NOT DISTINCT unique constraint — PostgreSQL 15+.
+Existing active documents are rolled up here.
+
+Revision ID: c5e8f1a3d7b9
+Revises: a9d3e5f7b1c2
+Create Date: 2025-07-22 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e8f1a3d7b9"
+down_revision: Union[str, Sequence[str], None] = "a9d3e5f7b1c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create document_rollups and fill it from the active documents."""
+    op.create_table(
+        "document_rollups",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("vault_id", sa.Uuid(), nullable=False),
+        sa.Column("document_type", sa.String(length=50), nullable=True),
+        sa.Column("month", sa.Date(), nullable=True),
+        sa.Column("customer_id", sa.String(length=50), nullable=True),
+        sa.Column("doc_count", sa.Integer(), nullable=False),
+        sa.Column("missing_total_price", sa.Integer(), nullable=False),
+        sa.Column("total_price_sum", sa.Numeric(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["vault_id"], ["vaults.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "vault_id", "document_type", "month", "customer_id",
+            name="uq_document_rollups_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+    op.execute("""
+        INSERT INTO document_rollups (
+            id, vault_id, document_type, month, customer_id,
+            doc_count, missing_total_price, total_price_sum, updated_at
+        )
+        SELECT gen_random_uuid(), vault_id, document_type,
+               CAST(date_trunc('month', order_date) AS date), customer_id,
+               count(*), count(*) FILTER (WHERE total_price IS NULL),
+               coalesce(sum(CAST(total_price AS numeric)), 0),
+               timezone('utc', now())
+        FROM documents
+        WHERE status = 'active' AND deleted_at IS NULL
+        GROUP BY vault_id, document_type, CAST(date_trunc('month', order_date) AS date), customer_id
+    """)
+
+
+def downgrade() -> None:
+    """Drop the document_rollups table."""
+    op.drop_table("document_rollups")
@@ -0,0 +1,125 @@
+"""Hash-partition chunks by vault_id with per-partition HNSW and BM25 indexes.
+
+With one table-wide index per access method, every vault's search walks
+the same HNSW graph and BM25 index and filters ``vault_id`` afterwards:
+small vaults inside a large table lose recall (the ANN candidates
+belong to other vaults) and large vaults slow every search down.
+
+``chunks`` becomes a table partitioned by ``HASH (vault_id)`` into
+``CHUNK_PARTITIONS`` partitions (``chunks_p00`` ...). Every partition
+has its own HNSW and BM25 index, and retrieval SQL filtering on
+``vault_id`` is pruned to a single partition. Existing rows are copied
+over inside the migration transaction.
+
+Partitioned tables require the partition key in every unique
+constraint, so:
+  - the primary key becomes (id, vault_id)
+  - uq_chunks_doc_index_version becomes (vault_id, doc_id, chunk_index, chunk_version)
+  - the unused parent_chunk_id self-reference loses its foreign key
+    (the column is kept)
+
+The HNSW index dropped by 0838ab6e302a is recreated here, per partition.
+
+Revision ID: e4c1a7b3d920
+Revises: b7d2c9e4f5a6
+Create Date: 2025-07-09 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4c1a7b3d920"
+down_revision: Union[str, Sequence[str], None] = "b7d2c9e4f5a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Changing this later means re-partitioning: write a new migration
+CHUNK_PARTITIONS = 16
+
+
+def _partition(i: int) -> str:
+    return f"chunks_p{i:02d}"
+
+
+def upgrade() -> None:
+    """Copy chunks into a vault-partitioned table and index each partition."""
+    op.execute("""
+        CREATE TABLE chunks_partitioned (LIKE chunks INCLUDING DEFAULTS)
+        PARTITION BY HASH (vault_id)
+    """)
+    for i in range(CHUNK_PARTITIONS):
+        op.execute(f"""
+            CREATE TABLE {_partition(i)} PARTITION OF chunks_partitioned
+            FOR VALUES WITH (MODULUS {CHUNK_PARTITIONS}, REMAINDER {i})
+        """)
+
+    # Load before indexing: one index build per partition instead of
+    # incremental HNSW / BM25 inserts
+    op.execute("INSERT INTO chunks_partitioned SELECT * FROM chunks")
+    op.execute("DROP TABLE chunks")
+    op.execute("ALTER TABLE chunks_partitioned RENAME TO chunks")
+
+    op.execute("ALTER TABLE chunks ADD CONSTRAINT chunks_pkey PRIMARY KEY (id, vault_id)")
+    op.execute("""
+        ALTER TABLE chunks ADD CONSTRAINT uq_chunks_doc_index_version
+        UNIQUE (vault_id, doc_id, chunk_index, chunk_version)
+    """)
+    op.execute("""
+        ALTER TABLE chunks ADD CONSTRAINT chunks_doc_id_fkey
+        FOREIGN KEY (doc_id) REFERENCES documents (id)
+    """)
+    op.execute("""
+        ALTER TABLE chunks ADD CONSTRAINT chunks_vault_id_fkey
+        FOREIGN KEY (vault_id) REFERENCES vaults (id)
+    """)
+
+    # Created on the parent, built per partition
+    op.execute("CREATE INDEX idx_chunks_doc ON chunks (doc_id)")
+    op.execute("""
+        CREATE INDEX idx_chunks_embedding ON chunks
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 200)
+    """)
+
+    # pg_search indexes are created on each partition directly
+    for i in range(CHUNK_PARTITIONS):
+        op.execute(f"""
+            CREATE INDEX {_partition(i)}_bm25_idx ON {_partition(i)}
+            USING bm25 (id, content_with_header)
+            WITH (key_field = 'id')
+        """)
+
+
+def downgrade() -> None:
+    """Copy chunks back into a single unpartitioned table."""
+    op.execute("CREATE TABLE chunks_unpartitioned (LIKE chunks INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO chunks_unpartitioned SELECT * FROM chunks")
+    op.execute("DROP TABLE chunks")  # drops the partitions and their indexes
+    op.execute("ALTER TABLE chunks_unpartitioned RENAME TO chunks")
+
+    op.execute("ALTER TABLE chunks ADD CONSTRAINT chunks_pkey PRIMARY KEY (id)")
+    op.execute("""
+        ALTER TABLE chunks ADD CONSTRAINT uq_chunks_doc_index_version
+        UNIQUE (doc_id, chunk_index, chunk_version)
+    """)
+    op.execute("""
+        ALTER TABLE chunks ADD CONSTRAINT chunks_doc_id_fkey
+        FOREIGN KEY (doc_id) REFERENCES documents (id)
+    """)
+    op.execute("""
+        ALTER TABLE chunks ADD CONSTRAINT chunks_vault_id_fkey
+        FOREIGN KEY (vault_id) REFERENCES vaults (id)
+    """)
+    op.execute("""
+        ALTER TABLE chunks ADD CONSTRAINT chunks_parent_chunk_id_fkey
+        FOREIGN KEY (parent_chunk_id) REFERENCES chunks (id)
+    """)
+    op.execute("""
+        CREATE INDEX chunks_bm25_idx
+        ON chunks
+        USING bm25(id, content_with_header)
+        WITH (key_field = 'id')
+    """)
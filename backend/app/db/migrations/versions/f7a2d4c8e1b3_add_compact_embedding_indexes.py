@@ -0,0 +1,54 @@
+"""Add compact HNSW expression indexes for two-stage dense search.
+
+The fp32 HNSW index on ``chunks.embedding`` stores 6 KB per vector, so on
+large vaults dense search is dominated by index pages missing the
+buffer cache. Two smaller indexes are built over expressions of the
+same column — no extra column to maintain, Postgres keeps them in sync
+on every insert:
+
+  - idx_chunks_embedding_half: ``embedding::halfvec(1536)`` (half the size)
+  - idx_chunks_embedding_bq: binary quantization of the first 512
+    dimensions (text-embedding-3 vectors are Matryoshka-trained, so the
+    prefix keeps most of the ranking signal) — 64 bytes per vector
+
+``DENSE_SEARCH_MODE`` selects which one ``dense_search`` over-fetches
+from before reranking on the full vectors. The expressions must match
+``app.core.rag.retrieval.dense`` exactly.
+
+Requires pgvector >= 0.7 (halfvec, binary_quantize, subvector).
+
+Revision ID: f7a2d4c8e1b3
+Revises: e4c1a7b3d920
+Create Date: 2025-07-14 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f7a2d4c8e1b3"
+down_revision: Union[str, Sequence[str], None] = "e4c1a7b3d920"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the halfvec and binary-quantized HNSW indexes."""
+    op.execute("""
+        CREATE INDEX idx_chunks_embedding_half ON chunks
+        USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)
+        WITH (m = 16, ef_construction = 200)
+    """)
+    op.execute("""
+        CREATE INDEX idx_chunks_embedding_bq ON chunks
+        USING hnsw ((binary_quantize(subvector(embedding, 1, 512))::bit(512)) bit_hamming_ops)
+        WITH (m = 16, ef_construction = 200)
+    """)
+
+
+def downgrade() -> None:
+    """Drop the compact indexes."""
+    op.execute("DROP INDEX IF EXISTS idx_chunks_embedding_bq")
+    op.execute("DROP INDEX IF EXISTS idx_chunks_embedding_half")
@@ -1,7 +1,9 @@
 from app.db.models.user import User
 from app.db.models.vault import Vault, VaultMember
 from app.db.models.document import Document
+from app.db.models.document_rollup import DocumentRollup
 from app.db.models.chunk import Chunk
+from app.db.models.embedding_cache import EmbeddingCacheEntry
 from app.db.models.audit_log import AuditLog
 from app.db.models.feedback import Feedback
 from app.db.models.transcription_session import TranscriptionSession
@@ -13,7 +15,9 @@ __all__ = [
     "Vault",
     "VaultMember",
     "Document",
+    "DocumentRollup",
     "Chunk",
+    "EmbeddingCacheEntry",
     "AuditLog",
     "Feedback",
     "TranscriptionSession",
@@ -14,14 +14,21 @@ except ImportError:
 
 class Chunk(SQLModel, table=True):
     __tablename__ = "chunks"
+    # Hash-partitioned by vault (partitions and their HNSW / BM25 indexes
+    # are created by migration e4c1a7b3d920), so every unique constraint
+    # includes vault_id and vault-scoped queries touch one partition.
     __table_args__ = (
-        UniqueConstraint("doc_id", "chunk_index", "chunk_version", name="uq_chunks_doc_index_version"),
+        UniqueConstraint(
+            "vault_id", "doc_id", "chunk_index", "chunk_version",
+            name="uq_chunks_doc_index_version",
+        ),
+        {"postgresql_partition_by": "HASH (vault_id)"},
     )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     doc_id: UUID = Field(foreign_key="documents.id", nullable=False)
-    vault_id: UUID = Field(foreign_key="vaults.id", nullable=False)
-    parent_chunk_id: UUID | None = Field(default=None, foreign_key="chunks.id")
+    vault_id: UUID = Field(foreign_key="vaults.id", primary_key=True, nullable=False)
+    parent_chunk_id: UUID | None = Field(default=None)
     chunk_type: str = Field(default="child", max_length=20, nullable=False)
     content: str = Field(nullable=False)
     content_with_header: str = Field(nullable=False)
@@ -35,6 +42,9 @@ class Chunk(SQLModel, table=True):
     char_end: int | None = Field(default=None)
     chunk_index: int = Field(nullable=False)
     embedding: Any | None = Field(default=None, sa_column=Column(VECTOR_TYPE, nullable=True))
+    # Identifier tokens (invoice/order numbers, references) — GIN-indexed
+    # for entity lookups; see app.core.rag.metadata.extract_identifier_tokens
+    entity_tokens: list[str] | None = Field(default=None, sa_column=Column(ARRAY(Text), nullable=True))
     is_deleted: bool = Field(default=False)
     chunk_version: int = Field(default=1)
     created_at: datetime = Field(default_factory=_utcnow_naive)
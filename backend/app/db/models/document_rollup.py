@@ -0,0 +1,39 @@
+from uuid import UUID, uuid4
+from datetime import date, datetime
+from decimal import Decimal
+from app.db.models.utils import _utcnow_naive
+from sqlalchemy import Column, Numeric, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+class DocumentRollup(SQLModel, table=True):
+    """Per-vault document counts and totals by (type, month, customer).
+
+    One row per key combination among the vault's active documents; a
+    NULL key column groups documents missing that metadata field. Rows
+    are adjusted by signed deltas whenever a document enters or leaves
+    the ``active`` status (``app.core.rag.rollup``), so aggregate counts
+    and sums read a handful of rows instead of scanning ``documents``.
+    """
+
+    __tablename__ = "document_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "vault_id", "document_type", "month", "customer_id",
+            name="uq_document_rollups_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    vault_id: UUID = Field(foreign_key="vaults.id", nullable=False)
+    document_type: str | None = Field(default=None, max_length=50)
+    month: date | None = Field(default=None)  # first day of the order_date month
+    customer_id: str | None = Field(default=None, max_length=50)
+    doc_count: int = Field(default=0, nullable=False)
+    missing_total_price: int = Field(default=0, nullable=False)
+    # numeric, so repeated +/- deltas never drift
+    total_price_sum: Decimal = Field(
+        default=Decimal(0), sa_column=Column(Numeric, nullable=False, server_default="0"),
+    )
+    updated_at: datetime = Field(default_factory=_utcnow_naive)
@@ -0,0 +1,24 @@
+from typing import Any
+from datetime import datetime
+from app.db.models.utils import _utcnow_naive
+from sqlalchemy import Column
+from sqlmodel import Field, SQLModel
+
+try:
+    from pgvector.sqlalchemy import Vector
+    VECTOR_TYPE = Vector(1536)
+except ImportError:
+    VECTOR_TYPE = None
+
+
+class EmbeddingCacheEntry(SQLModel, table=True):
+    """Document-chunk embedding keyed by sha256(model:dimensions:content_with_header)."""
+
+    __tablename__ = "embedding_cache"
+
+    key_hash: str = Field(primary_key=True, max_length=64)
+    model: str = Field(max_length=100, nullable=False)
+    dimensions: int = Field(nullable=False)
+    embedding: Any = Field(sa_column=Column(VECTOR_TYPE, nullable=False))
+    token_count: int = Field(default=0, nullable=False)
+    created_at: datetime = Field(default_factory=_utcnow_naive)
@@ -5,6 +5,8 @@ from app.core.logger import setup_logger
 from app.core.kafka.topics import (
     FileDeletedEvent, AuditEvent, AUDIT_EVENTS, parse_file_event,
 )
+from app.core.rag.rollup import apply_rollup_deltas, rollup_delta
+from app.core.rag.vault_version import bump_vault_versions
 from app.core.utils import utcnow, utcnow_aware
 from app.db.models import Document, Chunk
 from app.db.models.utils import touch_vault_updated_at
@@ -32,8 +34,11 @@ class DeletionWorker(BaseWorker):
 
         logger.info(f"Processing deletion for document {doc_id}")
 
-        # 1. Fetch document
-        result = await db.execute(select(Document).where(Document.id == doc_id))
+        # 1. Fetch and lock document (an ingestion finishing concurrently
+        #    either commits first or sees the deletion)
+        result = await db.execute(
+            select(Document).where(Document.id == doc_id).with_for_update()
+        )
         doc = result.scalars().first()
 
         if not doc:
@@ -45,7 +50,11 @@ class DeletionWorker(BaseWorker):
             logger.info(f"Document {doc_id} already deleted — skipping")
             return
 
-        # 3. Soft-delete the document
+        # 3. Soft-delete the document. Only an active document is counted
+        #    in the aggregate rollup — the API already removed it when it
+        #    moved the document to pending_delete.
+        if doc.status == "active":
+            await apply_rollup_deltas(db, [rollup_delta(doc.vault_id, doc, -1)])
         now = utcnow()
         doc.status = "deleted"
         doc.deleted_at = now
@@ -56,7 +65,11 @@ class DeletionWorker(BaseWorker):
         from sqlalchemy import update as sa_update
         chunk_count_result = await db.execute(
             sa_update(Chunk)
-            .where(Chunk.doc_id == doc_id, Chunk.is_deleted == False)
+            .where(
+                Chunk.vault_id == doc.vault_id,
+                Chunk.doc_id == doc_id,
+                Chunk.is_deleted == False,
+            )
             .values(is_deleted=True)
         )
         chunk_count = chunk_count_result.rowcount
@@ -65,6 +78,7 @@ class DeletionWorker(BaseWorker):
         await touch_vault_updated_at(db, parsed.vault_id)
 
         await db.commit()
+        await bump_vault_versions([parsed.vault_id])
         logger.info(f"Deleted document {doc_id} and {chunk_count} chunk(s)")
 
         # 6. Produce audit event
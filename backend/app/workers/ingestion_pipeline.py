@@ -0,0 +1,290 @@
+"""Staged ingestion pipeline for the Kafka ingestion worker.
+
+Four stages connected by bounded queues, each with its own concurrency:
+
+    parse (CPU / process pool) → enrich (LLM) → embed (OpenAI) → store (Postgres)
+
+While one batch of chunks is being embedded, the next documents are
+parsed and enriched, and the previous batch is written — so the PDF
+pool, both OpenAI APIs and Postgres stay busy instead of idling through
+each other's phases. Full queues block the upstream stage, and the
+consumer stops polling while ``PIPELINE_MAX_IN_FLIGHT`` messages are
+un-acked, so memory stays bounded.
+
+Every message is acked exactly once when it reaches a terminal state
+(stored, skipped, failed or DLQ'd); the consumer commits offsets up to
+the lowest un-acked message per partition.
+
+Usage::
+
+    pipeline = IngestionPipeline(session_factory, producer, dlq)
+    await pipeline.start()
+    await consumer.consume_tracked(submit=pipeline.submit, drain=pipeline.drain)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.kafka.dlq import DLQHandler
+from app.core.kafka.producer import KafkaProducer
+from app.core.kafka.topics import FILE_EVENTS, FileUploadedEvent, parse_file_event
+from app.core.logger import setup_logger
+from app.core.rag.embedding import get_embedder
+from app.core.rag.ingest import (
+    PreparedDoc, embed_prepared_docs, enrich_prepared_docs, store_prepared_docs,
+)
+from app.core.storage.local import LocalFileStore
+from app.workers.ingestion_worker import prepare_upload, send_ingested_audit
+from app.workers.pipeline_metrics import StageMetrics, publish_pipeline_stats
+
+logger = setup_logger(__name__)
+SETTINGS = get_settings()
+
+
+@dataclass
+class _Job:
+    """One upload event travelling through the stages."""
+
+    raw: dict
+    event: FileUploadedEvent
+    ack: Callable[[], None]
+    pdoc: PreparedDoc | None = None
+
+
+@dataclass
+class _Stage:
+    name: str
+    inbox: asyncio.Queue
+    handler: Callable[[list[_Job]], Awaitable[list[_Job]]]
+    metrics: StageMetrics
+    batch_size: int = 1
+    next: _Stage | None = None
+
+
+class IngestionPipeline:
+    """Bounded, staged parse → enrich → embed → store pipeline.
+
+    Args:
+        session_factory: Each stage invocation uses its own session.
+        producer: For ``document.ingested`` audit events.
+        dlq: Dead letter queue for events whose stage raised.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        producer: KafkaProducer,
+        dlq: DLQHandler,
+    ) -> None:
+        cfg = SETTINGS.WORKER
+        self._session_factory = session_factory
+        self._producer = producer
+        self._dlq = dlq
+        self._file_store = LocalFileStore(SETTINGS.FILE_STORE_PATH)
+        self._embedder = get_embedder()
+        self._linger_s = cfg.INGESTION_BATCH_TIMEOUT_S
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+
+        def stage(name, handler, concurrency, batch_size=1) -> _Stage:
+            return _Stage(
+                name=name,
+                inbox=asyncio.Queue(maxsize=max(cfg.PIPELINE_QUEUE_SIZE, 1)),
+                handler=handler,
+                metrics=StageMetrics(name=name, concurrency=max(concurrency, 1)),
+                batch_size=batch_size,
+            )
+
+        batch = max(cfg.INGESTION_BATCH_SIZE, 1)
+        self._stages = [
+            stage("parse", self._parse, cfg.PIPELINE_PARSE_CONCURRENCY),
+            stage("enrich", self._enrich, cfg.PIPELINE_ENRICH_CONCURRENCY),
+            stage("embed", self._embed, cfg.PIPELINE_EMBED_CONCURRENCY, batch),
+            stage("store", self._store, cfg.PIPELINE_STORE_CONCURRENCY, batch),
+        ]
+        for upstream, downstream in zip(self._stages, self._stages[1:]):
+            upstream.next = downstream
+
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks: list[asyncio.Task] = []
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Spawn stage workers and the metrics reporter."""
+        for stage in self._stages:
+            for _ in range(stage.metrics.concurrency):
+                self._tasks.append(asyncio.create_task(self._run_stage(stage)))
+        self._tasks.append(asyncio.create_task(self._report_loop()))
+        logger.info(
+            "Ingestion pipeline started: "
+            + ", ".join(f"{s.name}×{s.metrics.concurrency}" for s in self._stages)
+        )
+
+    async def submit(self, raw: dict, ack: Callable[[], None]) -> None:
+        """Enqueue one event (blocks while the parse queue is full)."""
+        try:
+            event = parse_file_event(raw)
+        except Exception as e:
+            logger.error(f"Invalid file event: {e}")
+            await self._dlq.send(original_topic=FILE_EVENTS, original_event=raw, error=e)
+            ack()
+            return
+        if not isinstance(event, FileUploadedEvent):
+            ack()
+            return
+
+        self._in_flight += 1
+        self._idle.clear()
+        await self._stages[0].inbox.put(_Job(raw=raw, event=event, ack=ack))
+
+    async def drain(self) -> None:
+        """Wait for every submitted event to finish, then stop the stages."""
+        await self._idle.wait()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        await self._publish()
+
+    def stats(self) -> dict:
+        """Per-stage throughput and queue depth."""
+        return {
+            "in_flight": self._in_flight,
+            "stages": {
+                s.name: s.metrics.snapshot(s.inbox.qsize(), s.inbox.maxsize)
+                for s in self._stages
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Stage handlers — return the jobs that continue downstream
+    # ------------------------------------------------------------------
+
+    async def _parse(self, jobs: list[_Job]) -> list[_Job]:
+        (job,) = jobs
+        async with self._session_factory() as db:
+            job.pdoc = await prepare_upload(db, job.event, self._file_store)
+            await db.commit()
+        return [job] if job.pdoc and job.pdoc.chunks else []
+
+    async def _enrich(self, jobs: list[_Job]) -> list[_Job]:
+        await enrich_prepared_docs([job.pdoc for job in jobs], concurrency=len(jobs))
+        return jobs
+
+    async def _embed(self, jobs: list[_Job]) -> list[_Job]:
+        async with self._session_factory() as db:
+            failed = await embed_prepared_docs([job.pdoc for job in jobs], db, self._embedder)
+            await db.commit()
+        return [job for job in jobs if job.pdoc.doc_id not in failed]
+
+    async def _store(self, jobs: list[_Job]) -> list[_Job]:
+        async with self._session_factory() as db:
+            results = await store_prepared_docs([job.pdoc for job in jobs], db)
+        stored = [job for job in jobs if job.pdoc.doc_id in results]
+        for job in stored:
+            try:
+                await send_ingested_audit(self._producer, job.event, results[job.pdoc.doc_id])
+            except Exception as e:
+                logger.warning(f"Audit event failed for {job.pdoc.doc_id}: {e}")
+        return stored
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _run_stage(self, stage: _Stage) -> None:
+        while True:
+            jobs = await self._take(stage)
+            stage.metrics.active += 1
+            started = time.perf_counter()
+            failure: Exception | None = None
+            try:
+                survivors = await stage.handler(jobs)
+            except Exception as e:
+                logger.error(f"{stage.name} stage failed for {len(jobs)} document(s): {e}")
+                failure = e
+                survivors = []
+            finally:
+                stage.metrics.active -= 1
+                stage.metrics.calls += 1
+                stage.metrics.busy_s += time.perf_counter() - started
+
+            stage.metrics.processed += len(survivors)
+            stage.metrics.dropped += len(jobs) - len(survivors)
+            if failure is not None:
+                await self._dead_letter(jobs, failure)
+                continue
+            kept = {id(job) for job in survivors}
+            for job in jobs:
+                if id(job) not in kept:
+                    self._finish(job)
+            for job in survivors:
+                if stage.next is None:
+                    self._finish(job)
+                else:
+                    await stage.next.inbox.put(job)
+
+    async def _dead_letter(self, jobs: list[_Job], error: Exception) -> None:
+        """Send a failed batch to the DLQ; its jobs finish even if that fails."""
+        for job in jobs:
+            try:
+                await self._dlq.send(original_topic=FILE_EVENTS, original_event=job.raw, error=error)
+            except Exception as e:
+                logger.error(f"DLQ send failed for {job.event.doc_id}: {e}")
+            finally:
+                self._finish(job)
+
+    async def _take(self, stage: _Stage) -> list[_Job]:
+        """Next job, plus any more that arrive within the linger window."""
+        jobs = [await stage.inbox.get()]
+        if stage.batch_size == 1:
+            return jobs
+        deadline = asyncio.get_running_loop().time() + self._linger_s
+        while len(jobs) < stage.batch_size:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                jobs.append(await asyncio.wait_for(stage.inbox.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return jobs
+
+    def _finish(self, job: _Job) -> None:
+        job.ack()
+        job.pdoc = None
+        self._in_flight -= 1
+        if self._in_flight == 0:
+            self._idle.set()
+
+    async def _report_loop(self) -> None:
+        interval = max(SETTINGS.WORKER.PIPELINE_METRICS_INTERVAL_S, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            await self._publish()
+            stages = self.stats()["stages"]
+            logger.info(
+                "Pipeline: "
+                + " | ".join(
+                    f"{name} q={s['queue_depth']}/{s['queue_capacity']} "
+                    f"{s['docs_per_s']}/s util={s['utilisation']}"
+                    for name, s in stages.items()
+                )
+            )
+
+    async def _publish(self) -> None:
+        ttl = int(max(SETTINGS.WORKER.PIPELINE_METRICS_INTERVAL_S, 1.0) * 4)
+        await publish_pipeline_stats(self._worker_id, self.stats(), ttl)
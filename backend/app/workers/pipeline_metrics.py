@@ -0,0 +1,93 @@
+"""Per-stage counters for the pipelined ingestion worker.
+
+Workers run in their own processes, so each pipeline periodically
+publishes a snapshot to a Redis hash (one field per worker instance,
+short TTL). ``GET /metrics`` reads the hash back. Publishing and reading
+are fail-open.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass, field
+
+from app.core.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_REDIS_KEY = "metrics:ingestion_pipeline"
+
+
+@dataclass
+class StageMetrics:
+    """Throughput counters for one pipeline stage.
+
+    Attributes:
+        name: Stage name (parse / enrich / embed / store).
+        concurrency: Number of stage workers.
+        processed: Documents that left the stage.
+        dropped: Documents that ended in the stage (skipped, failed or DLQ'd).
+        calls: Handler invocations (batches for embed/store).
+        busy_s: Total handler wall time across workers.
+        active: Handler invocations currently running.
+    """
+
+    name: str
+    concurrency: int
+    processed: int = 0
+    dropped: int = 0
+    calls: int = 0
+    busy_s: float = 0.0
+    active: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def snapshot(self, queue_depth: int, queue_capacity: int) -> dict:
+        uptime = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "concurrency": self.concurrency,
+            "active": self.active,
+            "queue_depth": queue_depth,
+            "queue_capacity": queue_capacity,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "docs_per_s": round(self.processed / uptime, 3),
+            "avg_call_ms": round(self.busy_s / self.calls * 1000, 1) if self.calls else 0.0,
+            "utilisation": round(self.busy_s / (uptime * self.concurrency), 3),
+        }
+
+
+async def publish_pipeline_stats(worker_id: str, stats: dict, ttl_s: int) -> None:
+    """Store one worker's snapshot in Redis."""
+    try:
+        from app.core.tools.redis import get_redis_client
+        client = await get_redis_client()
+        pipe = client.pipeline(transaction=False)
+        pipe.hset(_REDIS_KEY, worker_id, json.dumps({**stats, "published_at": time.time()}))
+        pipe.expire(_REDIS_KEY, ttl_s)
+        await pipe.execute()
+    except Exception as e:
+        logger.debug(f"Could not publish pipeline stats: {e}")
+
+
+async def read_pipeline_stats(max_age_s: float = 120.0) -> dict:
+    """Recent worker snapshots, keyed by worker id (empty if unavailable).
+
+    Snapshots older than ``max_age_s`` (stopped workers) are skipped.
+    """
+    try:
+        from app.core.tools.redis import get_redis_client
+        client = await get_redis_client()
+        raw = await client.hgetall(_REDIS_KEY)
+    except Exception:
+        return {}
+    cutoff = time.time() - max_age_s
+    snapshots = {}
+    for worker_id, value in raw.items():
+        try:
+            snapshot = json.loads(value)
+        except ValueError:
+            continue
+        if snapshot.get("published_at", 0) >= cutoff:
+            snapshots[worker_id] = snapshot
+    return snapshots
@@ -20,6 +20,7 @@ from app.core.logger import setup_logger
 from app.core.kafka.producer import KafkaProducer
 from app.core.kafka.consumer import KafkaConsumer
 from app.core.kafka.topics import FILE_EVENTS, AUDIT_EVENTS, FileUploadedEvent
+from app.core.tools.llm import close_llm_clients
 from app.db.models import Document
 
 logger = setup_logger(__name__)
@@ -249,6 +250,7 @@ async def run(worker_type: str) -> None:
         for w in workers:
             await w._consumer.stop()
         await producer.stop()
+        await close_llm_clients()
         await engine.dispose()
         logger.info("Worker shutdown complete")
 
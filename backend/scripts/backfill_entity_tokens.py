@@ -0,0 +1,50 @@
+"""Backfill ``chunks.entity_tokens`` for chunks ingested before the column existed.
+
+Entity lookups only see chunks with tokens, so run this once per
+deployment after migrating to a9d3e5f7b1c2. Safe to interrupt and
+re-run: only chunks whose tokens are still NULL are touched, and every
+batch is committed. Run from the backend root::
+
+    PYTHONPATH=. python scripts/backfill_entity_tokens.py
+    PYTHONPATH=. python scripts/backfill_entity_tokens.py --vault-id <uuid> --batch-size 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.core.rag.retrieval.entity import backfill_entity_tokens
+from app.db import async_session
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vault-id", type=UUID, action="append", default=None,
+                        help="Vault to backfill (repeatable); default: every vault")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    async with async_session() as db:
+        if args.vault_id:
+            vault_ids = args.vault_id
+        else:
+            result = await db.execute(text("SELECT id FROM vaults ORDER BY created_at"))
+            vault_ids = [row[0] for row in result.fetchall()]
+
+        total = 0
+        for vault_id in vault_ids:
+            start = time.perf_counter()
+            updated = await backfill_entity_tokens(vault_id, db, batch_size=args.batch_size)
+            total += updated
+            print(f"{vault_id}: {updated} chunks in {time.perf_counter() - start:.1f}s")
+
+    print(f"Backfilled {total} chunks across {len(vault_ids)} vaults")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
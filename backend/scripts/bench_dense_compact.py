@@ -0,0 +1,151 @@
+"""Benchmark: recall and latency of the two-stage dense search modes.
+
+Runs ``dense_hits`` against a real vault in every mode — ``exact`` (the
+fp32 HNSW index), ``halfvec`` and ``binary`` (compact first pass, exact
+rerank) — and compares each result list with brute-force top-k over the
+vault's stored vectors. Also prints the size of each HNSW index (summed
+over the ``chunks`` partitions).
+
+Queries are stored chunk embeddings with Gaussian noise, so no embedding
+API calls are made. Needs the database from the app settings, migrated
+to f7a2d4c8e1b3 or later. Run from the backend root::
+
+    PYTHONPATH=. python scripts/bench_dense_compact.py
+    PYTHONPATH=. python scripts/bench_dense_compact.py --vault-id <uuid> --top-k 40 \\
+        --queries 300 --overfetch 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import text
+
+from app.core.config import get_settings
+from app.core.rag.retrieval.base import decode_vectors
+from app.core.rag.retrieval.dense import dense_hits
+from app.db import async_session
+
+SETTINGS = get_settings()
+
+_INDEXES = {
+    "exact": "idx_chunks_embedding",
+    "halfvec": "idx_chunks_embedding_half",
+    "binary": "idx_chunks_embedding_bq",
+}
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+async def _pick_vault(db) -> UUID:
+    """The vault with the most live chunks."""
+    result = await db.execute(text("""
+        SELECT vault_id FROM chunks
+        WHERE is_deleted = FALSE AND embedding IS NOT NULL
+        GROUP BY vault_id ORDER BY count(*) DESC LIMIT 1
+    """))
+    row = result.first()
+    if row is None:
+        raise SystemExit("No embedded chunks found")
+    return row[0]
+
+
+async def _load_vault(db, vault_id: UUID) -> tuple[list[UUID], np.ndarray]:
+    """IDs and vectors of every chunk ``dense_hits`` can return for the vault."""
+    result = await db.execute(
+        text("""
+            SELECT c.id, vector_send(c.embedding)
+            FROM chunks c
+            JOIN documents d ON c.doc_id = d.id
+            WHERE c.vault_id = :vault_id
+              AND c.is_deleted = FALSE
+              AND d.status = 'active'
+              AND c.embedding IS NOT NULL
+        """),
+        {"vault_id": str(vault_id)},
+    )
+    rows = result.fetchall()
+    matrix, _ = decode_vectors([row[1] for row in rows])
+    return [row[0] for row in rows], matrix
+
+
+async def _index_sizes(db) -> dict[str, int]:
+    sizes = {}
+    for mode, index in _INDEXES.items():
+        try:
+            result = await db.execute(
+                text("""
+                    SELECT coalesce(sum(pg_relation_size(relid)), 0)
+                    FROM pg_partition_tree(CAST(:index AS regclass))
+                """),
+                {"index": index},
+            )
+            sizes[mode] = int(result.scalar_one())
+        except Exception:
+            await db.rollback()
+            sizes[mode] = -1
+    return sizes
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+async def _run_mode(vault_id, queries, truth, top_k, mode) -> tuple[np.ndarray, np.ndarray]:
+    latencies, recalls = [], []
+    for query, exact in zip(queries, truth):
+        async with async_session() as db:
+            start = time.perf_counter()
+            hits = await dense_hits(query, vault_id, db, top_k=top_k, mode=mode)
+            latencies.append((time.perf_counter() - start) * 1000)
+        recalls.append(len({h.chunk_id for h in hits} & exact) / len(exact))
+    return np.asarray(latencies), np.asarray(recalls)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vault-id", type=UUID, default=None)
+    parser.add_argument("--top-k", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--noise", type=float, default=0.02)
+    parser.add_argument("--overfetch", type=int, nargs="+", default=[SETTINGS.DENSE_RERANK_OVERFETCH])
+    args = parser.parse_args()
+
+    async with async_session() as db:
+        vault_id = args.vault_id or await _pick_vault(db)
+        ids, matrix = await _load_vault(db, vault_id)
+        sizes = await _index_sizes(db)
+
+    rng = np.random.default_rng(0)
+    picks = rng.integers(0, len(ids), size=args.queries)
+    queries = matrix[picks] + args.noise * rng.standard_normal((args.queries, matrix.shape[1]))
+    queries = (queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(np.float32)
+
+    normed = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+    id_array = np.asarray(ids, dtype=object)
+    truth = [set(id_array[np.argsort(-(normed @ q))[:args.top_k]]) for q in queries]
+    query_lists = [q.tolist() for q in queries]
+
+    print(f"vault: {vault_id}, chunks: {len(ids)}, top_k: {args.top_k}, queries: {args.queries}")
+    print(f"{'mode':>8}  {'overfetch':>9}  {'index MiB':>9}  {'p50 ms':>8}  {'p99 ms':>8}  {'recall':>7}")
+    for mode in _INDEXES:
+        for overfetch in ([1] if mode == "exact" else args.overfetch):
+            SETTINGS.DENSE_RERANK_OVERFETCH = overfetch
+            await _run_mode(vault_id, query_lists[:10], truth[:10], args.top_k, mode)  # warm-up
+            latencies, recalls = await _run_mode(vault_id, query_lists, truth, args.top_k, mode)
+            size = f"{sizes[mode] / 2**20:.1f}" if sizes[mode] >= 0 else "n/a"
+            print(
+                f"{mode:>8}  {overfetch if mode != 'exact' else '-':>9}  {size:>9}  "
+                f"{np.percentile(latencies, 50):>8.2f}  {np.percentile(latencies, 99):>8.2f}  "
+                f"{recalls.mean():>7.3f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,199 @@
+"""Benchmark: dense search on one shared HNSW index vs vault-partitioned indexes.
+
+Loads the same synthetic corpus into two layouts in a scratch schema:
+
+    flat         one table, one HNSW index, ``vault_id`` filtered after the scan
+    partitioned  ``PARTITION BY HASH (vault_id)``, one HNSW index per partition
+
+and runs the ``dense_search`` query shape (``WHERE vault_id = $1 ORDER BY
+embedding <=> $2 LIMIT k``) against each, for several vault counts at a
+fixed total corpus size. Vault sizes are Zipf-skewed and chunk vectors
+are drawn around topics shared by all vaults, so the nearest neighbours
+of a query mostly belong to other vaults — the case where post-filtering
+loses recall. Recall is measured against exact per-vault top-k.
+
+Queries pick vaults uniformly (every tenant counts), so ``recall small``
+— vaults in the smaller half — shows what small tenants experience.
+
+Needs a PostgreSQL with pgvector; everything lives in ``--schema`` and is
+dropped afterwards unless ``--keep`` is given. Run from the backend root::
+
+    PYTHONPATH=. python scripts/bench_dense_partitions.py
+    PYTHONPATH=. python scripts/bench_dense_partitions.py --vaults 10 100 1000 \\
+        --total-chunks 200000 --dims 384 --partitions 16 --queries 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import asyncpg
+import numpy as np
+from pgvector.asyncpg import register_vector
+
+from app.core.config import get_settings
+
+_LAYOUTS = ("flat", "partitioned")
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+def _make_corpus(
+    n_vaults: int,
+    total: int,
+    dims: int,
+    rng: np.random.Generator,
+    topics: int = 64,
+) -> tuple[list[uuid.UUID], np.ndarray, list[uuid.UUID], np.ndarray]:
+    """Return (vault ids, per-row vault index, row ids, row vectors) — Zipf vault sizes."""
+    weights = 1.0 / np.arange(1, n_vaults + 1) ** 1.1
+    sizes = np.maximum((weights / weights.sum() * total).astype(int), 1)
+    owner = np.repeat(np.arange(n_vaults), sizes)
+
+    centroids = rng.standard_normal((topics, dims)).astype(np.float32)
+    topic = rng.integers(0, topics, size=len(owner))
+    vectors = centroids[topic] + 0.35 * rng.standard_normal((len(owner), dims)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    vault_ids = [uuid.uuid4() for _ in range(n_vaults)]
+    row_ids = [uuid.uuid4() for _ in range(len(owner))]
+    return vault_ids, owner, row_ids, vectors
+
+
+# ---------------------------------------------------------------------------
+# Schema
+# ---------------------------------------------------------------------------
+
+async def _create_tables(conn, schema: str, dims: int, partitions: int) -> None:
+    await conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    await conn.execute(f"CREATE SCHEMA {schema}")
+    await conn.execute(f"""
+        CREATE TABLE {schema}.flat (
+            id uuid PRIMARY KEY, vault_id uuid NOT NULL, embedding vector({dims})
+        )
+    """)
+    await conn.execute(f"""
+        CREATE TABLE {schema}.partitioned (
+            id uuid NOT NULL, vault_id uuid NOT NULL, embedding vector({dims}),
+            PRIMARY KEY (id, vault_id)
+        ) PARTITION BY HASH (vault_id)
+    """)
+    for i in range(partitions):
+        await conn.execute(f"""
+            CREATE TABLE {schema}.partitioned_p{i:02d} PARTITION OF {schema}.partitioned
+            FOR VALUES WITH (MODULUS {partitions}, REMAINDER {i})
+        """)
+
+
+async def _load(conn, schema: str, vault_ids, owner, row_ids, vectors) -> None:
+    records = [(rid, vault_ids[v], vec) for rid, v, vec in zip(row_ids, owner, vectors)]
+    for layout in _LAYOUTS:
+        await conn.copy_records_to_table(
+            layout, schema_name=schema, records=records,
+            columns=["id", "vault_id", "embedding"],
+        )
+        await conn.execute(f"CREATE INDEX ON {schema}.{layout} (vault_id)")
+        await conn.execute(f"""
+            CREATE INDEX ON {schema}.{layout}
+            USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 200)
+        """)
+        await conn.execute(f"ANALYZE {schema}.{layout}")
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _exact_top_k(query: np.ndarray, vectors: np.ndarray, ids: np.ndarray, k: int) -> set:
+    scores = vectors @ query
+    top = np.argsort(-scores)[:k]
+    return set(ids[top])
+
+
+async def _run_queries(conn, schema, layout, plan, top_k) -> tuple[np.ndarray, np.ndarray]:
+    stmt = await conn.prepare(f"""
+        SELECT id FROM {schema}.{layout}
+        WHERE vault_id = $1 AND embedding IS NOT NULL
+        ORDER BY embedding <=> $2
+        LIMIT $3
+    """)
+    latencies, recalls = [], []
+    for vault_id, query, exact in plan:
+        start = time.perf_counter()
+        rows = await stmt.fetch(vault_id, query, top_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found = {row[0] for row in rows}
+        recalls.append(len(found & exact) / len(exact))
+    return np.asarray(latencies), np.asarray(recalls)
+
+
+async def _bench(conn, args, n_vaults: int, rng: np.random.Generator) -> None:
+    vault_ids, owner, row_ids, vectors = _make_corpus(n_vaults, args.total_chunks, args.dims, rng)
+    await _create_tables(conn, args.schema, args.dims, args.partitions)
+    await _load(conn, args.schema, vault_ids, owner, row_ids, vectors)
+
+    row_ids = np.asarray(row_ids, dtype=object)
+    sizes = np.bincount(owner, minlength=n_vaults)
+    median_size = float(np.median(sizes))
+
+    plan, small = [], []
+    for _ in range(args.queries):
+        v = int(rng.integers(0, n_vaults))
+        rows = np.flatnonzero(owner == v)
+        query = vectors[rng.choice(rows)] + 0.3 * rng.standard_normal(args.dims)
+        query = (query / np.linalg.norm(query)).astype(np.float32)
+        plan.append((vault_ids[v], query, _exact_top_k(query, vectors[rows], row_ids[rows], args.top_k)))
+        small.append(sizes[v] <= median_size)
+    small = np.asarray(small)
+
+    await conn.execute(f"SET hnsw.ef_search = {args.ef_search}")
+    for layout in _LAYOUTS:
+        await _run_queries(conn, args.schema, layout, plan[:10], args.top_k)  # warm-up
+        latencies, recalls = await _run_queries(conn, args.schema, layout, plan, args.top_k)
+        print(
+            f"{n_vaults:>7}  {layout:>11}  {np.percentile(latencies, 50):>8.2f}  "
+            f"{np.percentile(latencies, 99):>8.2f}  {recalls.mean():>8.3f}  "
+            f"{recalls[small].mean() if small.any() else float('nan'):>12.3f}"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dsn", default=get_settings().DATABASE_URL)
+    parser.add_argument("--vaults", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--total-chunks", type=int, default=100_000)
+    parser.add_argument("--dims", type=int, default=256)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--ef-search", type=int, default=40)
+    parser.add_argument("--schema", default="bench_partitions")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema")
+    args = parser.parse_args()
+
+    conn = await asyncpg.connect(args.dsn)
+    await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    await register_vector(conn)
+    rng = np.random.default_rng(0)
+
+    print(
+        f"chunks: {args.total_chunks}, dims: {args.dims}, partitions: {args.partitions}, "
+        f"top_k: {args.top_k}, ef_search: {args.ef_search}"
+    )
+    print(f"{'vaults':>7}  {'layout':>11}  {'p50 ms':>8}  {'p99 ms':>8}  {'recall':>8}  {'recall small':>12}")
+    try:
+        for n_vaults in args.vaults:
+            await _bench(conn, args, n_vaults, rng)
+    finally:
+        if not args.keep:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""Micro-benchmark: RRF + MMR fusion cost per hybrid_search call.
+
+Compares the index-based NumPy engine used by ``hybrid.py`` against the
+previous implementation (string-keyed RRF with a ``model_copy`` per
+candidate, then langchain's MMR over per-result vectors).
+
+Run from the backend root::
+
+    PYTHONPATH=. python scripts/bench_fusion.py
+    PYTHONPATH=. python scripts/bench_fusion.py --sizes 40 200 1000 --dims 1536 --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from uuid import uuid4
+
+import numpy as np
+from langchain_core.vectorstores.utils import maximal_marginal_relevance as lc_mmr
+
+from app.core.rag.retrieval.base import SearchResult
+from app.core.rag.retrieval.hybrid import _fuse
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def _make_lists(n: int, dims: int, rng: np.random.Generator):
+    """Two ranked lists of ``n`` results each, half of them overlapping."""
+    matrix = rng.standard_normal((n + n // 2, dims)).astype(np.float32)
+    pool = []
+    for row in matrix:
+        r = SearchResult(
+            chunk_id=uuid4(), doc_id=uuid4(),
+            content="x", content_with_header="x", score=float(rng.random()),
+        )
+        r._vector = row
+        pool.append(r)
+    dense = pool[:n]
+    sparse = pool[n // 2:]
+    rng.shuffle(sparse)
+    return dense, list(sparse)
+
+
+# ---------------------------------------------------------------------------
+# Previous implementation (reference)
+# ---------------------------------------------------------------------------
+
+def _legacy_fuse(query, dense, sparse, top_k, lam):
+    scores: dict[str, float] = {}
+    best: dict[str, SearchResult] = {}
+    for result_list in (dense, sparse):
+        for rank, result in enumerate(result_list):
+            cid = str(result.chunk_id)
+            scores[cid] = scores.get(cid, 0.0) + 1.0 / (60 + rank + 1)
+            if cid not in best or result.score > best[cid].score:
+                best[cid] = result
+    fused = [best[c].model_copy(update={"score": s}) for c, s in scores.items()]
+    fused.sort(key=lambda r: r.score, reverse=True)
+    embeddings = [r.vector.tolist() for r in fused]
+    picked = lc_mmr(np.array(query), embeddings, lambda_mult=lam, k=top_k)
+    return [fused[i] for i in picked]
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _time_us(fn, repeat: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[40, 200, 1000])
+    parser.add_argument("--dims", type=int, default=1536)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--lambda", dest="lam", type=float, default=0.7)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    query = rng.standard_normal(args.dims).astype(np.float32).tolist()
+
+    print(f"{'candidates':>10}  {'legacy µs':>10}  {'numpy µs':>10}  {'speed-up':>8}")
+    for n in args.sizes:
+        dense, sparse = _make_lists(n, args.dims, rng)
+        legacy = _time_us(lambda: _legacy_fuse(query, dense, sparse, args.top_k, args.lam), args.repeat)
+        engine = _time_us(lambda: _fuse(query, dense, sparse, args.top_k, args.lam), args.repeat)
+        print(f"{n:>10}  {legacy:>10.0f}  {engine:>10.0f}  {legacy / engine:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
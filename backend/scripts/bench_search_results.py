@@ -0,0 +1,132 @@
+"""Micro-benchmark: per-query cost of the retrieval result objects.
+
+Compares the Pydantic path (validated ``SearchResult`` per candidate,
+model copies during fusion, ``model_dump`` into graph state) with the
+slotted ``RetrievalHit`` path (unhydrated hits over a shared vector
+matrix, text loaded for ``top_k`` only, plain ``as_dict``).
+
+Database time is excluded — rows are synthesised in memory — so the
+numbers isolate Python-side allocation and CPU per query.
+
+Run from the backend root::
+
+    PYTHONPATH=. python scripts/bench_search_results.py
+    PYTHONPATH=. python scripts/bench_search_results.py --top-k 5 --repeat 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import struct
+import time
+import tracemalloc
+from uuid import uuid4
+
+import numpy as np
+
+from app.core.rag.retrieval.base import SearchResult, hits_from_rows
+from app.core.rag.retrieval.hybrid import (
+    _fetch_k,
+    _fuse,
+    maximal_marginal_relevance,
+    reciprocal_rank_fusion,
+)
+
+_CONTENT = "Invoice 10248 — Vins et alcools Chevalier. " * 40
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def _make_rows(n: int, dims: int, rng: np.random.Generator) -> list[tuple]:
+    """Synthesise full leg rows: id, doc_id, score, vector_send bytes, text columns."""
+    rows = []
+    for _ in range(n):
+        vec = rng.standard_normal(dims).astype(">f4").tobytes()
+        rows.append((
+            uuid4(), uuid4(), float(rng.random()),
+            struct.pack(">hh", dims, 0) + vec,
+            _CONTENT, f"[Source: invoice.pdf] {_CONTENT}", "Items", 1, "invoice.pdf",
+        ))
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Paths under test
+# ---------------------------------------------------------------------------
+
+def _pydantic_path(query, dense_rows, sparse_rows, top_k, lam):
+    def build(rows):
+        results = []
+        for hit in hits_from_rows(rows):
+            results.append(SearchResult(
+                chunk_id=hit.chunk_id, doc_id=hit.doc_id,
+                content=hit.content, content_with_header=hit.content_with_header,
+                score=hit.score, section_heading=hit.section_heading,
+                page_number=hit.page_number, original_filename=hit.original_filename,
+            ))
+            results[-1]._vector = hit.vector
+        return results
+
+    fused = reciprocal_rank_fusion([build(dense_rows), build(sparse_rows)])
+    selected = maximal_marginal_relevance(query, fused, top_k=top_k, lambda_param=lam)
+    return [r.model_dump(mode="json") for r in selected]
+
+
+def _hit_path(query, dense_rows, sparse_rows, top_k, lam):
+    dense = hits_from_rows([row[:4] for row in dense_rows])
+    sparse = hits_from_rows([row[:4] for row in sparse_rows])
+    selected = _fuse(query, dense, sparse, top_k, lam)
+    # Stand-in for hydrate_hits: attach text for the final selection only
+    text_by_id = {row[0]: row[4:] for row in dense_rows + sparse_rows}
+    for hit in selected:
+        (hit.content, hit.content_with_header, hit.section_heading,
+         hit.page_number, hit.original_filename) = text_by_id[hit.chunk_id]
+    return [h.as_dict() for h in selected]
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _measure(fn, repeat: int) -> tuple[float, float]:
+    """Return (µs per call, peak traced KiB per call)."""
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed_us = (time.perf_counter() - start) / repeat * 1e6
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_us, peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--dims", type=int, default=1536)
+    parser.add_argument("--lambda", dest="lam", type=float, default=0.7)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    fetch_k = _fetch_k(args.top_k)
+    dense_rows = _make_rows(fetch_k, args.dims, rng)
+    sparse_rows = dense_rows[: fetch_k // 2] + _make_rows(fetch_k - fetch_k // 2, args.dims, rng)
+    query = rng.standard_normal(args.dims).astype(np.float32).tolist()
+
+    print(f"candidates per leg: {fetch_k}, top_k: {args.top_k}, dims: {args.dims}")
+    print(f"{'path':>10}  {'µs/query':>10}  {'peak KiB':>10}")
+    for name, fn in (("pydantic", _pydantic_path), ("hits", _hit_path)):
+        us, kib = _measure(
+            lambda: fn(query, dense_rows, sparse_rows, args.top_k, args.lam), args.repeat,
+        )
+        print(f"{name:>10}  {us:>10.0f}  {kib:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
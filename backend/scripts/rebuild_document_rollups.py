@@ -0,0 +1,45 @@
+"""Recompute ``document_rollups`` from ``documents``.
+
+The rollup is filled by migration c5e8f1a3d7b9 and kept current by the
+ingestion and deletion paths; this is the repair tool for when it has
+drifted (e.g. documents edited by hand). Run it while the vaults have
+no ingestion or deletion in flight — each vault is rebuilt and
+committed on its own. Run from the backend root::
+
+    PYTHONPATH=. python scripts/rebuild_document_rollups.py
+    PYTHONPATH=. python scripts/rebuild_document_rollups.py --vault-id <uuid>
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.core.rag.rollup import rebuild_vault_rollup
+from app.db import async_session
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vault-id", type=UUID, action="append", default=None,
+                        help="Vault to rebuild (repeatable); default: every vault")
+    args = parser.parse_args()
+
+    async with async_session() as db:
+        if args.vault_id:
+            vault_ids = args.vault_id
+        else:
+            result = await db.execute(text("SELECT id FROM vaults ORDER BY created_at"))
+            vault_ids = [row[0] for row in result.fetchall()]
+
+        for vault_id in vault_ids:
+            rows = await rebuild_vault_rollup(db, vault_id)
+            await db.commit()
+            print(f"{vault_id}: {rows} rollup rows")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,200 @@
+"""Unit tests for the copilot answer cache and cached-answer replay."""
+
+from uuid import uuid4
+
+import pytest
+from langchain_core.messages import AIMessage, ToolMessage
+
+from app.core.copilot import agent, answer_cache
+from app.core.copilot.agent import _early_answer, _replay_events
+from app.core.copilot.answer_cache import AnswerCache, CachedAnswer
+from app.core.copilot.base import CopilotAnswer, Evidence
+
+
+class _Pipeline:
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def hset(self, key, field, value):
+        self.ops.append(lambda: self.redis.hashes.setdefault(key, {}).__setitem__(field, value))
+
+    def expire(self, key, ttl):
+        self.ops.append(lambda: None)
+
+    async def execute(self):
+        return [op() for op in self.ops]
+
+
+class _Redis:
+
+    def __init__(self):
+        self.values: dict[str, str] = {}
+        self.hashes: dict[str, dict] = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hlen(self, key):
+        return len(self.hashes.get(key, {}))
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+_VECTORS = {
+    "total of invoice 10248": [1.0, 0.0, 0.0],
+    "what was the total for invoice 10248": [0.99, 0.1, 0.0],
+    "who shipped order 10300": [0.0, 1.0, 0.0],
+}
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = _Redis()
+
+    async def client():
+        return fake
+
+    async def scope(vault_id, top_k):
+        return f"{vault_id}:1:{top_k}"
+
+    async def vector(query):
+        return _VECTORS[answer_cache.normalize_query(query)]
+
+    monkeypatch.setattr(answer_cache, "_get_client", client)
+    monkeypatch.setattr(answer_cache, "_get_binary_client", client)
+    monkeypatch.setattr(answer_cache, "_scope", scope)
+    monkeypatch.setattr(answer_cache, "_query_vector", vector)
+    return fake
+
+
+def _answer(text: str = "Invoice 10248 totals 440.00.") -> CopilotAnswer:
+    return CopilotAnswer(
+        answer=text,
+        citations=[Evidence(doc_title="invoice_10248.pdf", quote="Total: 440.00", relevance_score=1.0)],
+        confidence=0.8,
+        has_sufficient_evidence=True,
+    )
+
+
+async def test_exact_hit_ignores_case_and_punctuation(redis):
+    cache, vault_id = AnswerCache(), uuid4()
+    await cache.store(vault_id, "Total of invoice 10248?", 5, _answer(), chunks_used=3, agent_ms=4200)
+
+    hit = await cache.lookup(vault_id, "total of INVOICE 10248", 5)
+
+    assert hit is not None and hit.similarity == 1.0
+    assert hit.answer.citations[0].doc_title == "invoice_10248.pdf"
+    assert await cache.lookup(vault_id, "total of invoice 10248", 8) is None
+    assert cache.stats()["saved_agent_ms"] == 4200
+    assert cache.stats()["hit_ratio"] == 0.5
+
+
+async def test_near_duplicate_lookup_uses_threshold(redis):
+    cache, vault_id = AnswerCache(semantic=True, similarity_threshold=0.95), uuid4()
+    await cache.store(vault_id, "total of invoice 10248", 5, _answer(), chunks_used=3, agent_ms=100)
+
+    near = await cache.lookup(vault_id, "What was the total for invoice 10248?", 5)
+    far = await cache.lookup(vault_id, "Who shipped order 10300?", 5)
+
+    assert near is not None and 0.95 <= near.similarity < 1.0
+    assert far is None
+    assert cache.stats()["semantic_hits"] == 1
+
+
+async def test_embedding_errors_count_as_misses(redis, monkeypatch):
+    async def rate_limited(query):
+        raise RuntimeError("429 Too Many Requests")
+
+    cache, vault_id = AnswerCache(semantic=True), uuid4()
+    await cache.store(vault_id, "total of invoice 10248", 5, _answer(), chunks_used=3, agent_ms=100)
+    monkeypatch.setattr(answer_cache, "_query_vector", rate_limited)
+    await cache.store(vault_id, "who shipped order 10300", 5, _answer(), chunks_used=1, agent_ms=100)
+
+    assert await cache.lookup(vault_id, "What was the total for invoice 10248?", 5) is None
+    assert await cache.lookup(vault_id, "who shipped order 10300", 5) is not None
+    assert cache.stats()["redis_errors"] == 2
+
+
+async def test_answers_without_evidence_are_not_cached(redis):
+    cache, vault_id = AnswerCache(), uuid4()
+    await cache.store(
+        vault_id, "total of invoice 10248", 5,
+        CopilotAnswer(answer="Query timed out. Please try again."), chunks_used=0, agent_ms=1,
+    )
+    assert redis.values == {}
+
+
+def test_replay_streams_the_cached_answer():
+    events = list(_replay_events(CachedAnswer(answer=_answer(), chunks_used=3, agent_ms=100)))
+
+    assert events[0] == {"type": "retrieval", "chunks_used": 3}
+    assert "".join(e["content"] for e in events if e["type"] == "token") == "Invoice 10248 totals 440.00."
+    assert events[-1]["type"] == "done"
+    assert events[-1]["retrieval_method"] == "cache"
+    assert events[-1]["citations"][0]["doc_title"] == "invoice_10248.pdf"
+
+
+async def test_speculative_calls_are_closed_when_the_lookup_raises():
+    closed: list[bool] = []
+
+    class _Cache:
+        async def lookup(self, vault_id, query, top_k):
+            raise RuntimeError("vault version lookup failed")
+
+    class _Speculative:
+        async def close(self):
+            closed.append(True)
+
+    with pytest.raises(RuntimeError):
+        await _early_answer("total of invoice 10248", uuid4(), None, 5, _Cache(), _Speculative())
+    assert closed == [True]
+
+
+@pytest.mark.parametrize("reply, tool_output, cached", [
+    (AIMessage(content="Invoice 10248 totals 440.00."),
+     "--- Document Chunk 1 ---\n[Source: invoice_10248.pdf]\nTotal 440.00\n", True),
+    (AIMessage(content="Hello! Ask me about your documents."), None, False),
+    (AIMessage(content="I apologize, but the response is taking too long.",
+               additional_kwargs={agent._TIMED_OUT: True}),
+     "--- Document Chunk 1 ---\n[Source: invoice_10248.pdf]\nTotal 440.00\n", False),
+])
+async def test_only_agent_answers_drawn_from_tools_are_cached(monkeypatch, reply, tool_output, cached):
+    stored: list[CopilotAnswer] = []
+
+    class _Cache:
+        async def lookup(self, vault_id, query, top_k):
+            return None
+
+        async def store(self, vault_id, query, top_k, answer, *, chunks_used, agent_ms):
+            if answer.has_sufficient_evidence:
+                stored.append(answer)
+
+    class _Graph:
+        async def ainvoke(self, state, config=None):
+            tools = [ToolMessage(content=tool_output, name="search_documents", tool_call_id="1")]
+            return {"messages": state["messages"] + (tools if tool_output else []) + [reply]}
+
+    async def rewrite(query, history, vault_id, top_k):
+        return query, None
+
+    monkeypatch.setattr(agent, "_rewrite", rewrite)
+    monkeypatch.setattr(agent, "get_answer_cache", _Cache)
+    monkeypatch.setattr(agent, "get_agent_graph", _Graph)
+    monkeypatch.setattr(agent.SETTINGS.COPILOT, "ANSWER_CACHE_ENABLED", True)
+    monkeypatch.setattr(agent.SETTINGS.COPILOT, "AGENT_FASTPATH_ENABLED", False)
+    monkeypatch.setattr(agent.SETTINGS.COPILOT, "AGENT_PREFETCH_ENABLED", False)
+
+    answer = await agent.query_vault_agent("total of invoice 10248", uuid4())
+
+    assert answer.answer == reply.content
+    assert bool(stored) is cached
+    assert answer.has_sufficient_evidence is not agent._timed_out(reply)
@@ -0,0 +1,103 @@
+"""Unit tests for the copilot planner's deterministic fast paths."""
+
+from contextlib import asynccontextmanager
+from datetime import date
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core.copilot import planner
+from app.core.rag.generation import AnswerResult, Citation
+from app.core.rag.retrieval.base import SearchResult
+from app.core.rag.rollup import DocumentStats
+
+
+@asynccontextmanager
+async def _session():
+    yield None
+
+
+def _doc(entity_id: str, price: float) -> SimpleNamespace:
+    return SimpleNamespace(
+        original_filename=f"invoice_{entity_id}.pdf",
+        order_date=date(2016, 7, 4),
+        customer_id="VINET",
+        total_price=price,
+        entity_id=entity_id,
+    )
+
+
+@pytest.fixture
+def sql(monkeypatch):
+    state = {"stats": DocumentStats(doc_count=2, total_price_sum=880.0)}
+
+    async def stats(db, **filters):
+        state["filters"] = filters
+        return state["stats"]
+
+    async def list_documents(*args, limit):
+        return [_doc("10248", 440.0), _doc("10249", 440.0)]
+
+    monkeypatch.setattr(planner, "get_db_session", _session)
+    monkeypatch.setattr(planner, "document_stats", stats)
+    monkeypatch.setattr(planner, "_list_documents", list_documents)
+    return state
+
+
+async def test_parseable_sum_is_answered_from_sql(sql):
+    planned = await planner.plan_answer(
+        "What is the total price of all invoices for customer VINET in July 2016?", uuid4(),
+    )
+
+    assert planned.answer.retrieval_method == "sql_aggregate"
+    assert "is $880.00" in planned.answer.answer
+    assert sql["filters"]["doc_type"] == "invoice"
+    assert sql["filters"]["date_from"] == date(2016, 7, 1)
+    assert [e.doc_title for e in planned.answer.citations] == ["invoice_10248.pdf", "invoice_10249.pdf"]
+
+
+async def test_aggregate_gives_up_on_gaps_and_open_questions(sql):
+    vault_id = uuid4()
+    sql["stats"] = DocumentStats(doc_count=2, total_price_sum=440.0, missing_total_price=1)
+
+    assert await planner.plan_answer("Total price of all invoices from July 2016", vault_id) is None
+    # Needs document contents, not a listing
+    assert await planner.plan_answer("Which invoices from July 2016 contain Tofu?", vault_id) is None
+    # Two questions in one
+    assert await planner.plan_answer(
+        "How many invoices from July 2016 and which customer ordered most?", vault_id,
+    ) is None
+
+
+async def test_single_entity_runs_one_lookup_and_one_generation(monkeypatch):
+    calls = {}
+
+    async def entity_search(entity_ids, vault_id, db):
+        calls["ids"] = entity_ids
+        return [SearchResult(
+            chunk_id=uuid4(), doc_id=uuid4(), content="Ship Via: Speedy Express",
+            content_with_header="Ship Via: Speedy Express", score=1.0,
+            original_filename="order_10248.pdf",
+        )]
+
+    async def generate(query, results, history=None):
+        calls["generated"] = calls.get("generated", 0) + 1
+        return AnswerResult(
+            answer="Order 10248 was shipped by Speedy Express.",
+            citations=[Citation(doc_title="order_10248.pdf", quote="Ship Via: Speedy Express")],
+            confidence=0.9,
+            has_sufficient_evidence=True,
+        )
+
+    monkeypatch.setattr(planner, "get_db_session", _session)
+    monkeypatch.setattr(planner, "entity_id_search", entity_search)
+    monkeypatch.setattr(planner, "generate_answer", generate)
+
+    planned = await planner.plan_answer("Who shipped order 10248 in 2016?", uuid4())
+
+    assert calls == {"ids": ["10248"], "generated": 1}
+    assert planned.answer.retrieval_method == "entity_lookup"
+    assert planned.chunks_used == 1
+    # Several entities are left to the agent
+    assert await planner.plan_answer("Compare order 10248 with order 10300", uuid4()) is None
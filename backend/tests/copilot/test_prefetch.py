@@ -0,0 +1,91 @@
+"""Unit tests for speculative tool prefetch in the query agent."""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.core.copilot import prefetch, tools
+from app.core.copilot.prefetch import PrefetchStats, ToolPrefetch
+
+
+@pytest.fixture(autouse=True)
+def totals(monkeypatch):
+    fresh = PrefetchStats()
+    monkeypatch.setattr(prefetch, "_totals", fresh)
+    return fresh
+
+
+async def _slow(output: str, delay: float = 0.01) -> str:
+    await asyncio.sleep(delay)
+    return output
+
+
+async def test_matching_call_is_served_once_and_the_rest_cancelled(totals):
+    calls = ToolPrefetch()
+    calls.start("search_documents", "Who shipped order 10248?", _slow("chunks"))
+    calls.start("lookup_entity", "10248,10300", _slow("entity chunks", delay=10))
+    await asyncio.sleep(0.02)
+
+    assert await calls.take("search_documents", "who shipped order 10248") == "chunks"
+    assert await calls.take("search_documents", "who shipped order 10248") is None
+    assert await calls.take("search_documents", "shipping of order 10300") is None
+    await calls.close()
+
+    stats = prefetch.prefetch_stats()
+    assert (stats["started"], stats["hits"], stats["misses"], stats["unused"]) == (2, 1, 2, 1)
+    assert stats["hit_ratio"] == 0.5
+    assert stats["saved_ms"] >= 10
+
+
+async def test_failed_prefetch_lets_the_tool_run(totals):
+    async def broken() -> str:
+        raise ConnectionError("pool exhausted")
+
+    calls = ToolPrefetch()
+    calls.start("lookup_entity", "10300,10248", broken())
+
+    assert await calls.take("lookup_entity", "10248, 10300") is None
+    assert totals.failed == 1
+
+
+async def test_tool_serves_the_prefetched_lookup(monkeypatch):
+    async def entity_search(*args):
+        raise AssertionError("lookup should have been served from the prefetch")
+
+    monkeypatch.setattr(tools, "entity_id_search", entity_search)
+    calls = ToolPrefetch()
+    calls.start("lookup_entity", "10248", _slow("[Source: invoice_10248.pdf]"))
+
+    output = await tools.lookup_entity.ainvoke(
+        {"entity_ids": "10248"},
+        config={"configurable": {"vault_id": uuid4(), "prefetch": calls}},
+    )
+
+    assert output == "[Source: invoice_10248.pdf]"
+
+
+async def test_raw_query_speculation_is_reconciled_with_the_rewrite(monkeypatch, totals):
+    started: list[str] = []
+
+    async def lookup(ids, vault_id):
+        started.append(",".join(ids))
+        return await _slow(f"chunks for {ids}")
+
+    monkeypatch.setattr(prefetch, "run_lookup_entity", lookup)
+    vault_id = uuid4()
+
+    # The rewrite keeps the raw query's entity: the speculative lookup is kept
+    kept = prefetch.start_prefetch("what was shipped in order 10248?", vault_id, 5)
+    kept = await prefetch.reconcile_prefetch(kept, "what was shipped in order 10248", vault_id, 5)
+    assert await kept.take("lookup_entity", "10248") == "chunks for ['10248']"
+
+    # The rewrite resolves a different entity: the lookup is replaced
+    replaced = prefetch.start_prefetch("and who shipped order 10300?", vault_id, 5)
+    replaced = await prefetch.reconcile_prefetch(replaced, "who shipped order 10300 and 10248", vault_id, 5)
+    assert await replaced.take("lookup_entity", "10248,10300") == "chunks for ['10300', '10248']"
+
+    assert "10300" not in started
+    stats = prefetch.prefetch_stats()
+    assert (stats["speculative_wins"], stats["speculative_losses"]) == (1, 1)
+    assert stats["speculation_win_ratio"] == 0.5
@@ -0,0 +1,114 @@
+"""Single-connection retrieval paths degrade to dense-only when BM25 or entity lookups fail."""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core.copilot import tools, verification
+from app.core.rag.retrieval import hybrid
+from app.core.rag.retrieval.base import RetrievalHit
+
+
+class _PostgresLikeSession:
+    """A failed statement aborts the transaction until its savepoint rolls back."""
+
+    def __init__(self, rows):
+        self.aborted = False
+        self.rows = rows
+        self.bm25_failures = 0
+        self.entity_failures = 0
+        self.fail_entity_lookups = False
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        if self.aborted:
+            raise RuntimeError("current transaction is aborted (InFailedSQLTransaction)")
+        try:
+            yield
+        except Exception:
+            self.aborted = False
+            raise
+
+    async def execute(self, query, params=None):
+        if self.aborted:
+            raise RuntimeError("current transaction is aborted (InFailedSQLTransaction)")
+        if "@@@" in str(query):
+            self.aborted = True
+            self.bm25_failures += 1
+            raise RuntimeError("operator does not exist: text @@@ unknown")
+        if self.fail_entity_lookups and "entity_tokens" in str(query):
+            self.aborted = True
+            self.entity_failures += 1
+            raise RuntimeError("canceling statement due to statement timeout")
+        return SimpleNamespace(fetchall=lambda: self.rows)
+
+
+class _Embedder:
+
+    async def embed_query(self, text):
+        return [1.0, 0.0]
+
+    async def embed_queries(self, texts):
+        return [[1.0, 0.0] for _ in texts]
+
+
+@pytest.fixture
+def session(monkeypatch):
+    hit = RetrievalHit(chunk_id=uuid4(), doc_id=uuid4(), score=0.9)
+    db = _PostgresLikeSession([(hit.chunk_id, "text", "[Source: doc] text", None, 1, "invoice.pdf")])
+
+    @asynccontextmanager
+    async def get_db_session():
+        yield db
+
+    async def dense_hits(query_embedding, vault_id, db, top_k=20):
+        return [RetrievalHit(chunk_id=hit.chunk_id, doc_id=hit.doc_id, score=0.9)]
+
+    monkeypatch.setattr(verification.SETTINGS, "HYBRID_CONCURRENT_ENABLED", False)
+    monkeypatch.setattr(hybrid, "dense_hits", dense_hits)
+    for module in (verification, tools):
+        monkeypatch.setattr(module, "get_db_session", get_db_session)
+        monkeypatch.setattr(module, "get_embedder", _Embedder)
+    db.hit = hit
+    return db
+
+
+async def test_every_aggregate_pass_survives_a_bm25_failure(monkeypatch, session):
+    async def no_metadata(statement, vault_id):
+        return []
+
+    async def doc_chunks(db, doc_ids, vault_id, score):
+        await db.execute("SELECT chunks of the discovered documents")
+        return []
+
+    monkeypatch.setattr(verification, "_sql_metadata_filter", no_metadata)
+    monkeypatch.setattr(verification, "_fetch_doc_chunk_hits", doc_chunks)
+
+    out = await verification.aggregate_retrieve_node({
+        "statement_text": "There were 3 invoices issued in July 2016",
+        "vault_id": str(uuid4()),
+    })
+
+    assert session.bm25_failures == 2
+    assert [r["chunk_id"] for r in out["search_results"]] == [str(session.hit.chunk_id)]
+
+
+async def test_search_tool_fallback_survives_a_bm25_failure(session):
+    output = await tools.run_search_documents("invoice 10248 freight", uuid4(), 5)
+
+    assert session.bm25_failures == 1
+    assert "[Source: doc] text" in output
+
+
+async def test_point_retrieval_survives_an_entity_lookup_failure(session):
+    session.fail_entity_lookups = True
+
+    out = await verification.retrieve_node({
+        "statement_text": "Invoice 10248 has a total of $440",
+        "vault_id": str(uuid4()),
+    })
+
+    assert session.entity_failures == 1
+    assert [r["chunk_id"] for r in out["search_results"]] == [str(session.hit.chunk_id)]
@@ -0,0 +1,158 @@
+"""Batched verification: response parsing, fallbacks and the shared deadline."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core.copilot import verification
+from app.core.copilot.base import Statement, Verdict
+
+_RESULTS = [{"chunk_id": "c1", "content_with_header": "Invoice 10248 total $440", "score": 0.9}]
+
+
+def _statement(text: str) -> Statement:
+    return Statement(
+        id=str(uuid4()), text=text, speaker=0,
+        timestamp_start=0.0, timestamp_end=1.0, context=text,
+    )
+
+
+def _verdict(statement: Statement, verdict: str = "supported") -> Verdict:
+    return Verdict(
+        claim_id=statement.id, claim_text=statement.text,
+        verdict=verdict, confidence=0.9, explanation="checked",
+    )
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Fake batch LLM: returns ``reply`` or raises it when it is an exception."""
+    calls = SimpleNamespace(reply=None, count=0)
+
+    async def invoke_chat(model, messages, **kwargs):
+        calls.count += 1
+        if isinstance(calls.reply, Exception):
+            raise calls.reply
+        return SimpleNamespace(content=calls.reply)
+
+    monkeypatch.setattr(verification, "invoke_chat", invoke_chat)
+    monkeypatch.setattr(verification, "_get_grading_llm", lambda: None)
+    monkeypatch.setattr(verification, "_get_verdict_llm", lambda: None)
+    return calls
+
+
+def test_entries_skip_missing_and_garbled_statement_numbers():
+    raw = json.dumps({"grades": [
+        {"statement": "2", "relevant": True},
+        {"statement": "two", "relevant": True},
+        {"relevant": False},
+        {"statement": 7, "relevant": True},
+        "not an object",
+    ]})
+
+    assert verification._entries_by_statement(raw, "grades", 3) == {
+        2: {"statement": "2", "relevant": True},
+    }
+    assert verification._entries_by_statement("[]", "grades", 3) == {}
+
+
+async def test_grading_assumes_relevant_for_statements_left_out(llm):
+    llm.reply = json.dumps({"grades": [{"statement": 1, "relevant": False}]})
+
+    relevant = await verification._grade_batch(["a", "b", "c"], [_RESULTS, [], _RESULTS])
+
+    # "b" has no results (not graded); "c" is statement 2 of the prompt, left out
+    assert relevant == [False, False, True]
+
+
+async def test_failed_grading_call_assumes_relevant(llm):
+    llm.reply = RuntimeError("provider down")
+
+    assert await verification._grade_batch(["a", "b"], [_RESULTS, []]) == [True, False]
+
+
+async def test_synthesis_falls_back_per_statement(monkeypatch, llm):
+    singles: list[str] = []
+
+    async def synthesise_node(state):
+        singles.append(state["statement_text"])
+        return {"verdict": "contradicted", "confidence": 0.5, "explanation": "single", "evidence": []}
+
+    monkeypatch.setattr(verification, "synthesise_node", synthesise_node)
+    llm.reply = json.dumps({"verdicts": [
+        {"statement": 1, "verdict": "supported", "confidence": 0.8, "explanation": "batch"},
+        {"statement": "?", "verdict": "supported"},
+    ]})
+
+    outputs = await verification._synthesise_batch(["a", "b", "c"], [_RESULTS, [], _RESULTS])
+
+    assert [o["verdict"] for o in outputs] == ["supported", "unverifiable", "contradicted"]
+    assert singles == ["c"]
+
+    llm.reply = RuntimeError("provider down")
+    singles.clear()
+    await verification._synthesise_batch(["a", "c"], [_RESULTS, _RESULTS])
+    assert singles == ["a", "c"]
+
+
+@pytest.fixture
+def batch(monkeypatch):
+    monkeypatch.setattr(verification.SETTINGS.COPILOT, "VERIFICATION_CACHE_ENABLED", False)
+    monkeypatch.setattr(verification.SETTINGS, "API_TIMEOUT_S", 0.2)
+    singles: list[str] = []
+
+    async def verify_statement(statement, vault_id, vault_version=None):
+        singles.append(statement.text)
+        if "hangs" in statement.text:
+            await asyncio.sleep(10)
+        return _verdict(statement)
+
+    monkeypatch.setattr(verification, "verify_statement", verify_statement)
+    return singles
+
+
+async def test_failed_batch_is_verified_statement_by_statement(monkeypatch, batch):
+    async def failing_batch(statements, vault_id):
+        raise RuntimeError("embedding service down")
+
+    monkeypatch.setattr(verification, "_verify_point_batch", failing_batch)
+    statements = [_statement("Invoice 10248 has a total of $440"), _statement("Order 10249 shipped")]
+
+    verdicts = await verification.verify_statements(statements, uuid4())
+
+    assert batch == [s.text for s in statements]
+    assert [v.verdict for v in verdicts] == ["supported", "supported"]
+
+
+async def test_timed_out_group_keeps_finished_verdicts(monkeypatch, batch):
+    async def slow_batch(statements, vault_id):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(verification, "_verify_point_batch", slow_batch)
+    statements = [
+        _statement("Invoice 10248 has a total of $440"),
+        _statement("There were 3 invoices issued in July 2016"),
+        _statement("Order 10249 shipped"),
+    ]
+
+    verdicts = await asyncio.wait_for(verification.verify_statements(statements, uuid4()), 2)
+
+    assert [v.explanation for v in verdicts] == [
+        "Verification timed out.", "checked", "Verification timed out.",
+    ]
+    assert verdicts[0].verification_path == "crag_batch"
+
+
+async def test_fallback_shares_the_batch_deadline(monkeypatch, batch):
+    async def failing_batch(statements, vault_id):
+        raise RuntimeError("embedding service down")
+
+    monkeypatch.setattr(verification, "_verify_point_batch", failing_batch)
+    statements = [_statement("Invoice 10248 hangs"), _statement("Order 10249 shipped")]
+
+    verdicts = await asyncio.wait_for(verification.verify_statements(statements, uuid4()), 2)
+
+    assert [v.explanation for v in verdicts] == ["Verification timed out.", "checked"]
@@ -0,0 +1,67 @@
+"""Tests for the streaming recursive chunker."""
+
+import random
+
+import pytest
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from app.core.rag.chunking.recursive import _ENCODER, _SEPARATORS, RecursiveChunker
+
+_WORDS = (
+    "invoice order total price customer shipped quantity product stock "
+    "units Chevalier Vins alcools 10248 12.50"
+).split()
+
+
+def _markdown(sections: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts = []
+    for s in range(sections):
+        parts.append(f"## Section {s}")
+        for _ in range(rng.randint(1, 6)):
+            sentences = (
+                " ".join(rng.choice(_WORDS) for _ in range(rng.randint(3, 40)))
+                for _ in range(rng.randint(1, 8))
+            )
+            parts.append(". ".join(sentences))
+        rows = "\n".join(f"| {rng.choice(_WORDS)} | {rng.randint(1, 999)} |" for _ in range(rng.randint(0, 30)))
+        parts.append("| a | b |\n|---|---|\n" + rows)
+    return "\n\n".join(parts) + "\n" + "x" * 3000
+
+
+@pytest.mark.parametrize("size,overlap", [(512, 50), (64, 10), (128, 0)])
+def test_matches_langchain_boundaries(size, overlap):
+    splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        encoding_name="cl100k_base", chunk_size=size, chunk_overlap=overlap, separators=_SEPARATORS,
+    )
+    text = _markdown(30)
+
+    expected = [f.strip() for f in splitter.split_text(text) if f.strip()]
+    chunks = RecursiveChunker(size, overlap).chunk(text, "report.md")
+
+    assert [c.content for c in chunks] == expected
+    assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+
+
+def test_token_counts_are_exact():
+    for c in RecursiveChunker(128, 16).chunk(_markdown(10, seed=3), "report.md"):
+        assert c.token_count == len(_ENCODER.encode(c.content))
+
+
+def test_iter_chunks_is_lazy():
+    chunker = RecursiveChunker(64, 8)
+    stream = chunker.iter_chunks(_markdown(50), "stock_report-2024.md")
+
+    first = next(stream)
+    assert first.chunk_index == 0
+    assert first.content_with_header.startswith("[Source: stock report 2024]\n")
+    assert next(stream).chunk_index == 1
+
+
+def test_blank_text_yields_nothing():
+    assert RecursiveChunker().chunk("  \n\n ", "empty.md") == []
+
+
+def test_overlap_larger_than_size_rejected():
+    with pytest.raises(ValueError):
+        RecursiveChunker(chunk_size=10, chunk_overlap=20)
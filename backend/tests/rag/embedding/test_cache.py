@@ -0,0 +1,68 @@
+"""Unit tests for the two-tier query-embedding cache."""
+
+import fakeredis.aioredis
+import pytest
+
+import app.core.tools.redis as redis_mod
+from app.core.rag.embedding.cache import QueryEmbeddingCache
+
+
+@pytest.fixture()
+def binary_redis():
+    original = redis_mod.redis_binary_client
+    redis_mod.redis_binary_client = fakeredis.aioredis.FakeRedis(decode_responses=False)
+    yield redis_mod.redis_binary_client
+    redis_mod.redis_binary_client = original
+
+
+def _cache(**kwargs) -> QueryEmbeddingCache:
+    return QueryEmbeddingCache(model="m", dimensions=3, **kwargs)
+
+
+class TestQueryEmbeddingCache:
+
+    async def test_miss_then_local_hit(self, binary_redis):
+        cache = _cache()
+        assert await cache.get("q") is None
+        await cache.put("q", [0.5, 1.0, -2.0])
+        assert await cache.get("q") == [0.5, 1.0, -2.0]
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["local_hits"] == 1
+
+    async def test_redis_tier_stores_packed_float32(self, binary_redis):
+        writer = _cache()
+        await writer.put("q", [0.25, 1.0, -2.0])
+        raw = await binary_redis.get(writer._key("q"))
+        assert len(raw) == 3 * 4
+
+        reader = _cache()  # fresh process-local tier
+        assert await reader.get_many(["q", "other"]) == [[0.25, 1.0, -2.0], None]
+        assert reader.stats()["redis_hits"] == 1
+        assert reader.stats()["misses"] == 1
+
+    async def test_lru_evicts_oldest(self, binary_redis):
+        cache = _cache(max_entries=2)
+        await cache.put_many(["a", "b", "c"], [[1.0] * 3, [2.0] * 3, [3.0] * 3])
+        assert cache.stats()["local_entries"] == 2
+        assert cache._local_get(cache._key("a")) is None
+
+    async def test_redis_failure_is_a_miss(self):
+        original = redis_mod.redis_binary_client
+
+        class Broken:
+            async def mget(self, keys):
+                raise ConnectionError("down")
+
+        redis_mod.redis_binary_client = Broken()
+        try:
+            cache = _cache()
+            assert await cache.get("q") is None
+            assert cache.stats()["redis_errors"] == 1
+        finally:
+            redis_mod.redis_binary_client = original
+
+    async def test_scope_isolates_models(self, binary_redis):
+        await _cache().put("q", [1.0, 2.0, 3.0])
+        other = QueryEmbeddingCache(model="other", dimensions=3)
+        assert await other.get("q") is None
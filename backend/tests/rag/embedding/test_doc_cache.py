@@ -0,0 +1,78 @@
+"""Unit tests for the content-hash keyed document-embedding cache."""
+
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core.rag.embedding.doc_cache import embed_documents_cached, embedding_cache_key
+from app.core.rag.exceptions import PartialEmbeddingError
+
+
+class _UnavailableCacheSession:
+    """Session whose cache table is unreachable — every statement fails."""
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    async def execute(self, *args, **kwargs):
+        raise RuntimeError("relation embedding_cache does not exist")
+
+
+class _RecordingEmbedder:
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    async def embed_documents(self, texts, token_counts=None):
+        self.calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+
+class TestEmbeddingCacheKey:
+
+    def test_scoped_by_model_and_dimensions(self):
+        base = embedding_cache_key("text", "m", 1536)
+        assert base != embedding_cache_key("text", "m", 256)
+        assert base != embedding_cache_key("text", "other", 1536)
+        assert len(base) == 64
+
+
+class TestEmbedDocumentsCached:
+
+    async def test_duplicate_texts_embedded_once(self):
+        embedder = _RecordingEmbedder()
+        texts = ["header A", "boilerplate", "boilerplate", "header B"]
+
+        vectors, stats = await embed_documents_cached(
+            texts, [2, 10, 10, 2], _UnavailableCacheSession(), embedder,
+        )
+
+        assert embedder.calls == [["header A", "boilerplate", "header B"]]
+        assert vectors == [[8.0], [11.0], [11.0], [8.0]]
+        assert stats.embedded_texts == 3
+        assert stats.cached_texts == 1
+        assert stats.tokens_saved == 10
+
+    async def test_empty_input_skips_api(self):
+        embedder = _RecordingEmbedder()
+        vectors, stats = await embed_documents_cached([], [], _UnavailableCacheSession(), embedder)
+        assert vectors == [] and embedder.calls == []
+        assert stats.api_calls_saved == 0
+
+    async def test_partial_failure_maps_back_to_every_duplicate(self):
+        class _PartlyFailingEmbedder:
+            async def embed_documents(self, texts, token_counts=None):
+                vectors = [None if t == "bad" else [1.0] for t in texts]
+                raise PartialEmbeddingError(
+                    "1 failed", vectors, [i for i, v in enumerate(vectors) if v is None],
+                )
+
+        with pytest.raises(PartialEmbeddingError) as info:
+            await embed_documents_cached(
+                ["ok", "bad", "ok", "bad"], [1, 1, 1, 1],
+                _UnavailableCacheSession(), _PartlyFailingEmbedder(),
+            )
+
+        assert info.value.failed_indices == [1, 3]
+        assert info.value.vectors == [[1.0], None, [1.0], None]
@@ -0,0 +1,95 @@
+"""Tests for token-packed, concurrent document embedding."""
+
+import asyncio
+
+import pytest
+
+from app.core.rag.embedding.scheduler import embed_in_sub_batches, pack_by_tokens
+from app.core.rag.exceptions import PartialEmbeddingError
+
+
+class _BadRequest(Exception):
+    status_code = 400
+
+
+class _FakeAPI:
+    """Embeds text as [len(text)]; rejects requests containing 'bad'."""
+
+    def __init__(self, delay: float = 0.0, fail_transient: bool = False):
+        self.requests: list[list[str]] = []
+        self.max_concurrent = 0
+        self._active = 0
+        self._delay = delay
+        self._fail_transient = fail_transient
+
+    async def __call__(self, texts):
+        self.requests.append(list(texts))
+        self._active += 1
+        self.max_concurrent = max(self.max_concurrent, self._active)
+        try:
+            await asyncio.sleep(self._delay)
+            if any("bad" in t for t in texts):
+                raise _BadRequest("invalid input")
+            if self._fail_transient and "t2" in texts:
+                raise TimeoutError("upstream timeout")
+            return [[float(len(t))] for t in texts]
+        finally:
+            self._active -= 1
+
+
+async def _embed(api, texts, tokens, **kw):
+    opts = dict(max_tokens=100, max_texts=10, max_in_flight=4) | kw
+    return await embed_in_sub_batches(texts, tokens, api, **opts)
+
+
+class TestPackByTokens:
+
+    def test_respects_token_budget_and_order(self):
+        assert pack_by_tokens([40, 40, 40, 10, 90], max_tokens=100, max_texts=10) == [
+            (0, 2), (2, 4), (4, 5),
+        ]
+
+    def test_respects_text_cap(self):
+        assert pack_by_tokens([1] * 5, max_tokens=100, max_texts=2) == [(0, 2), (2, 4), (4, 5)]
+
+    def test_oversized_text_gets_own_request(self):
+        assert pack_by_tokens([10, 500, 10], max_tokens=100, max_texts=10) == [(0, 1), (1, 2), (2, 3)]
+
+    def test_empty(self):
+        assert pack_by_tokens([], max_tokens=100, max_texts=10) == []
+
+
+class TestEmbedInSubBatches:
+
+    async def test_sub_batches_run_concurrently_and_keep_order(self):
+        api = _FakeAPI(delay=0.01)
+        texts = [f"text-{i:02d}" + "x" * i for i in range(20)]
+        vectors = await _embed(api, texts, [25] * 20, max_in_flight=3)
+
+        assert vectors == [[float(len(t))] for t in texts]
+        assert len(api.requests) == 5          # 4 texts × 25 tokens per request
+        assert api.max_concurrent == 3
+
+    async def test_bad_text_is_isolated_by_bisection(self):
+        api = _FakeAPI()
+        texts = [f"t{i}" for i in range(8)]
+        texts[5] = "bad"
+
+        with pytest.raises(PartialEmbeddingError) as info:
+            await _embed(api, texts, [10] * 8)
+
+        err = info.value
+        assert err.failed_indices == [5]
+        assert [v is None for v in err.vectors] == [i == 5 for i in range(8)]
+        assert err.vectors[0] == [2.0]
+
+    async def test_transient_failure_fails_only_its_request(self):
+        api = _FakeAPI(fail_transient=True)
+        texts = [f"t{i}" for i in range(6)]
+
+        with pytest.raises(PartialEmbeddingError) as info:
+            await _embed(api, texts, [50] * 6)
+
+        # requests are [t0,t1] [t2,t3] [t4,t5]; only the middle one failed, no bisection
+        assert info.value.failed_indices == [2, 3]
+        assert len(api.requests) == 3
@@ -0,0 +1,114 @@
+"""Tests for parsed-markdown artifacts."""
+
+import gzip
+
+import pytest
+
+from app.core.rag.parsing import artifact
+from app.core.rag.parsing.artifact import (
+    artifact_available,
+    artifact_path,
+    load_or_parse,
+    read_artifact,
+)
+from app.core.storage.local import LocalFileStore
+
+STORAGE_PATH = "vault-1/doc-1/notes.txt"
+FILE_HASH = "a" * 64
+
+
+class _CountingParser:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def parse(self, file_content: bytes, filename: str) -> str:
+        self.calls += 1
+        return file_content.decode("utf-8").upper()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalFileStore(str(tmp_path))
+
+
+@pytest.fixture
+def parser(monkeypatch):
+    p = _CountingParser()
+    monkeypatch.setattr(artifact, "get_parser", lambda file_type: p)
+    return p
+
+
+async def _load(store, parsed_ir_path, file_hash=FILE_HASH, file_content=None):
+    return await load_or_parse(
+        store,
+        storage_path=STORAGE_PATH,
+        file_hash=file_hash,
+        file_type="txt",
+        filename="notes.txt",
+        parsed_ir_path=parsed_ir_path,
+        file_content=file_content,
+    )
+
+
+def test_artifact_path_is_next_to_upload():
+    path = artifact_path(STORAGE_PATH, FILE_HASH)
+    assert path == f"vault-1/doc-1/parsed-{FILE_HASH}-v{artifact.ARTIFACT_VERSION}.md.gz"
+
+
+async def test_parse_once_then_serve_from_artifact(store, parser):
+    await store.save(STORAGE_PATH, b"invoice total")
+
+    markdown, ir_path = await _load(store, None)
+    assert markdown == "INVOICE TOTAL"
+    assert ir_path == artifact_path(STORAGE_PATH, FILE_HASH)
+    assert gzip.decompress(await store.get(ir_path)) == b"INVOICE TOTAL"
+
+    # Raw upload no longer needed once the artifact exists
+    await store.delete(STORAGE_PATH)
+    again, same_path = await _load(store, ir_path)
+    assert again == "INVOICE TOTAL"
+    assert same_path == ir_path
+    assert parser.calls == 1
+
+
+async def test_in_memory_content_skips_store_read(store, parser):
+    markdown, ir_path = await _load(store, None, file_content=b"abc")
+    assert markdown == "ABC"
+    assert await artifact_available(
+        store, storage_path=STORAGE_PATH, file_hash=FILE_HASH, parsed_ir_path=ir_path,
+    )
+
+
+async def test_hash_change_invalidates_artifact(store, parser):
+    await store.save(STORAGE_PATH, b"v1")
+    _, ir_path = await _load(store, None)
+
+    new_hash = "b" * 64
+    assert await read_artifact(
+        store, storage_path=STORAGE_PATH, file_hash=new_hash, parsed_ir_path=ir_path,
+    ) is None
+
+    await store.save(STORAGE_PATH, b"v2")
+    markdown, new_path = await _load(store, ir_path, file_hash=new_hash)
+    assert markdown == "V2"
+    assert new_path != ir_path
+    assert parser.calls == 2
+
+
+async def test_missing_or_corrupt_artifact_reparses(store, parser):
+    await store.save(STORAGE_PATH, b"text")
+    ir_path = artifact_path(STORAGE_PATH, FILE_HASH)
+
+    assert not await artifact_available(
+        store, storage_path=STORAGE_PATH, file_hash=FILE_HASH, parsed_ir_path=ir_path,
+    )
+    await store.save(ir_path, b"not gzip")
+    markdown, path = await _load(store, ir_path)
+    assert markdown == "TEXT"
+    assert path == ir_path
+    assert parser.calls == 1
+
+
+async def test_stale_artifact_without_raw_file_raises(store, parser):
+    with pytest.raises(FileNotFoundError):
+        await _load(store, None)
@@ -0,0 +1,146 @@
+"""Tests for page-sharded PDF parsing."""
+
+import pytest
+
+from app.core.rag.parsing import pdf
+from app.core.rag.parsing.pdf import (
+    _assemble,
+    _count_pages,
+    _page_ranges,
+    _parse_pdf_sync,
+    _scan_page_range,
+)
+
+
+# ---------------------------------------------------------------------------
+# Minimal PDF writer (Helvetica text + ruled table grids)
+# ---------------------------------------------------------------------------
+
+def _page_stream(title: str, table_rows: list[list[str]]) -> bytes:
+    ops = [f"BT /F1 18 Tf 50 780 Td ({title}) Tj ET", "BT /F1 10 Tf 50 750 Td (Region: North) Tj ET"]
+    if table_rows:
+        x0, col_w, row_h, top = 50, 150, 20, 720
+        ncols = len(table_rows[0])
+        bottom = top - row_h * len(table_rows)
+        for r in range(len(table_rows) + 1):
+            y = top - r * row_h
+            ops.append(f"{x0} {y} m {x0 + col_w * ncols} {y} l S")
+        for c in range(ncols + 1):
+            x = x0 + c * col_w
+            ops.append(f"{x} {top} m {x} {bottom} l S")
+        for r, row in enumerate(table_rows):
+            for c, cell in enumerate(row):
+                ops.append(f"BT /F1 10 Tf {x0 + c * col_w + 5} {top - (r + 1) * row_h + 6} Td ({cell}) Tj ET")
+    return "\n".join(ops).encode()
+
+
+def _build_pdf(pages: list[tuple[str, list[list[str]]]]) -> bytes:
+    objects: list[bytes] = []
+    n = len(pages)
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(n))
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {n} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, (title, rows) in enumerate(pages):
+        stream = _page_stream(title, rows)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def _report(n_pages: int) -> bytes:
+    """Stock report whose table continues across every page."""
+    header = ["Product", "Units", "Price"]
+    pages = []
+    for p in range(n_pages):
+        rows = [header] + [[f"Item{p}x{r}", str(p * 10 + r), f"{r}.50"] for r in range(3)]
+        pages.append((f"Stock Report {p + 1}", rows))
+    return _build_pdf(pages)
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestPageRanges:
+
+    def test_small_pdf_is_one_range(self):
+        assert _page_ranges(40, workers=4, min_pages=40) == [(0, 40)]
+
+    def test_single_worker_is_one_range(self):
+        assert _page_ranges(300, workers=1, min_pages=40) == [(0, 300)]
+
+    def test_ranges_cover_all_pages_contiguously(self):
+        ranges = _page_ranges(301, workers=4, min_pages=40)
+        assert len(ranges) == 4
+        assert ranges[0][0] == 0 and ranges[-1][1] == 301
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+
+class TestShardedParse:
+
+    def test_sharded_scan_matches_single_pass(self):
+        content = _report(5)
+        assert _count_pages(content, "r.pdf") == 5
+
+        single = _parse_pdf_sync(content, "r.pdf")
+        shards = [_scan_page_range(content, "r.pdf", s, e) for s, e in [(0, 2), (2, 3), (3, 5)]]
+        sharded = _assemble([scan for shard in shards for scan in shard], "r.pdf")
+        assert sharded == single
+
+    def test_table_merged_across_shard_boundary(self):
+        content = _report(4)
+        scans = _scan_page_range(content, "r.pdf", 0, 2) + _scan_page_range(content, "r.pdf", 2, 4)
+        markdown = _assemble(scans, "r.pdf")
+
+        # One merged table: a single header + separator, rows from every page
+        assert markdown.count("| Product") == 1
+        for p in range(4):
+            assert f"Item{p}x2" in markdown
+        # Table text is not duplicated into body blocks
+        assert markdown.count("Item0x0") == 1
+        assert "Stock Report 4" in markdown
+
+    async def test_parser_fans_out_across_pool(self, monkeypatch):
+        calls: list[tuple] = []
+        real_scan = pdf._scan_page_range
+
+        def recording_scan(content, filename, start, end):
+            calls.append((start, end))
+            return real_scan(content, filename, start, end)
+
+        class _InlinePool:
+            def submit(self, fn, *args):
+                from concurrent.futures import Future
+                fut = Future()
+                fut.set_result(fn(*args))
+                return fut
+
+        settings = pdf.get_settings()
+        monkeypatch.setattr(settings, "PDF_PARSE_WORKERS", 3)
+        monkeypatch.setattr(settings, "PDF_SHARD_MIN_PAGES", 2)
+        monkeypatch.setattr(pdf, "_scan_page_range", recording_scan)
+        monkeypatch.setattr(pdf, "_get_pdf_pool", lambda: _InlinePool())
+
+        content = _report(6)
+        markdown = await pdf.PdfParser().parse(content, "r.pdf")
+        assert calls == [(0, 2), (2, 4), (4, 6)]
+        assert markdown == _parse_pdf_sync(content, "r.pdf")
+
+    def test_unreadable_pdf_raises_value_error(self):
+        with pytest.raises(ValueError):
+            _parse_pdf_sync(b"not a pdf", "bad.pdf")
@@ -0,0 +1,87 @@
+"""Unit tests for follow-up reference detection and the rewrite cache."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.rag.query import rewriter
+from app.core.rag.query.rewriter import QueryRewriter, has_unresolved_references
+
+_HISTORY = [
+    {"role": "user", "content": "Tell me about invoice 10248"},
+    {"role": "assistant", "content": "Invoice 10248 has a total of $440"},
+]
+
+
+class _LLM:
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return SimpleNamespace(content="who are the customers of invoice 10248")
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    monkeypatch.setattr(rewriter, "_stats", dict.fromkeys(rewriter._stats, 0))
+    return _LLM()
+
+
+def _rewriter(llm, **kwargs) -> QueryRewriter:
+    instance = QueryRewriter(model="gpt-4o-mini", temperature=0.0, api_key="test", **kwargs)
+    instance._llm = llm
+    return instance
+
+
+class TestReferenceDetection:
+
+    @pytest.mark.parametrize("query", [
+        "who are the customers of it?",
+        "what's the total price?",
+        "and the shipping date?",
+        "Who shipped the order?",
+        "total?",
+    ])
+    def test_follow_ups_need_the_history(self, query):
+        assert has_unresolved_references(query)
+
+    @pytest.mark.parametrize("query", [
+        "What products are in order 10535?",
+        "List all invoices for customer MEREP",
+        "What is the total price of all invoices in 2016",
+        "Who shipped the order 10248?",
+    ])
+    def test_standalone_queries_are_not_rewritten(self, query):
+        assert not has_unresolved_references(query)
+
+
+async def test_standalone_follow_up_skips_the_llm(llm):
+    result = await _rewriter(llm).rewrite("What products are in order 10,535?", _HISTORY)
+
+    assert result == "What products are in order 10535?"
+    assert llm.calls == 0
+    assert rewriter.rewrite_stats()["skipped_standalone"] == 1
+
+
+async def test_rewrites_are_cached_on_the_prompt_history(llm):
+    instance = _rewriter(llm, cache_size=1, max_history_turns=1)
+    older = [{"role": "user", "content": "Show me order 10300"}] + _HISTORY
+
+    first = await instance.rewrite("who are the customers of it?", _HISTORY)
+    # The older turn is trimmed from the prompt, so it hits
+    second = await instance.rewrite("Who are the customers of it?  ", older)
+    assert not instance.needs_llm("who are the customers of it?", _HISTORY)
+    # Any change to the history the prompt sees is a different key
+    reworded = [_HISTORY[0], {"role": "assistant", "content": "It ships to Reims"}]
+    assert instance.needs_llm("who are the customers of it?", reworded)
+    # Evicts the first entry (cache_size=1)
+    await instance.rewrite("what about its date?", _HISTORY)
+    await instance.rewrite("who are the customers of it?", _HISTORY)
+
+    assert first == second == "who are the customers of invoice 10248"
+    assert llm.calls == 3
+    stats = rewriter.rewrite_stats()
+    assert (stats["cache_hits"], stats["llm_calls"]) == (1, 3)
+    assert stats["cache_hit_ratio"] == 0.25
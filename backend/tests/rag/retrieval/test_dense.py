@@ -0,0 +1,91 @@
+"""Unit tests for the dense search modes' SQL and parameters."""
+
+from uuid import uuid4
+
+import pytest
+
+from app.core.rag.retrieval import dense
+
+
+class _Result:
+
+    def fetchall(self):
+        return []
+
+
+class _RecordingSession:
+
+    def __init__(self):
+        self.calls: list[tuple[str, dict]] = []
+
+    async def execute(self, statement, params=None):
+        self.calls.append((str(statement), params or {}))
+        return _Result()
+
+
+async def test_exact_mode_orders_by_full_vector():
+    db = _RecordingSession()
+    await dense.dense_hits([0.1] * 8, uuid4(), db, top_k=5, mode="exact")
+
+    (sql, params), = db.calls
+    assert "halfvec" not in sql and "binary_quantize" not in sql
+    assert params["top_k"] == 5
+
+
+async def test_binary_mode_over_fetches_on_the_prefix_and_reranks(monkeypatch):
+    monkeypatch.setattr(dense.SETTINGS, "DENSE_RERANK_OVERFETCH", 4)
+    db = _RecordingSession()
+    query = [float(i) for i in range(1536)]
+
+    await dense.dense_hits(query, uuid4(), db, top_k=20, mode="binary")
+
+    (ef_sql, ef_params), (sql, params) = db.calls
+    assert "hnsw.ef_search" in ef_sql and ef_params == {"ef": "80"}
+    assert "binary_quantize(subvector(c.embedding, 1, 512))::bit(512)" in sql
+    assert "ORDER BY c.embedding <=> :query_vec" in sql
+    assert params["candidates"] == 80 and params["top_k"] == 20
+    assert params["compact_vec"] == str(query[:512])
+    assert params["query_vec"] == str(query)
+
+
+async def test_halfvec_mode_keeps_default_ef_search_for_small_fetches(monkeypatch):
+    monkeypatch.setattr(dense.SETTINGS, "DENSE_RERANK_OVERFETCH", 4)
+    db = _RecordingSession()
+
+    await dense.dense_hits([0.5] * 8, uuid4(), db, top_k=5, mode="halfvec")
+
+    (sql, params), = db.calls
+    assert "(c.embedding::halfvec(1536))" in sql
+    assert params["candidates"] == 20
+    assert params["compact_vec"] == params["query_vec"]
+
+
+async def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        await dense.dense_hits([0.1], uuid4(), _RecordingSession(), mode="pq")
+
+
+class _RowsSession(_RecordingSession):
+
+    def __init__(self, rows):
+        super().__init__()
+        self.rows = rows
+
+    async def execute(self, statement, params=None):
+        self.calls.append((str(statement), params or {}))
+        result = _Result()
+        result.fetchall = lambda: self.rows
+        return result
+
+
+async def test_many_queries_run_in_one_lateral_statement():
+    first, second = uuid4(), uuid4()
+    db = _RowsSession([(1, first, uuid4(), 0.9, None), (2, second, uuid4(), 0.8, None)])
+
+    hits = await dense.dense_hits_many([[0.1] * 4, [0.2] * 4, [0.3] * 4], uuid4(), db, mode="exact")
+
+    (sql, params), = db.calls
+    assert "CROSS JOIN LATERAL" in sql and "CAST(q.query_vec AS vector)" in sql
+    assert ":query_vec " not in sql
+    assert params["query_vecs"] == [str([0.1] * 4), str([0.2] * 4), str([0.3] * 4)]
+    assert [[h.chunk_id for h in per_query] for per_query in hits] == [[first], [second], []]
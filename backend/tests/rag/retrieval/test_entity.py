@@ -0,0 +1,83 @@
+"""Unit tests for identifier tokens and the indexed entity lookup."""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.core.rag.metadata import extract_identifier_tokens, identifier_lookup_tokens
+from app.core.rag.retrieval import entity
+
+
+class TestIdentifierTokens:
+
+    def test_extracts_numbers_and_named_references(self):
+        tokens = extract_identifier_tokens(
+            "[Source: invoice_10248.pdf] Invoice No: INV-10,249 | PO-5021 | order 521 | $440.00"
+        )
+        assert tokens == ["10248", "10249", "5021", "521", "INV-10249", "PO-5021"]
+
+    def test_codes_without_digits_are_tokens(self):
+        tokens = extract_identifier_tokens("Customer ID: VINET | Vins et alcools, SKU12a")
+        assert tokens == ["SKU12A", "VINET"]
+        assert identifier_lookup_tokens("vinet") == ["VINET"]
+
+    def test_digit_runs_inside_longer_numbers_are_not_tokens(self):
+        assert extract_identifier_tokens("Phone 1024812345") == ["1024812345"]
+
+    def test_lookup_matches_prefixed_and_bare_forms(self):
+        assert identifier_lookup_tokens("inv-10248") == ["INV-10248", "10248"]
+        assert identifier_lookup_tokens("10,248") == ["10248"]
+        assert set(identifier_lookup_tokens("INV-10248")) & set(
+            extract_identifier_tokens("Invoice 10248")
+        )
+
+
+class _Session:
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.params = None
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    async def execute(self, statement, params=None):
+        self.params = params
+        return SimpleNamespace(fetchall=lambda: self.rows)
+
+
+def _row(matched):
+    return SimpleNamespace(
+        id=uuid4(), doc_id=uuid4(), content="c", content_with_header="h",
+        chunk_index=0, section_heading=None, page_number=None,
+        original_filename="invoice.pdf", embedding_bin=None, matched=matched,
+    )
+
+
+async def test_chunks_matching_more_ids_rank_first():
+    one = _row(["10248", "INV-10248"])  # two tokens, but one ID
+    both = _row(["10248", "10249"])
+    db = _Session([one, both])
+
+    results = await entity.entity_id_search(["INV-10248", "10249"], uuid4(), db)
+
+    assert sorted(db.params["tokens"]) == ["10248", "10249", "INV-10248"]
+    # chunks stored before entity_tokens existed still match via ILIKE
+    assert sorted(db.params["patterns"]) == ["%10248%", "%10249%", "%INV-10248%"]
+    assert [r.chunk_id for r in results] == [both.id, one.id]
+    assert [r.score for r in results] == [1.0, 0.5]
+
+
+async def test_one_lookup_is_ranked_separately_per_query():
+    first = _row(["10248"])
+    second = _row(["10249"])
+    db = _Session([first, second])
+
+    results = await entity.entity_id_search_many([["10248"], [], ["10249", "10250"]], uuid4(), db)
+
+    assert sorted(db.params["tokens"]) == ["10248", "10249", "10250"]
+    assert [[r.chunk_id for r in per_query] for per_query in results] == [
+        [first.id], [], [second.id],
+    ]
+    assert results[2][0].score == 0.5
@@ -0,0 +1,39 @@
+"""Unit tests for the vectorised RRF / MMR kernels."""
+
+import numpy as np
+from langchain_core.vectorstores.utils import maximal_marginal_relevance as lc_mmr
+
+from app.core.rag.retrieval.fusion import mmr_indices, rank_by_score, rrf_scores
+
+
+class TestRrfScores:
+
+    def test_matches_formula(self):
+        scores = rrf_scores([np.array([0, 1]), np.array([1, 2])], n_candidates=3, k=60)
+        np.testing.assert_allclose(scores, [1 / 61, 1 / 62 + 1 / 61, 1 / 62])
+
+    def test_rank_by_score_is_stable_on_ties(self):
+        scores = rrf_scores([np.array([0]), np.array([1])], n_candidates=2)
+        assert rank_by_score(scores).tolist() == [0, 1]
+
+
+class TestMmrIndices:
+
+    def test_matches_langchain_reference(self):
+        rng = np.random.default_rng(7)
+        matrix = rng.standard_normal((200, 64)).astype(np.float32)
+        query = rng.standard_normal(64).astype(np.float32)
+
+        for lam in (1.0, 0.7, 0.3):
+            ours = mmr_indices(query, matrix, k=10, lambda_param=lam).tolist()
+            reference = lc_mmr(query, matrix, k=10, lambda_mult=lam)
+            assert ours == reference
+
+    def test_pure_diversity_skips_duplicates(self):
+        matrix = np.array([[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+        picked = mmr_indices(np.array([1.0, 0.1]), matrix, k=2, lambda_param=0.0)
+        assert picked.tolist() == [0, 2]
+
+    def test_k_larger_than_pool(self):
+        matrix = np.eye(2, dtype=np.float32)
+        assert sorted(mmr_indices(np.ones(2), matrix, k=5).tolist()) == [0, 1]
@@ -0,0 +1,172 @@
+"""Unit tests for hybrid search fusion and concurrent leg handling."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+import app.db
+from app.core.rag.retrieval import hybrid
+from app.core.rag.retrieval.base import RetrievalHit, SearchResult
+from app.core.rag.retrieval.hybrid import (
+    HybridTimings,
+    _run_leg,
+    concurrent_hybrid_search,
+    hybrid_search,
+    reciprocal_rank_fusion,
+)
+
+
+def _result(score: float = 0.5) -> SearchResult:
+    return SearchResult(
+        chunk_id=uuid4(),
+        doc_id=uuid4(),
+        content="text",
+        content_with_header="[Source: doc] text",
+        score=score,
+    )
+
+
+class TestReciprocalRankFusion:
+
+    def test_shared_chunk_ranks_first(self):
+        shared, dense_only, sparse_only = _result(), _result(), _result()
+        fused = reciprocal_rank_fusion([[dense_only, shared], [shared, sparse_only]])
+        assert fused[0].chunk_id == shared.chunk_id
+        assert len(fused) == 3
+
+    def test_keeps_vector_from_any_copy(self):
+        sparse_copy = _result()
+        dense_copy = sparse_copy.model_copy(update={"score": 0.9})
+        dense_copy._vector = np.ones(3, dtype=np.float32)
+        fused = reciprocal_rank_fusion([[sparse_copy], [dense_copy]])
+        assert fused[0].vector is not None
+
+    def test_empty_lists(self):
+        assert reciprocal_rank_fusion([[], []]) == []
+
+
+class TestRunLeg:
+
+    async def test_returns_results_and_records_timing(self):
+        timings = HybridTimings()
+        hits = [_result()]
+
+        async def leg():
+            return hits
+
+        assert await _run_leg("dense", leg, 1.0, timings) == hits
+        assert timings.dense_ms is not None
+        assert timings.degraded == []
+
+    async def test_slow_leg_degrades_to_empty(self):
+        timings = HybridTimings()
+
+        async def leg():
+            await asyncio.sleep(1.0)
+            return [_result()]
+
+        assert await _run_leg("sparse", leg, 0.01, timings) == []
+        assert timings.degraded == ["sparse"]
+        assert timings.sparse_ms is not None
+
+    async def test_failing_leg_degrades_to_empty(self):
+        timings = HybridTimings()
+
+        async def leg():
+            raise RuntimeError("bm25 index missing")
+
+        assert await _run_leg("sparse", leg, 1.0, timings) == []
+        assert timings.degraded == ["sparse"]
+
+
+class TestPendingEmbedding:
+
+    @pytest.fixture
+    def sparse_started(self, monkeypatch):
+        started = asyncio.Event()
+
+        @asynccontextmanager
+        async def fake_session():
+            yield None
+
+        async def fake_sparse(query_text, vault_id, db, top_k=20):
+            started.set()
+            return [RetrievalHit(chunk_id=uuid4(), doc_id=uuid4(), score=1.0)]
+
+        async def fake_dense(query_embedding, vault_id, db, top_k=20):
+            assert query_embedding == [1.0, 0.0]
+            return [RetrievalHit(chunk_id=uuid4(), doc_id=uuid4(), score=0.9)]
+
+        async def fake_hydrate(hits, vault_id, db):
+            return hits
+
+        monkeypatch.setattr(app.db, "get_db_session", fake_session)
+        monkeypatch.setattr(hybrid, "sparse_hits", fake_sparse)
+        monkeypatch.setattr(hybrid, "dense_hits", fake_dense)
+        monkeypatch.setattr(hybrid, "hydrate_hits", fake_hydrate)
+        return started
+
+    async def test_sparse_leg_runs_while_query_is_embedded(self, sparse_started):
+        async def embed():
+            # Only resolves once BM25 has started, i.e. without waiting for us
+            await sparse_started.wait()
+            return [1.0, 0.0]
+
+        outcome = await asyncio.wait_for(
+            concurrent_hybrid_search("invoice 10248", embed(), uuid4(), top_k=5), timeout=1.0,
+        )
+
+        assert len(outcome.results) == 2
+        assert outcome.timings.embed_ms is not None
+        assert outcome.timings.degraded == []
+
+    async def test_embedding_error_is_raised(self, sparse_started):
+        async def embed():
+            raise RuntimeError("embedding API down")
+
+        with pytest.raises(RuntimeError, match="embedding API down"):
+            await concurrent_hybrid_search("invoice 10248", embed(), uuid4(), top_k=5)
+        assert sparse_started.is_set()
+
+
+class _PostgresLikeSession:
+    """A failed statement aborts the transaction until its savepoint rolls back."""
+
+    def __init__(self, rows):
+        self.aborted = False
+        self.rows = rows
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        try:
+            yield
+        except Exception:
+            self.aborted = False
+            raise
+
+    async def execute(self, query, params=None):
+        if self.aborted:
+            raise RuntimeError("current transaction is aborted (InFailedSQLTransaction)")
+        if "@@@" in str(query):
+            self.aborted = True
+            raise RuntimeError("operator does not exist: text @@@ unknown")
+        return SimpleNamespace(fetchall=lambda: self.rows)
+
+
+async def test_failed_bm25_query_falls_back_to_dense_only(monkeypatch):
+    hit = RetrievalHit(chunk_id=uuid4(), doc_id=uuid4(), score=0.9)
+    db = _PostgresLikeSession([(hit.chunk_id, "text", "[Source: doc] text", None, 1, "doc.pdf")])
+
+    async def fake_dense(query_embedding, vault_id, db, top_k=20):
+        return [hit]
+
+    monkeypatch.setattr(hybrid, "dense_hits", fake_dense)
+
+    results = await hybrid_search("invoice 10248", [1.0, 0.0], uuid4(), db, top_k=5, mmr_lambda=1.0)
+
+    assert [r.chunk_id for r in results] == [hit.chunk_id]
+    assert results[0].original_filename == "doc.pdf"
@@ -0,0 +1,87 @@
+"""Unit tests for binary pgvector decoding and lightweight retrieval hits."""
+
+import struct
+from uuid import uuid4
+
+import numpy as np
+
+from app.core.rag.retrieval.base import (
+    RetrievalHit,
+    SearchResult,
+    attach_vectors,
+    decode_vectors,
+    hits_from_rows,
+)
+
+
+def _vector_send(values: list[float]) -> bytes:
+    """Encode values the way pgvector's ``vector_send`` does."""
+    return struct.pack(f">hh{len(values)}f", len(values), 0, *values)
+
+
+def _result() -> SearchResult:
+    return SearchResult(
+        chunk_id=uuid4(), doc_id=uuid4(),
+        content="text", content_with_header="text", score=0.5,
+    )
+
+
+class TestDecodeVectors:
+
+    def test_decodes_into_contiguous_float32_matrix(self):
+        matrix, present = decode_vectors([_vector_send([1.0, 2.0]), _vector_send([0.5, -1.5])])
+        assert matrix.dtype == np.float32
+        assert matrix.flags["C_CONTIGUOUS"]
+        np.testing.assert_array_equal(matrix, [[1.0, 2.0], [0.5, -1.5]])
+        assert present.tolist() == [True, True]
+
+    def test_null_rows_are_masked(self):
+        matrix, present = decode_vectors([None, _vector_send([3.0, 4.0])])
+        assert matrix.shape == (1, 2)
+        assert present.tolist() == [False, True]
+
+    def test_all_null(self):
+        matrix, present = decode_vectors([None])
+        assert matrix.size == 0
+        assert present.tolist() == [False]
+
+
+class TestAttachVectors:
+
+    def test_rows_share_one_buffer_and_are_not_serialised(self):
+        results = [_result(), _result(), _result()]
+        attach_vectors(results, [_vector_send([1.0, 0.0]), None, _vector_send([0.0, 1.0])])
+
+        assert results[1].vector is None
+        assert results[0].vector.base is results[2].vector.base
+        np.testing.assert_array_equal(results[2].vector, [0.0, 1.0])
+        assert "vector" not in results[0].model_dump()
+
+
+class TestRetrievalHit:
+
+    def _row(self, with_text: bool):
+        row = (uuid4(), uuid4(), 0.8, _vector_send([1.0, 2.0]))
+        if with_text:
+            row += ("body", "[Source: a.pdf] body", "Intro", 2, "a.pdf")
+        return row
+
+    def test_rows_without_text_are_unhydrated(self):
+        hits = hits_from_rows([self._row(False), self._row(False)])
+        assert not hits[0].is_hydrated
+        assert hits[0].vector.base is hits[1].vector.base
+
+    def test_as_dict_matches_pydantic_dump(self):
+        hit = hits_from_rows([self._row(True)])[0]
+        assert hit.is_hydrated
+        assert hit.as_dict() == hit.to_result().model_dump(mode="json")
+
+    def test_round_trip_keeps_vector(self):
+        hit = hits_from_rows([self._row(True)])[0]
+        back = RetrievalHit.from_result(hit.to_result())
+        assert back.vector is hit.vector
+        assert back.content_with_header == "[Source: a.pdf] body"
+
+    def test_is_slotted(self):
+        hit = hits_from_rows([self._row(False)])[0]
+        assert not hasattr(hit, "__dict__")
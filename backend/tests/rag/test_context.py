@@ -0,0 +1,72 @@
+"""Unit tests for token-budgeted prompt assembly."""
+
+from uuid import uuid4
+
+import pytest
+
+from app.core.rag import context
+from app.core.rag.chunking import count_tokens
+from app.core.rag.context import PromptBudgetStats, PromptUsage, assemble_context, fit_history
+from app.core.rag.retrieval.base import SearchResult
+
+_SHARED = "Ship Via: Speedy Express. Freight charges were 32.38 for this order."
+
+
+@pytest.fixture(autouse=True)
+def totals(monkeypatch):
+    fresh = PromptBudgetStats()
+    monkeypatch.setattr(context, "_totals", fresh)
+    return fresh
+
+
+def _result(doc_id, content: str, score: float = 0.9) -> SearchResult:
+    return SearchResult(
+        chunk_id=uuid4(), doc_id=doc_id, content=content,
+        content_with_header=f"[Source: order 10248]\n{content}", score=score,
+    )
+
+
+def test_overlapping_chunk_text_is_included_once():
+    doc = uuid4()
+    first = _result(doc, f"Order 10248 for VINET, shipped 1996-07-16. {_SHARED}")
+    second = _result(doc, f"{_SHARED} Products: Queso Cabrales x12, Tofu x10.")
+    duplicate = _result(doc, _SHARED)
+    usage = PromptUsage()
+
+    text = assemble_context([first, second, duplicate], max_tokens=1000, usage=usage)
+
+    assert text.count(_SHARED) == 1
+    assert "[Source: order 10248]\nProducts: Queso Cabrales" in text
+    assert "--- Document Chunk 3" not in text
+    assert usage.chunks_deduplicated == 2
+
+
+def test_chunks_past_the_budget_are_cut_then_dropped():
+    results = [_result(uuid4(), f"Line item {i}: " + "widget " * 80) for i in range(3)]
+    one = count_tokens(assemble_context(results[:1], max_tokens=10_000))
+    usage = PromptUsage()
+
+    text = assemble_context(results, max_tokens=one + 100, usage=usage)
+
+    assert count_tokens(text) <= one + 100
+    assert "Line item 1" in text and "Line item 2" not in text
+    assert (usage.truncations, usage.chunks_dropped) == (1, 1)
+
+
+def test_history_keeps_the_most_recent_turns_that_fit(totals):
+    history = [
+        {"role": "user", "content": "Tell me about invoice 10248"},
+        {"role": "assistant", "content": "Invoice 10248 " + "details " * 400},
+        {"role": "user", "content": "   "},
+        {"role": "user", "content": "Who shipped it?"},
+        {"role": "assistant", "content": "Speedy Express."},
+    ]
+    usage = PromptUsage()
+
+    kept = fit_history(history, max_tokens=50, max_message_tokens=40, usage=usage)
+    usage.record("test")
+
+    assert [m["content"] for m in kept[1:]] == ["Who shipped it?", "Speedy Express."]
+    assert kept[0]["content"].startswith("Invoice 10248") and kept[0]["content"].endswith("...")
+    assert usage.history_dropped == 1
+    assert totals.prompts == 1 and totals.prompt_tokens == usage.total <= 50
@@ -0,0 +1,56 @@
+"""Unit tests for the ingestion orchestrator's streaming chunk → embed stage."""
+
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core.rag import ingest
+from app.core.rag.chunking.recursive import RecursiveChunker
+
+
+class _NoCacheSession:
+    """Session whose embedding cache is unreachable (lookups fail open)."""
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    async def execute(self, *args, **kwargs):
+        raise RuntimeError("relation embedding_cache does not exist")
+
+
+class _RecordingEmbedder:
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    async def embed_documents(self, texts, token_counts=None):
+        self.calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(ingest, "get_chunker", lambda: RecursiveChunker(chunk_size=16, chunk_overlap=0))
+    monkeypatch.setattr(ingest.SETTINGS, "RAG_STREAM_EMBED_WINDOW", 3)
+
+
+async def test_chunks_are_embedded_in_windows(small_chunks):
+    markdown = "\n\n".join(f"Paragraph {i} lists invoice {10000 + i} for customer VINET." for i in range(8))
+    embedder = _RecordingEmbedder()
+
+    chunks, vectors, stats = await ingest._chunk_and_embed(markdown, "orders.md", _NoCacheSession(), embedder)
+
+    assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+    assert len(chunks) > 3
+    assert [len(call) for call in embedder.calls] == [
+        min(3, len(chunks) - i) for i in range(0, len(chunks), 3)
+    ]
+    assert vectors == [[float(len(c.content_with_header))] for c in chunks]
+    assert stats.total_texts == len(chunks)
+
+
+async def test_empty_markdown_embeds_nothing(small_chunks):
+    embedder = _RecordingEmbedder()
+    chunks, vectors, _ = await ingest._chunk_and_embed("   ", "empty.md", _NoCacheSession(), embedder)
+    assert chunks == [] and vectors == [] and embedder.calls == []
@@ -0,0 +1,152 @@
+"""Unit tests for the bulk persistence layer's COPY encoding and store fallback."""
+
+import struct
+from contextlib import asynccontextmanager
+from datetime import date
+from uuid import UUID, uuid4
+
+import numpy as np
+
+from app.core.rag import ingest
+from app.core.rag.chunking.base import ChunkData
+from app.core.rag.metadata import DocumentMetadata
+from app.core.rag.persistence import (
+    ChunkBatch, _STAGE_COLUMNS, _metadata_row, encode_vectors, iter_copy_payloads,
+)
+from app.core.rag.retrieval.base import decode_vectors
+
+
+def _chunk(i: int, text: str = "Invoice 10248") -> ChunkData:
+    return ChunkData(
+        content=text,
+        content_with_header=f"[Source: invoice.pdf] {text}",
+        content_hash=f"{i:064d}",
+        token_count=3 + i,
+        chunk_index=i,
+    )
+
+
+def _parse_copy(stream: bytes) -> list[list[bytes | None]]:
+    """Minimal reader for PostgreSQL's binary COPY format."""
+    assert stream.startswith(b"PGCOPY\n\xff\r\n\x00")
+    pos = 11 + 8
+    rows = []
+    while True:
+        (fields,) = struct.unpack_from(">h", stream, pos)
+        pos += 2
+        if fields == -1:
+            assert pos == len(stream)
+            return rows
+        row = []
+        for _ in range(fields):
+            (length,) = struct.unpack_from(">i", stream, pos)
+            pos += 4
+            if length == -1:
+                row.append(None)
+            else:
+                row.append(stream[pos:pos + length])
+                pos += length
+        rows.append(row)
+
+
+def test_vectors_round_trip_through_pgvector_binary_format():
+    vectors = [[0.5, -1.25, 3.0], [1e-3, 2.0, -7.5]]
+    matrix, present = decode_vectors(encode_vectors(vectors))
+    assert present.all()
+    np.testing.assert_allclose(matrix, np.asarray(vectors, dtype=np.float32))
+
+
+def test_copy_stream_encodes_every_chunk_row():
+    doc_id, vault_id = uuid4(), uuid4()
+    batch = ChunkBatch(
+        doc_id=doc_id,
+        vault_id=vault_id,
+        chunks=[_chunk(0), _chunk(1, "Ship to Reims — 32 €"), _chunk(2, "Summary")],
+        embeddings=[[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]],
+        meta_chunk_index=2,
+    )
+
+    rows = _parse_copy(b"".join(iter_copy_payloads([batch], rows_per_payload=2)))
+
+    assert len(rows) == 3
+    assert all(len(row) == len(_STAGE_COLUMNS) for row in rows)
+    col = {name: i for i, name in enumerate(_STAGE_COLUMNS)}
+    assert len({row[col["id"]] for row in rows}) == 3
+    assert {UUID(bytes=row[col["doc_id"]]) for row in rows} == {doc_id}
+    assert {UUID(bytes=row[col["vault_id"]]) for row in rows} == {vault_id}
+    assert [row[col["chunk_type"]] for row in rows] == [b"child", b"child", b"metadata"]
+    assert rows[1][col["content"]].decode() == "Ship to Reims — 32 €"
+    assert [struct.unpack(">i", row[col["token_count"]])[0] for row in rows] == [3, 4, 5]
+    assert [struct.unpack(">i", row[col["chunk_index"]])[0] for row in rows] == [0, 1, 2]
+    tokens = rows[0][col["entity_tokens"]]
+    assert struct.unpack_from(">iiiii", tokens) == (1, 0, 25, 1, 1)
+    assert tokens[20:].endswith(b"10248")
+    assert rows[2][col["entity_tokens"]] == struct.pack(">iii", 0, 0, 25)
+    matrix, _ = decode_vectors([row[col["embedding"]] for row in rows])
+    np.testing.assert_allclose(matrix, np.asarray(batch.embeddings, dtype=np.float32))
+
+
+def test_metadata_row_omits_missing_values():
+    doc_id = uuid4()
+    row = _metadata_row(doc_id, DocumentMetadata(
+        document_type="invoice", order_date=date(2016, 7, 4), total_price=440.0,
+    ))
+    assert row == {
+        "id": str(doc_id),
+        "document_type": "invoice",
+        "order_date": "2016-07-04",
+        "total_price": 440.0,
+    }
+
+
+class _Session:
+
+    def __init__(self):
+        self.commits = 0
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    async def commit(self):
+        self.commits += 1
+
+
+async def test_store_falls_back_to_per_document_writes(monkeypatch):
+    good, bad = uuid4(), uuid4()
+    calls: list[list[UUID]] = []
+    marked: dict = {}
+
+    async def fake_write(db, batches):
+        calls.append([b.doc_id for b in batches])
+        if any(b.doc_id == bad for b in batches):
+            raise RuntimeError("duplicate key value violates unique constraint")
+        return {b.doc_id: len(b.chunks) for b in batches}
+
+    async def fake_statuses(db, errors, status, **kwargs):
+        marked.update({doc_id: (status, msg) for doc_id, msg in errors.items()})
+
+    monkeypatch.setattr(ingest, "write_chunk_batch", fake_write)
+    monkeypatch.setattr(ingest, "set_document_statuses", fake_statuses)
+    bumped: list[set] = []
+
+    async def fake_bump(vault_ids):
+        bumped.append(set(vault_ids))
+
+    monkeypatch.setattr(ingest, "bump_vault_versions", fake_bump)
+
+    vault = uuid4()
+    prepared = [
+        ingest.PreparedDoc(doc_id=good, vault_id=vault, chunks=[_chunk(0)], embeddings=[[0.1]]),
+        ingest.PreparedDoc(doc_id=bad, vault_id=vault, chunks=[_chunk(0)], embeddings=[[0.2]]),
+    ]
+    session = _Session()
+
+    results = await ingest.store_prepared_docs(prepared, session)
+
+    assert results == {good: 1}
+    assert calls == [[good, bad], [good], [bad]]
+    assert marked[bad][0] == "failed" and "duplicate key" in marked[bad][1]
+    assert good not in marked
+    assert session.commits == 1
+    assert bumped == [{vault}]
@@ -0,0 +1,105 @@
+"""Unit tests for the aggregate rollup's deltas and read routing."""
+
+import json
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+from app.core.rag import rollup
+from app.core.rag.metadata import DocumentMetadata
+
+
+class _Result:
+
+    def __init__(self, row):
+        self._row = row
+
+    def one(self):
+        return self._row
+
+
+class _RecordingSession:
+
+    def __init__(self, row=(0, 0, 0, None)):
+        self.row = row
+        self.calls: list[tuple[str, dict]] = []
+
+    async def execute(self, statement, params=None):
+        self.calls.append((str(statement), params or {}))
+        return _Result(self.row)
+
+
+def test_delta_keys_by_month_and_counts_missing_price():
+    vault = uuid4()
+    added = rollup.rollup_delta(vault, DocumentMetadata(
+        document_type="invoice", order_date=date(2017, 3, 14), customer_id="VINET",
+        total_price=440.1,
+    ))
+    assert added == {
+        "vault_id": str(vault),
+        "document_type": "invoice",
+        "month": "2017-03-01",
+        "customer_id": "VINET",
+        "doc_count": 1,
+        "missing_total_price": 0,
+        "total_price_sum": "440.1",
+    }
+
+    removed = rollup.rollup_delta(vault, None, -1)
+    assert removed["document_type"] is None and removed["month"] is None
+    assert removed["doc_count"] == -1 and removed["missing_total_price"] == -1
+    assert removed["total_price_sum"] == "0"
+
+
+async def test_apply_sends_every_delta_in_one_upsert():
+    db = _RecordingSession()
+    vault = uuid4()
+    deltas = [rollup.rollup_delta(vault, None), rollup.rollup_delta(vault, None)]
+
+    await rollup.apply_rollup_deltas(db, deltas)
+    await rollup.apply_rollup_deltas(db, [])
+
+    (sql, params), = db.calls
+    assert "ON CONFLICT ON CONSTRAINT uq_document_rollups_key" in sql
+    assert "GROUP BY" in sql
+    assert json.loads(params["rows"]) == deltas
+
+
+async def test_whole_month_ranges_read_the_rollup():
+    db = _RecordingSession(row=(3, 1, 1, Decimal("880.20")))
+
+    stats = await rollup.document_stats(
+        db, vault_id=uuid4(), doc_type="invoice",
+        date_from=date(2017, 1, 1), date_to=date(2017, 12, 31),
+    )
+
+    (sql, _), = db.calls
+    assert "FROM document_rollups" in sql
+    assert stats == rollup.DocumentStats(
+        doc_count=3, total_price_sum=880.2, missing_order_date=1,
+        missing_total_price=1, source="rollup",
+    )
+
+
+async def test_rollup_reports_no_sum_when_nothing_is_priced():
+    db = _RecordingSession(row=(2, 0, 2, Decimal(0)))
+    stats = await rollup.document_stats(db, vault_id=uuid4(), doc_type="invoice")
+    assert stats.doc_count == 2 and stats.total_price_sum is None
+
+
+async def test_partial_month_ranges_fall_back_to_documents():
+    db = _RecordingSession(row=(1, 0, 0, 440.0))
+
+    stats = await rollup.document_stats(
+        db, vault_id=uuid4(), date_from=date(2017, 1, 5), date_to=date(2017, 1, 31),
+    )
+
+    (sql, _), = db.calls
+    assert "FROM documents" in sql and "document_rollups" not in sql
+    assert stats.source == "documents" and stats.total_price_sum == 440.0
+
+
+async def test_rollup_can_be_disabled():
+    db = _RecordingSession()
+    stats = await rollup.document_stats(db, vault_id=uuid4(), use_rollup=False)
+    assert stats.source == "documents"
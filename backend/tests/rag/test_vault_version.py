@@ -0,0 +1,120 @@
+"""Unit tests for the vault content-version counters and their local mirror."""
+
+from uuid import uuid4
+
+import pytest
+
+from app.core.rag import vault_version
+from app.core.rag.vault_version import VaultVersionCache
+
+
+class _Pipeline:
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def set(self, key, value, nx=False):
+        self.ops.append(("set", key, value, nx))
+
+    def get(self, key):
+        self.ops.append(("get", key))
+
+    def incr(self, key):
+        self.ops.append(("incr", key))
+
+    def publish(self, channel, message):
+        self.ops.append(("publish", channel, message))
+
+    async def execute(self):
+        return [self.redis.run(*op) for op in self.ops]
+
+
+class _Redis:
+
+    def __init__(self):
+        self.values: dict[str, str] = {}
+        self.published: list[tuple[str, str]] = []
+        self.reads = 0
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    def run(self, op, *args):
+        if op == "set":
+            key, value, nx = args
+            if nx and key in self.values:
+                return None
+            self.values[key] = str(value)
+            return True
+        if op == "get":
+            self.reads += 1
+            return self.values.get(args[0])
+        if op == "incr":
+            self.values[args[0]] = str(int(self.values.get(args[0], 0)) + 1)
+            return int(self.values[args[0]])
+        self.published.append(args)
+        return 1
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = _Redis()
+
+    async def get_client():
+        return fake
+
+    monkeypatch.setattr(vault_version, "_get_client", get_client)
+    return fake
+
+
+async def test_versions_are_seeded_and_only_grow(redis, monkeypatch):
+    monkeypatch.setattr(vault_version, "_seed", lambda: 1_000)
+    cache, vault_id = VaultVersionCache(), uuid4()
+
+    first = await cache.get(vault_id)
+    await cache.bump([vault_id])
+    second = await cache.get(vault_id)
+
+    assert (first, second) == ("1000", "1001")
+    assert redis.published == [("vault_version", f"{vault_id} 1001")]
+
+
+async def test_local_copy_is_only_trusted_while_subscribed(redis):
+    cache, vault_id = VaultVersionCache(), uuid4()
+
+    await cache.get(vault_id)
+    await cache.get(vault_id)
+    assert redis.reads == 2
+
+    cache._subscribed = True
+    await cache.get(vault_id)
+    assert redis.reads == 2
+    assert cache.stats()["local_hits"] == 1
+
+
+async def test_invalidation_messages_never_move_a_version_back(redis):
+    cache, vault_id = VaultVersionCache(), uuid4()
+    cache._subscribed = True
+
+    cache.apply(f"{vault_id} 7")
+    cache.apply(f"{vault_id} 5")
+    cache.apply("not a message")
+
+    assert await cache.get(vault_id) == "7"
+
+
+async def test_redis_failure_falls_back_to_vault_timestamp(monkeypatch):
+    async def broken_client():
+        raise ConnectionError("redis down")
+
+    async def updated_at(vault_id):
+        return "2025-07-01T10:00:00"
+
+    monkeypatch.setattr(vault_version, "_get_client", broken_client)
+    monkeypatch.setattr(vault_version, "_vault_updated_at", updated_at)
+    cache = VaultVersionCache()
+
+    assert await cache.get(uuid4()) == "2025-07-01T10:00:00"
+    await cache.bump([uuid4()])  # logged, not raised
+    assert cache.stats()["db_fallbacks"] == 1
@@ -0,0 +1,97 @@
+"""Tests for the shared LLM gateway's scheduling and retry policy."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.tools import llm
+from app.core.tools.llm import Priority, ProviderLimiter, call_provider
+
+
+class _ProviderError(Exception):
+
+    def __init__(self, status_code: int, headers: dict | None = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    fresh = ProviderLimiter("openai", max_concurrency=1)
+    monkeypatch.setattr(llm, "_limiters", {"openai": fresh})
+    monkeypatch.setattr(llm, "_stats", {})
+    return fresh
+
+
+async def test_waiting_calls_are_served_by_priority(limiter):
+    held = await limiter.acquire(Priority.INTERACTIVE, 0)
+    order: list[str] = []
+
+    async def wait(name: str, priority: Priority) -> None:
+        grant = await limiter.acquire(priority, 0)
+        order.append(name)
+        limiter.release(grant)
+
+    waiting = [
+        asyncio.create_task(wait("enrichment", Priority.BULK)),
+        asyncio.create_task(wait("chat", Priority.INTERACTIVE)),
+        asyncio.create_task(wait("verification", Priority.LIVE)),
+    ]
+    await asyncio.sleep(0)
+    limiter.release(held)
+    await asyncio.gather(*waiting)
+
+    assert order == ["verification", "chat", "enrichment"]
+
+
+async def test_bulk_calls_leave_slots_for_live_calls():
+    limiter = ProviderLimiter("openai", max_concurrency=2, bulk_max_share=0.5)
+    await limiter.acquire(Priority.BULK, 0)
+    second_bulk = asyncio.create_task(limiter.acquire(Priority.BULK, 0))
+    await asyncio.sleep(0)
+
+    live = await asyncio.wait_for(limiter.acquire(Priority.LIVE, 0), timeout=1)
+
+    assert live.priority == Priority.LIVE
+    assert not second_bulk.done()
+    second_bulk.cancel()
+
+
+async def test_rate_limit_honours_retry_after_and_pauses_the_queue(limiter):
+    attempts = 0
+
+    async def request() -> SimpleNamespace:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise _ProviderError(429, {"retry-after-ms": "50"})
+        return SimpleNamespace(usage_metadata={"input_tokens": 120, "output_tokens": 30})
+
+    started = time.monotonic()
+    await call_provider(
+        "openai", request, purpose="grading", priority=Priority.LIVE, timeout=1,
+        usage=llm._message_usage,
+    )
+
+    assert time.monotonic() - started >= 0.05
+    stats = llm.llm_stats()["purposes"]["grading"]
+    assert (stats["calls"], stats["retries"], stats["rate_limited"]) == (1, 1, 1)
+    assert (stats["input_tokens"], stats["output_tokens"]) == (120, 30)
+
+
+async def test_input_errors_are_not_retried(limiter):
+    attempts = 0
+
+    async def request():
+        nonlocal attempts
+        attempts += 1
+        raise _ProviderError(400)
+
+    with pytest.raises(_ProviderError):
+        await call_provider("openai", request, purpose="metadata", priority=Priority.BULK, timeout=1)
+
+    assert attempts == 1
+    assert llm.llm_stats()["providers"]["openai"]["in_flight"] == 0
@@ -0,0 +1,45 @@
+"""Tests for out-of-order Kafka offset tracking."""
+
+from app.core.kafka.offsets import OffsetTracker
+
+
+def test_commit_point_is_lowest_in_flight_offset():
+    tracker = OffsetTracker()
+    for offset in (10, 11, 12):
+        tracker.track("p0", offset)
+
+    tracker.complete("p0", 11)
+    tracker.complete("p0", 12)
+    assert tracker.committable() == {"p0": 10}
+
+    tracker.complete("p0", 10)
+    assert tracker.committable() == {"p0": 13}
+    assert tracker.in_flight() == 0
+
+
+def test_partitions_are_independent():
+    tracker = OffsetTracker()
+    tracker.track("p0", 5)
+    tracker.track("p1", 7)
+    tracker.complete("p1", 7)
+    assert tracker.committable() == {"p0": 5, "p1": 8}
+
+
+def test_only_advanced_partitions_are_reported():
+    tracker = OffsetTracker()
+    tracker.track("p0", 0)
+    tracker.complete("p0", 0)
+    tracker.mark_committed(tracker.committable())
+    assert tracker.committable() == {}
+
+    tracker.track("p0", 1)
+    assert tracker.committable() == {}
+    tracker.complete("p0", 1)
+    assert tracker.committable() == {"p0": 2}
+
+
+def test_forget_drops_revoked_partitions():
+    tracker = OffsetTracker()
+    tracker.track("p0", 3)
+    tracker.forget(["p0"])
+    assert tracker.committable() == {} and tracker.in_flight() == 0